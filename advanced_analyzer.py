@@ -14,11 +14,12 @@ _log = _logging.getLogger("alpha_hive.advanced_analyzer")
 
 # 动态导入期权分析模块
 try:
-    from options_analyzer import OptionsAgent
+    from options_analyzer import OptionsAgent, get_options_agent
     OPTIONS_AGENT_AVAILABLE = True
 except ImportError:
     OPTIONS_AGENT_AVAILABLE = False
     OptionsAgent = None
+    get_options_agent = None
 
 
 @dataclass
@@ -553,7 +554,7 @@ class AdvancedAnalyzer:
         # 5. 期权分析（新增）
         if OPTIONS_AGENT_AVAILABLE and OptionsAgent is not None:
             try:
-                options_agent = OptionsAgent()
+                options_agent = get_options_agent()
                 analysis["options_analysis"] = options_agent.analyze(
                     ticker, stock_price=current_price if current_price > 0 else None
                 )
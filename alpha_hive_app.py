@@ -25,6 +25,10 @@ _log = _logging.getLogger("alpha_hive.app")
 _PROJECT_ROOT = os.environ.get("ALPHA_HIVE_HOME", os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, _PROJECT_ROOT)
 
+from event_bus import TOPIC_PRICE_SPIKE, TOPIC_VOLUME_SPIKE, publish as _publish_event
+from market_feed import get_market_feed
+from resilience import PRIORITY_BACKGROUND, request_priority
+
 
 # ==================== 蜂群消息（Agent 间通信） ====================
 
@@ -179,8 +183,51 @@ class ResonanceLine:
 
 # ==================== 像素蜜蜂精灵 ====================
 
+class SpriteCache:
+    """
+    蜜蜂精灵缓存：每种（Agent 配色, 朝向, 翅膀相位, 像素尺寸）只绘制一次到 PhotoImage
+
+    精灵坐标系覆盖 _px 网格 gx ∈ [-1, 6]、gy ∈ [-1, 4]（含翅膀），左上角对应网格 (-1, -1)。
+    """
+
+    GRID_COLS = 8
+    GRID_ROWS = 6
+
+    def __init__(self, master=None):
+        self.master = master
+        self._images = {}
+
+    def get(self, agent_id, colors, facing_right, wing_phase, ps):
+        key = (agent_id, facing_right, wing_phase, ps)
+        img = self._images.get(key)
+        if img is None:
+            img = tk.PhotoImage(master=self.master, width=self.GRID_COLS * ps, height=self.GRID_ROWS * ps)
+            for gx, gy, color in PixelBee.sprite_pixels(colors, wing_phase):
+                if not facing_right:
+                    gx = 5 - gx
+                x0, y0 = (gx + 1) * ps, (gy + 1) * ps
+                img.put(color, to=(x0, y0, x0 + ps, y0 + ps))
+            self._images[key] = img
+        return img
+
+
 class PixelBee:
-    """像素蜜蜂 Agent（含互动能力）"""
+    """像素蜜蜂 Agent（含互动能力）
+
+    两种渲染方式：
+    - 逐像素（sprites=None）：每帧删除并重建所有像素矩形
+    - 精灵（传入 SpriteCache）：身体为缓存的 PhotoImage，标签/光圈/气泡/粒子为常驻 canvas item，
+      每帧只移动坐标、仅在属性变化时 itemconfigure（Tk 只重绘变化区域）
+    """
+
+    _BODY = [
+        (2, 0), (3, 0),
+        (1, 1), (2, 1), (3, 1), (4, 1),
+        (0, 2), (1, 2), (2, 2), (3, 2), (4, 2), (5, 2),
+        (1, 3), (2, 3), (3, 3), (4, 3),
+        (2, 4), (3, 4),
+    ]
+    _STRIPE = {(0, 2), (2, 2), (4, 2), (1, 3), (3, 3)}
 
     AGENT_COLORS = {
         "ScoutBeeNova":       {"body": "#FFB800", "wing": "#FFF4CC", "eye": "#1A1A1A", "accent": "#FF8C00", "label": "Scout"},
@@ -192,8 +239,12 @@ class PixelBee:
         "CodeExecutorAgent":  {"body": "#00CED1", "wing": "#E0FFFF", "eye": "#1A1A1A", "accent": "#008B8B", "label": "Code"},
     }
 
-    def __init__(self, canvas, agent_id, home_x, home_y, pixel_size=5):
+    def __init__(self, canvas, agent_id, home_x, home_y, pixel_size=5, sprites=None):
         self.canvas = canvas
+        self.sprites = sprites
+        self._sprite_items = {}   # 精灵模式：name → 常驻 canvas item
+        self._item_state = {}     # name → (coords, options)，用于跳过未变化的更新
+        self._hidden = set()
         self.agent_id = agent_id
         self.colors = self.AGENT_COLORS.get(agent_id, self.AGENT_COLORS["ScoutBeeNova"])
         self.home_x = home_x
@@ -274,12 +325,21 @@ class PixelBee:
         elif message.msg_type == "signal":
             self.say("?", 30)
 
-    def update(self):
-        self.frame += 1
+    @property
+    def is_animating(self):
+        """是否处于需要高帧率的动画中（空闲时 App 降低帧率）"""
+        return (self.state != "idle" or self.dancing or self.gathering or self.excited
+                or self.speech_timer > 0 or bool(self.particles)
+                or abs(self.home_x - self.x) > 2 or abs(self.home_y - self.y) > 2)
 
-        for item in self.items:
-            self.canvas.delete(item)
-        self.items.clear()
+    def update(self, step=1):
+        """推进动画；step 为本帧对应的逻辑帧数（降帧率时 >1，保持动画速度不变）"""
+        self.frame += step
+
+        if self.sprites is None:
+            for item in self.items:
+                self.canvas.delete(item)
+            self.items.clear()
 
         self._update_particles()
 
@@ -302,7 +362,7 @@ class PixelBee:
 
         # 兴奋计时器
         if self.excited_timer > 0:
-            self.excited_timer -= 1
+            self.excited_timer = max(0, self.excited_timer - step)
             if self.excited_timer == 0:
                 self.excited = False
 
@@ -321,15 +381,78 @@ class PixelBee:
         # 兴奋效果（闪烁轮廓）
         if self.excited:
             self._draw_excited_ring()
+        else:
+            self._hide("ring")
 
         # 气泡文字
         if self.speech_timer > 0:
             self._draw_speech_bubble()
-            self.speech_timer -= 1
+            self.speech_timer = max(0, self.speech_timer - step)
+        else:
+            self._hide("bubble_bg", "bubble_tip", "bubble_text")
 
         # 名称标签
         self._draw_label()
 
+    # ==================== 绘制原语 ====================
+
+    def _shape(self, name, factory, coords, **opts):
+        """
+        绘制一个具名图元：逐像素模式下每帧新建；精灵模式下首次创建，
+        之后只在坐标/属性变化时更新已有 item
+        """
+        coords = tuple(coords)
+        if self.sprites is None:
+            self.items.append(factory(*coords, **opts))
+            return
+        item = self._sprite_items.get(name)
+        if item is None:
+            self._sprite_items[name] = factory(*coords, **opts)
+            self._item_state[name] = (coords, opts)
+            return
+        last_coords, last_opts = self._item_state[name]
+        if coords != last_coords:
+            self.canvas.coords(item, *coords)
+        changed = {k: v for k, v in opts.items() if last_opts.get(k) != v}
+        if name in self._hidden:
+            self._hidden.discard(name)
+            changed["state"] = "normal"
+        if changed:
+            self.canvas.itemconfigure(item, **changed)
+        self._item_state[name] = (coords, {**last_opts, **opts})
+
+    def _hide(self, *names):
+        """精灵模式：隐藏常驻 item（逐像素模式下本帧未绘制即不可见）"""
+        for name in names:
+            item = self._sprite_items.get(name)
+            if item is not None and name not in self._hidden:
+                self.canvas.itemconfigure(item, state="hidden")
+                self._hidden.add(name)
+
+    @classmethod
+    def sprite_pixels(cls, colors, wing_phase=None):
+        """蜜蜂像素 [(gx, gy, color)]（朝右；wing_phase=None 表示不画翅膀）"""
+        pixels = [(gx, gy, "#1A1A1A" if (gx, gy) in cls._STRIPE else colors["body"])
+                  for gx, gy in cls._BODY]
+        pixels += [(2, 1, colors["eye"]), (4, 1, colors["eye"]),
+                   (1, -1, colors["accent"]), (4, -1, colors["accent"])]
+        if wing_phase is not None:
+            wy = (-1, 0) if wing_phase % 2 == 0 else (1, 2)
+            pixels += [(gx, gy, colors["wing"]) for gx in (-1, 6) for gy in wy]
+        return pixels
+
+    def _draw_bee(self, flap_phase=None):
+        """绘制身体 + 翅膀（flap_phase=None 不画翅膀）"""
+        if self.sprites is not None:
+            wing = None if flap_phase is None else flap_phase % 2
+            img = self.sprites.get(self.agent_id, self.colors, self.facing_right, wing, self.ps)
+            coords = (self.x - self.ps, self.y - self.ps + self.bob_offset)
+            self._shape("body", self.canvas.create_image, coords, image=img, anchor="nw")
+            return
+        self._draw_bee_body()
+        if flap_phase is not None:
+            self._draw_wings(flap_phase)
+
     def _px(self, gx, gy, color):
         if not self.facing_right:
             gx = 5 - gx  # 水平翻转
@@ -374,29 +497,26 @@ class PixelBee:
 
     def _draw_idle_bee(self):
         self.bob_offset = int(math.sin(self.frame * 0.08) * 3)
-        self._draw_bee_body()
-        self._draw_wings(self.frame // 18)
+        self._draw_bee(self.frame // 18)
 
     def _draw_working_bee(self):
         self.bob_offset = int(math.sin(self.frame * 0.25) * 5)
         if self.frame % 8 == 0:
             self.x += random.randint(-4, 4)
             self.y += random.randint(-3, 3)
-        self._draw_bee_body()
-        self._draw_wings(self.frame // 4)
+        self._draw_bee(self.frame // 4)
         if self.frame % 6 == 0:
             self._spawn_particle("spark")
 
     def _draw_publishing_bee(self):
         self.bob_offset = int(math.sin(self.frame * 0.15) * 2)
-        self._draw_bee_body()
-        self._draw_wings(self.frame // 6)
+        self._draw_bee(self.frame // 6)
         if self.frame % 4 == 0:
             self._spawn_particle("glow")
 
     def _draw_sleeping_bee(self):
         self.bob_offset = 0
-        self._draw_bee_body()
+        self._draw_bee()
         if self.frame % 40 == 0:
             self._spawn_particle("zzz")
 
@@ -411,8 +531,7 @@ class PixelBee:
         self.y = self.home_y + dy
         self.facing_right = math.cos(t) > 0
         self.bob_offset = int(math.sin(self.frame * 0.3) * 3)
-        self._draw_bee_body()
-        self._draw_wings(self.frame // 3)  # 快速扇翅
+        self._draw_bee(self.frame // 3)  # 快速扇翅
         if self.frame % 5 == 0:
             self._spawn_particle("spark")
             self._spawn_particle("glow")
@@ -422,11 +541,8 @@ class PixelBee:
         cx = self.x + 3 * self.ps
         cy = self.y + 2 * self.ps + self.bob_offset
         r = 18 + int(3 * math.sin(self.frame * 0.5))
-        item = self.canvas.create_oval(
-            cx - r, cy - r, cx + r, cy + r,
-            outline=self.colors["accent"], width=2, dash=(3, 3)
-        )
-        self.items.append(item)
+        self._shape("ring", self.canvas.create_oval, (cx - r, cy - r, cx + r, cy + r),
+                    outline=self.colors["accent"], width=2, dash=(3, 3))
 
     def _draw_speech_bubble(self):
         """头顶气泡"""
@@ -436,37 +552,26 @@ class PixelBee:
 
         # 气泡背景
         tw = len(text) * 7 + 10
-        item = self.canvas.create_rectangle(
-            cx - tw//2, cy - 10, cx + tw//2, cy + 8,
-            fill="#222200", outline=self.colors["accent"], width=1
-        )
-        self.items.append(item)
+        self._shape("bubble_bg", self.canvas.create_rectangle,
+                    (cx - tw//2, cy - 10, cx + tw//2, cy + 8),
+                    fill="#222200", outline=self.colors["accent"], width=1)
 
         # 小三角
-        item = self.canvas.create_polygon(
-            cx - 3, cy + 8, cx + 3, cy + 8, cx, cy + 14,
-            fill="#222200", outline=self.colors["accent"]
-        )
-        self.items.append(item)
+        self._shape("bubble_tip", self.canvas.create_polygon,
+                    (cx - 3, cy + 8, cx + 3, cy + 8, cx, cy + 14),
+                    fill="#222200", outline=self.colors["accent"])
 
         # 文字
-        item = self.canvas.create_text(
-            cx, cy - 1, text=text,
-            fill=self.colors["accent"], font=("Monaco", 9, "bold")
-        )
-        self.items.append(item)
+        self._shape("bubble_text", self.canvas.create_text, (cx, cy - 1), text=text,
+                    fill=self.colors["accent"], font=("Monaco", 9, "bold"))
 
     def _draw_label(self):
         label = self.colors["label"]
         x = self.x + 3 * self.ps
         y = self.y + 7 * self.ps + self.bob_offset
         score_text = f" {self.score:.1f}" if self.score > 0 else ""
-        item = self.canvas.create_text(
-            x, y, text=f"{label}{score_text}",
-            fill=self.colors["accent"],
-            font=("Monaco", 9, "bold"), anchor="center"
-        )
-        self.items.append(item)
+        self._shape("label", self.canvas.create_text, (x, y), text=f"{label}{score_text}",
+                    fill=self.colors["accent"], font=("Monaco", 9, "bold"), anchor="center")
 
     def _spawn_particle(self, ptype):
         px = self.x + 3 * self.ps + random.randint(-10, 10)
@@ -490,26 +595,37 @@ class PixelBee:
             })
 
     def _update_particles(self):
+        """推进粒子；精灵模式下每个粒子对应一个常驻 item，生命结束时删除"""
         new = []
         for p in self.particles:
             p["life"] -= 1
             if p["life"] <= 0:
+                if "item" in p:
+                    self.canvas.delete(p["item"])
                 continue
             p["x"] += p["vx"]
             p["y"] += p["vy"]
             if p["type"] == "zzz":
                 sz = max(1, p["life"] // 12)
-                item = self.canvas.create_text(
-                    p["x"], p["y"], text="z",
-                    fill=p["color"], font=("Monaco", 7 + sz)
-                )
+                coords, font = (p["x"], p["y"]), ("Monaco", 7 + sz)
+                if self.sprites is None:
+                    self.items.append(self.canvas.create_text(*coords, text="z", fill=p["color"], font=font))
+                elif "item" not in p:
+                    p["item"] = self.canvas.create_text(*coords, text="z", fill=p["color"], font=font)
+                else:
+                    self.canvas.coords(p["item"], *coords)
+                    if p.get("sz") != sz:
+                        self.canvas.itemconfigure(p["item"], font=font)
+                p["sz"] = sz
             else:
                 sz = max(1, p["life"] // 5)
-                item = self.canvas.create_oval(
-                    p["x"]-sz, p["y"]-sz, p["x"]+sz, p["y"]+sz,
-                    fill=p["color"], outline=""
-                )
-            self.items.append(item)
+                coords = (p["x"]-sz, p["y"]-sz, p["x"]+sz, p["y"]+sz)
+                if self.sprites is None:
+                    self.items.append(self.canvas.create_oval(*coords, fill=p["color"], outline=""))
+                elif "item" not in p:
+                    p["item"] = self.canvas.create_oval(*coords, fill=p["color"], outline="")
+                else:
+                    self.canvas.coords(p["item"], *coords)
             new.append(p)
         self.particles = new
 
@@ -518,8 +634,9 @@ class PixelBee:
 
 class LiveMonitor:
     """
-    真实数据实时监控 - 后台线程定期拉取 yfinance 数据
+    真实数据实时监控 - 后台线程每轮批量拉取全部监控标的（market_feed 共享行情源）
     检测价格异动、成交量异动、波动率变化、催化剂倒计时
+    bar 保存在进程级环形缓冲中，蜂群预取可直接复用
     """
 
     # 监控前 5 个 WATCHLIST 标的
@@ -536,6 +653,7 @@ class LiveMonitor:
         self._callbacks = []    # [(agent_id, msg, msg_type, bee_action)]
         self._lock = __import__("threading").Lock()
         self._last_catalyst_check = 0
+        self.feed = get_market_feed()
 
     def start(self):
         self.running = True
@@ -557,7 +675,7 @@ class LiveMonitor:
             self._callbacks.append((agent_id, msg, msg_type, bee_action))
 
     def _monitor_loop(self):
-        """后台循环"""
+        """后台循环：每轮批量拉取全部监控标的 → 共享环形缓冲 → 向量化异动检测"""
         import time as _time
         _time.sleep(3)  # 启动延迟
 
@@ -566,11 +684,10 @@ class LiveMonitor:
             try:
                 cycle += 1
 
-                # 每次随机选 1-2 个标的拉取（避免并发请求过多）
-                tickers = random.sample(self.MONITOR_TICKERS, min(2, len(self.MONITOR_TICKERS)))
-
-                for ticker in tickers:
-                    self._check_ticker(ticker)
+                # 后台轮询让出限流令牌：交互扫描 / 事件重扫优先
+                with request_priority(PRIORITY_BACKGROUND):
+                    self.feed.poll(self.MONITOR_TICKERS)
+                self._check_alerts(self.feed.snapshot(self.MONITOR_TICKERS))
 
                 # 每 5 分钟检查催化剂倒计时
                 now = _time.time()
@@ -581,45 +698,48 @@ class LiveMonitor:
             except (ConnectionError, TimeoutError, OSError, ValueError, KeyError) as e:
                 _log.debug("DataFeed cycle %d error: %s", cycle, e)
 
-            # 30-45 秒随机间隔（避免完全规律的请求）
-            _time.sleep(self.REFRESH_INTERVAL + random.randint(0, 15))
-
-    def _check_ticker(self, ticker):
-        """检查单个标的的价格和成交量"""
-        try:
-            import yfinance as yf
-            t = yf.Ticker(ticker)
-            hist = t.history(period="5d")
-            if hist.empty or len(hist) < 2:
-                return
-
-            current_price = float(hist["Close"].iloc[-1])
-            prev_close = float(hist["Close"].iloc[-2])
-            change_pct = (current_price / prev_close - 1) * 100
-
-            # 成交量
-            current_vol = float(hist["Volume"].iloc[-1])
-            avg_vol = float(hist["Volume"].mean())
-            vol_ratio = current_vol / avg_vol if avg_vol > 0 else 1.0
-
-            # 5 日动量
-            if len(hist) >= 5:
-                mom_5d = (hist["Close"].iloc[-1] / hist["Close"].iloc[0] - 1) * 100
-            else:
-                mom_5d = change_pct
-
-            prev = self._cache.get(ticker, {})
+            _time.sleep(self.REFRESH_INTERVAL)
+
+    def _check_alerts(self, snap):
+        """对一轮快照做向量化异动检测（全部标的一次比较），再逐条推送触发的事件"""
+        import numpy as np
+
+        tickers = snap["tickers"]
+        price = snap["price"]
+        change = snap["change_pct"]
+        vol_ratio = snap["volume_ratio_5d"]
+        mom_5d = snap["momentum_5d"]
+
+        valid = ~np.isnan(change)
+        prev_change = np.array([self._cache.get(t, {}).get("change_pct", 0.0) for t in tickers])
+        prev_vol = np.array([self._cache.get(t, {}).get("volume_ratio", 0.0) for t in tickers])
+        first_load = np.array([t not in self._cache for t in tickers], dtype=bool)
+
+        price_hit = valid & (np.abs(change) >= self.PRICE_ALERT_PCT)
+        vol_hit = valid & (vol_ratio >= self.VOLUME_ALERT_RATIO)
+        # 异动由"未触发"变为"触发"时发布到事件总线（驱动该 ticker 的事件式重扫）
+        price_new = price_hit & (np.abs(prev_change) < self.PRICE_ALERT_PCT)
+        vol_new = vol_hit & (prev_vol < self.VOLUME_ALERT_RATIO)
+
+        for i in np.flatnonzero(valid):
+            ticker = tickers[i]
+            current_price, change_pct = float(price[i]), float(change[i])
+            ratio = float(vol_ratio[i])
             self._cache[ticker] = {
                 "price": current_price,
                 "change_pct": change_pct,
-                "volume_ratio": vol_ratio,
-                "momentum_5d": mom_5d,
+                "volume_ratio": ratio,
+                "momentum_5d": float(mom_5d[i]),
             }
 
+            if price_new[i]:
+                _publish_event(TOPIC_PRICE_SPIKE, ticker, change_pct=change_pct, price=current_price)
+            if vol_new[i]:
+                _publish_event(TOPIC_VOLUME_SPIKE, ticker, volume_ratio=ratio)
+
             # === 价格异动检测 ===
-            if abs(change_pct) >= self.PRICE_ALERT_PCT:
+            if price_hit[i]:
                 dir_word = "涨" if change_pct > 0 else "跌"
-                emoji_dir = "看多" if change_pct > 0 else "看空"
                 self._emit(
                     "ScoutBeeNova",
                     f"{ticker} 价格异动！{dir_word} {change_pct:+.2f}%，现价 ${current_price:.2f}",
@@ -635,26 +755,23 @@ class LiveMonitor:
                 )
 
             # === 成交量异动检测 ===
-            if vol_ratio >= self.VOLUME_ALERT_RATIO:
+            if vol_hit[i]:
                 self._emit(
                     "BuzzBeeWhisper",
-                    f"{ticker} 成交量异动！量比 {vol_ratio:.1f}x（{vol_ratio:.0%} 于 5 日均量）",
+                    f"{ticker} 成交量异动！量比 {ratio:.1f}x（{ratio:.0%} 于 5 日均量）",
                     "alert",
                     {"state": "working", "say": f"{ticker} 量!"}
                 )
 
             # === 常规价格播报（无异动时也偶尔播报）===
-            elif not prev:  # 首次加载
+            elif first_load[i]:  # 首次加载
                 self._emit(
                     "ScoutBeeNova",
-                    f"{ticker} ${current_price:.2f}（{change_pct:+.2f}%）| 量比 {vol_ratio:.1f}x | 5日 {mom_5d:+.1f}%",
+                    f"{ticker} ${current_price:.2f}（{change_pct:+.2f}%）| 量比 {ratio:.1f}x | 5日 {float(mom_5d[i]):+.1f}%",
                     "discovery",
                     {"state": "publishing", "score": 5 + change_pct * 0.3}
                 )
 
-        except (ConnectionError, TimeoutError, OSError, ValueError, KeyError) as e:
-            _log.debug("Ticker check failed for %s: %s", ticker, e)
-
     def _check_catalysts(self):
         """检查催化剂倒计时"""
         try:
@@ -745,6 +862,17 @@ class InteractionManager:
         # 启动实时监控引擎
         self.monitor = LiveMonitor()
         self.monitor.start()
+        # 事件驱动重扫：LiveMonitor 异动 / 新 Form 4 / 财报发布 → 只重扫受影响 ticker 的相关 Agent
+        self.rescan_dispatcher = None
+        try:
+            from config import SWARM_CONFIG
+            if SWARM_CONFIG.get("event_rescan", {}).get("enabled"):
+                from rescan_dispatcher import RescanDispatcher, reporter_rescan
+                self.rescan_dispatcher = RescanDispatcher.from_config(
+                    reporter_rescan(), LiveMonitor.MONITOR_TICKERS
+                ).start(poll=True)
+        except ImportError as e:
+            _log.debug("事件驱动重扫不可用: %s", e)
 
     def _enqueue(self, action, *args, **kwargs):
         """线程安全：将 UI 操作放入队列，由主线程消费"""
@@ -767,8 +895,15 @@ class InteractionManager:
         if self.chat_log:
             self.chat_log.add(sender, text, msg_type)
 
-    def update(self):
-        self.tick += 1
+    @property
+    def is_animating(self):
+        """消息飞行 / 共振线 / 扫描进行中 / 有待处理的 UI 操作"""
+        return (self.scan_phase != "idle" or bool(self.messages)
+                or bool(self.resonance_lines) or not self._ui_queue.empty())
+
+    def update(self, step=1):
+        prev_tick = self.tick
+        self.tick += step
 
         # 更新消息
         new_msgs = []
@@ -805,8 +940,8 @@ class InteractionManager:
                     for tid in targets:
                         self.send_message(agent_id, tid, "alert")
 
-        # 空闲时随机互动
-        if self.scan_phase == "idle" and self.tick % 90 == 0:
+        # 空闲时随机互动（每 90 逻辑帧一次；降帧率时 step > 1）
+        if self.scan_phase == "idle" and self.tick // 90 != prev_tick // 90:
             self._random_idle_interaction()
 
     def send_message(self, sender_id, receiver_id, msg_type="signal", log_text=None):
@@ -1240,8 +1375,17 @@ class InfoPanel:
         self.height = height
         self.items = []
         self.opportunity_regions = []  # B2: [(y1, y2, ticker), ...] 供点击跳转简报
+        self._drawn_key = None
+        self._clock_item = None
 
     def update(self, data, scan_phase="idle"):
+        """重绘面板；数据与阶段未变化时只刷新时钟文字"""
+        key = (scan_phase, self.height, repr(sorted(data.items())))
+        if key == self._drawn_key and self._clock_item is not None:
+            self.canvas.itemconfigure(self._clock_item, text=f"Time:  {datetime.now().strftime('%H:%M:%S')}")
+            return
+        self._drawn_key = key
+
         for item in self.items:
             self.canvas.delete(item)
         self.items.clear()
@@ -1274,7 +1418,7 @@ class InfoPanel:
 
         y += 18
         now = datetime.now().strftime("%H:%M:%S")
-        self._text(self.x+10, y, f"Time:  {now}", "#888888", 10)
+        self._clock_item = self._text(self.x+10, y, f"Time:  {now}", "#888888", 10)
 
         y += 18
         self._text(self.x+10, y, f"Agents: {data.get('agent_count',7)}", "#888888", 10)
@@ -1440,6 +1584,7 @@ class InfoPanel:
         font = ("Monaco", size, weight) if weight else ("Monaco", size)
         item = self.canvas.create_text(x, y, text=text, fill=color, font=font, anchor=anchor)
         self.items.append(item)
+        return item
 
     def _line(self, y):
         item = self.canvas.create_line(
@@ -1660,6 +1805,7 @@ class ChatLog:
         self.messages = []   # list of {time, sender, text, color}
         self.items = []
         self.scroll_offset = 0  # 0 = 最底部（最新消息）
+        self._drawn_key = None  # 上次绘制时的状态；未变化时跳过重绘
 
     def add(self, sender, text, msg_type="chat"):
         """添加一条聊天消息"""
@@ -1702,6 +1848,13 @@ class ChatLog:
         self.scroll_offset = max(0, self.scroll_offset - 1)
 
     def draw(self):
+        """重绘聊天框（消息、滚动位置、尺寸均未变化时跳过）"""
+        key = (self.height, self.scroll_offset, len(self.messages),
+               id(self.messages[-1]) if self.messages else None)
+        if key == self._drawn_key:
+            return
+        self._drawn_key = key
+
         for item in self.items:
             self.canvas.delete(item)
         self.items.clear()
@@ -1828,6 +1981,9 @@ class AlphaHiveApp:
     INPUT_HEIGHT = 40        # 输入框高度
     PRESET_HEIGHT = 32       # C1: 收藏栏高度
     FPS = 30
+    IDLE_FPS = 10            # 空闲（无扫描、无动画）时的帧率
+    # 渲染方式：sprite = 缓存 PhotoImage 精灵 + 常驻 item；pixel = 每帧重建像素矩形
+    RENDER_MODE = os.environ.get("ALPHA_HIVE_RENDER", "sprite")
 
     def __init__(self):
         self.root = tk.Tk()
@@ -1874,6 +2030,7 @@ class AlphaHiveApp:
 
         # 蜜蜂
         self.bees = {}
+        sprites = SpriteCache(self.root) if self.RENDER_MODE == "sprite" else None
         positions = [
             ("ScoutBeeNova",       90, 100),
             ("OracleBeeEcho",     270,  90),
@@ -1884,7 +2041,7 @@ class AlphaHiveApp:
             ("CodeExecutorAgent", 270, 350),
         ]
         for agent_id, bx, by in positions:
-            self.bees[agent_id] = PixelBee(self.canvas, agent_id, bx, by, pixel_size=5)
+            self.bees[agent_id] = PixelBee(self.canvas, agent_id, bx, by, pixel_size=5, sprites=sprites)
 
         # 聊天框（在蜂巢区域下方）
         self.chat_log = ChatLog(
@@ -1912,6 +2069,7 @@ class AlphaHiveApp:
 
         self.running = True
         self.tick = 0
+        self._last_panel_update = 0.0
 
         self._start_data_refresh()
 
@@ -2064,23 +2222,15 @@ class AlphaHiveApp:
             self.root.unbind("C")
 
     def _load_last_swarm_results(self):
-        """启动时加载上次 .swarm_results JSON（如有）"""
-        from datetime import datetime as _dt
-        import glob as _glob
+        """启动时加载上次 .swarm_results 结果日志（如有）"""
+        from datetime import datetime as _dt, timedelta as _td
+        from result_log import load_swarm_results, latest_swarm_results_date
         try:
-            today = _dt.now().strftime("%Y-%m-%d")
-            pattern = os.path.join(_PROJECT_ROOT, f".swarm_results_{today}.json")
-            files = _glob.glob(pattern)
-            if not files:
-                # 尝试最近 3 天
-                for d in range(1, 4):
-                    past = (_dt.now() - __import__('datetime').timedelta(days=d)).strftime("%Y-%m-%d")
-                    files = _glob.glob(os.path.join(_PROJECT_ROOT, f".swarm_results_{past}.json"))
-                    if files:
-                        break
-            if files:
-                with open(files[0]) as f:
-                    data = json.load(f)
+            # 今天优先，其次尝试最近 3 天
+            candidates = [(_dt.now() - _td(days=d)).strftime("%Y-%m-%d") for d in range(0, 4)]
+            found = latest_swarm_results_date(_PROJECT_ROOT, candidates)
+            if found:
+                data = load_swarm_results(_PROJECT_ROOT, found)
                 if isinstance(data, dict) and data:
                     self.last_swarm_results = data
                     # 也更新面板
@@ -2442,9 +2592,16 @@ class AlphaHiveApp:
         webhook = os.path.expanduser("~/.alpha_hive_slack_webhook")
         self.system_data["slack"] = "connected" if os.path.exists(webhook) else "offline"
 
+    def _is_animating(self):
+        return self.interactions.is_animating or any(b.is_animating for b in self.bees.values())
+
     def _animation_loop(self):
         if not self.running:
             return
+        frame_start = time.perf_counter()
+        # 自适应帧率：有动画时全速，空闲时降到 IDLE_FPS（动画按逻辑帧步进，速度不变）
+        fps = self.FPS if self._is_animating() else self.IDLE_FPS
+        step = max(1, round(self.FPS / fps))
         try:
             self.tick += 1
 
@@ -2452,11 +2609,13 @@ class AlphaHiveApp:
             self.interactions.flush_ui_queue()
 
             for bee in self.bees.values():
-                bee.update()
+                bee.update(step)
 
-            self.interactions.update()
+            self.interactions.update(step)
 
-            if self.tick % 30 == 0:
+            now = time.time()
+            if now - self._last_panel_update >= 1.0:
+                self._last_panel_update = now
                 self.panel.update(self.system_data, self.interactions.scan_phase)
 
             # A1: 进度条更新（每 5 帧）
@@ -2472,16 +2631,18 @@ class AlphaHiveApp:
                     self.scan_btn.configure(text=new_text, fg=new_fg,
                                             activeforeground="#FF8888" if is_scanning else "#FFD700")
 
-            # 每 10 帧刷新聊天框（平衡性能和实时性）
-            if self.tick % 10 == 0:
-                self.chat_log.draw()
+            # 聊天框仅在内容/滚动变化时重绘
+            self.chat_log.draw()
         except (ValueError, TypeError, AttributeError, RuntimeError, tk.TclError) as e:
             _log.warning("AnimLoop recovered from: %s", e)
         finally:
             # 仅在 running 时重新调度，防止 root 已销毁时触发 TclError
             if self.running:
+                # 扣除本帧耗时；至少留 5ms 给 Tk 处理输入事件
+                elapsed_ms = (time.perf_counter() - frame_start) * 1000
+                delay = max(5, int(1000 / fps - elapsed_ms))
                 try:
-                    self._after_id = self.root.after(1000 // self.FPS, self._animation_loop)
+                    self._after_id = self.root.after(delay, self._animation_loop)
                 except tk.TclError:
                     pass
 
@@ -2499,6 +2660,9 @@ class AlphaHiveApp:
 
     def quit(self):
         self.running = False
+        dispatcher = getattr(getattr(self, "interactions", None), "rescan_dispatcher", None)
+        if dispatcher:
+            dispatcher.stop(timeout=1.0)
         # 取消待执行的动画帧，防止 root 销毁后触发 TclError
         after_id = getattr(self, "_after_id", None)
         if after_id:
@@ -2,96 +2,86 @@
 """
 🐝 Alpha Hive 日报生成器 - 集成期权分析的完整版本
 每日自动扫描 watchlist 并生成结构化投资简报 + X 线程版本
+
+启动路径只导入核心模块；ML 报告（yfinance / pandas）、回测、财报监控、向量记忆（chromadb）、
+日历、代码执行、CrewAI、Slack、指标与记忆存储均在首次使用时加载（见 _lazy_subsystem），
+--help 与单项命令无需为全部子系统付出导入 / 初始化开销。
 """
 
+import importlib
 import json
 import os
 import argparse
 import time
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from concurrent.futures import ThreadPoolExecutor
-from threading import Lock
+from threading import Lock, RLock
 
 # 导入现有模块
-from config import WATCHLIST, EVALUATION_WEIGHTS
-from hive_logger import get_logger, PATHS, set_correlation_id
+from config import (
+    WATCHLIST, EVALUATION_WEIGHTS, SWARM_CONFIG, METRICS_CONFIG, LLM_CONFIG,
+    CODE_EXECUTION_CONFIG, CREWAI_CONFIG, VECTOR_MEMORY_CONFIG,
+)
+from hive_logger import get_logger, PATHS, get_correlation_id, set_correlation_id
+import tracing
+from resilience import collect_source_stats, with_priority
 
 _log = get_logger("daily_report")
 
-# Week 4: 指标收集器
-try:
-    from metrics_collector import MetricsCollector
-except ImportError:
-    MetricsCollector = None
-from generate_ml_report import MLEnhancedReportGenerator
 from pheromone_board import PheromoneBoard
 from swarm_agents import (
     ScoutBeeNova, OracleBeeEcho, BuzzBeeWhisper,
     ChronosBeeHorizon, RivalBeeVanguard, GuardBeeSentinel,
     BearBeeContrarian,
-    QueenDistiller, prefetch_shared_data, inject_prefetched
+    QueenDistiller, prefetch_shared_data, inject_prefetched, warm_up_clients,
+    DeltaRescanner, collect_input_fingerprints, invalidate_source_caches,
+    analyze_in_processes, replay_entries, ticker_entries,
 )
 from concurrent.futures import as_completed
 from agent_toolbox import AgentHelper
+from result_log import (
+    DailyReportStore, agent_outputs_log, checkpoint_log, swarm_results_log, load_swarm_results,
+    llm_pending_key, replay_llm_pending,
+)
 
-# Phase 2: Import memory store
-try:
-    from memory_store import MemoryStore
-except ImportError:
-    MemoryStore = None
-
-# Phase 3 P2: Import Calendar integrator
-try:
-    from calendar_integrator import CalendarIntegrator
-except ImportError:
-    CalendarIntegrator = None
-
-# Phase 3 P4: Import Code Execution Agent
-try:
-    from code_executor_agent import CodeExecutorAgent
-    from config import CODE_EXECUTION_CONFIG
-except ImportError:
-    CodeExecutorAgent = None
-    CODE_EXECUTION_CONFIG = {"enabled": False}
-
-# Phase 3 P5: Import CrewAI 多 Agent 框架
-try:
-    from crewai_adapter import AlphaHiveCrew
-    from config import CREWAI_CONFIG
-except (ImportError, TypeError) as e:
-    AlphaHiveCrew = None
-    CREWAI_CONFIG = {"enabled": False}
-    _log.info("CrewAI 模块导入失败: %s (降级到原始蜂群)", type(e).__name__)
-
-# Phase 3 P6: Import Slack 报告通知器（替代 Gmail）
-try:
-    from slack_report_notifier import SlackReportNotifier
-except ImportError:
-    SlackReportNotifier = None
-
-# 财报自动监控器
-try:
-    from earnings_watcher import EarningsWatcher
-except ImportError:
-    EarningsWatcher = None
-
-# Phase 3 内存优化: 向量记忆层（Chroma 长期记忆）
-try:
-    from vector_memory import VectorMemory
-    from config import VECTOR_MEMORY_CONFIG
-except ImportError:
-    VectorMemory = None
-    VECTOR_MEMORY_CONFIG = {"enabled": False}
-
-# Phase 6: 回测反馈循环
-try:
-    from backtester import Backtester, run_full_backtest
-except ImportError:
-    Backtester = None
-    run_full_backtest = None
+
+# ==================== 懒加载：可选子系统 / 重依赖 ====================
+
+def _optional(module: str, attr: str, errors: tuple = (ImportError,)):
+    """按需导入可选模块中的类 / 函数（未安装或导入失败时返回 None）"""
+    try:
+        return getattr(importlib.import_module(module), attr)
+    except errors as e:
+        _log.debug("可选模块 %s 不可用: %s", module, e)
+        return None
+
+
+class _lazy_subsystem:
+    """
+    懒加载实例属性（装饰工厂方法）：首次访问时调用工厂构造并缓存在实例上，
+    同一实例只构造一次（线程安全）；可直接赋值覆盖（注入 / 测试）
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.name = factory.__name__
+        self.__doc__ = factory.__doc__
+        self._lock = RLock()
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        try:
+            return obj.__dict__[self.name]
+        except KeyError:
+            pass
+        with self._lock:
+            if self.name not in obj.__dict__:
+                obj.__dict__[self.name] = self.factory(obj)
+        return obj.__dict__[self.name]
 
 
 # 免责声明常量（去重，全局引用）
@@ -124,26 +114,22 @@ class OpportunityItem:
 class AlphaHiveDailyReporter:
     """Alpha Hive 日报生成引擎"""
 
+    # ML 增强报告并行渲染线程数
+    ML_REPORT_WORKERS = 8
+
     def __init__(self):
         self.report_dir = PATHS.home
         self.timestamp = datetime.now()
         self.date_str = self.timestamp.strftime("%Y-%m-%d")
 
-        # 初始化报告生成器
-        self.ml_generator = MLEnhancedReportGenerator()
-
         # 初始化 Agent 工具集（新增）
         self.agent_helper = AgentHelper()
 
-        # Phase 2: 初始化持久化记忆存储
-        self.memory_store = None
-        self._session_id = None
-        if MemoryStore:
-            try:
-                self.memory_store = MemoryStore()
-                self._session_id = self.memory_store.generate_session_id(run_mode="daily_scan")
-            except (OSError, ValueError, RuntimeError) as e:
-                _log.warning("MemoryStore 初始化失败，继续运行: %s", e)
+        # 可选子系统（ML 报告 / 记忆存储 / 日历 / 代码执行 / 向量记忆 / 指标 / 财报监控 / Slack）
+        # 均为懒加载属性：首次访问时导入并初始化，失败时为 None（见下方 _lazy_subsystem 工厂）
+
+        # 蜂群扫描预取的行情（供 ML 报告渲染复用，避免重复请求 yfinance）
+        self._prefetched_stock: Dict[str, Dict] = {}
 
         # 结果存储
         self.opportunities: List[OpportunityItem] = []
@@ -153,66 +139,124 @@ class AlphaHiveDailyReporter:
         # 线程安全锁（用于并行执行时保护共享数据）
         self._results_lock = Lock()
 
-        # Phase 3 P2: 初始化 Google Calendar 集成（失败时降级）
-        self.calendar = None
+        # 热路径追踪：span 按扫描汇总进 metrics.db；trace_export 时同时导出火焰图轨迹
+        trace_cfg = METRICS_CONFIG.get("tracing", {})
+        tracing.configure(enabled=trace_cfg.get("enabled", True),
+                          max_spans=trace_cfg.get("max_spans", 50000))
+        self.trace_export = trace_cfg.get("export", False)
+        self._trace_spans: List[Dict] = []
+
+        # Phase 2: 共享线程池（替代所有 daemon 线程，退出时等待完成）
+        import atexit
+        self._bg_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="hive_bg")
+        self._bg_futures = []
+        atexit.register(self._shutdown_bg)
+
+    # ==================== 懒加载子系统 ====================
+
+    @_lazy_subsystem
+    def ml_generator(self):
+        """ML 增强报告生成器（导入 yfinance / pandas）"""
+        from generate_ml_report import MLEnhancedReportGenerator
+        return MLEnhancedReportGenerator()
+
+    @_lazy_subsystem
+    def memory_store(self):
+        """Phase 2: 持久化记忆存储（构造时执行 PRAGMA integrity_check）"""
+        MemoryStore = _optional("memory_store", "MemoryStore")
+        if MemoryStore:
+            try:
+                return MemoryStore()
+            except (OSError, ValueError, RuntimeError) as e:
+                _log.warning("MemoryStore 初始化失败，继续运行: %s", e)
+        return None
+
+    @_lazy_subsystem
+    def _session_id(self):
+        if self.memory_store:
+            try:
+                return self.memory_store.generate_session_id(run_mode="daily_scan")
+            except (OSError, ValueError, RuntimeError) as e:
+                _log.warning("MemoryStore 会话 ID 生成失败: %s", e)
+        return None
+
+    @_lazy_subsystem
+    def calendar(self):
+        """Phase 3 P2: Google Calendar 集成（失败时降级）"""
+        CalendarIntegrator = _optional("calendar_integrator", "CalendarIntegrator")
         if CalendarIntegrator:
             try:
-                self.calendar = CalendarIntegrator()
+                return CalendarIntegrator()
             except (OSError, ValueError, RuntimeError) as e:
                 _log.warning("Calendar 初始化失败: %s", e)
-
-        # Phase 3 P4: 初始化代码执行 Agent（失败时降级）
-        self.code_executor_agent = None
-        if CodeExecutorAgent and CODE_EXECUTION_CONFIG.get("enabled"):
+        return None
+
+    @_lazy_subsystem
+    def code_executor_agent(self):
+        """Phase 3 P4: 代码执行 Agent（失败时降级；board 在 run_swarm_scan 时注入）"""
+        if not CODE_EXECUTION_CONFIG.get("enabled"):
+            return None
+        CodeExecutorAgent = _optional("code_executor_agent", "CodeExecutorAgent")
+        if CodeExecutorAgent:
             try:
-                self.code_executor_agent = CodeExecutorAgent(board=None)
-                # board 在 run_swarm_scan 时注入
+                return CodeExecutorAgent(board=None)
             except (OSError, ValueError, RuntimeError, TypeError) as e:
                 _log.warning("CodeExecutorAgent 初始化失败: %s", e)
-
-        # Phase 3 内存优化: 初始化向量记忆层（Chroma 长期记忆）
-        self.vector_memory = None
-        if VectorMemory and VECTOR_MEMORY_CONFIG.get("enabled"):
-            try:
-                self.vector_memory = VectorMemory(
-                    db_path=VECTOR_MEMORY_CONFIG.get("db_path"),
-                    retention_days=VECTOR_MEMORY_CONFIG.get("retention_days", 90)
-                )
-                if self.vector_memory.enabled:
-                    if VECTOR_MEMORY_CONFIG.get("cleanup_on_startup"):
-                        self.vector_memory.cleanup()
-            except (ImportError, OSError, ValueError, RuntimeError) as e:
-                _log.warning("向量记忆初始化失败: %s", e)
-
-        # Week 4: 指标收集器
-        self.metrics = None
+        return None
+
+    @_lazy_subsystem
+    def vector_memory(self):
+        """Phase 3 内存优化: 向量记忆层（Chroma 长期记忆）"""
+        if not VECTOR_MEMORY_CONFIG.get("enabled"):
+            return None
+        VectorMemory = _optional("vector_memory", "VectorMemory")
+        if not VectorMemory:
+            return None
+        try:
+            vm = VectorMemory(
+                db_path=VECTOR_MEMORY_CONFIG.get("db_path"),
+                retention_days=VECTOR_MEMORY_CONFIG.get("retention_days", 90)
+            )
+            if vm.enabled:
+                if VECTOR_MEMORY_CONFIG.get("cleanup_on_startup"):
+                    vm.cleanup()
+            return vm
+        except (ImportError, OSError, ValueError, RuntimeError) as e:
+            _log.warning("向量记忆初始化失败: %s", e)
+        return None
+
+    @_lazy_subsystem
+    def metrics(self):
+        """Week 4: 指标收集器"""
+        MetricsCollector = _optional("metrics_collector", "MetricsCollector")
         if MetricsCollector:
             try:
-                self.metrics = MetricsCollector()
+                return MetricsCollector()
             except (OSError, ValueError, RuntimeError) as e:
                 _log.warning("MetricsCollector 初始化失败: %s", e)
+        return None
 
-        # Phase 2: 共享线程池（替代所有 daemon 线程，退出时等待完成）
-        import atexit
-        self._bg_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="hive_bg")
-        self._bg_futures = []
-        atexit.register(self._shutdown_bg)
-
-        # 财报自动监控器
-        self.earnings_watcher = None
+    @_lazy_subsystem
+    def earnings_watcher(self):
+        """财报自动监控器"""
+        EarningsWatcher = _optional("earnings_watcher", "EarningsWatcher")
         if EarningsWatcher:
             try:
-                self.earnings_watcher = EarningsWatcher()
+                return EarningsWatcher()
             except (OSError, ValueError, RuntimeError) as e:
                 _log.warning("EarningsWatcher 初始化失败: %s", e)
+        return None
 
-        # Phase 3 P6: 初始化 Slack 报告通知器（替代 Gmail）
-        self.slack_notifier = None
+    @_lazy_subsystem
+    def slack_notifier(self):
+        """Phase 3 P6: Slack 报告通知器（替代 Gmail）"""
+        SlackReportNotifier = _optional("slack_report_notifier", "SlackReportNotifier")
         if SlackReportNotifier:
             try:
-                self.slack_notifier = SlackReportNotifier()
+                return SlackReportNotifier()
             except (OSError, ValueError, RuntimeError, ConnectionError) as e:
                 _log.warning("Slack 通知器初始化失败: %s", e)
+        return None
 
     def _shutdown_bg(self) -> None:
         """atexit 处理器：等待后台任务完成"""
@@ -330,12 +374,20 @@ class AlphaHiveDailyReporter:
 
         return report
 
-    def run_swarm_scan(self, focus_tickers: List[str] = None, progress_callback=None) -> Dict:
+    def run_swarm_scan(self, focus_tickers: List[str] = None, progress_callback=None,
+                       use_processes: bool = None, delta: bool = None,
+                       dirty_sources: Dict[str, set] = None) -> Dict:
         """
         真正的蜂群协作扫描 - 7 个自治工蜂并行运行（6 核心 + BearBeeContrarian），实时通过信息素板交换发现
 
         Args:
             focus_tickers: 重点关注标的（如为None则扫描全部watchlist）
+            use_processes: 进程池模式（多 ticker 跨进程并行，绕开 GIL）；
+                           None 时读取 SWARM_CONFIG["process_pool"]["enabled"]
+            delta: 盘中增量重扫（输入指纹未变的 Agent 复用当日上一批输出）；
+                   None 时读取 SWARM_CONFIG["delta_rescan"]["enabled"]
+            dirty_sources: {ticker: {输入源}}，事件驱动重扫时清除这些源的缓存并强制重跑依赖它们的 Agent
+                           （隐含 delta=True，见 rescan_dispatcher）
 
         Returns:
             完整的蜂群分析报告
@@ -343,6 +395,8 @@ class AlphaHiveDailyReporter:
         # Week 4: 设置 correlation_id 追踪本次扫描
         set_correlation_id(self._session_id or f"swarm_{self.date_str}")
         _log.info("蜂群协作启动 %s", self.date_str)
+        import llm_service
+        llm_service.begin_scan()
 
         targets = focus_tickers or list(WATCHLIST.keys())[:10]
         _log.info("标的：%s", " ".join(targets))
@@ -365,75 +419,86 @@ class AlphaHiveDailyReporter:
         # 看空对冲蜂：二阶段执行（等其他 Agent 写入信息素板后再分析）
         bear_agent = BearBeeContrarian(board, retriever=retriever)
 
-        # Phase 3 P4: 动态注入 CodeExecutorAgent
-        if self.code_executor_agent and CODE_EXECUTION_CONFIG.get("add_to_swarm"):
+        pool_cfg = SWARM_CONFIG.get("process_pool", {})
+        if use_processes is None:
+            use_processes = pool_cfg.get("enabled", False)
+
+        # Phase 3 P4: 动态注入 CodeExecutorAgent（进程池模式下不参与：其状态无法跨进程共享）
+        if (self.code_executor_agent and CODE_EXECUTION_CONFIG.get("add_to_swarm")
+                and not use_processes):
             self.code_executor_agent.board = board
             phase1_agents.append(self.code_executor_agent)
 
         # Phase 6: 自适应权重
+        Backtester = _optional("backtester", "Backtester")
         adapted_w = Backtester.load_adapted_weights() if Backtester else None
         queen = QueenDistiller(board, adapted_weights=adapted_w)
 
         all_agents = phase1_agents + [bear_agent]
         _log.info("%d Agent（含二阶段看空蜂）| 预取数据中...", len(all_agents))
 
+        # 事件驱动重扫：先清除 dirty 输入源的缓存，预取 / 指纹 / Agent 重跑均拉取新数据
+        if dirty_sources:
+            invalidate_source_caches(dirty_sources)
+
         # ⚡ 优化 #1+#2: 批量预取 yfinance + VectorMemory（每 ticker 仅 1 次）
-        prefetched = prefetch_shared_data(targets, retriever)
+        warm_up_clients()
+        with tracing.span("prefetch", tickers=len(targets)):
+            prefetched = prefetch_shared_data(
+                targets, retriever, agent_ids=[a.__class__.__name__ for a in all_agents]
+            )
         inject_prefetched(all_agents, prefetched)
+        self._prefetched_stock = prefetched.get("stock_data", {})
+
+        # 盘中增量重扫：采集各 Agent 的输入指纹（进程池模式下不启用：复用记录需在主进程信息素板回放）
+        delta_cfg = SWARM_CONFIG.get("delta_rescan", {})
+        if delta is None:
+            delta = bool(dirty_sources) or delta_cfg.get("enabled", False)
+        rescanner = None
+        if delta and use_processes:
+            _log.info("增量重扫仅支持线程模式，本次全量分析")
+        elif delta:
+            fingerprints = collect_input_fingerprints(
+                targets, self._prefetched_stock, delta_cfg.get("price_tolerance_pct", 0.5)
+            )
+            rescanner = DeltaRescanner(agent_outputs_log(self.report_dir, self.date_str),
+                                       fingerprints, dirty=dirty_sources)
         prefetch_elapsed = time.time() - start_time
         _log.info("预取完成 (%.1fs) | 开始并行分析", prefetch_elapsed)
 
         # ⚡ 优化 #3: 单层线程池，按 ticker 串行、Agent 并行
         swarm_results = {}
 
-        # Phase 2: 崩溃恢复 checkpoint
-        checkpoint_file = self.report_dir / f".checkpoint_{self._session_id or 'default'}.json"
-        completed_tickers = set()
-        if checkpoint_file.exists():
-            try:
-                with open(checkpoint_file, "r") as f:
-                    ckpt = json.load(f)
-                    swarm_results = ckpt.get("results", {})
-                    completed_tickers = set(swarm_results.keys())
-                    if completed_tickers:
-                        _log.info("恢复 checkpoint：%d 标的已完成", len(completed_tickers))
-            except (json.JSONDecodeError, KeyError, OSError) as e:
-                _log.warning("Checkpoint 恢复失败，重新开始: %s", e)
-
-        for idx, ticker in enumerate(targets, 1):
-            if ticker in completed_tickers:
-                res = "✅" if swarm_results[ticker]["resonance"]["resonance_detected"] else "—"
-                _log.info("[%d/%d] %s: %.1f/10 (已缓存) %s", idx, len(targets), ticker, swarm_results[ticker]['final_score'], res)
-                continue
-
-            # 第一阶段：6 个核心 Agent 并行分析（含可选 CodeExecutorAgent）
-            with ThreadPoolExecutor(max_workers=len(phase1_agents)) as executor:
-                futures = {executor.submit(agent.analyze, ticker): agent for agent in phase1_agents}
-                agent_results = []
-                for future in as_completed(futures):
-                    try:
-                        agent_results.append(future.result(timeout=60))
-                    except (TimeoutError, ValueError, KeyError, TypeError, RuntimeError) as e:
-                        _log.warning("Agent future failed: %s", e)
-                        agent_results.append(None)
-
-            # 第二阶段：BearBeeContrarian 读取信息素板后分析（此时其他 Agent 数据已可用）
-            try:
-                bear_result = bear_agent.analyze(ticker)
-                agent_results.append(bear_result)
-                _log.info("  🐻 看空蜂: %s %s (%.1f分, %d信号)",
-                          ticker, bear_result.get("direction", "?"),
-                          bear_result.get("details", {}).get("bear_score", 0),
-                          len(bear_result.get("details", {}).get("bearish_signals", [])))
-            except (ValueError, KeyError, TypeError, AttributeError) as e:
-                _log.warning("BearBeeContrarian failed for %s: %s", ticker, e)
-                agent_results.append(None)
-
-            distilled = queen.distill(ticker, agent_results)
+        # Phase 2: 崩溃恢复 checkpoint（追加式日志：每个 ticker 一条记录，回放恢复）
+        ckpt_log = checkpoint_log(self.report_dir, self._session_id or "default")
+        replayed = ckpt_log.replay()
+        swarm_results = {t: r for t, r in replayed.items() if t in targets}
+        completed_tickers = set(swarm_results.keys())
+        if completed_tickers:
+            _log.info("恢复 checkpoint：%d 标的已完成", len(completed_tickers))
+
+        ticker_seconds: Dict[str, float] = {}
+
+        # 批量蒸馏：扫描期间只跑规则引擎，全部标的完成后把 LLM 推理打包成少数几次请求
+        # 规则引擎结果连同原始 Agent 结果（llm_pending 标记）写入 checkpoint，
+        # 扫描在批量蒸馏前中断时，恢复后这些标的重新排队 LLM 步骤
+        batch_llm = LLM_CONFIG.get("batch_distill", {}).get("enabled", False) and llm_service.is_available()
+        deferred: Dict[str, List] = (replay_llm_pending(replayed, completed_tickers)
+                                     if llm_service.is_available() else {})
+        if deferred:
+            _log.info("恢复 checkpoint：%d 标的待批量 LLM 蒸馏", len(deferred))
+
+        def _finish_ticker(idx: int, ticker: str, agent_results: List, started: float) -> None:
+            with tracing.span("distill", ticker=ticker):
+                distilled = queen.distill(ticker, agent_results, llm=not batch_llm)
+            if batch_llm:
+                deferred[ticker] = agent_results
             swarm_results[ticker] = distilled
+            ticker_seconds[ticker] = time.perf_counter() - started
 
             res = "✅" if distilled["resonance"]["resonance_detected"] else "—"
-            _log.info("[%d/%d] %s: %.1f/10 %s %s", idx, len(targets), ticker, distilled['final_score'], distilled['direction'], res)
+            _log.info("[%d/%d] %s: %.1f/10 %s %s%s", idx, len(targets), ticker, distilled['final_score'],
+                      distilled['direction'], res, "（规则引擎，待批量 LLM 蒸馏）" if batch_llm else "")
 
             # 进度回调（供桌面 App 实时动画使用）
             if progress_callback:
@@ -442,33 +507,125 @@ class AlphaHiveDailyReporter:
                 except Exception as _cb_err:
                     _log.debug("Progress callback error: %s", _cb_err)
 
-            # 写入 checkpoint（每个 ticker 完成后）
+            # 追加 checkpoint 记录（每个 ticker 完成后，仅写入本 ticker；先写 llm_pending 标记）
             try:
-                with open(checkpoint_file, "w") as f:
-                    json.dump({"results": swarm_results, "targets": targets}, f, default=str)
-            except (OSError, TypeError) as e:
+                with tracing.span("persist.checkpoint", ticker=ticker):
+                    if batch_llm:
+                        ckpt_log.append(llm_pending_key(ticker), agent_results)
+                    ckpt_log.append(ticker, distilled)
+            except (OSError, TypeError, ValueError) as e:
                 _log.warning("Checkpoint 写入失败: %s", e)
 
-        # 扫描完成，保存蜂群结果（合并当日已有结果，支持分批运行）
+        pending = []
+        for idx, ticker in enumerate(targets, 1):
+            if ticker in completed_tickers:
+                res = "✅" if swarm_results[ticker]["resonance"]["resonance_detected"] else "—"
+                _log.info("[%d/%d] %s: %.1f/10 (已缓存) %s", idx, len(targets), ticker, swarm_results[ticker]['final_score'], res)
+            else:
+                pending.append((idx, ticker))
+
+        if use_processes and pending:
+            # 进程池模式：每个工作进程独立完成 ticker 的两阶段分析，主进程回放信息素并蒸馏
+            workers = min(len(pending), pool_cfg.get("max_workers") or os.cpu_count() or 2)
+            _log.info("进程池模式：%d 个工作进程", workers)
+            # 剩余预算均分给工作进程，其花费合并回本进程调度器；预算已耗尽时工作进程禁用 LLM
+            worker_budget = llm_service.get_dispatcher().split_budget(workers)
+            index = {t: i for i, t in pending}
+            for ticker, payload in analyze_in_processes(
+                [t for _, t in pending], prefetched, board, workers, llm_budget_usd=worker_budget or 0,
+                agent_classes=(tuple(type(a) for a in phase1_agents), type(bear_agent)),
+                correlation_id=get_correlation_id(), llm_enabled=worker_budget is not None,
+            ):
+                _finish_ticker(index[ticker], ticker, payload["agent_results"],
+                               time.perf_counter() - payload.get("seconds", 0.0))
+        else:
+            for idx, ticker in pending:
+                started = time.perf_counter()
+                with tracing.span("ticker", ticker=ticker):
+                    # 增量模式：输入指纹未变化的 Agent 复用上一批输出，其信息素条目回放到本批信息素板
+                    # GuardBeeSentinel 读取信息素板，仅当其余第一阶段 Agent 全部复用时才复用
+                    reused: Dict[str, Dict] = {}
+                    if rescanner:
+                        reused = rescanner.cached_phase(ticker, [a.__class__.__name__ for a in phase1_agents])
+                        for name, rec in reused.items():
+                            tracing.event("cache.delta_rescan.hit", ticker=ticker, agent=name)
+                            replay_entries(board, rec["entries"])
+                    run_agents = [a for a in phase1_agents if a.__class__.__name__ not in reused]
+                    agent_results = [rec["result"] for rec in reused.values()]
+                    fresh: Dict[str, Dict] = {}
+
+                    # 第一阶段：6 个核心 Agent 并行分析（含可选 CodeExecutorAgent）
+                    if run_agents:
+                        with ThreadPoolExecutor(max_workers=len(run_agents)) as executor:
+                            futures = {
+                                executor.submit(
+                                    with_priority(tracing.wrap(agent.analyze, f"agent.{agent.__class__.__name__}")),
+                                    ticker,
+                                ): agent
+                                for agent in run_agents
+                            }
+                            for future in as_completed(futures):
+                                try:
+                                    result = future.result(timeout=60)
+                                    fresh[futures[future].__class__.__name__] = result
+                                    agent_results.append(result)
+                                except (TimeoutError, ValueError, KeyError, TypeError, RuntimeError) as e:
+                                    _log.warning("Agent future failed: %s", e)
+                                    agent_results.append(None)
+
+                    # 第二阶段：BearBeeContrarian 读取信息素板后分析（此时其他 Agent 数据已可用）
+                    # 增量模式下仅当第一阶段全部复用且自身输入未变时才复用（否则信息素板已变化）
+                    bear_rec = rescanner.cached(ticker, "BearBeeContrarian") if (rescanner and not run_agents) else None
+                    if bear_rec:
+                        replay_entries(board, bear_rec["entries"])
+                        agent_results.append(bear_rec["result"])
+                    else:
+                        try:
+                            with tracing.span("agent.BearBeeContrarian"):
+                                bear_result = bear_agent.analyze(ticker)
+                            fresh["BearBeeContrarian"] = bear_result
+                            agent_results.append(bear_result)
+                            _log.info("  🐻 看空蜂: %s %s (%.1f分, %d信号)",
+                                      ticker, bear_result.get("direction", "?"),
+                                      bear_result.get("details", {}).get("bear_score", 0),
+                                      len(bear_result.get("details", {}).get("bearish_signals", [])))
+                        except (ValueError, KeyError, TypeError, AttributeError) as e:
+                            _log.warning("BearBeeContrarian failed for %s: %s", ticker, e)
+                            agent_results.append(None)
+
+                    if rescanner and fresh:
+                        entries = ticker_entries(board, ticker)
+                        for name, result in fresh.items():
+                            rescanner.record(ticker, name, result, entries)
+
+                    _finish_ticker(idx, ticker, agent_results, started)
+
+        if rescanner:
+            rescanner.close()
+            _log.info("增量重扫：复用 %d 个 Agent 输出（共 %d 标的）", rescanner.reused, len(pending))
+
+        if deferred:
+            with tracing.span("distill.llm_batch", tickers=len(deferred)):
+                enhanced = queen.enhance_batch({t: swarm_results[t] for t in deferred}, deferred)
+            swarm_results.update(enhanced)
+            n_llm = sum(1 for d in enhanced.values() if d.get("distill_mode") == "llm_enhanced")
+            _log.info("批量 LLM 蒸馏：%d/%d 标的增强", n_llm, len(deferred))
+            # 增强结果覆盖 checkpoint 中的规则引擎结果，并清除 llm_pending 标记
+            try:
+                with tracing.span("persist.checkpoint", tickers=len(enhanced)):
+                    ckpt_log.append_many({**enhanced, **{llm_pending_key(t): None for t in enhanced}})
+            except (OSError, TypeError, ValueError) as e:
+                _log.warning("Checkpoint 写入失败: %s", e)
+
+        # 扫描完成，追加本批蜂群结果到当日日志（读取时同名标的以最新批次为准，支持分批运行）
         try:
-            swarm_json = self.report_dir / f".swarm_results_{self.date_str}.json"
-            merged_swarm = {}
-            if swarm_json.exists():
-                try:
-                    with open(swarm_json, encoding="utf-8") as _f:
-                        merged_swarm = json.load(_f)
-                except (OSError, json.JSONDecodeError):
-                    pass
-            merged_swarm.update(swarm_results)  # 新批次覆盖同名标的
-            with open(swarm_json, "w") as f:
-                json.dump(merged_swarm, f, default=str, ensure_ascii=False)
-        except (OSError, TypeError) as e:
+            with tracing.span("persist.swarm_results"), \
+                    swarm_results_log(self.report_dir, self.date_str) as day_log:
+                day_log.append_many(swarm_results)
+        except (OSError, TypeError, ValueError) as e:
             _log.warning("Swarm results 保存失败: %s", e)
         # 清理 checkpoint
-        try:
-            checkpoint_file.unlink(missing_ok=True)
-        except OSError as e:
-            _log.debug("Checkpoint 清理失败: %s", e)
+        ckpt_log.unlink()
 
         elapsed = time.time() - start_time
 
@@ -476,8 +633,10 @@ class AlphaHiveDailyReporter:
         try:
             import llm_service
             usage = llm_service.get_usage()
-            if usage["call_count"] > 0:
-                _log.info("蜂群耗时：%.1fs | LLM: %d调用 $%.4f", elapsed, usage['call_count'], usage['total_cost_usd'])
+            if usage["call_count"] > 0 or usage.get("cache_hits"):
+                _log.info("蜂群耗时：%.1fs | LLM: %d调用 $%.4f | 缓存命中 %d (节省 $%.4f)",
+                          elapsed, usage['call_count'], usage['total_cost_usd'],
+                          usage.get('cache_hits', 0), usage.get('cache_saved_usd', 0.0))
             else:
                 _log.info("蜂群耗时：%.1fs | 规则引擎模式", elapsed)
         except (ImportError, AttributeError, KeyError) as e:
@@ -532,9 +691,13 @@ class AlphaHiveDailyReporter:
                         supporting_agents=data.get("supporting_agents", 0),
                         data_real_pct=data.get("data_real_pct", 0),
                         resonance_detected=data.get("resonance", {}).get("resonance_detected", False),
+                        analysis_seconds=ticker_seconds.get(ticker, 0.0),
                         session_id=self._session_id or "",
                     )
 
+                # 数据源延迟 / 错误直方图（本次扫描期间各限流器与熔断器的统计）
+                self.metrics.record_sources(collect_source_stats(), session_id=self._session_id or "")
+
                 # SLO 检查
                 violations = self.metrics.check_slo(days=1)
                 if violations:
@@ -543,8 +706,10 @@ class AlphaHiveDailyReporter:
                                  "; ".join(v["details"] for v in violations))
             except (OSError, ValueError, KeyError, TypeError) as e:
                 _log.warning("指标收集异常: %s", e)
+        self._flush_trace()
 
         # Phase 6: 回测反馈循环
+        Backtester = _optional("backtester", "Backtester")
         if Backtester:
             try:
                 bt = Backtester()
@@ -615,41 +780,51 @@ class AlphaHiveDailyReporter:
                 targets, swarm_results, snapshot, elapsed
             )
 
-        # Phase 3 内存优化: 将高价值发现存入向量记忆（长期记忆）
+        # Phase 3 内存优化: 将高价值发现存入向量记忆（长期记忆，批量嵌入 + 后台写入）
         if self.vector_memory and self.vector_memory.enabled:
-            stored = 0
-            # 1. 存储 Queen 的最终评分
-            for ticker, data in swarm_results.items():
-                if data.get("final_score", 0) >= 5.0:
-                    self.vector_memory.store(
-                        ticker=ticker,
-                        agent_id="QueenDistiller",
-                        discovery=f"评分{data['final_score']:.1f} {data['direction']} "
-                                  f"支持{data.get('supporting_agents', 0)}Agent",
-                        direction=data["direction"],
-                        score=data["final_score"],
-                        source="swarm_scan",
-                        session_id=self._session_id or ""
-                    )
-                    stored += 1
-            # 2. 存储信息素板上每个 Agent 的高价值发现
-            for entry in board.snapshot():
-                if entry.get("self_score", 0) >= 6.0:
-                    self.vector_memory.store(
-                        ticker=entry.get("ticker", ""),
-                        agent_id=entry.get("agent_id", ""),
-                        discovery=entry.get("discovery", "")[:300],
-                        direction=entry.get("direction", "neutral"),
-                        score=entry.get("self_score", 5.0),
-                        source=entry.get("source", ""),
-                        session_id=self._session_id or ""
-                    )
-                    stored += 1
-            if stored > 0:
-                _log.info("已存入 %d 条长期记忆 (Chroma)", stored)
+            memories = self._collect_vector_memories(swarm_results, board.snapshot())
+            if memories:
+                self._submit_bg(self._persist_vector_memories, memories)
 
         return report
 
+    def _collect_vector_memories(self, swarm_results: Dict, board_entries: List[Dict]) -> List[Dict]:
+        """收集扫描结束时需写入长期记忆的记录（Queen 高分结论 + 信息素板高价值发现）"""
+        session_id = self._session_id or ""
+        memories = []
+        # 1. Queen 的最终评分
+        for ticker, data in swarm_results.items():
+            if data.get("final_score", 0) >= 5.0:
+                memories.append({
+                    "ticker": ticker,
+                    "agent_id": "QueenDistiller",
+                    "discovery": f"评分{data['final_score']:.1f} {data['direction']} "
+                                 f"支持{data.get('supporting_agents', 0)}Agent",
+                    "direction": data["direction"],
+                    "score": data["final_score"],
+                    "source": "swarm_scan",
+                    "session_id": session_id,
+                })
+        # 2. 信息素板上每个 Agent 的高价值发现
+        for entry in board_entries:
+            if entry.get("self_score", 0) >= 6.0:
+                memories.append({
+                    "ticker": entry.get("ticker", ""),
+                    "agent_id": entry.get("agent_id", ""),
+                    "discovery": entry.get("discovery", "")[:300],
+                    "direction": entry.get("direction", "neutral"),
+                    "score": entry.get("self_score", 5.0),
+                    "source": entry.get("source", ""),
+                    "session_id": session_id,
+                })
+        return memories
+
+    def _persist_vector_memories(self, memories: List[Dict]) -> None:
+        """后台任务：单次批量嵌入写入 Chroma"""
+        stored = self.vector_memory.store_many(memories, session_id=self._session_id or "")
+        if stored:
+            _log.info("已存入 %d 条长期记忆 (Chroma)", len(stored))
+
     def run_crew_scan(self, focus_tickers: List[str] = None) -> Dict:
         """
         CrewAI 模式蜂群扫描 - 使用 Process.hierarchical 主-子 Agent 递归调度
@@ -661,8 +836,10 @@ class AlphaHiveDailyReporter:
         Returns:
             完整的蜂群分析报告
         """
-        # 检查 CrewAI 是否可用
-        if not AlphaHiveCrew or not CREWAI_CONFIG.get("enabled"):
+        # 检查 CrewAI 是否可用（Phase 3 P5：导入失败降级到原始蜂群）
+        AlphaHiveCrew = (_optional("crewai_adapter", "AlphaHiveCrew", errors=(ImportError, TypeError))
+                         if CREWAI_CONFIG.get("enabled") else None)
+        if not AlphaHiveCrew:
             _log.info("CrewAI 未安装或未启用，降级到标准蜂群模式")
             return self.run_swarm_scan(focus_tickers)
 
@@ -789,6 +966,7 @@ class AlphaHiveDailyReporter:
         # ── P3: 获取回测准确率统计（附加到报告）──
         backtest_stats = {}
         try:
+            Backtester = _optional("backtester", "Backtester")
             if Backtester:
                 _bt = Backtester()
                 backtest_stats = _bt.store.get_accuracy_stats("t7", days=30)
@@ -1367,6 +1545,7 @@ class AlphaHiveDailyReporter:
 
         return report
 
+    @tracing.traced("render.markdown")
     def _generate_markdown_report(self) -> str:
         """生成中文 Markdown 报告"""
 
@@ -1626,15 +1805,8 @@ class AlphaHiveDailyReporter:
 
     def _generate_ml_reports(self, report: Dict) -> List[str]:
         """为扫描标的批量生成 ML 增强 HTML 报告（同步写入，供 _generate_index_html 检测到文件后添加链接）"""
-        # 加载蜂群详细数据（save_report 已写入 .swarm_results_*.json）
-        swarm_data: Dict = {}
-        sr_path = self.report_dir / f".swarm_results_{self.date_str}.json"
-        if sr_path.exists():
-            try:
-                with open(sr_path) as f:
-                    swarm_data = json.load(f)
-            except (OSError, json.JSONDecodeError):
-                pass
+        # 加载蜂群详细数据（run_swarm_scan 已追加到当日结果日志）
+        swarm_data: Dict = load_swarm_results(self.report_dir, self.date_str)
 
         # 用 swarm_data 所有标的（而非仅 opportunities 前几名），确保每个扫描标的都有 ML 报告
         opps = report.get("opportunities", [])
@@ -1644,104 +1816,129 @@ class AlphaHiveDailyReporter:
         if not tickers:
             return []
 
-        generated = []
-        for ticker in tickers:
-            try:
-                # 从 yfinance 获取当前价格
-                real_price, real_change = 100.0, 0.0
+        # 并行渲染 + 并发写入（每个 ticker 独立线程：分析/ML 预测/模板填充/写文件）
+        # 各线程共享 self.ml_generator：其 analyzer（行业表 / 历史 / 概率计算器）与模型权重在构造后只读，
+        # 渲染只读 self.timestamp；唯一的写路径是 predict_for_opportunity 在模型未训练时训练，
+        # 故在分发前确保模型已训练，渲染期间不再修改任何共享状态
+        model_service = self.ml_generator.ml_service
+        if not model_service.model.is_trained:
+            model_service.train_model()
+        workers = min(len(tickers), self.ML_REPORT_WORKERS)
+        done = set()
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ml_report") as pool:
+            futures = {
+                pool.submit(tracing.wrap(self._render_ml_report, "render.ml_report", ticker=t),
+                            t, swarm_data.get(t)): t
+                for t in tickers
+            }
+            for future in as_completed(futures):
+                ticker = futures[future]
                 try:
-                    import yfinance as _yf
-                    _hist = _yf.Ticker(ticker).history(period="5d")
-                    if not _hist.empty:
-                        real_price = float(_hist["Close"].iloc[-1])
-                        if len(_hist) >= 2:
-                            real_change = (_hist["Close"].iloc[-1] / _hist["Close"].iloc[-2] - 1) * 100
-                except Exception:
-                    pass
-
-                ticker_data = {
-                    "ticker": ticker,
-                    "sources": {
-                        "yahoo_finance": {
-                            "current_price": real_price,
-                            "price_change_5d": real_change,
-                            "change_pct": real_change,
-                        }
-                    },
+                    html_path = future.result()
+                    done.add(ticker)
+                    _log.info("ML 增强报告已生成：%s", html_path.name)
+                except Exception as e:
+                    _log.warning("ML 报告生成失败 %s: %s", ticker, e)
+
+        return [t for t in tickers if t in done]
+
+    def _render_ml_report(self, ticker: str, swarm_result: Dict = None) -> Path:
+        """渲染并写入单个标的的 ML 增强 HTML 报告（线程安全），返回文件路径"""
+        # 行情优先使用本次扫描的预取数据，缺失时回退到带缓存的 yfinance 拉取
+        stock = self._prefetched_stock.get(ticker)
+        if stock is None:
+            from swarm_agents import _fetch_stock_data
+            stock = _fetch_stock_data(ticker)
+        real_price = stock.get("price", 100.0)
+        real_change = stock.get("momentum_5d", 0.0)
+
+        ticker_data = {
+            "ticker": ticker,
+            "sources": {
+                "yahoo_finance": {
+                    "current_price": real_price,
+                    "price_change_5d": real_change,
+                    "change_pct": real_change,
                 }
+            },
+        }
 
-                # 生成 ML 增强分析
-                enhanced = self.ml_generator.generate_ml_enhanced_report(ticker, ticker_data)
-
-                # 注入蜂群数据
-                if ticker in swarm_data:
-                    enhanced["swarm_results"] = swarm_data[ticker]
+        # 生成 ML 增强分析
+        enhanced = self.ml_generator.generate_ml_enhanced_report(ticker, ticker_data)
 
-                # 同步写入 HTML（必须在 _generate_index_html 前完成，以便文件存在性检测通过）
-                html = self.ml_generator.generate_html_report(ticker, enhanced)
-                html_path = self.report_dir / f"alpha-hive-{ticker}-ml-enhanced-{self.date_str}.html"
-                with open(html_path, "w", encoding="utf-8") as f:
-                    f.write(html)
+        # 注入蜂群数据
+        if swarm_result:
+            enhanced["swarm_results"] = swarm_result
 
-                generated.append(ticker)
-                _log.info("ML 增强报告已生成：%s", html_path.name)
+        # 同步写入 HTML（必须在 _generate_index_html 前完成，以便文件存在性检测通过）
+        html = self.ml_generator.generate_html_report(ticker, enhanced)
+        html_path = self.report_dir / f"alpha-hive-{ticker}-ml-enhanced-{self.date_str}.html"
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(html)
+        return html_path
 
-            except Exception as e:
-                _log.warning("ML 报告生成失败 %s: %s", ticker, e)
-
-        return generated
+    def save_report(self, report: Dict, materialize: bool = True) -> str:
+        """
+        保存报告（追加到当日报告存储，再生成 MD / JSON / X线程 / index.html GitHub Pages）
 
-    def save_report(self, report: Dict) -> str:
-        """保存报告到文件（MD / JSON / X线程 / index.html GitHub Pages）"""
+        Args:
+            report: 本批报告
+            materialize: False 时只追加到当日存储（盘中增量 / 事件重扫使用，文件由节流的
+                         materialize_report() 或下一次 materialize=True 的保存统一生成）
+        """
+        store = DailyReportStore(self.report_dir, self.date_str)
+
+        # 追加本批结果（支持分批运行：opportunities 按 ticker 取最新，Markdown 按批次范围取最新）
+        with tracing.span("persist.report_batch"):
+            store.append_batch(report)
+        if not materialize:
+            _log.info("报告已追加到当日存储（未生成文件）：%s", store.log.path.name)
+            self._flush_trace()
+            return str(store.md_path)
+        return self.materialize_report(report)
+
+    def materialize_report(self, report: Optional[Dict] = None) -> str:
+        """
+        由当日报告存储生成 MD / JSON / X线程 / ML HTML / index.html（GitHub Pages）
 
-        json_file = self.report_dir / f"alpha-hive-daily-{self.date_str}.json"
-        md_file = self.report_dir / f"alpha-hive-daily-{self.date_str}.md"
+        Args:
+            report: 刚追加的本批报告（用其 X 线程与元数据）；None 时只用存储中的合并视图，
+                    X 线程文件保持不变（事件重扫只含单个 ticker，不覆盖当日线程）
+        """
+        store = DailyReportStore(self.report_dir, self.date_str)
+        md_file = store.md_path
 
-        # 如果今日已有报告，合并 opportunities（支持分批运行，避免互相覆盖）
-        if json_file.exists():
-            try:
-                with open(json_file, encoding="utf-8") as _f:
-                    existing = json.load(_f)
-                existing_by_ticker = {o.get("ticker"): o for o in existing.get("opportunities", [])}
-                new_by_ticker = {o.get("ticker"): o for o in report.get("opportunities", [])}
-                existing_by_ticker.update(new_by_ticker)  # 新批次结果优先
-                merged_opps = sorted(existing_by_ticker.values(),
-                                     key=lambda x: x.get("opportunity_score", 0), reverse=True)
-                report["opportunities"] = merged_opps
-                if "swarm_metadata" in report:
-                    report["swarm_metadata"]["tickers_analyzed"] = len(merged_opps)
-                _log.info("合并今日已有报告：共 %d 标的", len(merged_opps))
-            except Exception as e:
-                _log.warning("合并已有报告失败，使用新报告: %s", e)
-
-        # 保存 JSON 版本
-        with open(json_file, "w", encoding="utf-8") as f:
-            json.dump(report, f, ensure_ascii=False, indent=2)
-
-        # 保存 Markdown 版本（新批次追加到已有文件末尾）
-        if md_file.exists():
-            existing_md = md_file.read_text(encoding="utf-8")
-            combined_md = existing_md + "\n\n---\n\n" + report["markdown_report"]
-            with open(md_file, "w", encoding="utf-8") as f:
-                f.write(combined_md)
-            report["markdown_report"] = combined_md
+        with tracing.span("persist.report_materialize"):
+            merged = store.materialize()
+        if report is None:
+            report = merged
         else:
-            with open(md_file, "w", encoding="utf-8") as f:
-                f.write(report["markdown_report"])
-
-        # 清理当天旧的 X 线程文件（防止多次运行时数量不同导致残留叠加）
-        for old in self.report_dir.glob(f"alpha-hive-thread-{self.date_str}-*.txt"):
-            old.unlink()
-
-        # 保存 X 线程版本
-        for i, thread in enumerate(report["twitter_threads"], 1):
-            thread_file = self.report_dir / f"alpha-hive-thread-{self.date_str}-{i}.txt"
-            with open(thread_file, "w", encoding="utf-8") as f:
-                f.write(thread)
+            report["opportunities"] = merged["opportunities"]
+            report["markdown_report"] = merged["markdown_report"]
+            if "swarm_metadata" in report and "swarm_metadata" in merged:
+                report["swarm_metadata"]["tickers_analyzed"] = merged["swarm_metadata"].get(
+                    "tickers_analyzed", report["swarm_metadata"].get("tickers_analyzed"))
+        _log.info("当日报告：共 %d 标的", len(report["opportunities"]))
+
+        # 保存 JSON / Markdown 版本
+        with tracing.span("persist.report_artifacts"):
+            store.write_artifacts(report)
+
+        if report.get("twitter_threads"):
+            # 清理当天旧的 X 线程文件（防止多次运行时数量不同导致残留叠加）
+            for old in self.report_dir.glob(f"alpha-hive-thread-{self.date_str}-*.txt"):
+                old.unlink()
+
+            # 保存 X 线程版本
+            for i, thread in enumerate(report["twitter_threads"], 1):
+                thread_file = self.report_dir / f"alpha-hive-thread-{self.date_str}-{i}.txt"
+                with open(thread_file, "w", encoding="utf-8") as f:
+                    f.write(thread)
 
         # 生成 ML 增强 HTML 报告（必须在 _generate_index_html 前完成，以便 ML 链接自动出现）
         try:
-            ml_tickers = self._generate_ml_reports(report)
+            with tracing.span("render.ml_reports"):
+                ml_tickers = self._generate_ml_reports(report)
             if ml_tickers:
                 _log.info("ML 增强报告完成：%s", ml_tickers)
                 print(f"   ML 报告     : ✅ {', '.join(ml_tickers)}")
@@ -1750,18 +1947,283 @@ class AlphaHiveDailyReporter:
 
         # 更新 GitHub Pages 仪表板
         try:
-            html = self._generate_index_html(report)
-            index_file = self.report_dir / "index.html"
-            with open(index_file, "w", encoding="utf-8") as f:
-                f.write(html)
+            with tracing.span("render.index"):
+                html = self._generate_index_html(report)
+                index_file = self.report_dir / "index.html"
+                with open(index_file, "w", encoding="utf-8") as f:
+                    f.write(html)
             _log.info("index.html 已更新（GitHub Pages）")
         except Exception as e:
             _log.warning("index.html 生成失败: %s", e)
 
         _log.info("报告已保存：%s", md_file.name)
+        self._flush_trace()
 
         return str(md_file)
 
+    def _flush_trace(self) -> None:
+        """取出本次扫描（当前 correlation_id）的 span：按名称汇总分位数写入 metrics.db，按需导出轨迹"""
+        spans = tracing.drain(get_correlation_id())
+        if not spans:
+            return
+        if self.metrics:
+            try:
+                self.metrics.record_spans(spans, session_id=self._session_id or "")
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                _log.warning("追踪指标写入失败: %s", e)
+        if self.trace_export:
+            self._trace_spans.extend(spans)
+            self.export_trace()
+
+    def export_trace(self) -> List[Path]:
+        """
+        导出本会话累计的 span（扫描 + 持久化 + 渲染）：
+        - <session>.trace.json：Chrome Trace Event（chrome://tracing / Perfetto / speedscope）
+        - <session>.folded：折叠栈（flamegraph.pl / speedscope / inferno）
+        """
+        if not self._trace_spans:
+            return []
+        out_dir = self.report_dir / METRICS_CONFIG.get("tracing", {}).get("export_dir", "traces")
+        name = self._session_id or f"swarm_{self.date_str}"
+        paths = [out_dir / f"{name}.trace.json", out_dir / f"{name}.folded"]
+        try:
+            out_dir.mkdir(parents=True, exist_ok=True)
+            tracing.export_chrome_trace(self._trace_spans, paths[0])
+            tracing.export_folded(self._trace_spans, paths[1])
+        except OSError as e:
+            _log.warning("追踪导出失败: %s", e)
+            return []
+        _log.info("追踪已导出：%s", paths[0])
+        return paths
+
+    # index.html 逐 ticker 片段模板版本（修改片段 HTML 时递增，使磁盘缓存失效）
+    DASHBOARD_FRAGMENT_VERSION = 1
+    # 片段中的排名占位符（排名随排序变化，拼接整页时再替换，避免排名变动使缓存失效）
+    _RANK_TOKEN = "@@RANK@@"
+
+    _LOGO_DOMAINS = {
+        "MSFT": "microsoft.com", "NVDA": "nvidia.com",  "TSLA": "tesla.com",
+        "META": "meta.com",       "AMZN": "amazon.com",  "RKLB": "rocketlabusa.com",
+        "BILI": "bilibili.com",   "VKTX": "vikingtherapeutics.com", "CRCL": "circle.com",
+        "GOOGL": "google.com",    "AAPL": "apple.com",   "NFLX": "netflix.com",
+    }
+
+    def _render_ticker_fragments(self, ticker: str, opp: Dict, sd: Dict, ml_exists: bool) -> Dict:
+        """
+        渲染单个 ticker 的仪表板片段（纯函数：只依赖入参，可按内容摘要缓存）
+
+        Returns:
+            {"card": Top 卡片, "row": 表格行, "company": 深度卡片, "radar": 雷达五维数据}
+            card / row 中的排名为 _RANK_TOKEN 占位符
+        """
+        import html as _html
+        import re as _re
+
+        date_str = self.date_str
+        rank = self._RANK_TOKEN
+
+        def sc_cls(score):
+            return "sc-h" if score >= 7.0 else ("sc-m" if score >= 5.5 else "sc-l")
+
+        def _detail():
+            """提取 ticker 的详细指标"""
+            ad = sd.get("agent_details", {})
+            oracle = ad.get("OracleBeeEcho", {}).get("details", {})
+            bear_score = ad.get("BearBeeContrarian", {}).get("score", 0.0)
+            ab = sd.get("agent_breakdown", {})
+            iv_rank = oracle.get("iv_rank", None)
+            pc = oracle.get("put_call_ratio", None)
+            return {
+                "iv_rank": f"{iv_rank:.1f}" if iv_rank is not None else "-",
+                "pc": f"{pc:.2f}" if pc is not None else "-",
+                "bear_score": float(bear_score),
+                "bullish": ab.get("bullish", 0),
+                "bearish_v": ab.get("bearish", 0),
+                "neutral_v": ab.get("neutral", 0),
+            }
+
+        def _radar_data():
+            dim = sd.get("dimension_scores", {})
+            if dim:
+                signal    = float(dim.get("signal",   5.0)) * 10
+                catalyst  = float(dim.get("catalyst", 5.0)) * 10
+                sentiment = float(dim.get("sentiment",5.0)) * 10
+                odds      = float(dim.get("odds",     5.0)) * 10
+                risk_adj  = float(dim.get("risk_adj", 5.0)) * 10
+            else:
+                ad = sd.get("agent_details", {})
+                signal   = float(ad.get("ScoutBeeNova",     {}).get("self_score", 5.0)) * 10
+                catalyst = float(ad.get("ChronosBeeHorizon",{}).get("self_score", 5.0)) * 10
+                oracle_det = ad.get("OracleBeeEcho", {}).get("details", {})
+                pc_r    = oracle_det.get("put_call_ratio", 1.0) or 1.0
+                odds    = max(0.0, min(100.0, (2.0 - float(pc_r)) / 1.5 * 100))
+                buzz_d  = ad.get("BuzzBeeWhisper", {}).get("discovery", "")
+                sm3     = _re.search(r'情绪\s*([\d.]+)%', buzz_d)
+                sentiment = float(sm3.group(1)) if sm3 else 50.0
+                bear_s  = float(ad.get("BearBeeContrarian", {}).get("score", 5.0))
+                risk_adj = max(0.0, (10.0 - bear_s) * 10)
+            return [round(min(100, max(0, signal)),   1),
+                    round(min(100, max(0, catalyst)), 1),
+                    round(min(100, max(0, sentiment)),1),
+                    round(min(100, max(0, odds)),     1),
+                    round(min(100, max(0, risk_adj)), 1)]
+
+        score = float(opp.get("opp_score") or sd.get("final_score", 0))
+        direction = str(opp.get("direction") or sd.get("direction", "neutral")).lower()
+        if "多" in direction: direction = "bullish"
+        elif "空" in direction: direction = "bearish"
+        elif direction not in ("bullish","bearish","neutral"): direction = "neutral"
+        scls = sc_cls(score)
+        det = _detail()
+        ad = sd.get("agent_details", {})
+        ml_href = f"alpha-hive-{ticker}-ml-enhanced-{date_str}.html"
+
+        # ── Top 卡片 ──
+        _dlbl6 = {"bullish":"🟢 看多","bearish":"🔴 看空","neutral":"🟡 中性"}[direction]
+        _dcls6 = {"bullish":"sdir-bull","bearish":"sdir-bear","neutral":"sdir-neut"}[direction]
+        _fcls6 = "fill-h" if score >= 7.0 else ("fill-m" if score >= 5.5 else "fill-l")
+        _pct6  = int(score * 10)
+        _dom6  = self._LOGO_DOMAINS.get(ticker, "")
+        _logo6 = (f'<img class="slogo" src="https://logo.clearbit.com/{_dom6}" '
+                  f'alt="{_html.escape(ticker)}" onerror="this.style.display=\'none\';this.nextSibling.style.display=\'flex\'">'
+                  f'<div class="slogo-fb" style="display:none">{_html.escape(ticker[:2])}</div>') if _dom6 else \
+                 f'<div class="slogo-fb">{_html.escape(ticker[:2])}</div>'
+        # Insight: first non-empty discovery
+        _ins6 = ""
+        for _agt6 in ["ScoutBeeNova","OracleBeeEcho","BuzzBeeWhisper","ChronosBeeHorizon"]:
+            _d6 = ad.get(_agt6,{}).get("discovery","")
+            if _d6:
+                _ins6 = _html.escape(_d6.split("|")[0].strip()[:100])
+                break
+        _ml6   = (f'<a href="{ml_href}" class="ml-btn">ML 详情 →</a>'
+                  if ml_exists else '<span style="font-size:.75em;color:var(--ts);">ML 报告生成中</span>')
+        # Dimension mini-bars (uses dimension_scores 0-10 → height %)
+        _dims6 = sd.get("dimension_scores", {})
+        _dim_html6 = ""
+        if _dims6:
+            _dl6 = [("信号","signal"),("催化","catalyst"),("情绪","sentiment"),("赔率","odds"),("风险","risk_adj")]
+            _db6 = ""
+            for _dlbl6x, _dkey6 in _dl6:
+                _dv6  = float(_dims6.get(_dkey6, 5.0))
+                _dpct6 = max(5, int(_dv6 * 10))
+                _dcol6 = "#22c55e" if _dv6 >= 7 else ("#f59e0b" if _dv6 >= 5.5 else "#ef4444")
+                _db6 += (f'<div class="dim-b-item">'
+                         f'<div class="dim-b" style="height:{_dpct6}%;background:{_dcol6}"></div>'
+                         f'<span class="dim-lbl">{_dlbl6x}</span></div>')
+            _dim_html6 = f'<div class="dim-bars">{_db6}</div>'
+        card = f"""
+            <div class="scard">
+              <div class="scard-head">
+                <div class="slogo-wrap">{_logo6}<span class="srank">#{rank}</span></div>
+                <span class="sdir {_dcls6}">{_dlbl6}</span>
+              </div>
+              <div class="scard-body">
+                <div class="sticker">{_html.escape(ticker)}</div>
+                <div class="score-row">
+                  <span class="score-big {scls}">{score:.1f}</span>
+                  <div class="sbar-wrap">
+                    <div class="sbar-lbl"><span>综合分</span><span>/10</span></div>
+                    <div class="sbar"><div class="sbar-fill {_fcls6}" style="width:{_pct6}%"></div></div>
+                  </div>
+                </div>
+                {_dim_html6}
+                {f'<div class="sinsight">{_ins6}</div>' if _ins6 else ''}
+                {_ml6}
+              </div>
+            </div>"""
+
+        # ── 表格行 ──
+        _dlrt = {"bullish":"看多","bearish":"看空","neutral":"中性"}[direction]
+        _dclrt = {"bullish":"dcell-bull","bearish":"dcell-bear","neutral":"dcell-neut"}[direction]
+        _res_rt = sd.get("resonance",{}).get("resonance_detected",False)
+        _sup_rt = int(opp.get("supporting_agents") or sd.get("supporting_agents",0))
+        _res_html_rt = (f'<span class="res-y">{_sup_rt}A</span>' if _res_rt else '<span class="res-n">无</span>')
+        _ml_rt = (f'<a href="{ml_href}" class="ml-btn-sm">查看</a>'
+                  if ml_exists else "-")
+        _pc_st_rt = (' style="color:var(--bull);font-weight:700"' if det["pc"] != "-" and float(det["pc"]) < 0.7
+                     else (' style="color:var(--bear);font-weight:700"' if det["pc"] != "-" and float(det["pc"]) > 1.5 else ""))
+        row = f"""
+            <tr>
+              <td>{rank}</td>
+              <td><strong>{_html.escape(ticker)}</strong></td>
+              <td><span class="{_dclrt}">{_dlrt}</span></td>
+              <td class="{scls}"><strong>{score:.1f}</strong>/10</td>
+              <td>{_res_html_rt}</td>
+              <td>{det['bullish']}/{det['bearish_v']}/{det['neutral_v']}</td>
+              <td>{det['iv_rank']}</td>
+              <td{_pc_st_rt}>{det['pc']}</td>
+              <td style="color:var(--neut)">{det['bear_score']:.1f}</td>
+              <td>{_ml_rt}</td>
+            </tr>"""
+
+        # ── 深度卡片（含雷达 canvas）──
+        _dir_hdr3 = {"bullish":"#1a7a3a","bearish":"#8b1a1a","neutral":"#7a5c1a"}
+        _dlbld = {"bullish":"看多 ↑","bearish":"看空 ↓","neutral":"中性 →"}[direction]
+        _hcd   = _dir_hdr3.get(direction, "#1a3a7a")
+        _blstd = []
+        for _discd, _icod, _lbd in [
+            (ad.get("ScoutBeeNova",{}).get("discovery",""),       "📋","内幕"),
+            (ad.get("OracleBeeEcho",{}).get("discovery",""),      "📊","期权"),
+            (ad.get("BuzzBeeWhisper",{}).get("discovery",""),     "💬","情绪"),
+            (ad.get("BearBeeContrarian",{}).get("discovery",""),  "🐻","风险"),
+        ]:
+            _fd = _discd.split("|")[0].strip()[:85] if _discd else ""
+            if _fd:
+                _blstd.append(f'<li>{_icod} <strong>{_lbd}：</strong>{_html.escape(_fd)}</li>')
+        _bhtmld = "\n                    ".join(_blstd) if _blstd else "<li>数据采集中</li>"
+        _mlbtnd = (f'<a href="{ml_href}" class="ml-btn-cc">ML 增强分析 →</a>'
+                   if ml_exists else '<span style="font-size:.78em;color:var(--ts)">ML 报告生成中</span>')
+        company = f"""
+            <div class="company-card">
+              <div class="cc-header" style="background:{_hcd};">
+                <span class="cc-ticker">{_html.escape(ticker)}</span>
+                <span class="cc-dir">{_dlbld}</span>
+                <span class="cc-score">{score:.1f}/10</span>
+              </div>
+              <div class="cc-body">
+                <div class="cc-two">
+                  <div class="cc-metrics-col">
+                    <div class="cc-metric"><span class="cm-l">IV Rank</span><span class="cm-v">{det['iv_rank']}</span></div>
+                    <div class="cc-metric"><span class="cm-l">P/C Ratio</span><span class="cm-v">{det['pc']}</span></div>
+                    <div class="cc-metric"><span class="cm-l">看空强度</span><span class="cm-v">{det['bear_score']:.1f}/10</span></div>
+                    <div class="cc-metric"><span class="cm-l">投票</span><span class="cm-v">{det['bullish']}多/{det['bearish_v']}空</span></div>
+                  </div>
+                  <div class="radar-wrap"><canvas id="radar-{_html.escape(ticker)}" width="160" height="160"></canvas></div>
+                </div>
+                <ul class="cc-signals">{_bhtmld}</ul>
+                <div class="cc-footer">{_mlbtnd}</div>
+              </div>
+            </div>"""
+
+        return {"card": card, "row": row, "company": company, "radar": _radar_data()}
+
+    def _build_ticker_fragments(self, tickers: List[str], opp_by_ticker: Dict,
+                                swarm_detail: Dict) -> Dict[str, Dict]:
+        """
+        增量构建所有 ticker 的仪表板片段
+
+        以 (opportunity, 蒸馏结果, ML 报告是否存在, 日期) 的内容摘要为键读取磁盘缓存，
+        只重新渲染摘要变化的 ticker；已不在仪表板上的 ticker 缓存被清理。
+        """
+        from fragment_cache import FragmentCache
+
+        cache = FragmentCache(self.report_dir / ".fragment_cache",
+                              version=self.DASHBOARD_FRAGMENT_VERSION)
+        fragments: Dict[str, Dict] = {}
+        for ticker in tickers:
+            opp = opp_by_ticker.get(ticker, {})
+            sd = swarm_detail.get(ticker, {})
+            ml_exists = (self.report_dir / f"alpha-hive-{ticker}-ml-enhanced-{self.date_str}.html").exists()
+            digest = cache.digest({"date": self.date_str, "opp": opp, "swarm": sd, "ml": ml_exists})
+            frags = cache.get(ticker, digest)
+            if frags is None:
+                frags = self._render_ticker_fragments(ticker, opp, sd, ml_exists)
+                cache.put(ticker, digest, frags)
+            fragments[ticker] = frags
+        cache.prune(tickers)
+        _log.info("index.html 片段：%d 复用 / %d 重新渲染", cache.hits, cache.misses)
+        return fragments
+
     def _generate_index_html(self, report: Dict) -> str:
         """从 swarm report + .swarm_results_*.json 生成完整 GitHub Pages 仪表板"""
         from datetime import datetime as _dt
@@ -1777,14 +2239,7 @@ class AlphaHiveDailyReporter:
         n_resonance = meta.get("resonances_detected", 0)
 
         # 读取详细 swarm_results（含 IV Rank、P/C Ratio、内幕信号等）
-        swarm_detail: Dict = {}
-        try:
-            sr_path = self.report_dir / f".swarm_results_{date_str}.json"
-            if sr_path.exists():
-                with open(sr_path) as _f:
-                    swarm_detail = json.load(_f)
-        except (OSError, json.JSONDecodeError):
-            pass
+        swarm_detail: Dict = load_swarm_results(self.report_dir, date_str)
 
         # 将 opportunities 按 ticker 建立索引，并补充 swarm 详细数据
         opp_by_ticker = {o.get("ticker"): o for o in opps}
@@ -1794,173 +2249,16 @@ class AlphaHiveDailyReporter:
             if t not in all_tickers_sorted:
                 all_tickers_sorted.append(t)
 
-        dir_map = {"bullish": ("看多", "bullish", "#28a745"),
-                   "bearish": ("看空", "bearish", "#dc3545"),
-                   "neutral": ("中性", "neutral", "#ffc107")}
-
-        def sc_cls(score):
-            return "sc-h" if score >= 7.0 else ("sc-m" if score >= 5.5 else "sc-l")
-
-        def _detail(ticker):
-            """提取单个 ticker 的详细指标"""
-            sd = swarm_detail.get(ticker, {})
-            ad = sd.get("agent_details", {})
-            oracle = ad.get("OracleBeeEcho", {}).get("details", {})
-            scout_disc = ad.get("ScoutBeeNova", {}).get("discovery", "")
-            bear_score = ad.get("BearBeeContrarian", {}).get("score", 0.0)
-            ab = sd.get("agent_breakdown", {})
-            iv_rank = oracle.get("iv_rank", None)
-            pc = oracle.get("put_call_ratio", None)
-            real_pct = sd.get("data_real_pct", None)
-            # 内幕信号：取 ScoutBeeNova discovery 第一个 | 段
-            insider_hint = scout_disc.split("|")[0].strip() if scout_disc else ""
-            # 是否有内幕买入/卖出
-            insider_color = "#28a745" if "买入" in insider_hint else ("#dc3545" if "卖出" in insider_hint else "#666")
-            return {
-                "iv_rank": f"{iv_rank:.1f}" if iv_rank is not None else "-",
-                "pc": f"{pc:.2f}" if pc is not None else "-",
-                "bear_score": float(bear_score),
-                "bullish": ab.get("bullish", 0),
-                "bearish_v": ab.get("bearish", 0),
-                "neutral_v": ab.get("neutral", 0),
-                "insider_hint": _html.escape(insider_hint[:35]) if insider_hint else "",
-                "insider_color": insider_color,
-                "real_pct": f"{real_pct:.0f}%" if real_pct is not None else "-",
-            }
+        # 逐 ticker 片段（Top 卡片 / 表格行 / 深度卡片 / 雷达数据）：按内容摘要增量渲染
+        fragments = self._build_ticker_fragments(all_tickers_sorted, opp_by_ticker, swarm_detail)
 
         # 计算 avg real_pct
         real_pcts = [swarm_detail[t].get("data_real_pct", 0) for t in swarm_detail if swarm_detail[t].get("data_real_pct")]
         avg_real = f"{sum(real_pcts)/len(real_pcts):.0f}%" if real_pcts else "-"
 
-        # ── 机会卡片（Top 6）──
-        cards_html = ""
-        for i, ticker in enumerate(all_tickers_sorted[:6], 1):
-            opp = opp_by_ticker.get(ticker, {})
-            score = float(opp.get("opp_score") or swarm_detail.get(ticker, {}).get("final_score", 0))
-            direction = str(opp.get("direction") or swarm_detail.get(ticker, {}).get("direction", "neutral")).lower()
-            if direction not in dir_map:
-                direction = "bullish" if "多" in direction else ("bearish" if "空" in direction else "neutral")
-            resonance = opp.get("resonance", swarm_detail.get(ticker, {}).get("resonance", {}).get("resonance_detected", False))
-            supporting = int(opp.get("supporting_agents") or swarm_detail.get(ticker, {}).get("supporting_agents", 0))
-            dir_label, dir_cls, dir_color = dir_map[direction]
-            border = " style=\"border-color:#28a745;border-width:2px;\"" if i == 1 else ""
-            rank_style = " style=\"background:#28a745;color:white;\"" if i == 1 else ""
-            sc = sc_cls(score)
-            res_badge = (f'<span class="res-badge res-y">{supporting} Agent 共振</span>'
-                         if resonance else '<span class="res-badge res-n">无共振</span>')
-            d = _detail(ticker)
-            pc_color = ' style="color:#28a745;font-weight:bold;"' if d["pc"] != "-" and float(d["pc"]) < 0.7 else (
-                       ' style="color:#dc3545;font-weight:bold;"' if d["pc"] != "-" and float(d["pc"]) > 1.5 else "")
-            bear_pct = min(100, int(d["bear_score"] * 10))
-            insider_row = (f'<div class="mr"><span class="lbl">内幕信号</span>'
-                           f'<span class="val" style="color:{d["insider_color"]};">{d["insider_hint"]}</span></div>'
-                           if d["insider_hint"] else "")
-            ml_link = _Path(self.report_dir / f"alpha-hive-{ticker}-ml-enhanced-{date_str}.html")
-            ml_row = (f'<div class="mr"><span class="lbl">ML 报告</span>'
-                      f'<span class="val"><a href="alpha-hive-{ticker}-ml-enhanced-{date_str}.html" style="color:#667eea;">查看详情</a></span></div>'
-                      if ml_link.exists() else "")
-            cards_html += f"""
-                <div class="opp-card"{border}>
-                    <div class="card-rank"{rank_style}>#{i}</div>
-                    <div class="card-hd">
-                        <h3>{_html.escape(ticker)}</h3>
-                        <div class="dir-badge dir-{dir_cls}">{dir_label}</div>
-                    </div>
-                    <div class="card-body">
-                        <div class="mr"><span class="lbl">综合分</span><span class="val {sc}">{score:.1f}/10</span></div>
-                        <div class="mr"><span class="lbl">共振信号</span>{res_badge}</div>
-                        <div class="mr"><span class="lbl">投票</span><span class="val">{d['bullish']}多 / {d['bearish_v']}空 / {d['neutral_v']}中</span></div>
-                        <div class="mr"><span class="lbl">IV Rank</span><span class="val">{d['iv_rank']}</span></div>
-                        <div class="mr"><span class="lbl">P/C Ratio</span><span class="val"{pc_color}>{d['pc']}</span></div>
-                        {insider_row}
-                        <div class="mr"><span class="lbl">看空强度</span><span class="val">{d['bear_score']:.1f}/10</span></div>
-                        <div class="bear-bar"><div class="bear-fill" style="width:{bear_pct}%"></div></div>
-                        {ml_row}
-                    </div>
-                </div>"""
-
-        # ── 完整表格（全部 ticker）──
-        rows_html = ""
-        for i, ticker in enumerate(all_tickers_sorted, 1):
-            opp = opp_by_ticker.get(ticker, {})
-            score = float(opp.get("opp_score") or swarm_detail.get(ticker, {}).get("final_score", 0))
-            direction = str(opp.get("direction") or swarm_detail.get(ticker, {}).get("direction", "neutral")).lower()
-            if direction not in dir_map:
-                direction = "bullish" if "多" in direction else ("bearish" if "空" in direction else "neutral")
-            resonance = opp.get("resonance", swarm_detail.get(ticker, {}).get("resonance", {}).get("resonance_detected", False))
-            supporting = int(opp.get("supporting_agents") or swarm_detail.get(ticker, {}).get("supporting_agents", 0))
-            dir_label, _, dir_color = dir_map[direction]
-            sc = sc_cls(score)
-            d = _detail(ticker)
-            res_html = (f'<span class="res-badge res-y">{supporting} Agent</span>'
-                        if resonance else '<span class="res-badge res-n">无</span>')
-            row_style = " style=\"background:#f0fff0;\"" if i == 1 else ""
-            ml_link = _Path(self.report_dir / f"alpha-hive-{ticker}-ml-enhanced-{date_str}.html")
-            ml_td = (f'<a href="alpha-hive-{ticker}-ml-enhanced-{date_str}.html" style="color:#667eea;">查看</a>'
-                     if ml_link.exists() else "-")
-            pc_style = (' style="color:#28a745;font-weight:bold;"' if d["pc"] != "-" and float(d["pc"]) < 0.7
-                        else (' style="color:#dc3545;font-weight:bold;"' if d["pc"] != "-" and float(d["pc"]) > 1.5 else ""))
-            rows_html += f"""
-                <tr{row_style}>
-                    <td>{i}</td>
-                    <td><strong>{_html.escape(ticker)}</strong></td>
-                    <td style="color:{dir_color};font-weight:bold;">{dir_label}</td>
-                    <td class="{sc}"><strong>{score:.1f}</strong>/10</td>
-                    <td>{res_html}</td>
-                    <td>{d['bullish']} / {d['bearish_v']} / {d['neutral_v']}</td>
-                    <td>{d['iv_rank']}</td>
-                    <td{pc_style}>{d['pc']}</td>
-                    <td style="color:#fd7e14;">{d['bear_score']:.1f}/10</td>
-                    <td>{ml_td}</td>
-                </tr>"""
-
         # ── Phase 3 增强：宏观面板 + 深度卡片 + Markdown 渲染 ──
         import re as _re
 
-        # extra_css：用普通字符串（不用 f-string），避免 CSS 大括号转义问题
-        extra_css = """
-        .reports-list { display: flex; flex-direction: column; gap: 12px; }
-        .report-item { border: 1px solid #eee; border-radius: 8px; padding: 12px; }
-        .report-date { font-size: 0.85em; color: #666; margin-bottom: 8px; }
-        .report-links { display: flex; flex-wrap: wrap; gap: 8px; }
-        .rl { display: inline-block; padding: 5px 12px; border-radius: 15px; font-size: 0.82em;
-              font-weight: bold; text-decoration: none; transition: opacity 0.2s; }
-        .rl:hover { opacity: 0.85; }
-        .rl.md { background: #667eea; color: white; }
-        .rl.json { background: #764ba2; color: white; }
-        .rl.ml-rl { background: #17a2b8; color: white; font-size: 0.78em; padding: 4px 10px; }
-        .company-grid { display: grid; grid-template-columns: repeat(auto-fit, minmax(360px, 1fr)); gap: 20px; }
-        .company-card { border-radius: 12px; overflow: hidden; box-shadow: 0 4px 18px rgba(0,0,0,0.09); }
-        .cc-header { display: flex; justify-content: space-between; align-items: center; padding: 14px 20px; color: white; }
-        .cc-ticker { font-size: 1.4em; font-weight: bold; }
-        .cc-dir { font-size: 0.88em; background: rgba(255,255,255,0.22); padding: 3px 12px; border-radius: 12px; }
-        .cc-score { font-size: 1.1em; font-weight: bold; }
-        .cc-score.sc-h { color: #90EE90; } .cc-score.sc-m { color: #FFD700; } .cc-score.sc-l { color: #FFB6C1; }
-        .cc-body { padding: 16px 20px; background: white; }
-        .cc-metrics { display: flex; gap: 12px; margin-bottom: 12px; padding-bottom: 12px; border-bottom: 1px solid #f0f0f0; }
-        .cc-metric { flex: 1; text-align: center; background: #f8f9fa; border-radius: 8px; padding: 8px 4px; }
-        .cm-l { display: block; font-size: 0.75em; color: #888; }
-        .cm-v { display: block; font-size: 1em; font-weight: bold; color: #333; margin-top: 3px; }
-        .cc-signals { list-style: none; padding: 0; margin: 0 0 14px 0; }
-        .cc-signals li { padding: 5px 0; border-bottom: 1px dashed #f5f5f5; font-size: 0.87em; color: #444; line-height: 1.5; }
-        .cc-signals li:last-child { border-bottom: none; }
-        .cc-footer { text-align: right; margin-top: 4px; }
-        .ml-btn { display: inline-block; padding: 6px 16px; background: linear-gradient(135deg,#667eea,#764ba2);
-                  color: white; border-radius: 15px; font-size: 0.82em; font-weight: bold; text-decoration: none; }
-        .ml-btn:hover { opacity: 0.88; }
-        .ml-btn-na { font-size: 0.82em; color: #bbb; font-style: italic; }
-        .report-body { font-size: 0.92em; line-height: 1.8; color: #333; max-height: 900px; overflow-y: auto; padding-right: 8px; }
-        .report-body h1 { font-size: 1.5em; color: #667eea; border-bottom: 2px solid #667eea; padding-bottom: 8px; margin: 20px 0 12px; }
-        .report-body h2 { font-size: 1.2em; color: #667eea; border-left: 4px solid #667eea; padding-left: 10px; margin: 16px 0 8px; }
-        .report-body h3 { font-size: 1.05em; color: #764ba2; font-weight: bold; margin: 12px 0 5px; }
-        .report-body h4 { font-size: 0.97em; color: #555; margin: 8px 0 4px; }
-        .report-body ul { margin: 4px 0 8px 18px; }
-        .report-body .sub-ul { margin-top: 4px; padding-left: 16px; }
-        .report-body li { margin: 2px 0; }
-        .report-body p { margin: 2px 0; }
-        .report-body hr { border: none; border-top: 1px solid #eee; margin: 14px 0; }
-        """
-
         # F&G 指数 + 平均情绪
         _fg_val = None
         _avg_sent, _sent_cnt = 0.0, 0
@@ -1981,62 +2279,6 @@ class AlphaHiveDailyReporter:
         _fg_str = str(_fg_val) if _fg_val is not None else "?"
         _avg_sent_str = f"{_avg_sent/_sent_cnt:.0f}%" if _sent_cnt else "-"
 
-        # ML 快捷链接
-        _ml_ql = ""
-        for _t3 in all_tickers_sorted:
-            if _Path(self.report_dir / f"alpha-hive-{_t3}-ml-enhanced-{date_str}.html").exists():
-                _ml_ql += (f'<a href="alpha-hive-{_t3}-ml-enhanced-{date_str}.html"'
-                           f' class="rl ml-rl">{_html.escape(_t3)}</a> ')
-
-        # 个股深度分析卡片
-        _dir_hdr = {"bullish": "#28a745", "bearish": "#dc3545", "neutral": "#e67e22"}
-        company_cards_html = ""
-        for _tkr3 in all_tickers_sorted:
-            _sd3 = swarm_detail.get(_tkr3, {})
-            _ad3 = _sd3.get("agent_details", {})
-            _sc3 = float(opp_by_ticker.get(_tkr3, {}).get("opp_score") or _sd3.get("final_score", 0))
-            _dr3 = str(opp_by_ticker.get(_tkr3, {}).get("direction") or _sd3.get("direction", "neutral")).lower()
-            if _dr3 not in dir_map:
-                _dr3 = "bullish" if "多" in _dr3 else ("bearish" if "空" in _dr3 else "neutral")
-            _dlbl3, _, _ = dir_map[_dr3]
-            _hc3 = _dir_hdr.get(_dr3, "#667eea")
-            _scls3 = sc_cls(_sc3)
-            _det3 = _detail(_tkr3)
-            _blist = []
-            for _disc3, _ico3, _lb3 in [
-                (_ad3.get("ScoutBeeNova", {}).get("discovery", ""), "📋", "内幕"),
-                (_ad3.get("OracleBeeEcho", {}).get("discovery", ""), "📊", "期权"),
-                (_ad3.get("BuzzBeeWhisper", {}).get("discovery", ""), "💬", "情绪"),
-                (_ad3.get("ChronosBeeHorizon", {}).get("discovery", ""), "📅", "催化剂"),
-                (_ad3.get("BearBeeContrarian", {}).get("discovery", ""), "🐻", "风险"),
-            ]:
-                _f3 = _disc3.split("|")[0].strip()[:90] if _disc3 else ""
-                if _f3:
-                    _blist.append(f'<li>{_ico3} <strong>{_lb3}：</strong>{_html.escape(_f3)}</li>')
-            _bhtml3 = "\n                        ".join(_blist) if _blist else "<li>数据采集中...</li>"
-            _ml3ex = _Path(self.report_dir / f"alpha-hive-{_tkr3}-ml-enhanced-{date_str}.html").exists()
-            _mlbtn3 = (f'<a href="alpha-hive-{_tkr3}-ml-enhanced-{date_str}.html" class="ml-btn">ML 增强分析 →</a>'
-                       if _ml3ex else '<span class="ml-btn-na">ML 报告生成中</span>')
-            company_cards_html += f"""
-            <div class="company-card">
-                <div class="cc-header" style="background:{_hc3};">
-                    <span class="cc-ticker">{_html.escape(_tkr3)}</span>
-                    <span class="cc-dir">{_dlbl3}</span>
-                    <span class="cc-score {_scls3}">{_sc3:.1f}/10</span>
-                </div>
-                <div class="cc-body">
-                    <div class="cc-metrics">
-                        <div class="cc-metric"><span class="cm-l">IV Rank</span><span class="cm-v">{_det3['iv_rank']}</span></div>
-                        <div class="cc-metric"><span class="cm-l">P/C Ratio</span><span class="cm-v">{_det3['pc']}</span></div>
-                        <div class="cc-metric"><span class="cm-l">看空强度</span><span class="cm-v">{_det3['bear_score']:.1f}/10</span></div>
-                    </div>
-                    <ul class="cc-signals">
-                        {_bhtml3}
-                    </ul>
-                    <div class="cc-footer">{_mlbtn3}</div>
-                </div>
-            </div>"""
-
         # Markdown → HTML 轻量渲染
         def _md2html(md_text: str) -> str:
             lines = md_text.split('\n')
@@ -2082,10 +2324,17 @@ class AlphaHiveDailyReporter:
             return '\n'.join(out)
 
         _rpt_body = ""
+        # 优先使用内存中已合并的简报（save_report 刚生成），否则读取磁盘文件
+        _md_text3 = report.get("markdown_report")
         _md_path3 = _Path(self.report_dir) / f"alpha-hive-daily-{date_str}.md"
-        if _md_path3.exists():
+        if _md_text3 is None and _md_path3.exists():
+            try:
+                _md_text3 = _md_path3.read_text(encoding='utf-8')
+            except OSError:
+                _rpt_body = "<p>报告加载失败</p>"
+        if _md_text3 is not None:
             try:
-                _rpt_body = _md2html(_md_path3.read_text(encoding='utf-8'))
+                _rpt_body = _md2html(_md_text3)
             except Exception:
                 _rpt_body = "<p>报告加载失败</p>"
 
@@ -2109,43 +2358,9 @@ class AlphaHiveDailyReporter:
         ]
         _avg_score = (sum(s for _, s in _all_scores) / len(_all_scores)) if _all_scores else 0
 
-        def _radar_data(ticker):
-            sd  = swarm_detail.get(ticker, {})
-            dim = sd.get("dimension_scores", {})
-            if dim:
-                signal    = float(dim.get("signal",   5.0)) * 10
-                catalyst  = float(dim.get("catalyst", 5.0)) * 10
-                sentiment = float(dim.get("sentiment",5.0)) * 10
-                odds      = float(dim.get("odds",     5.0)) * 10
-                risk_adj  = float(dim.get("risk_adj", 5.0)) * 10
-            else:
-                ad = sd.get("agent_details", {})
-                signal   = float(ad.get("ScoutBeeNova",     {}).get("self_score", 5.0)) * 10
-                catalyst = float(ad.get("ChronosBeeHorizon",{}).get("self_score", 5.0)) * 10
-                oracle_det = ad.get("OracleBeeEcho", {}).get("details", {})
-                pc_r    = oracle_det.get("put_call_ratio", 1.0) or 1.0
-                odds    = max(0.0, min(100.0, (2.0 - float(pc_r)) / 1.5 * 100))
-                buzz_d  = ad.get("BuzzBeeWhisper", {}).get("discovery", "")
-                sm3     = _re.search(r'情绪\s*([\d.]+)%', buzz_d)
-                sentiment = float(sm3.group(1)) if sm3 else 50.0
-                bear_s  = float(ad.get("BearBeeContrarian", {}).get("score", 5.0))
-                risk_adj = max(0.0, (10.0 - bear_s) * 10)
-            return [round(min(100, max(0, signal)),   1),
-                    round(min(100, max(0, catalyst)), 1),
-                    round(min(100, max(0, sentiment)),1),
-                    round(min(100, max(0, odds)),     1),
-                    round(min(100, max(0, risk_adj)), 1)]
-
         _scores_js  = _json.dumps([[t, round(s, 1)] for t, s in _all_scores])
         _dir_js     = _json.dumps([_dir_counts["bullish"], _dir_counts["bearish"], _dir_counts["neutral"]])
-        _radar_js   = _json.dumps({t: _radar_data(t) for t in all_tickers_sorted})
-
-        _DOMAINS = {
-            "MSFT": "microsoft.com", "NVDA": "nvidia.com",  "TSLA": "tesla.com",
-            "META": "meta.com",       "AMZN": "amazon.com",  "RKLB": "rocketlabusa.com",
-            "BILI": "bilibili.com",   "VKTX": "vikingtherapeutics.com", "CRCL": "circle.com",
-            "GOOGL": "google.com",    "AAPL": "apple.com",   "NFLX": "netflix.com",
-        }
+        _radar_js   = _json.dumps({t: fragments[t]["radar"] for t in all_tickers_sorted})
 
         # ── New CSS (plain string – no f-string brace escaping) ──
         new_css = """
@@ -2368,154 +2583,18 @@ body{font-family:-apple-system,BlinkMacSystemFont,'Segoe UI',Roboto,sans-serif;
 .full-table th[data-sort="desc"]::after{content:' ↓';opacity:.8}
 """
 
-        # ── Build new Top-6 cards ──
-        new_cards_html = ""
-        for _ci, _tc6 in enumerate(all_tickers_sorted[:6], 1):
-            _oc6   = opp_by_ticker.get(_tc6, {})
-            _sc6   = float(_oc6.get("opp_score") or swarm_detail.get(_tc6, {}).get("final_score", 0))
-            _dr6   = str(_oc6.get("direction") or swarm_detail.get(_tc6, {}).get("direction", "neutral")).lower()
-            if "多" in _dr6: _dr6 = "bullish"
-            elif "空" in _dr6: _dr6 = "bearish"
-            elif _dr6 not in ("bullish","bearish","neutral"): _dr6 = "neutral"
-            _dlbl6 = {"bullish":"🟢 看多","bearish":"🔴 看空","neutral":"🟡 中性"}[_dr6]
-            _dcls6 = {"bullish":"sdir-bull","bearish":"sdir-bear","neutral":"sdir-neut"}[_dr6]
-            _scls6 = sc_cls(_sc6)
-            _fcls6 = "fill-h" if _sc6 >= 7.0 else ("fill-m" if _sc6 >= 5.5 else "fill-l")
-            _pct6  = int(_sc6 * 10)
-            _dom6  = _DOMAINS.get(_tc6, "")
-            _logo6 = (f'<img class="slogo" src="https://logo.clearbit.com/{_dom6}" '
-                      f'alt="{_html.escape(_tc6)}" onerror="this.style.display=\'none\';this.nextSibling.style.display=\'flex\'">'
-                      f'<div class="slogo-fb" style="display:none">{_html.escape(_tc6[:2])}</div>') if _dom6 else \
-                     f'<div class="slogo-fb">{_html.escape(_tc6[:2])}</div>'
-            # Insight: first non-empty discovery
-            _ins6 = ""
-            for _agt6 in ["ScoutBeeNova","OracleBeeEcho","BuzzBeeWhisper","ChronosBeeHorizon"]:
-                _d6 = swarm_detail.get(_tc6,{}).get("agent_details",{}).get(_agt6,{}).get("discovery","")
-                if _d6:
-                    _ins6 = _html.escape(_d6.split("|")[0].strip()[:100])
-                    break
-            _ml6ex = _Path(self.report_dir / f"alpha-hive-{_tc6}-ml-enhanced-{date_str}.html").exists()
-            _ml6   = (f'<a href="alpha-hive-{_tc6}-ml-enhanced-{date_str}.html" class="ml-btn">ML 详情 →</a>'
-                      if _ml6ex else '<span style="font-size:.75em;color:var(--ts);">ML 报告生成中</span>')
-            # Dimension mini-bars (uses dimension_scores 0-10 → height %)
-            _dims6 = swarm_detail.get(_tc6, {}).get("dimension_scores", {})
-            _dim_html6 = ""
-            if _dims6:
-                _dl6 = [("信号","signal"),("催化","catalyst"),("情绪","sentiment"),("赔率","odds"),("风险","risk_adj")]
-                _db6 = ""
-                for _dlbl6x, _dkey6 in _dl6:
-                    _dv6  = float(_dims6.get(_dkey6, 5.0))
-                    _dpct6 = max(5, int(_dv6 * 10))
-                    _dcol6 = "#22c55e" if _dv6 >= 7 else ("#f59e0b" if _dv6 >= 5.5 else "#ef4444")
-                    _db6 += (f'<div class="dim-b-item">'
-                             f'<div class="dim-b" style="height:{_dpct6}%;background:{_dcol6}"></div>'
-                             f'<span class="dim-lbl">{_dlbl6x}</span></div>')
-                _dim_html6 = f'<div class="dim-bars">{_db6}</div>'
-            new_cards_html += f"""
-            <div class="scard">
-              <div class="scard-head">
-                <div class="slogo-wrap">{_logo6}<span class="srank">#{_ci}</span></div>
-                <span class="sdir {_dcls6}">{_dlbl6}</span>
-              </div>
-              <div class="scard-body">
-                <div class="sticker">{_html.escape(_tc6)}</div>
-                <div class="score-row">
-                  <span class="score-big {_scls6}">{_sc6:.1f}</span>
-                  <div class="sbar-wrap">
-                    <div class="sbar-lbl"><span>综合分</span><span>/10</span></div>
-                    <div class="sbar"><div class="sbar-fill {_fcls6}" style="width:{_pct6}%"></div></div>
-                  </div>
-                </div>
-                {_dim_html6}
-                {f'<div class="sinsight">{_ins6}</div>' if _ins6 else ''}
-                {_ml6}
-              </div>
-            </div>"""
-
-        # ── Build Full Table rows ──
-        new_rows_html = ""
-        for _ri, _trt in enumerate(all_tickers_sorted, 1):
-            _ort = opp_by_ticker.get(_trt, {})
-            _srt = float(_ort.get("opp_score") or swarm_detail.get(_trt, {}).get("final_score", 0))
-            _drt = str(_ort.get("direction") or swarm_detail.get(_trt, {}).get("direction","neutral")).lower()
-            if "多" in _drt: _drt = "bullish"
-            elif "空" in _drt: _drt = "bearish"
-            elif _drt not in ("bullish","bearish","neutral"): _drt = "neutral"
-            _dlrt = {"bullish":"看多","bearish":"看空","neutral":"中性"}[_drt]
-            _dclrt = {"bullish":"dcell-bull","bearish":"dcell-bear","neutral":"dcell-neut"}[_drt]
-            _scrt = sc_cls(_srt)
-            _det_rt = _detail(_trt)
-            _res_rt = swarm_detail.get(_trt,{}).get("resonance",{}).get("resonance_detected",False)
-            _sup_rt = int(_ort.get("supporting_agents") or swarm_detail.get(_trt,{}).get("supporting_agents",0))
-            _res_html_rt = (f'<span class="res-y">{_sup_rt}A</span>' if _res_rt else '<span class="res-n">无</span>')
-            _ml_ex_rt = _Path(self.report_dir / f"alpha-hive-{_trt}-ml-enhanced-{date_str}.html").exists()
-            _ml_rt = (f'<a href="alpha-hive-{_trt}-ml-enhanced-{date_str}.html" class="ml-btn-sm">查看</a>'
-                      if _ml_ex_rt else "-")
-            _pc_st_rt = (' style="color:var(--bull);font-weight:700"' if _det_rt["pc"] != "-" and float(_det_rt["pc"]) < 0.7
-                         else (' style="color:var(--bear);font-weight:700"' if _det_rt["pc"] != "-" and float(_det_rt["pc"]) > 1.5 else ""))
-            new_rows_html += f"""
-            <tr>
-              <td>{_ri}</td>
-              <td><strong>{_html.escape(_trt)}</strong></td>
-              <td><span class="{_dclrt}">{_dlrt}</span></td>
-              <td class="{_scrt}"><strong>{_srt:.1f}</strong>/10</td>
-              <td>{_res_html_rt}</td>
-              <td>{_det_rt['bullish']}/{_det_rt['bearish_v']}/{_det_rt['neutral_v']}</td>
-              <td>{_det_rt['iv_rank']}</td>
-              <td{_pc_st_rt}>{_det_rt['pc']}</td>
-              <td style="color:var(--neut)">{_det_rt['bear_score']:.1f}</td>
-              <td>{_ml_rt}</td>
-            </tr>"""
+        # ── 拼接逐 ticker 片段（排名占位符在此替换）──
+        _rank_tok = self._RANK_TOKEN
+        new_cards_html = "".join(
+            fragments[_t]["card"].replace(_rank_tok, str(_i))
+            for _i, _t in enumerate(all_tickers_sorted[:6], 1)
+        )
+        new_rows_html = "".join(
+            fragments[_t]["row"].replace(_rank_tok, str(_i))
+            for _i, _t in enumerate(all_tickers_sorted, 1)
+        )
+        new_company_html = "".join(fragments[_t]["company"] for _t in all_tickers_sorted)
 
-        # ── Build Deep Analysis cards (with radar canvas) ──
-        _dir_hdr3 = {"bullish":"#1a7a3a","bearish":"#8b1a1a","neutral":"#7a5c1a"}
-        new_company_html = ""
-        for _tkrd in all_tickers_sorted:
-            _sdd = swarm_detail.get(_tkrd, {})
-            _add = _sdd.get("agent_details", {})
-            _scd = float(opp_by_ticker.get(_tkrd,{}).get("opp_score") or _sdd.get("final_score", 0))
-            _drd = str(opp_by_ticker.get(_tkrd,{}).get("direction") or _sdd.get("direction","neutral")).lower()
-            if "多" in _drd: _drd = "bullish"
-            elif "空" in _drd: _drd = "bearish"
-            elif _drd not in ("bullish","bearish","neutral"): _drd = "neutral"
-            _dlbld = {"bullish":"看多 ↑","bearish":"看空 ↓","neutral":"中性 →"}[_drd]
-            _hcd   = _dir_hdr3.get(_drd, "#1a3a7a")
-            _detd  = _detail(_tkrd)
-            _blstd = []
-            for _discd, _icod, _lbd in [
-                (_add.get("ScoutBeeNova",{}).get("discovery",""),       "📋","内幕"),
-                (_add.get("OracleBeeEcho",{}).get("discovery",""),      "📊","期权"),
-                (_add.get("BuzzBeeWhisper",{}).get("discovery",""),     "💬","情绪"),
-                (_add.get("BearBeeContrarian",{}).get("discovery",""),  "🐻","风险"),
-            ]:
-                _fd = _discd.split("|")[0].strip()[:85] if _discd else ""
-                if _fd:
-                    _blstd.append(f'<li>{_icod} <strong>{_lbd}：</strong>{_html.escape(_fd)}</li>')
-            _bhtmld = "\n                    ".join(_blstd) if _blstd else "<li>数据采集中</li>"
-            _ml_exd = _Path(self.report_dir / f"alpha-hive-{_tkrd}-ml-enhanced-{date_str}.html").exists()
-            _mlbtnd = (f'<a href="alpha-hive-{_tkrd}-ml-enhanced-{date_str}.html" class="ml-btn-cc">ML 增强分析 →</a>'
-                       if _ml_exd else '<span style="font-size:.78em;color:var(--ts)">ML 报告生成中</span>')
-            new_company_html += f"""
-            <div class="company-card">
-              <div class="cc-header" style="background:{_hcd};">
-                <span class="cc-ticker">{_html.escape(_tkrd)}</span>
-                <span class="cc-dir">{_dlbld}</span>
-                <span class="cc-score">{_scd:.1f}/10</span>
-              </div>
-              <div class="cc-body">
-                <div class="cc-two">
-                  <div class="cc-metrics-col">
-                    <div class="cc-metric"><span class="cm-l">IV Rank</span><span class="cm-v">{_detd['iv_rank']}</span></div>
-                    <div class="cc-metric"><span class="cm-l">P/C Ratio</span><span class="cm-v">{_detd['pc']}</span></div>
-                    <div class="cc-metric"><span class="cm-l">看空强度</span><span class="cm-v">{_detd['bear_score']:.1f}/10</span></div>
-                    <div class="cc-metric"><span class="cm-l">投票</span><span class="cm-v">{_detd['bullish']}多/{_detd['bearish_v']}空</span></div>
-                  </div>
-                  <div class="radar-wrap"><canvas id="radar-{_html.escape(_tkrd)}" width="160" height="160"></canvas></div>
-                </div>
-                <ul class="cc-signals">{_bhtmld}</ul>
-                <div class="cc-footer">{_mlbtnd}</div>
-              </div>
-            </div>"""
 
         # ── 历史简报回溯 ──
         _hist_entries = []
@@ -2917,6 +2996,21 @@ def main():
         action='store_true',
         help='启用蜂群协作模式（7 个自治工蜂：6 核心并行 + BearBeeContrarian 看空对冲）'
     )
+    parser.add_argument(
+        '--processes',
+        action='store_true',
+        help='蜂群模式下使用进程池并行分析多个标的（CPU 密集阶段跨核并行）'
+    )
+    parser.add_argument(
+        '--delta',
+        action='store_true',
+        help='蜂群模式下盘中增量重扫：仅重跑输入（价格/期权链/Form4/新闻/宏观）有变化的 Agent'
+    )
+    parser.add_argument(
+        '--trace',
+        action='store_true',
+        help='导出本次扫描的火焰图轨迹（<报告目录>/traces/*.trace.json 与 *.folded）'
+    )
     parser.add_argument(
         '--check-earnings',
         action='store_true',
@@ -2932,16 +3026,24 @@ def main():
         action='store_true',
         help='跳过询问，直接使用 LLM 混合模式'
     )
+    parser.add_argument(
+        '--llm-backend',
+        choices=['anthropic', 'replay'],
+        help='LLM 后端：replay = 离线替身（回放录制响应 + 模拟延迟/故障，无需网络与 API Key）'
+    )
 
     args = parser.parse_args()
 
     # ── LLM 模式选择（每次跑简报前询问）──
     import llm_service as _llm_svc
+    if args.llm_backend:
+        # 写入环境变量，进程池工作进程（spawn）同样生效
+        os.environ["ALPHA_HIVE_LLM_BACKEND"] = args.llm_backend
     _llm_key_exists = bool(_llm_svc._load_api_key())
 
     if args.no_llm:
         use_llm = False
-    elif args.use_llm:
+    elif args.use_llm or args.llm_backend == "replay":
         use_llm = True
     elif _llm_key_exists:
         print("\n┌─────────────────────────────────────────┐")
@@ -2968,6 +3070,8 @@ def main():
 
     # 创建报告生成器
     reporter = AlphaHiveDailyReporter()
+    if args.trace:
+        reporter.trace_export = True
 
     # 如果只是检查财报更新
     if args.check_earnings:
@@ -2985,13 +3089,24 @@ def main():
     focus_tickers = list(WATCHLIST.keys())[:10] if args.all_watchlist else args.tickers
 
     if args.swarm:
-        report = reporter.run_swarm_scan(focus_tickers=focus_tickers)
+        report = reporter.run_swarm_scan(
+            focus_tickers=focus_tickers, use_processes=args.processes or None,
+            delta=args.delta or None,
+        )
     else:
         report = reporter.run_daily_scan(focus_tickers=focus_tickers)
 
-    # 保存报告（Hive app 通过 .swarm_results_{date}.json 自动同步）
-    report_path = reporter.save_report(report)
+    # 保存报告（Hive app 通过 .swarm_results_{date}.bin 自动同步）
+    # 盘中增量批次只追加；距上次生成文件超过 materialize_interval_seconds 时才重新生成当日文件
+    materialize = True
+    if args.swarm and (args.delta or SWARM_CONFIG.get("delta_rescan", {}).get("enabled")):
+        interval = SWARM_CONFIG.get("delta_rescan", {}).get("materialize_interval_seconds", 900)
+        materialize = DailyReportStore(reporter.report_dir, reporter.date_str).artifacts_age() >= interval
+    report_path = reporter.save_report(report, materialize=materialize)
     _log.info("报告已保存：%s", report_path)
+    if not materialize:
+        print("\n📝 增量批次已追加到当日存储（距上次生成文件未满间隔，跳过文件生成与三端同步）")
+        return report
 
     # 三端同步：GitHub 提交推送 + Hive App + Slack
     print("\n📡 同步三端：GitHub / Hive App / Slack...")
@@ -28,6 +28,16 @@ _log = get_logger("backtester")
 DB_PATH = PATHS.db
 
 
+def direction_correct(direction: str, actual_return: float) -> bool:
+    """方向判定规则（Backtester._check_direction 与批量上下文统计共用）"""
+    if direction == "bullish":
+        return actual_return > -1.0
+    elif direction == "bearish":
+        return actual_return < 1.0
+    else:  # neutral
+        return abs(actual_return) < 3.0
+
+
 class PredictionStore:
     """预测记录存储（SQLite）"""
 
@@ -301,6 +311,60 @@ class PredictionStore:
             if conn:
                 conn.close()
 
+    def get_context_stats(self, tickers: List[str], period: str = "t7", days: int = 90) -> Dict[str, Dict]:
+        """
+        批量获取多个标的的准确率上下文（单次 SQL 查询，供扫描预取使用）
+
+        返回: {ticker: {total, correct, accuracy, avg_return,
+                        agents: {agent_id: {total, correct}}}}
+        """
+        if not tickers:
+            return {}
+        cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
+        placeholders = ",".join("?" * len(tickers))
+        conn = None
+        try:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(f"""
+                SELECT ticker, agent_directions,
+                       correct_{period} AS correct, return_{period} AS ret
+                FROM {self.TABLE}
+                WHERE checked_{period} = 1 AND date >= ? AND ticker IN ({placeholders})
+            """, (cutoff, *tickers)).fetchall()
+        except (sqlite3.Error, OSError) as e:
+            _log.warning("批量获取准确率上下文失败: %s", e)
+            return {}
+        finally:
+            if conn:
+                conn.close()
+
+        stats: Dict[str, Dict] = {}
+        returns: Dict[str, List[float]] = {}
+        for r in rows:
+            s = stats.setdefault(r["ticker"], {"total": 0, "correct": 0, "agents": {}})
+            s["total"] += 1
+            s["correct"] += r["correct"] or 0
+            ret = r["ret"]
+            if ret is not None:
+                returns.setdefault(r["ticker"], []).append(ret)
+            try:
+                agent_dirs = json.loads(r["agent_directions"] or "{}")
+            except (json.JSONDecodeError, TypeError):
+                agent_dirs = {}
+            if ret is None or not isinstance(agent_dirs, dict):
+                continue
+            for agent_id, agent_dir in agent_dirs.items():
+                a = s["agents"].setdefault(agent_id, {"total": 0, "correct": 0})
+                a["total"] += 1
+                a["correct"] += int(direction_correct(agent_dir, ret))
+
+        for ticker, s in stats.items():
+            rets = returns.get(ticker, [])
+            s["accuracy"] = s["correct"] / s["total"] if s["total"] else 0.0
+            s["avg_return"] = round(sum(rets) / len(rets), 2) if rets else 0.0
+        return stats
+
     def get_all_predictions(self, days: int = 30) -> List[Dict]:
         """获取最近 N 天所有预测"""
         cutoff = (datetime.now() - timedelta(days=days)).strftime("%Y-%m-%d")
@@ -487,9 +551,8 @@ class Backtester:
         """T+1 期权回验：获取 T+1 的 IV Rank 用于对比"""
         ticker = pred["ticker"]
         try:
-            from options_analyzer import OptionsAgent
-            agent = OptionsAgent()
-            result = agent.analyze(ticker)
+            from options_analyzer import get_options_agent
+            result = get_options_agent().analyze(ticker)
             iv_rank_t1 = result.get("iv_rank")
 
             if iv_rank_t1 is not None:
@@ -521,12 +584,7 @@ class Backtester:
         - bearish: 实际收益 < +1%
         - neutral: 实际收益在 ±3% 内
         """
-        if direction == "bullish":
-            return actual_return > -1.0
-        elif direction == "bearish":
-            return actual_return < 1.0
-        else:  # neutral
-            return abs(actual_return) < 3.0
+        return direction_correct(direction, actual_return)
 
     # ==================== 准确率报告 ====================
 
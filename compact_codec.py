@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+🐝 Alpha Hive 紧凑二进制编码 - 内部产物（checkpoint / 蜂群结果 / 信息素快照 / ML 缓存）的序列化
+
+格式（带版本的信封）：
+    b"AHB" | schema_version (1B) | codec (1B) | zlib(payload)
+
+- codec 1：msgpack（已安装 msgpack 时）
+- codec 2：紧凑 JSON（无缩进，标准库降级方案）
+两种 codec 都经过 zlib 压缩（蒸馏结果中的 agent_details / 期权链重复度高）。
+读取端根据信封自动识别 codec；不带信封的旧版 JSON 文本也能直接解码。
+
+公开输出（日报 JSON、index.html、分析 JSON）仍使用 JSON，不走本模块。
+
+追加式日志使用长度前缀帧：
+    len (4B, big-endian) | 信封
+截断的尾帧在回放时自动丢弃。
+"""
+
+import json
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Any, BinaryIO, Iterator
+
+try:
+    import msgpack
+    HAS_MSGPACK = True
+except ImportError:
+    msgpack = None
+    HAS_MSGPACK = False
+
+MAGIC = b"AHB"
+SCHEMA_VERSION = 1
+
+CODEC_MSGPACK = 1
+CODEC_JSON = 2
+
+_HEADER = struct.Struct(">3sBB")
+_FRAME_LEN = struct.Struct(">I")
+
+# zlib 压缩级别：1 级在速度与压缩率之间最均衡（大扫描时写入路径是热点）
+_ZLIB_LEVEL = 1
+
+
+class CodecError(ValueError):
+    """二进制产物无法解码（版本过新 / codec 不可用 / 数据损坏）"""
+
+
+def _default(obj):
+    """处理 pandas Timestamp / numpy 标量 / set 等不可直接序列化的类型"""
+    if hasattr(obj, "isoformat"):
+        return obj.isoformat()
+    if hasattr(obj, "item"):  # numpy scalar
+        return obj.item()
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+# ==================== 编码 / 解码 ====================
+
+def encode(obj: Any) -> bytes:
+    """编码为带版本信封的紧凑二进制"""
+    if HAS_MSGPACK:
+        codec = CODEC_MSGPACK
+        raw = msgpack.packb(obj, default=_default, use_bin_type=True)
+    else:
+        codec = CODEC_JSON
+        raw = json.dumps(obj, default=_default, ensure_ascii=False,
+                         separators=(",", ":")).encode("utf-8")
+    return _HEADER.pack(MAGIC, SCHEMA_VERSION, codec) + zlib.compress(raw, _ZLIB_LEVEL)
+
+
+def decode(data) -> Any:
+    """
+    解码二进制信封；不带信封的 bytes / str 按旧版 JSON 解析
+
+    Raises:
+        CodecError: 版本过新、codec 不可用或数据损坏
+    """
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    if not data.startswith(MAGIC):
+        try:
+            return json.loads(data)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise CodecError(f"既不是 AHB 信封也不是 JSON: {e}") from e
+    if len(data) < _HEADER.size:
+        raise CodecError("信封头不完整")
+    _, version, codec = _HEADER.unpack_from(data)
+    if version > SCHEMA_VERSION:
+        raise CodecError(f"schema 版本 {version} 高于当前支持的 {SCHEMA_VERSION}")
+    try:
+        raw = zlib.decompress(data[_HEADER.size:])
+    except zlib.error as e:
+        raise CodecError(f"解压失败: {e}") from e
+    if codec == CODEC_MSGPACK:
+        if not HAS_MSGPACK:
+            raise CodecError("数据使用 msgpack 编码，但当前环境未安装 msgpack")
+        try:
+            return msgpack.unpackb(raw, raw=False, strict_map_key=False)
+        except (ValueError, msgpack.ExtraData) as e:
+            raise CodecError(f"msgpack 解码失败: {e}") from e
+    if codec == CODEC_JSON:
+        try:
+            return json.loads(raw)
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            raise CodecError(f"JSON 解码失败: {e}") from e
+    raise CodecError(f"未知 codec: {codec}")
+
+
+# ==================== 文件 ====================
+
+def write_file(path, obj: Any) -> None:
+    """原子写入二进制文件（write-to-tmp + os.replace）"""
+    path = Path(path)
+    data = encode(obj)
+    with tempfile.NamedTemporaryFile(dir=str(path.parent), suffix=".tmp", delete=False) as tmp:
+        try:
+            tmp.write(data)
+            tmp.flush()
+            os.fsync(tmp.fileno())
+        except OSError:
+            tmp.close()
+            os.unlink(tmp.name)
+            raise
+    os.replace(tmp.name, str(path))
+
+
+def read_file(path) -> Any:
+    """读取二进制文件（兼容旧版 JSON 文件）"""
+    with open(path, "rb") as f:
+        return decode(f.read())
+
+
+# ==================== 长度前缀帧（追加式日志） ====================
+
+def encode_frame(obj: Any) -> bytes:
+    """编码一条日志帧：4 字节长度 + 信封"""
+    body = encode(obj)
+    return _FRAME_LEN.pack(len(body)) + body
+
+
+def iter_frames(fh: BinaryIO) -> Iterator[bytes]:
+    """依次读取文件中的帧体（信封，需再 decode）；遇到截断的尾帧时停止"""
+    while True:
+        head = fh.read(_FRAME_LEN.size)
+        if len(head) < _FRAME_LEN.size:
+            return
+        (n,) = _FRAME_LEN.unpack(head)
+        body = fh.read(n)
+        if len(body) < n:
+            return
+        yield body
@@ -247,6 +247,18 @@ RUNTIME_CONFIG = {
     "rate_limit_delay": 1,  # 请求间延迟（秒）
 }
 
+# ==================== 弹性层配置 ====================
+RESILIENCE_CONFIG = {
+    # 跨进程共享限流 / 熔断状态（shared_state.py）：同一主机的所有 Alpha Hive 进程共用每个数据源的预算
+    # 环境变量 ALPHA_HIVE_SHARED_LIMITS=0 可临时关闭（退回进程内限流）
+    "shared_state": {
+        "enabled": True,
+        "db_path": None,                # None = <cache_dir>/resilience_state.db
+        "stale_seconds": 3600,          # 桶超过该时长未使用则按初始速率重置（清除前次 AIMD 降速）
+        "busy_timeout_seconds": 5.0,    # 等待其他进程释放写锁的上限
+    },
+}
+
 # ==================== 催化剂日期 ====================
 CATALYSTS = {
     # 科技
@@ -509,7 +521,14 @@ METRICS_CONFIG = {
         "file_sizes": True,
         "report_quality": True,
         "deployment_status": True,
-    }
+    },
+    # 热路径追踪（tracing.py）：span 汇总为分位数写入 metrics.db 的 span_metrics 表
+    "tracing": {
+        "enabled": True,
+        "max_spans": 50000,      # 进程内 span 缓冲上限（超出丢弃最早的）
+        "export": False,         # 每次扫描导出火焰图轨迹（也可用 --trace 开启）
+        "export_dir": "traces",  # 相对报告目录：<session>.trace.json / <session>.folded
+    },
 }
 
 # ==================== 信息素板持久化配置 (Phase 2) ====================
@@ -542,7 +561,28 @@ SWARM_CONFIG = {
     "system_monitoring": {
         "cpu_threshold": 80,     # CPU 使用率超过 80% 时缩减 agent
         "memory_threshold": 85,  # 内存使用率超过 85% 时缩减 agent
-    }
+    },
+    # 进程池模式：多个 ticker 分发到工作进程并行分析（期权/拥挤度/ML 等 CPU 密集阶段不再受 GIL 串行化）
+    "process_pool": {
+        "enabled": False,        # 默认线程模式；CLI --processes 可单次开启
+        "max_workers": None,     # None = os.cpu_count()
+    },
+    # 盘中增量重扫：按输入指纹（价格 bar / 期权链 / 最新 Form4 / 新闻+Reddit / 宏观）只重跑输入变化的 Agent
+    "delta_rescan": {
+        "enabled": False,             # 默认全量；CLI --delta 可单次开启
+        "price_tolerance_pct": 0.5,   # 价格分桶容差：相对变动小于该值视为同一 bar
+        "materialize_interval_seconds": 900,  # 增量批次只追加日报存储；距上次生成文件超过该时长才重新生成
+    },
+    # 事件驱动重扫：Form4 RSS / 财报发布 / 价格量能异动 → 只对受影响 ticker 的相关 Agent 增量重扫
+    "event_rescan": {
+        "enabled": False,             # 桌面 App 内随 LiveMonitor 启动；CLI 见 rescan_dispatcher.py
+        "debounce_seconds": 60,       # 同一 ticker 的事件在静默该时长后合并为一次重扫
+        "max_delay_seconds": 300,     # 事件持续涌入时，最晚在首个事件后该时长内触发
+        "cooldown_seconds": 600,      # 同一 ticker 两次重扫的最小间隔
+        "form4_poll_seconds": 300,    # EDGAR RSS 轮询间隔
+        "earnings_poll_seconds": 900, # 财报发布轮询间隔
+        "materialize_interval_seconds": 300,  # 重扫只追加日报存储；当日文件最多每该时长生成一次（停止时补一次）
+    },
 }
 
 # ==================== 持久化记忆配置 (Phase 2) ====================
@@ -637,6 +677,61 @@ LLM_CONFIG = {
     # 降级策略
     "fallback_on_error": True,          # API 失败时降级到规则引擎
     "fallback_on_budget": True,         # 超预算时降级到规则引擎
+    # 请求调度（llm_service.LLMDispatcher）
+    "dispatcher": {
+        "max_concurrency": 4,           # 同时在途的 API 请求上限
+        "tokens_per_minute": 200_000,   # 输入估算 + max_tokens 的令牌桶速率
+        "scan_budget_usd": 0.50,        # 单次扫描美元预算，超出后剩余调用降级规则引擎（0 = 不限）
+        "acquire_timeout_seconds": 60,  # 等待并发槽位 / 令牌的上限，超时按降级处理
+    },
+    # 内容寻址响应缓存（llm_cache.py）：相同 (model, system, prompt, temperature, max_tokens) 直接复用
+    "response_cache": {
+        "enabled": True,
+        "db_path": None,                # None = <cache_dir>/llm_responses.db
+        "max_bytes": 50 * 1024 * 1024,  # 响应文本总量上限，超出按最久未使用淘汰
+        "max_entries": 20000,
+        # 按调用方的 TTL（秒）；0 = 不缓存
+        "ttl_seconds": {
+            "distill": 4 * 3600,        # QueenDistiller 蒸馏（输入含全部 Agent 结果，变化即失效）
+            "news": 2 * 3600,           # 新闻情绪
+            "insider": 12 * 3600,       # Form 4 解读（申报当日不变）
+            "catalyst": 12 * 3600,      # 催化剂影响
+            "options": 3600,            # 期权流（盘中变化快）
+            "conflicts": 3600,          # Agent 矛盾识别
+            "default": 0,               # 未标注的直接 call()
+        },
+    },
+    # 流式 JSON 提前返回（llm_service.call_json）：首个 JSON 对象闭合即断开，缩短阻塞 ticker 完成的尾延迟
+    "streaming": {
+        "enabled": True,
+        "tags": ["distill"],            # 按响应缓存标签启用（蒸馏路径阻塞每个 ticker 的完成）
+        "max_preamble_chars": 400,      # 首个 "{" 前允许的前导文本（超过即判定未按格式输出）
+    },
+    # LLM 后端（llm_backend.py）：环境变量 ALPHA_HIVE_LLM_BACKEND 优先
+    "backend": {
+        "type": "anthropic",            # anthropic = 线上 API；replay = 离线替身（回放录制 + 模拟延迟/故障）
+        "record": None,                 # 非空时把线上响应追加录制到该 JSONL（供 replay 回放）
+        "replay": {
+            "recordings": None,         # JSONL 或 llm_responses.db；None = <cache_dir>/llm_recordings.jsonl
+            "latency_ms": 800,          # 模拟单次请求延迟
+            "jitter_ms": 300,           # 延迟抖动（±）
+            "error_rate": 0.0,          # 模拟 ConnectionError 概率
+            "timeout_rate": 0.0,        # 模拟 TimeoutError 概率
+            "miss": "neutral",          # 未录制请求：neutral = 中性 JSON；error = 抛错
+            "seed": 42,
+        },
+    },
+    # 批量蒸馏（llm_service.distill_batch）：扫描期间先出规则引擎结果，全部标的完成后统一做 LLM 推理
+    "batch_distill": {
+        "enabled": True,
+        "mode": "packed",               # packed = 多标的打包一次请求；batch_api = Message Batches API（半价，异步）
+        "batch_size": 8,                # packed 模式每次请求的标的数
+        "max_tokens_per_ticker": 400,   # packed 模式输出预算（按标的数累加）
+        "fallback_single": True,        # 打包结果缺失/非法的标的回退单独请求
+        "poll_seconds": 10,             # batch_api 轮询间隔
+        "max_wait_seconds": 1800,       # batch_api 等待上限，超时取消并保留规则引擎结果
+        "batch_api_discount": 0.5,      # Batches API 计费折扣
+    },
 }
 
 if __name__ == "__main__":
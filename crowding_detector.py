@@ -5,6 +5,7 @@
 
 import logging as _logging
 import json
+import threading
 from datetime import datetime
 from typing import Dict, Tuple, List
 
@@ -456,6 +457,21 @@ class CrowdingDetector:
         return filename
 
 
+_detectors: Dict[str, CrowdingDetector] = {}
+_detectors_lock = threading.Lock()
+
+
+def get_detector(ticker: str) -> CrowdingDetector:
+    """进程级复用的 CrowdingDetector（每个 ticker 一个实例，评分方法无状态）"""
+    detector = _detectors.get(ticker)
+    if detector is None:
+        with _detectors_lock:
+            detector = _detectors.get(ticker)
+            if detector is None:
+                detector = _detectors[ticker] = CrowdingDetector(ticker)
+    return detector
+
+
 def get_crowding_metrics(ticker: str, board=None) -> Dict:
     """
     获取指定标的的真实拥挤度指标
@@ -303,8 +303,8 @@ class DataFetcher:
             _log.info(f"🔄 获取 SEC Form {form_type}: {ticker}")
 
             # 使用 sec_edgar.py 的真实 API 实现
-            from sec_edgar import SECEdgarClient
-            client = SECEdgarClient()
+            from sec_edgar import get_sec_client
+            client = get_sec_client()
 
             if form_type == "4":
                 # 获取完整的内幕交易分析
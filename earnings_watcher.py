@@ -6,6 +6,7 @@
 2. 财报发布后自动抓取实际业绩数据（营收、EPS、指引等）
 3. 更新当日简报中对应标的的数据
 4. 可通过 scheduler 定时轮询，或手动触发
+5. 抓到当日财报结果时发布到 event_bus（TOPIC_EARNINGS），驱动事件式重扫
 
 数据源优先级：
 - yfinance earnings_dates / quarterly_financials（免费，无 API Key）
@@ -23,6 +24,7 @@ from datetime import datetime, timedelta, date
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
+from event_bus import TOPIC_EARNINGS, publish
 from hive_logger import PATHS, get_logger, atomic_json_write
 
 _log = get_logger("earnings_watcher")
@@ -62,6 +64,7 @@ class EarningsWatcher:
 
     def __init__(self):
         self._calendar_cache: Dict[str, Dict] = {}  # ticker -> {date, source, ts}
+        self._announced: set = set()  # 已发布事件的 (ticker, 日期)，轮询时不重复发布
 
     # ==================== 财报日期获取 ====================
 
@@ -542,6 +545,11 @@ class EarningsWatcher:
                 earnings = self.fetch_earnings_results(ticker)
                 if earnings:
                     result["earnings_data"][ticker] = earnings
+                    key = (ticker, date.today().isoformat())
+                    if key not in self._announced:
+                        self._announced.add(key)
+                        publish(TOPIC_EARNINGS, ticker,
+                                data_completeness=earnings.get("data_completeness"))
                     _log.info("%s 财报数据：营收 %s, EPS %s, 完整度 %s",
                               ticker,
                               earnings.get("revenue_actual"),
@@ -5,6 +5,7 @@ P2: SEC EDGAR Form 4 RSS 实时流 - 事件驱动告警
 - URL: https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&type=4&count=40&output=atom
 - 缓存：15 分钟（RSS 更新频率约 10 分钟）
 - 功能：过滤 watchlist 公司当日新鲜 Form 4 申报
+- 事件：拉取到新申报时发布到 event_bus（TOPIC_FORM4），驱动事件式重扫
 
 用于 ScoutBeeNova：在 REST API 之前先检查今日实时告警，
 发现当日新鲜内幕交易申报（比 REST API 反应更快）。
@@ -20,6 +21,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from event_bus import TOPIC_FORM4, publish
 from hive_logger import PATHS, atomic_json_write
 
 _log = _logging.getLogger("alpha_hive.edgar_rss")
@@ -49,6 +51,7 @@ class EdgarRSSClient:
     def __init__(self):
         self._cache: List[Dict] = []
         self._cache_ts: float = 0.0
+        self._seen: Optional[set] = None   # 已见过的 accession number（首次拉取只做基线，不发布）
 
     # ==================== 数据获取 ====================
 
@@ -72,6 +75,7 @@ class EdgarRSSClient:
                         with open(_CACHE_PATH) as f:
                             self._cache = json.load(f)
                             self._cache_ts = now
+                            self._announce_new(self._cache)
                             return self._cache
                     except (json.JSONDecodeError, OSError):
                         pass
@@ -88,6 +92,7 @@ class EdgarRSSClient:
                 entries = self._parse_atom(resp.text)
                 self._cache = entries
                 self._cache_ts = now
+                self._announce_new(entries)
 
                 # 写入磁盘缓存
                 try:
@@ -103,6 +108,20 @@ class EdgarRSSClient:
                 _log.debug("EDGAR RSS fetch error: %s", e)
                 return self._cache
 
+    def _announce_new(self, entries: List[Dict]) -> None:
+        """向事件总线发布今日新出现的申报（ticker 未知，携带 CIK / 公司名由订阅者解析）"""
+        accessions = {e.get("accession_number") for e in entries if e.get("accession_number")}
+        if self._seen is None:
+            self._seen = accessions
+            return
+        today = datetime.now().strftime("%Y-%m-%d")
+        for e in entries:
+            acc = e.get("accession_number")
+            if acc and acc not in self._seen and e.get("filing_date") == today:
+                publish(TOPIC_FORM4, cik=e.get("cik", ""), company_name=e.get("company_name", ""),
+                        accession_number=acc)
+        self._seen |= accessions
+
     # ==================== Atom 解析 ====================
 
     def _parse_atom(self, xml_text: str) -> List[Dict]:
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+🐝 Alpha Hive 事件总线 - 进程内发布/订阅
+
+检测器（edgar_rss / earnings_watcher / LiveMonitor）在发现新鲜事件时发布，
+订阅者（如 rescan_dispatcher.RescanDispatcher）据此触发增量重扫。
+
+- 同步分发：publish() 在发布者线程内依次调用处理函数，处理函数应尽快返回
+  （耗时工作交给自己的工作线程）
+- 处理函数抛出的异常只记录日志，不影响发布者和其他订阅者
+- 无订阅者时 publish() 几乎零开销
+
+用法：
+    bus = get_event_bus()
+    unsubscribe = bus.subscribe(TOPIC_FORM4, handler)
+    bus.publish(TOPIC_FORM4, ticker="NVDA", accession_number="0001-24-000001")
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from hive_logger import get_logger
+
+_log = get_logger("event_bus")
+
+# ==================== 事件主题 ====================
+
+TOPIC_FORM4 = "form4"                # 新 Form 4 申报（edgar_rss）
+TOPIC_EARNINGS = "earnings"          # 财报发布（earnings_watcher）
+TOPIC_PRICE_SPIKE = "price_spike"    # 价格异动（LiveMonitor）
+TOPIC_VOLUME_SPIKE = "volume_spike"  # 成交量异动（LiveMonitor）
+
+ALL_TOPICS = "*"
+
+
+@dataclass
+class Event:
+    """总线事件（ticker 可为空：如 RSS 申报只知道 CIK，由订阅者解析）"""
+    topic: str
+    ticker: Optional[str] = None
+    payload: Dict = field(default_factory=dict)
+    ts: float = field(default_factory=time.time)
+
+
+Handler = Callable[[Event], None]
+
+
+class EventBus:
+    """线程安全的进程内事件总线"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._handlers: Dict[str, List[Handler]] = {}
+        self.published = 0
+
+    def subscribe(self, topic: str, handler: Handler) -> Callable[[], None]:
+        """订阅主题（ALL_TOPICS 订阅全部），返回取消订阅函数"""
+        with self._lock:
+            self._handlers.setdefault(topic, []).append(handler)
+
+        def _unsubscribe():
+            with self._lock:
+                handlers = self._handlers.get(topic, [])
+                if handler in handlers:
+                    handlers.remove(handler)
+        return _unsubscribe
+
+    def has_subscribers(self, topic: str) -> bool:
+        with self._lock:
+            return bool(self._handlers.get(topic) or self._handlers.get(ALL_TOPICS))
+
+    def publish(self, topic: str, ticker: Optional[str] = None, **payload) -> int:
+        """发布事件，返回收到事件的处理函数数量"""
+        with self._lock:
+            handlers = list(self._handlers.get(topic, ())) + list(self._handlers.get(ALL_TOPICS, ()))
+        if not handlers:
+            return 0
+        event = Event(topic=topic, ticker=ticker.upper() if ticker else None, payload=payload)
+        self.published += 1
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:  # 订阅者故障不能影响检测器
+                _log.warning("事件处理失败 %s/%s: %s", topic, ticker, e)
+        return len(handlers)
+
+
+# ==================== 单例 ====================
+
+_bus: Optional[EventBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    """获取进程级事件总线单例"""
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                _bus = EventBus()
+    return _bus
+
+
+def publish(topic: str, ticker: Optional[str] = None, **payload) -> int:
+    """便捷函数：发布到全局事件总线"""
+    return get_event_bus().publish(topic, ticker, **payload)
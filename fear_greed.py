@@ -20,6 +20,7 @@ from pathlib import Path
 from typing import Dict
 
 from hive_logger import atomic_json_write
+import tracing
 
 _log = _logging.getLogger("alpha_hive.fear_greed")
 
@@ -33,6 +34,7 @@ _CACHE_TTL = 3600  # 1 小时（指数每天更新）
 _lock = threading.Lock()
 
 
+@tracing.traced("fetch.fear_greed")
 def get_fear_greed() -> Dict:
     """
     获取当前市场 Fear & Greed Index
@@ -19,6 +19,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from hive_logger import atomic_json_write
+import tracing
 
 _log = _logging.getLogger("alpha_hive.finviz_sentiment")
 
@@ -63,6 +64,7 @@ class FinvizSentimentClient:
             time.sleep(2.0 - elapsed)
         self._last_request = time.time()
 
+    @tracing.traced("fetch.finviz")
     def get_news_titles(self, ticker: str, max_titles: int = 30) -> List[str]:
         """抓取 Finviz 新闻标题"""
         cache_path = CACHE_DIR / f"{ticker.upper()}_titles.json"
@@ -217,6 +219,15 @@ _client: Optional[FinvizSentimentClient] = None
 _client_lock = threading.Lock()
 
 
+def invalidate_cache(ticker: str) -> None:
+    """删除该 ticker 的 Finviz 标题 / 情绪缓存（事件驱动重扫前调用）"""
+    for name in (f"{ticker.upper()}_titles.json", f"{ticker.upper()}_sentiment.json"):
+        try:
+            (CACHE_DIR / name).unlink(missing_ok=True)
+        except OSError as exc:
+            _log.debug("Finviz 缓存删除失败 (%s): %s", ticker, exc)
+
+
 def get_finviz_sentiment(ticker: str) -> Dict:
     """便捷函数：获取 Finviz 新闻情绪"""
     global _client
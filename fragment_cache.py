@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+🐝 Alpha Hive 片段缓存 - index.html 仪表板的增量构建
+
+仪表板的大部分 HTML 是逐 ticker 生成的（Top 卡片 / 表格行 / 深度卡片 / 雷达数据）。
+每个 ticker 的片段按其输入内容（蒸馏结果 + opportunity + ML 报告是否存在）
+计算摘要并缓存到磁盘；下次构建时只重新渲染摘要变化的 ticker，再拼接整页。
+
+用法：
+    cache = FragmentCache(PATHS.home / ".fragment_cache", version=2)
+    digest = cache.digest({"opp": opp, "swarm": sd})
+    frags = cache.get("NVDA", digest)
+    if frags is None:
+        frags = render(...)
+        cache.put("NVDA", digest, frags)
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import tracing
+from hive_logger import get_logger, atomic_json_write
+
+_log = get_logger("fragment_cache")
+
+_SAFE_KEY = re.compile(r"[^A-Za-z0-9._-]")
+
+
+class FragmentCache:
+    """按内容摘要缓存逐 key 的渲染片段（每个 key 一个 JSON 文件）"""
+
+    def __init__(self, cache_dir, version: int = 1):
+        """
+        Args:
+            cache_dir: 缓存目录（不存在时自动创建）
+            version: 渲染模板版本；模板改动时递增，旧片段自动失效
+        """
+        self.cache_dir = Path(cache_dir)
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+
+    def digest(self, payload) -> str:
+        """计算输入内容摘要（键排序，保证同一内容摘要稳定）"""
+        raw = json.dumps({"v": self.version, "p": payload},
+                         sort_keys=True, default=str, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{_SAFE_KEY.sub('_', key)}.json"
+
+    def get(self, key: str, digest: str) -> Optional[Dict]:
+        """摘要一致时返回缓存片段，否则返回 None"""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+            if entry.get("digest") == digest and isinstance(entry.get("fragments"), dict):
+                self.hits += 1
+                tracing.event("cache.fragment.hit", key=key)
+                return entry["fragments"]
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError, AttributeError) as e:
+            _log.debug("片段缓存读取失败 %s: %s", path.name, e)
+        self.misses += 1
+        tracing.event("cache.fragment.miss", key=key)
+        return None
+
+    def put(self, key: str, digest: str, fragments: Dict) -> None:
+        """写入片段（原子替换，失败只记录日志）"""
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            atomic_json_write(self._path(key), {"digest": digest, "fragments": fragments})
+        except (OSError, TypeError, ValueError) as e:
+            _log.debug("片段缓存写入失败 %s: %s", key, e)
+
+    def prune(self, keep: Iterable[str]) -> int:
+        """删除不在 keep 中的 key 的缓存文件，返回删除数量"""
+        keep_names = {self._path(k).name for k in keep}
+        removed = 0
+        if not self.cache_dir.exists():
+            return removed
+        for path in self.cache_dir.glob("*.json"):
+            if path.name not in keep_names:
+                try:
+                    path.unlink()
+                    removed += 1
+                except OSError as e:
+                    _log.debug("片段缓存清理失败 %s: %s", path.name, e)
+        return removed
@@ -20,6 +20,8 @@ import time
 import threading
 from typing import Dict, Optional, Tuple
 
+import tracing
+
 _log = logging.getLogger("alpha_hive.fred_macro")
 
 
@@ -81,6 +83,7 @@ def get_macro_context() -> Dict:
     return result
 
 
+@tracing.traced("fetch.fred")
 def _fetch_macro_data() -> Dict:
     """内部：实际拉取宏观数据"""
 
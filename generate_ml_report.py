@@ -11,6 +11,7 @@ from pathlib import Path
 from threading import Lock, Thread
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import queue
+from string import Template
 from advanced_analyzer import AdvancedAnalyzer
 from ml_predictor import (
     MLPredictionService,
@@ -19,10 +20,152 @@ from ml_predictor import (
 )
 from config import WATCHLIST
 from hive_logger import PATHS, get_logger
+import compact_codec
 
 _log = get_logger("ml_report")
 
 
+# HTML 页面骨架（模块加载时编译一次；各版块内容由 generate_html_report 填充）
+_ML_REPORT_PAGE = Template("""<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>$ticker ML 增强分析 - Alpha Hive</title>
+    <style>
+        * { margin: 0; padding: 0; box-sizing: border-box; }
+        body {
+            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh; padding: 20px;
+        }
+        .container { max-width: 900px; margin: 0 auto; }
+        .header {
+            background: white; border-radius: 15px; padding: 35px;
+            margin-bottom: 25px; box-shadow: 0 10px 40px rgba(0,0,0,0.1);
+            text-align: center;
+        }
+        .header h1 { font-size: 2.2em; color: #667eea; margin-bottom: 8px; }
+        .header .rating {
+            display: inline-block; padding: 8px 25px; border-radius: 25px;
+            color: white; font-size: 1.3em; font-weight: bold;
+            background: $rating_color; margin: 10px 0;
+        }
+        .section {
+            background: white; border-radius: 12px; padding: 25px;
+            margin-bottom: 20px; box-shadow: 0 5px 20px rgba(0,0,0,0.08);
+        }
+        .section h2 {
+            color: #667eea; font-size: 1.4em; margin-bottom: 18px;
+            padding-bottom: 10px; border-bottom: 2px solid #f0f0f0;
+        }
+        .section h3 { color: #555; margin: 15px 0 10px; font-size: 1.1em; }
+        .grid-4 {
+            display: grid; grid-template-columns: repeat(4, 1fr); gap: 15px;
+        }
+        .grid-2 {
+            display: grid; grid-template-columns: 1fr 1fr; gap: 20px;
+        }
+        .stat {
+            text-align: center; padding: 15px; border-radius: 10px;
+            background: linear-gradient(135deg, #f8f9fa, #fff);
+            border: 1px solid #e8e8e8;
+        }
+        .stat .num { font-size: 1.8em; font-weight: bold; color: #667eea; }
+        .stat .lbl { font-size: 0.85em; color: #888; margin-top: 5px; }
+        .metric {
+            display: flex; justify-content: space-between; align-items: center;
+            padding: 10px 0; border-bottom: 1px solid #f5f5f5;
+        }
+        .metric-label { color: #666; font-weight: 500; }
+        .metric-value { font-weight: bold; color: #333; }
+        table {
+            width: 100%; border-collapse: collapse; margin-top: 10px;
+        }
+        th, td {
+            padding: 10px 12px; text-align: left; border-bottom: 1px solid #eee;
+        }
+        th {
+            background: linear-gradient(135deg, #667eea, #764ba2);
+            color: white; font-weight: 600; font-size: 0.9em;
+        }
+        ul { padding-left: 20px; margin: 10px 0; }
+        li { margin: 6px 0; color: #444; line-height: 1.6; }
+        .footer {
+            text-align: center; color: rgba(255,255,255,0.85);
+            margin-top: 20px; font-size: 0.9em;
+        }
+        @media (max-width: 600px) {
+            .grid-4 { grid-template-columns: repeat(2, 1fr); }
+            .grid-2 { grid-template-columns: 1fr; }
+        }
+    </style>
+</head>
+<body>
+<div class="container">
+    <!-- 头部 -->
+    <div class="header">
+        <h1>$ticker ML 增强分析</h1>
+        <div class="rating">$rating - $action</div>
+        <p style="color:#888; margin-top:10px;">
+            $generated_at | Alpha Hive
+        </p>
+    </div>
+
+    <!-- 核心指标 -->
+    <div class="section">
+        <h2>核心指标</h2>
+        <div class="grid-4">
+            <div class="stat">
+                <div class="num">$combined_prob%</div>
+                <div class="lbl">综合胜率</div>
+            </div>
+            <div class="stat">
+                <div class="num">$win_prob%</div>
+                <div class="lbl">人工分析</div>
+            </div>
+            <div class="stat">
+                <div class="num">$ml_prob%</div>
+                <div class="lbl">ML 预测</div>
+            </div>
+            <div class="stat">
+                <div class="num">$risk_reward</div>
+                <div class="lbl">风险回报比</div>
+            </div>
+        </div>
+    </div>
+
+    <!-- 蜂群智能 -->
+    $swarm_html
+
+    <!-- 期权信号 -->
+    $options_html
+
+    <!-- 止损止盈 -->
+    $position_html
+
+    <!-- 投资建议 -->
+    $rec_html
+
+    <!-- ML 特征 -->
+    $ml_html
+
+    <!-- 免责声明 -->
+    <div class="section" style="background:#fff3cd; border:1px solid #ffc107;">
+        <p style="color:#856404; font-size:0.9em;">
+            <strong>免责声明</strong>：本报告为 AI 自动生成，不构成投资建议。
+            所有交易决策需自行判断和风控。预测存在误差，过往表现不代表未来收益。
+        </p>
+    </div>
+
+    <div class="footer">
+        <p><a href="index.html" style="color:white;">返回仪表板</a></p>
+    </div>
+</div>
+</body>
+</html>""")
+
+
 class MLEnhancedReportGenerator:
     """ML 增强的报告生成器"""
 
@@ -30,7 +173,7 @@ class MLEnhancedReportGenerator:
     _model_cache = {}          # 内存缓存（同一进程内）
     _cache_date = None         # 缓存日期
     _training_lock = Lock()    # 防止并发重复训练
-    _model_file = PATHS.home / "ml_model_cache.json"  # 磁盘缓存文件（JSON，安全序列化）
+    _model_file = PATHS.home / "ml_model_cache.bin"  # 磁盘缓存文件（紧凑二进制，安全序列化）
 
     # ⭐ Task 3: 异步 HTML 生成（后台文件写入）
     _file_writer_pool = None   # 异步文件写入线程池
@@ -98,11 +241,9 @@ class MLEnhancedReportGenerator:
             return False
 
     def _load_model_from_disk(self):
-        """从磁盘加载模型（JSON 格式，安全反序列化）"""
+        """从磁盘加载模型（紧凑二进制格式，安全反序列化）"""
         try:
-            import json as _json
-            with open(self._model_file, "r", encoding="utf-8") as f:
-                model_data = _json.load(f)
+            model_data = compact_codec.read_file(self._model_file)
             model = self.ml_service.model
             model.weights = model_data["weights"]
             model.feature_stats = model_data.get("feature_stats", {})
@@ -113,9 +254,8 @@ class MLEnhancedReportGenerator:
             self.ml_service.train_model()
 
     def _save_model_to_disk(self):
-        """保存模型到磁盘（JSON 格式，安全序列化）"""
+        """保存模型到磁盘（紧凑二进制格式，安全序列化）"""
         try:
-            import json as _json
             model = self.ml_service.model
             model_data = {
                 "weights": model.weights,
@@ -123,9 +263,8 @@ class MLEnhancedReportGenerator:
                 "is_trained": model.is_trained,
                 "training_accuracy": model.training_accuracy,
             }
-            with open(self._model_file, "w", encoding="utf-8") as f:
-                _json.dump(model_data, f, ensure_ascii=False, indent=2)
-        except (TypeError, OSError) as e:
+            compact_codec.write_file(self._model_file, model_data)
+        except (TypeError, ValueError, OSError) as e:
             _log.warning("磁盘缓存保存失败：%s", e)
 
     # ⭐ Task 3: 异步文件写入方法
@@ -587,145 +726,22 @@ class MLEnhancedReportGenerator:
                 {f'<h3>风险因素</h3><ul>{risks_li}</ul>' if risks_li else ''}
             </div>"""
 
-        html = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{ticker} ML 增强分析 - Alpha Hive</title>
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh; padding: 20px;
-        }}
-        .container {{ max-width: 900px; margin: 0 auto; }}
-        .header {{
-            background: white; border-radius: 15px; padding: 35px;
-            margin-bottom: 25px; box-shadow: 0 10px 40px rgba(0,0,0,0.1);
-            text-align: center;
-        }}
-        .header h1 {{ font-size: 2.2em; color: #667eea; margin-bottom: 8px; }}
-        .header .rating {{
-            display: inline-block; padding: 8px 25px; border-radius: 25px;
-            color: white; font-size: 1.3em; font-weight: bold;
-            background: {rating_color}; margin: 10px 0;
-        }}
-        .section {{
-            background: white; border-radius: 12px; padding: 25px;
-            margin-bottom: 20px; box-shadow: 0 5px 20px rgba(0,0,0,0.08);
-        }}
-        .section h2 {{
-            color: #667eea; font-size: 1.4em; margin-bottom: 18px;
-            padding-bottom: 10px; border-bottom: 2px solid #f0f0f0;
-        }}
-        .section h3 {{ color: #555; margin: 15px 0 10px; font-size: 1.1em; }}
-        .grid-4 {{
-            display: grid; grid-template-columns: repeat(4, 1fr); gap: 15px;
-        }}
-        .grid-2 {{
-            display: grid; grid-template-columns: 1fr 1fr; gap: 20px;
-        }}
-        .stat {{
-            text-align: center; padding: 15px; border-radius: 10px;
-            background: linear-gradient(135deg, #f8f9fa, #fff);
-            border: 1px solid #e8e8e8;
-        }}
-        .stat .num {{ font-size: 1.8em; font-weight: bold; color: #667eea; }}
-        .stat .lbl {{ font-size: 0.85em; color: #888; margin-top: 5px; }}
-        .metric {{
-            display: flex; justify-content: space-between; align-items: center;
-            padding: 10px 0; border-bottom: 1px solid #f5f5f5;
-        }}
-        .metric-label {{ color: #666; font-weight: 500; }}
-        .metric-value {{ font-weight: bold; color: #333; }}
-        table {{
-            width: 100%; border-collapse: collapse; margin-top: 10px;
-        }}
-        th, td {{
-            padding: 10px 12px; text-align: left; border-bottom: 1px solid #eee;
-        }}
-        th {{
-            background: linear-gradient(135deg, #667eea, #764ba2);
-            color: white; font-weight: 600; font-size: 0.9em;
-        }}
-        ul {{ padding-left: 20px; margin: 10px 0; }}
-        li {{ margin: 6px 0; color: #444; line-height: 1.6; }}
-        .footer {{
-            text-align: center; color: rgba(255,255,255,0.85);
-            margin-top: 20px; font-size: 0.9em;
-        }}
-        @media (max-width: 600px) {{
-            .grid-4 {{ grid-template-columns: repeat(2, 1fr); }}
-            .grid-2 {{ grid-template-columns: 1fr; }}
-        }}
-    </style>
-</head>
-<body>
-<div class="container">
-    <!-- 头部 -->
-    <div class="header">
-        <h1>{ticker} ML 增强分析</h1>
-        <div class="rating">{rating} - {combined['action']}</div>
-        <p style="color:#888; margin-top:10px;">
-            {self.timestamp.strftime('%Y-%m-%d %H:%M')} | Alpha Hive
-        </p>
-    </div>
-
-    <!-- 核心指标 -->
-    <div class="section">
-        <h2>核心指标</h2>
-        <div class="grid-4">
-            <div class="stat">
-                <div class="num">{combined['combined_probability']:.1f}%</div>
-                <div class="lbl">综合胜率</div>
-            </div>
-            <div class="stat">
-                <div class="num">{win_prob:.1f}%</div>
-                <div class="lbl">人工分析</div>
-            </div>
-            <div class="stat">
-                <div class="num">{ml_prob_val:.1f}%</div>
-                <div class="lbl">ML 预测</div>
-            </div>
-            <div class="stat">
-                <div class="num">{risk_reward:.2f}</div>
-                <div class="lbl">风险回报比</div>
-            </div>
-        </div>
-    </div>
-
-    <!-- 蜂群智能 -->
-    {swarm_html}
-
-    <!-- 期权信号 -->
-    {options_html}
-
-    <!-- 止损止盈 -->
-    {position_html}
-
-    <!-- 投资建议 -->
-    {rec_html}
-
-    <!-- ML 特征 -->
-    {ml_html}
-
-    <!-- 免责声明 -->
-    <div class="section" style="background:#fff3cd; border:1px solid #ffc107;">
-        <p style="color:#856404; font-size:0.9em;">
-            <strong>免责声明</strong>：本报告为 AI 自动生成，不构成投资建议。
-            所有交易决策需自行判断和风控。预测存在误差，过往表现不代表未来收益。
-        </p>
-    </div>
-
-    <div class="footer">
-        <p><a href="index.html" style="color:white;">返回仪表板</a></p>
-    </div>
-</div>
-</body>
-</html>"""
-        return html
+        return _ML_REPORT_PAGE.substitute(
+            ticker=ticker,
+            rating_color=rating_color,
+            rating=rating,
+            action=combined['action'],
+            generated_at=self.timestamp.strftime('%Y-%m-%d %H:%M'),
+            combined_prob=f"{combined['combined_probability']:.1f}",
+            win_prob=f"{win_prob:.1f}",
+            ml_prob=f"{ml_prob_val:.1f}",
+            risk_reward=f"{risk_reward:.2f}",
+            swarm_html=swarm_html,
+            options_html=options_html,
+            position_html=position_html,
+            rec_html=rec_html,
+            ml_html=ml_html,
+        )
 
 
 def main():
@@ -782,28 +798,18 @@ def main():
     report_gen = MLEnhancedReportGenerator()
 
     # 加载今日蜂群扫描结果（与 markdown 报告同步）
-    swarm_data = {}
+    from result_log import AppendOnlyLog, load_swarm_results
     today_str = datetime.now().strftime("%Y-%m-%d")
-    swarm_json = report_dir / f".swarm_results_{today_str}.json"
-    if swarm_json.exists():
-        try:
-            with open(swarm_json) as f:
-                swarm_data = json.load(f)
-            _log.info("已加载蜂群扫描数据: %d 标的", len(swarm_data))
-        except (json.JSONDecodeError, OSError) as e:
-            _log.debug("蜂群 JSON 加载失败: %s", e)
-    if not swarm_data:
+    swarm_data = load_swarm_results(report_dir, today_str)
+    if swarm_data:
+        _log.info("已加载蜂群扫描数据: %d 标的", len(swarm_data))
+    else:
         # 尝试从 checkpoint 恢复
-        for ckpt in report_dir.glob(".checkpoint_*.json"):
-            try:
-                with open(ckpt) as f:
-                    ckpt_data = json.load(f)
-                    swarm_data = ckpt_data.get("results", {})
-                    if swarm_data:
-                        _log.info("从 checkpoint 加载蜂群数据: %d 标的", len(swarm_data))
-                        break
-            except (json.JSONDecodeError, OSError, KeyError) as e:
-                _log.debug("checkpoint 加载失败: %s", e)
+        for ckpt in [*report_dir.glob(".checkpoint_*.bin"), *report_dir.glob(".checkpoint_*.jsonl")]:
+            swarm_data = AppendOnlyLog(ckpt).replay()
+            if swarm_data:
+                _log.info("从 checkpoint 加载蜂群数据: %d 标的", len(swarm_data))
+                break
 
     _log.info("生成 ML 增强报告...")
     _log.info("=" * 60)
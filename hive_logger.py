@@ -9,17 +9,31 @@ Alpha Hive 统一日志 + 路径管理 + 结构化 JSON 日志
     db_path = PATHS.db
 
 结构化日志输出到 alpha_hive_structured.jsonl（每行一条 JSON）。
+
+默认为队列模式：调用线程只做消息格式化并入队（QueueHandler），控制台与两个文件 handler
+由专用写线程按批处理，每批结束统一 flush；DEBUG 日志按调用点采样，队列满时丢弃低级别日志。
+环境变量：
+    ALPHA_HIVE_LOG_QUEUE=0             关闭队列模式（handler 直接挂在 logger 上，同步写入）
+    ALPHA_HIVE_LOG_QUEUE_SIZE=10000    队列容量
+    ALPHA_HIVE_LOG_BATCH=256           写线程每批最多处理的记录数
+    ALPHA_HIVE_LOG_DEBUG_SAMPLE=10     DEBUG 采样：每个调用点超过 burst 后每 N 条保留 1 条（1 = 不采样）
+    ALPHA_HIVE_LOG_DEBUG_BURST=50      DEBUG 采样前每个调用点全量保留的条数
 """
 
+import atexit
+import copy
 import json
 import logging
 import os
+import queue
 import sys
 import threading
+import time
 import uuid
 from datetime import datetime
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, List, Optional, Tuple
 
 
 # ==================== Correlation ID (线程本地) ====================
@@ -95,21 +109,204 @@ class JSONFormatter(logging.Formatter):
 
     def format(self, record: logging.LogRecord) -> str:
         entry = {
-            "ts": datetime.utcnow().isoformat() + "Z",
+            "ts": datetime.utcfromtimestamp(record.created).isoformat() + "Z",
             "level": record.levelname,
             "logger": record.name,
             "msg": record.getMessage(),
-            "corr_id": get_correlation_id(),
+            # 队列模式下由调用线程在入队时记录（写线程的 correlation_id 不是调用方的）
+            "corr_id": getattr(record, "corr_id", None) or get_correlation_id(),
         }
         if record.exc_info and record.exc_info[0]:
             entry["exception"] = self.formatException(record.exc_info)
         return json.dumps(entry, ensure_ascii=False)
 
 
+# ==================== 队列日志管道 ====================
+
+class _DeferredFlushMixin:
+    """emit 后不立即 flush；由写线程在每批结束时调用 flush_batch() 一次落盘"""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+class _BatchStreamHandler(_DeferredFlushMixin, logging.StreamHandler):
+    pass
+
+
+class _BatchRotatingFileHandler(_DeferredFlushMixin, RotatingFileHandler):
+    pass
+
+
+class _SamplingFilter(logging.Filter):
+    """
+    按级别采样：max_level 及以下的记录按调用点（logger + 行号）计数，
+    前 burst 条全量保留，之后每 every 条保留 1 条；更高级别全部保留
+    """
+
+    def __init__(self, every: int = 10, burst: int = 50, max_level: int = logging.DEBUG):
+        super().__init__()
+        self.every = max(1, every)
+        self.burst = burst
+        self.max_level = max_level
+        self._counts: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()   # Handler.filter 在 handler 锁之外、由各日志线程并发调用
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > self.max_level or self.every <= 1:
+            return True
+        key = (record.name, record.lineno)
+        with self._lock:
+            n = self._counts.get(key, 0) + 1
+            self._counts[key] = n
+            if n <= self.burst or (n - self.burst) % self.every == 0:
+                return True
+            self.sampled_out += 1
+            return False
+
+
+class _HiveQueueHandler(QueueHandler):
+    """调用线程侧：格式化消息、记录 correlation_id 后入队；队列满时丢弃 INFO 以下，WARNING+ 最多等 1 秒"""
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 同进程队列：保留 exc_info 交给写线程格式化；args 立即展开（避免入队后被调用方修改）
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        record.corr_id = get_correlation_id()
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            return
+        except queue.Full:
+            pass
+        if record.levelno >= logging.WARNING:
+            try:
+                self.queue.put(record, timeout=1.0)
+                return
+            except queue.Full:
+                pass
+        self.dropped += 1
+
+
+class _BatchingQueueListener(QueueListener):
+    """写线程：阻塞取到一条后尽量取满一批，逐条分发给 handler，整批结束后统一 flush"""
+
+    def __init__(self, q: queue.Queue, *handlers: logging.Handler, batch_size: int = 256):
+        super().__init__(q, *handlers, respect_handler_level=True)
+        self.batch_size = max(1, batch_size)
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+    def _monitor(self):
+        q = self.queue
+        while True:
+            batch = [q.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(q.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            for record in batch:
+                if record is self._sentinel:
+                    stop = True
+                else:
+                    self.handle(record)
+            for handler in self.handlers:
+                try:
+                    getattr(handler, "flush_batch", handler.flush)()
+                except (OSError, ValueError):
+                    pass    # 流已关闭（如解释器退出 / 测试替换 stderr）：不能让写线程退出
+            for _ in batch:
+                q.task_done()
+            if stop:
+                return
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+def make_queue_pipeline(handlers: List[logging.Handler], queue_size: int = 10000, batch_size: int = 256,
+                        sample_every: int = 10, sample_burst: int = 50
+                        ) -> Tuple[_HiveQueueHandler, _BatchingQueueListener]:
+    """构建 QueueHandler（挂到 logger） + 写线程 QueueListener（已启动）"""
+    q: queue.Queue = queue.Queue(maxsize=queue_size)
+    qh = _HiveQueueHandler(q)
+    qh.addFilter(_SamplingFilter(every=sample_every, burst=sample_burst))
+    listener = _BatchingQueueListener(q, *handlers, batch_size=batch_size)
+    listener.start()
+    return qh, listener
+
+
+_queue_handler: Optional[_HiveQueueHandler] = None
+_listener: Optional[_BatchingQueueListener] = None
+
+
+def flush_logs(timeout: float = 5.0) -> bool:
+    """等待队列中的日志全部写出（同步模式直接返回 True）"""
+    if _queue_handler is None:
+        return True
+    deadline = time.monotonic() + timeout
+    while _queue_handler.queue.unfinished_tasks:
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def logging_stats() -> Dict:
+    """日志管道统计：模式、队列积压、队列满丢弃数、采样丢弃数"""
+    if _queue_handler is None:
+        return {"mode": "sync"}
+    sampler = next((f for f in _queue_handler.filters if isinstance(f, _SamplingFilter)), None)
+    return {
+        "mode": "queue",
+        "pending": _queue_handler.queue.qsize(),
+        "dropped": _queue_handler.dropped,
+        "sampled_out": sampler.sampled_out if sampler else 0,
+    }
+
+
+def _stop_listener():
+    if _listener is not None:
+        _listener.stop()
+
+
+def _restart_listener_after_fork():
+    """fork 出的子进程没有写线程：换一个新队列并重新启动写线程"""
+    global _listener
+    if _queue_handler is None or _listener is None:
+        return
+    _queue_handler.queue = queue.Queue(maxsize=_queue_handler.queue.maxsize)
+    _listener = _BatchingQueueListener(_queue_handler.queue, *_listener.handlers,
+                                       batch_size=_listener.batch_size)
+    _listener.start()
+
+
 # ==================== 日志配置 ====================
 
 def _setup_logger() -> logging.Logger:
-    """配置全局 logger：控制台（人类可读） + 文件旋转（人类可读） + JSON 文件（机器可读）"""
+    """
+    配置全局 logger：控制台（人类可读） + 文件旋转（人类可读） + JSON 文件（机器可读）
+    队列模式下三个 handler 由写线程驱动，logger 上只挂 QueueHandler
+    """
+    global _queue_handler, _listener
     log = logging.getLogger("alpha_hive")
 
     if log.handlers:
@@ -119,6 +316,11 @@ def _setup_logger() -> logging.Logger:
     level = getattr(logging, level_name, logging.INFO)
     log.setLevel(level)
 
+    queued = os.environ.get("ALPHA_HIVE_LOG_QUEUE", "1").strip().lower() not in ("0", "false", "no", "off")
+    stream_cls, file_cls = ((_BatchStreamHandler, _BatchRotatingFileHandler) if queued
+                            else (logging.StreamHandler, RotatingFileHandler))
+    handlers: List[logging.Handler] = []
+
     # 格式：时间 | 级别 | 模块 | correlation_id | 消息
     fmt = logging.Formatter(
         "%(asctime)s | %(levelname)-7s | %(name)s | %(message)s",
@@ -126,37 +328,54 @@ def _setup_logger() -> logging.Logger:
     )
 
     # 控制台输出（INFO+）
-    console = logging.StreamHandler(sys.stderr)
+    console = stream_cls(sys.stderr)
     console.setLevel(level)
     console.setFormatter(fmt)
-    log.addHandler(console)
+    handlers.append(console)
 
     # 文件输出（旋转，5MB x 3，人类可读）
     try:
         log_file = PATHS.logs_dir / "alpha_hive.log"
-        fh = RotatingFileHandler(
+        fh = file_cls(
             str(log_file), maxBytes=5 * 1024 * 1024, backupCount=3,
             encoding="utf-8"
         )
         fh.setLevel(logging.DEBUG)
         fh.setFormatter(fmt)
-        log.addHandler(fh)
+        handlers.append(fh)
     except OSError as _fh_err:
         logging.getLogger(__name__).debug("Cannot create rotating file handler: %s", _fh_err)
 
     # JSON Lines 文件输出（结构化，2MB x 5，机器可读）
     try:
         json_file = PATHS.logs_dir / "alpha_hive_structured.jsonl"
-        jh = RotatingFileHandler(
+        jh = file_cls(
             str(json_file), maxBytes=2 * 1024 * 1024, backupCount=5,
             encoding="utf-8"
         )
         jh.setLevel(logging.DEBUG)
         jh.setFormatter(JSONFormatter())
-        log.addHandler(jh)
+        handlers.append(jh)
     except OSError as _jh_err:
         logging.getLogger(__name__).debug("Cannot create JSON file handler: %s", _jh_err)
 
+    if not queued:
+        for h in handlers:
+            log.addHandler(h)
+        return log
+
+    _queue_handler, _listener = make_queue_pipeline(
+        handlers,
+        queue_size=_env_int("ALPHA_HIVE_LOG_QUEUE_SIZE", 10000),
+        batch_size=_env_int("ALPHA_HIVE_LOG_BATCH", 256),
+        sample_every=_env_int("ALPHA_HIVE_LOG_DEBUG_SAMPLE", 10),
+        sample_burst=_env_int("ALPHA_HIVE_LOG_DEBUG_BURST", 50),
+    )
+    log.addHandler(_queue_handler)
+    # 先于 logging.shutdown 执行（atexit 后注册先运行）：退出前写完队列
+    atexit.register(_stop_listener)
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=_restart_listener_after_fork)
     return log
 
 
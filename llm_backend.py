@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+🐝 Alpha Hive LLM 后端 - 可插拔 client + 离线替身（录制回放）
+
+llm_service 只依赖 Anthropic SDK 的一小部分接口：
+    client.messages.create(**kwargs)                  # 普通 / stream=True 事件流
+    client.messages.batches.create / retrieve / results / cancel
+
+凡实现这几个方法的对象都可以作为后端。本模块提供：
+
+- ReplayClient：离线替身。按请求摘要（与 llm_cache.make_key 相同）回放录制的响应，
+  未录制的请求返回中性 JSON（或按配置抛错）；可配置延迟 / 抖动 / 错误率 / 超时率，
+  用于无网络环境下以真实并发压测 distill_mode="llm_enhanced" 路径，结果确定可复现
+- RecordingClient：包装真实 client，把每次响应追加到 JSONL 录制文件
+- 录制来源：JSONL 文件，或 llm_cache 的 llm_responses.db（同一摘要，可直接回放线上缓存）
+
+选择后端：环境变量 ALPHA_HIVE_LLM_BACKEND 优先，其次 LLM_CONFIG["backend"]["type"]
+（"anthropic" / "replay"）。
+
+用法：
+    ALPHA_HIVE_LLM_BACKEND=replay python3 alpha_hive_daily_report.py --swarm --use-llm
+    client = ReplayClient(recordings="cache/llm_recordings.jsonl", latency_ms=800, error_rate=0.05)
+"""
+
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+from types import SimpleNamespace
+from typing import Dict, Iterator, List, Optional
+
+from hive_logger import PATHS, get_logger
+from llm_cache import make_key
+
+_log = get_logger("llm_backend")
+
+# 未录制请求的默认回答：覆盖 llm_service 各高级 API 的必需字段，全部取中性值
+NEUTRAL_RESPONSE = {
+    "final_score": 5.0, "direction": "neutral", "confidence": 0.5,
+    "reasoning": "离线替身响应", "key_insight": "", "risk_flag": "",
+    "sentiment_score": 5.0, "sentiment_label": "neutral", "key_theme": "",
+    "intent_score": 5.0, "intent_label": "neutral", "intent_reasoning": "", "red_flags": [],
+    "impact_score": 5.0, "impact_direction": "neutral", "impact_reasoning": "", "key_catalyst": "",
+    "smart_money_score": 5.0, "smart_money_direction": "neutral", "flow_reasoning": "", "signal_type": "none",
+    "risk_score": 5.0, "conflict_type": "coherent", "guard_reasoning": "", "recommended_action": "proceed",
+}
+
+
+def backend_name() -> str:
+    """当前配置的后端类型（"anthropic" / "replay"）"""
+    from config import LLM_CONFIG
+    return (os.environ.get("ALPHA_HIVE_LLM_BACKEND")
+            or LLM_CONFIG.get("backend", {}).get("type", "anthropic")).lower()
+
+
+def _system_text(system) -> str:
+    """system 可能是字符串或内容块列表（提示前缀缓存）"""
+    if isinstance(system, list):
+        return "".join(b.get("text", "") for b in system)
+    return system or ""
+
+
+def request_key(kwargs: Dict) -> str:
+    """messages.create 参数 → 请求摘要（与 llm_service 响应缓存的 key 一致）"""
+    messages = kwargs.get("messages") or [{}]
+    return make_key(kwargs.get("model", ""), _system_text(kwargs.get("system")),
+                    messages[-1].get("content", ""), kwargs.get("temperature", 0.3),
+                    kwargs.get("max_tokens", 1024))
+
+
+def _approx_tokens(text: str) -> int:
+    return max(1, len(text.encode("utf-8")) // 3)
+
+
+def load_recordings(path: str) -> Dict[str, Dict]:
+    """
+    读取录制：*.db 视为 llm_cache 数据库，其余按 JSONL（每行 {key, text, input_tokens, output_tokens}）
+
+    Returns:
+        {key: {"text", "input_tokens", "output_tokens"}}；文件不存在时返回空 dict
+    """
+    if not path or not os.path.exists(path):
+        return {}
+    records: Dict[str, Dict] = {}
+    if path.endswith(".db"):
+        try:
+            conn = sqlite3.connect(path, timeout=10)
+            try:
+                for key, text, tin, tout in conn.execute(
+                    "SELECT key, text, input_tokens, output_tokens FROM llm_responses"
+                ):
+                    records[key] = {"text": text, "input_tokens": tin, "output_tokens": tout}
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            _log.warning("读取 LLM 缓存录制失败 %s: %s", path, e)
+        return records
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+                records[rec["key"]] = rec
+            except (json.JSONDecodeError, KeyError, TypeError):
+                _log.debug("跳过损坏的录制行: %s", line[:80])
+    return records
+
+
+def _response(text: str, input_tokens: int, output_tokens: int) -> SimpleNamespace:
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=text)],
+        usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens,
+                              cache_creation_input_tokens=0, cache_read_input_tokens=0),
+    )
+
+
+def _stream_events(response: SimpleNamespace, delay: float, chunk_chars: int = 16) -> Iterator:
+    """把完整响应拆成 Anthropic 流式事件；delay 秒均摊到各个文本块上"""
+    text = response.content[0].text
+    chunks = [text[i:i + chunk_chars] for i in range(0, len(text), chunk_chars)] or [""]
+    yield SimpleNamespace(type="message_start", message=SimpleNamespace(
+        usage=SimpleNamespace(input_tokens=response.usage.input_tokens, output_tokens=1,
+                              cache_creation_input_tokens=0, cache_read_input_tokens=0)))
+    for chunk in chunks:
+        if delay > 0:
+            time.sleep(delay / len(chunks))
+        yield SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(type="text_delta", text=chunk))
+    yield SimpleNamespace(type="message_delta",
+                          usage=SimpleNamespace(output_tokens=response.usage.output_tokens))
+    yield SimpleNamespace(type="message_stop")
+
+
+class ReplayClient:
+    """离线替身 client（线程安全；随机性由 seed 固定）"""
+
+    def __init__(self, recordings=None, latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 error_rate: float = 0.0, timeout_rate: float = 0.0, miss: str = "neutral",
+                 seed: Optional[int] = 42):
+        """
+        Args:
+            recordings: 录制文件路径（JSONL / llm_responses.db）或 {key: record} dict
+            latency_ms: 每次请求的模拟延迟（流式时均摊到各文本块，首块前等待一半）
+            jitter_ms: 延迟的均匀抖动幅度（±）
+            error_rate: 抛 ConnectionError 的概率
+            timeout_rate: 抛 TimeoutError 的概率
+            miss: 未录制请求的处理："neutral" 返回 NEUTRAL_RESPONSE，"error" 抛 ConnectionError
+            seed: 随机种子（None = 不固定）
+        """
+        if isinstance(recordings, dict):
+            self.recordings = dict(recordings)
+        else:
+            self.recordings = load_recordings(recordings)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.miss = miss
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats = {"requests": 0, "hits": 0, "misses": 0, "errors": 0, "timeouts": 0}
+        self._batches: Dict[str, List] = {}
+        self.messages = SimpleNamespace(
+            create=self.create,
+            batches=SimpleNamespace(create=self._batch_create, retrieve=self._batch_retrieve,
+                                    results=self._batch_results, cancel=self._batch_cancel),
+        )
+
+    @classmethod
+    def from_config(cls) -> "ReplayClient":
+        """按 LLM_CONFIG["backend"]["replay"] 创建"""
+        from config import LLM_CONFIG
+        cfg = LLM_CONFIG.get("backend", {}).get("replay", {})
+        recordings = cfg.get("recordings") or str(PATHS.cache_dir / "llm_recordings.jsonl")
+        client = cls(recordings=recordings, latency_ms=cfg.get("latency_ms", 0.0),
+                     jitter_ms=cfg.get("jitter_ms", 0.0), error_rate=cfg.get("error_rate", 0.0),
+                     timeout_rate=cfg.get("timeout_rate", 0.0), miss=cfg.get("miss", "neutral"),
+                     seed=cfg.get("seed", 42))
+        _log.info("LLM 离线替身：%d 条录制 | 延迟 %sms | 错误率 %s", len(client.recordings),
+                  client.latency_ms, client.error_rate)
+        return client
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return dict(self._stats)
+
+    def _draw(self):
+        """抽取本次请求的 (延迟秒, 故障类型)"""
+        with self._lock:
+            self._stats["requests"] += 1
+            jitter = self._rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+            roll = self._rng.random()
+        fault = None
+        if roll < self.timeout_rate:
+            fault = "timeouts"
+        elif roll < self.timeout_rate + self.error_rate:
+            fault = "errors"
+        return max(0.0, self.latency_ms + jitter) / 1000.0, fault
+
+    def _lookup(self, kwargs: Dict) -> SimpleNamespace:
+        rec = self.recordings.get(request_key(kwargs))
+        with self._lock:
+            self._stats["hits" if rec else "misses"] += 1
+        if rec:
+            text = rec["text"]
+            return _response(text, rec.get("input_tokens") or 0, rec.get("output_tokens") or _approx_tokens(text))
+        if self.miss == "error":
+            raise ConnectionError("replay: 未录制的请求")
+        text = json.dumps(NEUTRAL_RESPONSE, ensure_ascii=False)
+        messages = kwargs.get("messages") or [{}]
+        prompt_tokens = _approx_tokens(_system_text(kwargs.get("system")) + messages[-1].get("content", ""))
+        return _response(text, prompt_tokens, _approx_tokens(text))
+
+    def _fail(self, fault: str, delay: float):
+        with self._lock:
+            self._stats[fault] += 1
+        if fault == "timeouts":
+            time.sleep(delay)
+            raise TimeoutError("replay: 模拟超时")
+        raise ConnectionError("replay: 模拟连接错误")
+
+    def create(self, stream: bool = False, **kwargs):
+        delay, fault = self._draw()
+        limit = kwargs.get("timeout")
+        if not fault and limit is not None and delay > limit:
+            fault, delay = "timeouts", limit
+        if fault:
+            self._fail(fault, delay)
+        response = self._lookup(kwargs)
+        if stream:
+            time.sleep(delay / 2)
+            return _stream_events(response, delay / 2)
+        time.sleep(delay)
+        return response
+
+    # ---- Message Batches API（同步完成，结果按 custom_id 返回）----
+
+    def _batch_create(self, requests: List[Dict]) -> SimpleNamespace:
+        results = []
+        for req in requests:
+            delay, fault = self._draw()
+            if fault:
+                with self._lock:
+                    self._stats[fault] += 1
+                results.append(SimpleNamespace(custom_id=req["custom_id"],
+                                               result=SimpleNamespace(type="errored")))
+                continue
+            try:
+                message = self._lookup(req["params"])
+            except ConnectionError:
+                results.append(SimpleNamespace(custom_id=req["custom_id"],
+                                               result=SimpleNamespace(type="errored")))
+                continue
+            results.append(SimpleNamespace(custom_id=req["custom_id"],
+                                           result=SimpleNamespace(type="succeeded", message=message)))
+        with self._lock:
+            batch_id = f"replay_batch_{len(self._batches) + 1}"
+            self._batches[batch_id] = results
+        return SimpleNamespace(id=batch_id, processing_status="ended")
+
+    def _batch_retrieve(self, batch_id: str) -> SimpleNamespace:
+        return SimpleNamespace(id=batch_id, processing_status="ended")
+
+    def _batch_results(self, batch_id: str) -> Iterator:
+        return iter(self._batches.get(batch_id, []))
+
+    def _batch_cancel(self, batch_id: str) -> SimpleNamespace:
+        return SimpleNamespace(id=batch_id, processing_status="ended")
+
+
+class RecordingClient:
+    """包装真实 client：每个成功响应以 {key, text, input_tokens, output_tokens} 追加到 JSONL"""
+
+    def __init__(self, inner, path: str):
+        self._inner = inner
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.messages = SimpleNamespace(create=self.create, batches=getattr(inner.messages, "batches", None))
+
+    def _write(self, key: str, text: str, input_tokens: int, output_tokens: int) -> None:
+        line = json.dumps({"key": key, "text": text, "input_tokens": input_tokens,
+                           "output_tokens": output_tokens}, ensure_ascii=False)
+        try:
+            with self._lock, open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+        except OSError as e:
+            _log.debug("LLM 录制写入失败: %s", e)
+
+    def create(self, stream: bool = False, **kwargs):
+        key = request_key(kwargs)
+        if stream:
+            return self._record_stream(key, self._inner.messages.create(stream=True, **kwargs))
+        response = self._inner.messages.create(**kwargs)
+        text = "".join(getattr(b, "text", "") for b in response.content)
+        usage = response.usage
+        self._write(key, text, usage.input_tokens, usage.output_tokens)
+        return response
+
+    def _record_stream(self, key: str, events) -> Iterator:
+        """透传事件流，结束（或调用方提前关闭）时写入已收到的完整文本"""
+        parts: List[str] = []
+        usage = {"input_tokens": 0, "output_tokens": 0}
+        completed = False
+        try:
+            for event in events:
+                kind = getattr(event, "type", "")
+                if kind == "message_start":
+                    usage["input_tokens"] = event.message.usage.input_tokens
+                elif kind == "content_block_delta":
+                    parts.append(getattr(event.delta, "text", "") or "")
+                elif kind == "message_delta":
+                    usage["output_tokens"] = event.usage.output_tokens
+                elif kind == "message_stop":
+                    completed = True
+                yield event
+        finally:
+            close = getattr(events, "close", None)
+            if close:
+                close()
+            # 提前断开的流只保留到已收文本（回放时同样在首个 JSON 对象处结束）
+            if parts:
+                text = "".join(parts)
+                self._write(key, text, usage["input_tokens"],
+                            usage["output_tokens"] if completed else _approx_tokens(text))
+
+
+def wrap_recording(client):
+    """LLM_CONFIG["backend"]["record"] 非空时用 RecordingClient 包装"""
+    from config import LLM_CONFIG
+    path = LLM_CONFIG.get("backend", {}).get("record")
+    if not path or client is None:
+        return client
+    _log.info("LLM 录制到 %s", path)
+    return RecordingClient(client, path)
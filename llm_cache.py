@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+🐝 Alpha Hive LLM 响应缓存 - 内容寻址 + 按函数 TTL + 容量上限淘汰
+
+llm_service.call() 在请求 API 前先按 (model, system, prompt, temperature, max_tokens)
+的摘要查缓存：输入不变的重跑 / 盘中增量重扫直接复用上次的回答，不再产生延迟和费用。
+
+- 持久化到 SQLite（进程池工作进程共享同一文件，WAL 模式）
+- TTL 在读取时按调用方标签（distill / news / insider ...）判断，改配置立即生效
+- 写入后按总字节数 / 条目数上限淘汰最久未使用的条目
+- 每条记录保存原始 token 用量与费用，命中时计入"节省"统计
+
+用法：
+    cache = get_llm_cache()
+    key = make_key(model, system, prompt, temperature, max_tokens)
+    hit = cache.get(key, ttl=3600)          # {"text", "input_tokens", "output_tokens", "cost_usd"} 或 None
+    cache.put(key, text, input_tokens=120, output_tokens=80, cost_usd=0.0005, tag="distill")
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+from hive_logger import PATHS, get_logger
+
+_log = get_logger("llm_cache")
+
+
+def make_key(model: str, system: str, prompt: str, temperature: float, max_tokens: int) -> str:
+    """请求内容摘要（同一请求参数 → 同一 key）"""
+    raw = json.dumps([model, system, prompt, round(float(temperature), 4), int(max_tokens)],
+                     ensure_ascii=False)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """内容寻址的 LLM 响应缓存（线程安全）"""
+
+    def __init__(self, db_path: str = None, max_bytes: int = 50 * 1024 * 1024,
+                 max_entries: int = 20000):
+        """
+        Args:
+            db_path: SQLite 文件路径（默认 <cache_dir>/llm_responses.db）
+            max_bytes: 响应文本总字节上限（超出后淘汰最久未使用的条目）
+            max_entries: 条目数上限
+        """
+        self._db_path = db_path or str(PATHS.cache_dir / "llm_responses.db")
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self._db_path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self._db_path, timeout=10)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+    def _init_db(self):
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    key TEXT PRIMARY KEY,
+                    tag TEXT,
+                    text TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    input_tokens INTEGER DEFAULT 0,
+                    output_tokens INTEGER DEFAULT 0,
+                    cost_usd REAL DEFAULT 0.0,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    hits INTEGER DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_last_used ON llm_responses(last_used)")
+            conn.commit()
+
+    def get(self, key: str, ttl: float) -> Optional[Dict]:
+        """未过期（created_at 距今 < ttl 秒）时返回缓存记录并更新最近使用时间，否则 None"""
+        if ttl <= 0:
+            return None
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT text, input_tokens, output_tokens, cost_usd, created_at "
+                    "FROM llm_responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row is None or now - row[4] >= ttl:
+                    return None
+                conn.execute("UPDATE llm_responses SET last_used = ?, hits = hits + 1 WHERE key = ?",
+                             (now, key))
+                conn.commit()
+        except sqlite3.Error as e:
+            _log.debug("LLM 缓存读取失败: %s", e)
+            return None
+        return {"text": row[0], "input_tokens": row[1], "output_tokens": row[2], "cost_usd": row[3]}
+
+    def put(self, key: str, text: str, input_tokens: int = 0, output_tokens: int = 0,
+            cost_usd: float = 0.0, tag: str = "") -> None:
+        """写入（覆盖同 key），随后按容量上限淘汰；失败只记录日志"""
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("""
+                    INSERT OR REPLACE INTO llm_responses
+                        (key, tag, text, size, input_tokens, output_tokens, cost_usd, created_at, last_used, hits)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+                """, (key, tag, text, len(text.encode("utf-8")), input_tokens, output_tokens,
+                      cost_usd, now, now))
+                self._evict_locked(conn)
+                conn.commit()
+        except sqlite3.Error as e:
+            _log.debug("LLM 缓存写入失败: %s", e)
+
+    def _evict_locked(self, conn: sqlite3.Connection) -> int:
+        """超出字节 / 条目上限时按 last_used 从旧到新删除，返回删除条数"""
+        count, total = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_responses"
+        ).fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return 0
+        removed = 0
+        for key, size in conn.execute(
+            "SELECT key, size FROM llm_responses ORDER BY last_used ASC"
+        ).fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+            count -= 1
+            total -= size
+            removed += 1
+        if removed:
+            _log.debug("LLM 缓存淘汰 %d 条", removed)
+        return removed
+
+    def purge_expired(self, max_age: float) -> int:
+        """删除创建时间早于 max_age 秒前的条目（超过最长 TTL 的记录不会再命中）"""
+        cutoff = time.time() - max_age
+        with self._lock, self._connect() as conn:
+            cur = conn.execute("DELETE FROM llm_responses WHERE created_at < ?", (cutoff,))
+            conn.commit()
+            return cur.rowcount
+
+    def stats(self) -> Dict:
+        """{"entries", "bytes", "hits"}"""
+        with self._connect() as conn:
+            count, total, hits = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(hits), 0) FROM llm_responses"
+            ).fetchone()
+        return {"entries": count, "bytes": total, "hits": hits}
+
+
+# ==================== 单例 ====================
+
+_cache: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """按 LLM_CONFIG["response_cache"] 创建进程级缓存；禁用或初始化失败时返回 None"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                from config import LLM_CONFIG
+                cfg = LLM_CONFIG.get("response_cache", {})
+                if not cfg.get("enabled", False):
+                    return None
+                try:
+                    _cache = LLMResponseCache(
+                        db_path=cfg.get("db_path"),
+                        max_bytes=cfg.get("max_bytes", 50 * 1024 * 1024),
+                        max_entries=cfg.get("max_entries", 20000),
+                    )
+                    max_ttl = max(cfg.get("ttl_seconds", {}).values(), default=0)
+                    if max_ttl > 0:
+                        _cache.purge_expired(max_ttl)
+                except (sqlite3.Error, OSError) as e:
+                    _log.warning("LLM 响应缓存初始化失败: %s", e)
+                    return None
+    return _cache
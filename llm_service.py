@@ -8,6 +8,14 @@ Alpha Hive - LLM 服务层
 - 默认使用 claude-haiku-4-5（最低成本，~$0.02/ticker）
 - 每次调用有 token 预算限制
 - 内置重试 + 超时 + 降级
+- 内容寻址响应缓存（llm_cache）：输入不变的重跑直接复用回答，命中与节省计入 get_usage()
+- 调度器（LLMDispatcher）：并发上限 + token/分钟限流 + 单次扫描美元预算（超出降级规则引擎）
+  + 超时计入 resilience.llm_breaker 熔断
+- 批量蒸馏（distill_batch）：多个标的打包为一次请求共用系统提示，或走 Message Batches API
+- 用量计费：普通输入 / 提示缓存写入 / 提示缓存读取 / 输出 token 分别按各自单价计费与统计
+- 流式 JSON 提前返回：call_json(stream=True) 边接收边扫描，首个完整 JSON 对象闭合即断开流；
+  前导非 JSON 文本过长或 schema 校验失败时立即返回 None（调用方降级规则引擎）
+- 可插拔后端（llm_backend）：ALPHA_HIVE_LLM_BACKEND=replay 时使用离线替身回放录制响应
 """
 
 import json
@@ -15,7 +23,11 @@ import logging as _logging
 import os
 import time
 import threading
-from typing import Dict, Optional, List
+from types import SimpleNamespace
+from typing import Callable, Dict, Optional, List, Tuple
+
+import tracing
+from resilience import CircuitBreaker, RateLimiter, llm_breaker
 
 _log = _logging.getLogger("alpha_hive.llm_service")
 
@@ -30,13 +42,24 @@ _token_usage = {
     "output_tokens": 0,
     "total_cost_usd": 0.0,
     "call_count": 0,
+    # 响应缓存：命中次数及因此节省的 token / 费用（不计入上面的 API 用量）
+    "cache_hits": 0,
+    "cache_saved_tokens": 0,
+    "cache_saved_usd": 0.0,
+    # 提示前缀缓存（服务端）：写入 / 读取的输入 token（不含在 input_tokens 内）及净节省
+    "prompt_cache_write_tokens": 0,
+    "prompt_cache_read_tokens": 0,
+    "prompt_cache_saved_usd": 0.0,
 }
 
-# 定价（claude-haiku-4-5）
+# 定价（claude-haiku-4-5）；cache_write = 5 分钟缓存写入（1.25× 输入价），cache_read = 缓存读取（0.1×）
 _PRICING = {
-    "claude-haiku-4-5-20251001": {"input": 1.0 / 1_000_000, "output": 5.0 / 1_000_000},
-    "claude-sonnet-4-6": {"input": 3.0 / 1_000_000, "output": 15.0 / 1_000_000},
+    "claude-haiku-4-5-20251001": {"input": 1.0 / 1_000_000, "output": 5.0 / 1_000_000,
+                                  "cache_write": 1.25 / 1_000_000, "cache_read": 0.10 / 1_000_000},
+    "claude-sonnet-4-6": {"input": 3.0 / 1_000_000, "output": 15.0 / 1_000_000,
+                          "cache_write": 3.75 / 1_000_000, "cache_read": 0.30 / 1_000_000},
 }
+_DEFAULT_PRICING = _PRICING["claude-haiku-4-5-20251001"]
 
 
 def _load_api_key() -> Optional[str]:
@@ -64,7 +87,7 @@ def _load_api_key() -> Optional[str]:
 
 
 def _get_client():
-    """获取 Anthropic client（懒加载）"""
+    """获取 LLM client（懒加载；后端见 llm_backend：anthropic 或离线替身 replay）"""
     global _client, _api_key
     if _disabled:
         return None
@@ -72,13 +95,18 @@ def _get_client():
         if _client is not None:
             return _client
 
+        import llm_backend
+        if llm_backend.backend_name() == "replay":
+            _client = llm_backend.ReplayClient.from_config()
+            return _client
+
         _api_key = _load_api_key()
         if not _api_key:
             return None
 
         try:
             import anthropic
-            _client = anthropic.Anthropic(api_key=_api_key)
+            _client = llm_backend.wrap_recording(anthropic.Anthropic(api_key=_api_key))
             return _client
         except (ImportError, ValueError, OSError) as e:
             _log.debug("Failed to initialize Anthropic client: %s", e)
@@ -95,18 +123,232 @@ def disable() -> None:
 
 
 def is_available() -> bool:
-    """检查 LLM 服务是否可用"""
+    """检查 LLM 服务是否可用（已禁用 / 本次扫描预算耗尽 / 熔断打开时为 False）"""
     if _disabled:
         return False
+    if get_dispatcher().degraded():
+        return False
     return _get_client() is not None
 
 
+# ==================== 调度器：并发 / 限流 / 预算 / 熔断 ====================
+
+class LLMDispatcher:
+    """
+    LLM 请求准入控制（进程级单例，见 get_dispatcher()）
+
+    - 并发上限：同时在途的 API 请求数（BoundedSemaphore）
+    - token/分钟：按 (输入估算 + max_tokens) 权重从令牌桶扣除
+    - 单次扫描美元预算：begin_scan() 重置；超出后本次扫描剩余调用降级为规则引擎
+    - 熔断：超时 / API 错误计入 resilience.llm_breaker，打开期间直接降级
+    """
+
+    def __init__(self, max_concurrency: int = 4, tokens_per_minute: int = 200_000,
+                 scan_budget_usd: float = 0.5, acquire_timeout: float = 60.0,
+                 breaker: CircuitBreaker = llm_breaker):
+        self.max_concurrency = max(1, max_concurrency)
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._limiter = (RateLimiter(rate=tokens_per_minute / 60.0, burst=tokens_per_minute, name="llm")
+                         if tokens_per_minute else None)
+        self.breaker = breaker
+        self.acquire_timeout = acquire_timeout
+        self.scan_budget_usd = scan_budget_usd
+        self._lock = threading.Lock()
+        self.scan_spent_usd = 0.0
+        self.rejected = {"budget": 0, "breaker": 0, "concurrency": 0, "rate": 0}
+        self._budget_warned = False
+
+    @classmethod
+    def from_config(cls) -> "LLMDispatcher":
+        from config import LLM_CONFIG
+        cfg = LLM_CONFIG.get("dispatcher", {})
+        budget = cfg.get("scan_budget_usd", 0.5) if LLM_CONFIG.get("fallback_on_budget", True) else 0
+        return cls(
+            max_concurrency=cfg.get("max_concurrency", 4),
+            tokens_per_minute=cfg.get("tokens_per_minute", 200_000),
+            scan_budget_usd=budget,
+            acquire_timeout=cfg.get("acquire_timeout_seconds", 60.0),
+        )
+
+    def begin_scan(self, budget_usd: Optional[float] = None) -> None:
+        """开始新一次扫描：清零本次花费（budget_usd 非空时覆盖预算；0 = 不限）"""
+        with self._lock:
+            if budget_usd is not None:
+                self.scan_budget_usd = budget_usd
+            self.scan_spent_usd = 0.0
+            self._budget_warned = False
+
+    def over_budget(self) -> bool:
+        with self._lock:
+            return bool(self.scan_budget_usd) and self.scan_spent_usd >= self.scan_budget_usd
+
+    def degraded(self) -> bool:
+        """当前是否应直接走规则引擎（预算耗尽或熔断打开）"""
+        return self.over_budget() or self.breaker.state == CircuitBreaker.OPEN
+
+    def _reject(self, reason: str) -> None:
+        with self._lock:
+            self.rejected[reason] += 1
+            warn = reason != "budget" or not self._budget_warned
+            if reason == "budget":
+                self._budget_warned = True
+        if warn:
+            _log.warning("LLM 请求降级为规则引擎（%s）", reason)
+
+    def admit(self, estimated_tokens: int) -> bool:
+        """申请一次 API 调用：通过后必须调用 release()"""
+        if self.over_budget():
+            self._reject("budget")
+            return False
+        if not self.breaker.allow_request():
+            self._reject("breaker")
+            return False
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            self._reject("concurrency")
+            return False
+        if self._limiter and not self._limiter.acquire(timeout=self.acquire_timeout,
+                                                       tokens=estimated_tokens):
+            self._slots.release()
+            self._reject("rate")
+            return False
+        return True
+
+    def release(self, cost_usd: float = 0.0, latency: Optional[float] = None, ok: bool = True) -> None:
+        """结束一次 API 调用：释放并发槽位，记录花费与熔断结果"""
+        self._slots.release()
+        with self._lock:
+            self.scan_spent_usd += cost_usd
+        if ok:
+            self.breaker.record_success(latency)
+        else:
+            self.breaker.record_failure(latency)
+
+    def charge(self, cost_usd: float) -> None:
+        """计入不经本调度器准入的花费（如进程池工作进程的 LLM 调用）"""
+        with self._lock:
+            self.scan_spent_usd += cost_usd
+
+    def split_budget(self, parts: int) -> Optional[float]:
+        """
+        把本次扫描剩余预算均分为 parts 份（进程池工作进程各持一份）
+
+        Returns:
+            每份预算；不限预算时为 0；预算已耗尽时为 None（工作进程应禁用 LLM，
+            不能传 0——begin_scan(0) 表示不限）
+        """
+        with self._lock:
+            if not self.scan_budget_usd:
+                return 0
+            remaining = self.scan_budget_usd - self.scan_spent_usd
+        return remaining / max(1, parts) if remaining > 0 else None
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "scan_spent_usd": round(self.scan_spent_usd, 6),
+                "scan_budget_usd": self.scan_budget_usd,
+                "rejected": dict(self.rejected),
+                "breaker": self.breaker.state,
+            }
+
+
+_dispatcher: Optional[LLMDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_dispatcher() -> LLMDispatcher:
+    """获取进程级 LLM 调度器（按 LLM_CONFIG["dispatcher"] 创建）"""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                _dispatcher = LLMDispatcher.from_config()
+    return _dispatcher
+
+
+def begin_scan(budget_usd: Optional[float] = None) -> None:
+    """扫描开始时调用：重置本次扫描的美元预算计数"""
+    get_dispatcher().begin_scan(budget_usd)
+
+
+def _estimate_tokens(system: str, prompt: str, max_tokens: int) -> int:
+    """请求 token 上界估算（中文约 1 字/token，英文更少；输出按 max_tokens 计）"""
+    return len(system) + len(prompt) + max_tokens
+
+
+def _api_errors() -> tuple:
+    """API 调用可能抛出的异常（含 anthropic SDK 的 APIError / 超时）"""
+    errors = (ConnectionError, TimeoutError, OSError, ValueError)
+    try:
+        import anthropic
+        return errors + (anthropic.APIError,)
+    except (ImportError, AttributeError):
+        return errors
+
+
 def get_usage() -> Dict:
     """获取 token 使用统计"""
     with _lock:
         return dict(_token_usage)
 
 
+def merge_usage(usage: Dict) -> None:
+    """合并外部（如进程池工作进程）产生的 token 使用统计，并把其花费计入本次扫描预算"""
+    with _lock:
+        for k in _token_usage:
+            _token_usage[k] += usage.get(k, 0)
+    get_dispatcher().charge(usage.get("total_cost_usd", 0.0))
+
+
+def _cache_ttl(tag: str) -> float:
+    """调用方标签对应的缓存 TTL（秒），未配置时取 "default"（0 = 不缓存）"""
+    from config import LLM_CONFIG
+    ttls = LLM_CONFIG.get("response_cache", {}).get("ttl_seconds", {})
+    return ttls.get(tag, ttls.get("default", 0))
+
+
+def _record_usage(model: str, usage, discount: float = 1.0) -> Tuple[float, int]:
+    """
+    按模型单价计入一次响应的用量（普通输入 / 缓存写入 / 缓存读取 / 输出分别计价）
+
+    Returns:
+        (费用 USD, 全部输入 token 数)
+    """
+    pricing = _PRICING.get(model, _DEFAULT_PRICING)
+    cache_write = getattr(usage, "cache_creation_input_tokens", 0) or 0
+    cache_read = getattr(usage, "cache_read_input_tokens", 0) or 0
+    cost = (usage.input_tokens * pricing["input"]
+            + cache_write * pricing["cache_write"]
+            + cache_read * pricing["cache_read"]
+            + usage.output_tokens * pricing["output"]) * discount
+    # 相对不缓存（全部按输入价）的净节省：读取省下的减去写入多付的
+    saved = (cache_read * (pricing["input"] - pricing["cache_read"])
+             - cache_write * (pricing["cache_write"] - pricing["input"])) * discount
+    with _lock:
+        _token_usage["input_tokens"] += usage.input_tokens
+        _token_usage["output_tokens"] += usage.output_tokens
+        _token_usage["prompt_cache_write_tokens"] += cache_write
+        _token_usage["prompt_cache_read_tokens"] += cache_read
+        _token_usage["prompt_cache_saved_usd"] += saved
+        _token_usage["total_cost_usd"] += cost
+        _token_usage["call_count"] += 1
+    return cost, usage.input_tokens + cache_write + cache_read
+
+
+def _cache_lookup(store, key: str, ttl: float, tag: str) -> Optional[str]:
+    """查响应缓存，命中时计入节省统计并返回文本"""
+    hit = store.get(key, ttl)
+    if hit is None:
+        tracing.event("cache.llm.miss", tag=tag)
+        return None
+    tracing.event("cache.llm.hit", tag=tag)
+    with _lock:
+        _token_usage["cache_hits"] += 1
+        _token_usage["cache_saved_tokens"] += hit["input_tokens"] + hit["output_tokens"]
+        _token_usage["cache_saved_usd"] += hit["cost_usd"]
+    return hit["text"]
+
+
 def call(
     prompt: str,
     system: str = "",
@@ -114,6 +356,8 @@ def call(
     max_tokens: int = 1024,
     temperature: float = 0.3,
     timeout: float = 30.0,
+    cache: str = "default",
+    stream: bool = False,
 ) -> Optional[str]:
     """
     调用 Claude API
@@ -125,6 +369,8 @@ def call(
         max_tokens: 最大输出 token
         temperature: 温度 (0-1)
         timeout: 超时秒数
+        cache: 响应缓存标签（决定 TTL，见 LLM_CONFIG["response_cache"]["ttl_seconds"]）
+        stream: 流式接收，首个完整 JSON 对象闭合即返回该对象文本（见 _JSONObjectScanner）
 
     Returns:
         模型输出文本，失败返回 None
@@ -133,6 +379,24 @@ def call(
     if client is None:
         return None
 
+    # 响应缓存：相同请求在 TTL 内直接复用
+    from llm_cache import get_llm_cache, make_key
+    ttl = _cache_ttl(cache)
+    store = get_llm_cache() if ttl > 0 else None
+    key = make_key(model, system, prompt, temperature, max_tokens) if store else None
+    if store:
+        text = _cache_lookup(store, key, ttl, cache)
+        if text is not None:
+            return text
+
+    # 调度器准入：预算 / 熔断 / 并发 / token 限流，未通过时返回 None（调用方降级规则引擎）
+    dispatcher = get_dispatcher()
+    if not dispatcher.admit(_estimate_tokens(system, prompt, max_tokens)):
+        return None
+
+    started = time.monotonic()
+    cost = 0.0
+    ok = False
     try:
         messages = [{"role": "user", "content": prompt}]
 
@@ -141,34 +405,41 @@ def call(
             "max_tokens": max_tokens,
             "messages": messages,
             "temperature": temperature,
+            "timeout": timeout,
         }
         if system:
             kwargs["system"] = system
 
-        response = client.messages.create(**kwargs)
+        if stream:
+            with tracing.span("llm.call", model=model, stream=True):
+                text, usage = _stream_json_text(client, kwargs)
+        else:
+            with tracing.span("llm.call", model=model):
+                response = client.messages.create(**kwargs)
 
-        # 提取文本
-        text = ""
-        for block in response.content:
-            if hasattr(block, "text"):
-                text += block.text
+            # 提取文本
+            text = ""
+            for block in response.content:
+                if hasattr(block, "text"):
+                    text += block.text
+            usage = response.usage
 
         # 追踪用量
-        usage = response.usage
-        pricing = _PRICING.get(model, {"input": 1.0 / 1_000_000, "output": 5.0 / 1_000_000})
-        cost = usage.input_tokens * pricing["input"] + usage.output_tokens * pricing["output"]
-
-        with _lock:
-            _token_usage["input_tokens"] += usage.input_tokens
-            _token_usage["output_tokens"] += usage.output_tokens
-            _token_usage["total_cost_usd"] += cost
-            _token_usage["call_count"] += 1
+        cost, input_total = _record_usage(model, usage)
+        ok = True
+        if text is None:
+            return None
 
+        if store and text:
+            store.put(key, text, input_tokens=input_total, output_tokens=usage.output_tokens,
+                      cost_usd=cost, tag=cache)
         return text
 
-    except (ConnectionError, TimeoutError, OSError, ValueError) as e:
+    except _api_errors() as e:
         _log.error("LLM API call failed: %s", e, exc_info=True)
         return None
+    finally:
+        dispatcher.release(cost, time.monotonic() - started, ok)
 
 
 def call_json(
@@ -177,17 +448,143 @@ def call_json(
     model: str = "claude-haiku-4-5-20251001",
     max_tokens: int = 1024,
     temperature: float = 0.2,
+    cache: str = "default",
+    stream: Optional[bool] = None,
+    validate: Optional[Callable[[Dict], Optional[Dict]]] = None,
 ) -> Optional[Dict]:
     """
     调用 Claude API 并解析 JSON 响应
 
+    Args:
+        stream: 流式提前返回；None 时按 LLM_CONFIG["streaming"]（启用且 cache 标签在 tags 中）
+        validate: schema 校验函数（返回规范化结果，不合法返回 None）
+
     Returns:
-        解析后的 dict，失败返回 None
+        解析（并校验）后的 dict，失败返回 None
     """
-    text = call(prompt, system=system, model=model, max_tokens=max_tokens, temperature=temperature)
+    if stream is None:
+        from config import LLM_CONFIG
+        cfg = LLM_CONFIG.get("streaming", {})
+        stream = cfg.get("enabled", False) and cache in cfg.get("tags", ())
+    text = call(prompt, system=system, model=model, max_tokens=max_tokens, temperature=temperature,
+                cache=cache, stream=stream)
     if text is None:
         return None
+    data = _parse_json(text)
+    if data is None or validate is None:
+        return data
+    result = validate(data)
+    if result is None:
+        _log.warning("LLM JSON 未通过 schema 校验（%s），降级规则引擎", cache)
+    return result
+
+
+class _JSONObjectScanner:
+    """
+    增量扫描流式文本，定位第一个顶层 JSON 对象的闭合位置（跳过字符串内的括号与转义）
+
+    feed() 返回 True 表示对象已完整；首个 "{" 之前的前导文本超过 max_preamble 个字符时
+    置 failed（模型没有按要求输出 JSON，无需再等）。
+    """
+
+    def __init__(self, max_preamble: int = 400):
+        self.max_preamble = max_preamble
+        self._chunks: List[str] = []
+        self._length = 0
+        self.start = -1
+        self.end = -1
+        self.failed = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    @property
+    def complete(self) -> bool:
+        return self.end >= 0
+
+    def feed(self, chunk: str) -> bool:
+        offset = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        for i, ch in enumerate(chunk):
+            if self.start < 0:
+                if ch == "{":
+                    self.start = offset + i
+                    self._depth = 1
+                elif offset + i >= self.max_preamble:
+                    self.failed = True
+                    return False
+                continue
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif ch == "\\":
+                    self._escaped = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == "{":
+                self._depth += 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._depth == 0:
+                    self.end = offset + i + 1
+                    return True
+        return False
+
+    def result(self) -> Optional[str]:
+        """完整对象文本；未闭合时返回全部已收文本（交给 _parse_json 兜底），前导过长返回 None"""
+        if self.failed:
+            return None
+        text = self.text
+        return text[self.start:self.end] if self.complete else text
+
+
+def _stream_json_text(client, kwargs: Dict) -> Tuple[Optional[str], SimpleNamespace]:
+    """
+    流式请求：首个 JSON 对象闭合或判定失败即关闭流
 
+    Returns:
+        (对象文本或 None, 用量)；提前断开时输出 token 按已收文本估算
+    """
+    from config import LLM_CONFIG
+    scanner = _JSONObjectScanner(LLM_CONFIG.get("streaming", {}).get("max_preamble_chars", 400))
+    usage = SimpleNamespace(input_tokens=0, output_tokens=0,
+                            cache_creation_input_tokens=0, cache_read_input_tokens=0)
+    events = client.messages.create(stream=True, **kwargs)
+    try:
+        for event in events:
+            kind = getattr(event, "type", "")
+            if kind == "message_start":
+                start_usage = event.message.usage
+                for field in vars(usage):
+                    setattr(usage, field, getattr(start_usage, field, 0) or 0)
+            elif kind == "content_block_delta":
+                text = getattr(event.delta, "text", None)
+                if text and (scanner.feed(text) or scanner.failed):
+                    break
+            elif kind == "message_delta":
+                usage.output_tokens = getattr(event.usage, "output_tokens", 0) or usage.output_tokens
+    finally:
+        close = getattr(events, "close", None)
+        if close:
+            close()
+    if scanner.complete or scanner.failed:
+        tracing.event("llm.stream.early_exit", failed=scanner.failed)
+        # 提前断开收不到 message_delta 的最终计数：按 UTF-8 字节 / 3 粗估
+        usage.output_tokens = max(usage.output_tokens, len(scanner.text.encode("utf-8")) // 3)
+    if scanner.failed:
+        _log.warning("LLM 流式响应前导文本超过 %d 字符仍无 JSON，提前终止", scanner.max_preamble)
+    return scanner.result(), usage
+
+
+def _parse_json(text: str) -> Optional[Dict]:
+    """从模型输出中提取 JSON（整体 / markdown code block / 首尾花括号），失败返回 None"""
     # 尝试提取 JSON
     try:
         return json.loads(text)
@@ -217,36 +614,7 @@ def call_json(
 
 # ==================== 高级 API：蜂群专用 ====================
 
-def distill_with_reasoning(
-    ticker: str,
-    agent_results: List[Dict],
-    dim_scores: Dict,
-    resonance: Dict,
-    rule_score: float,
-    rule_direction: str,
-) -> Optional[Dict]:
-    """
-    QueenDistiller LLM 蒸馏：基于 6 Agent 的结构化数据，用 Claude 做最终推理
-
-    Args:
-        ticker: 股票代码
-        agent_results: 6 个 Agent 的分析结果
-        dim_scores: 5 维评分 {signal: x, catalyst: x, ...}
-        resonance: 共振检测结果
-        rule_score: 规则引擎计算的基础分
-        rule_direction: 规则引擎计算的方向
-
-    Returns:
-        {
-            "final_score": float,      # LLM 调整后的最终分
-            "direction": str,          # LLM 判断的方向
-            "reasoning": str,          # 中文推理链
-            "key_insight": str,        # 核心洞察（一句话）
-            "risk_flag": str,          # 风险标记
-            "confidence": float,       # 0-1 置信度
-        }
-    """
-    system = """你是 Alpha Hive 的 QueenDistiller（最终蒸馏蜂）。
+_DISTILL_SYSTEM = """你是 Alpha Hive 的 QueenDistiller（最终蒸馏蜂）。
 你的任务是基于 6 个专业 Agent 的分析结果，做出最终投资机会评估。
 
 输出要求：
@@ -264,7 +632,24 @@ def distill_with_reasoning(
 - 对数据质量低的维度降权
 - 给出规则引擎无法做到的定性判断"""
 
-    # 构建 Agent 摘要
+# 打包模式：多个标的共用一次请求与一份系统提示
+_DISTILL_BATCH_SYSTEM = _DISTILL_SYSTEM + """
+
+本次请求包含多个标的，请逐个独立评估（标的之间互不影响），输出：
+{"results": {"<TICKER>": {final_score, direction, reasoning, key_insight, risk_flag, confidence}, ...}}
+每个标的都必须出现在 results 中，键为原样的股票代码。"""
+
+_DIRECTIONS = ("bullish", "bearish", "neutral")
+
+
+def _distill_context(
+    agent_results: List[Dict],
+    dim_scores: Dict,
+    resonance: Dict,
+    rule_score: float,
+    rule_direction: str,
+) -> str:
+    """单个标的的蒸馏输入（Agent 摘要 + 5 维评分 + 共振 + 规则引擎基础分）"""
     agent_summaries = []
     for r in agent_results:
         if r and "error" not in r:
@@ -279,9 +664,7 @@ def distill_with_reasoning(
                 "data_real_pct": f"{real_pct:.0f}%",
             })
 
-    prompt = f"""分析 **{ticker}** 的投资机会。
-
-## 6 Agent 分析结果
+    return f"""## 6 Agent 分析结果
 {json.dumps(agent_summaries, ensure_ascii=False, indent=2)}
 
 ## 5 维评分
@@ -294,14 +677,222 @@ def distill_with_reasoning(
 
 ## 规则引擎基础分
 - 评分: {rule_score}/10
-- 方向: {rule_direction}
+- 方向: {rule_direction}"""
+
+
+def _distill_prompt(ticker: str, **context) -> str:
+    return f"""分析 **{ticker}** 的投资机会。
+
+{_distill_context(**context)}
 
 请输出 JSON："""
 
-    result = call_json(prompt, system=system, max_tokens=512, temperature=0.3)
+
+def distill_with_reasoning(
+    ticker: str,
+    agent_results: List[Dict],
+    dim_scores: Dict,
+    resonance: Dict,
+    rule_score: float,
+    rule_direction: str,
+) -> Optional[Dict]:
+    """
+    QueenDistiller LLM 蒸馏：基于 6 Agent 的结构化数据，用 Claude 做最终推理
+
+    Args:
+        ticker: 股票代码
+        agent_results: 6 个 Agent 的分析结果
+        dim_scores: 5 维评分 {signal: x, catalyst: x, ...}
+        resonance: 共振检测结果
+        rule_score: 规则引擎计算的基础分
+        rule_direction: 规则引擎计算的方向
+
+    Returns:
+        {
+            "final_score": float,      # LLM 调整后的最终分
+            "direction": str,          # LLM 判断的方向
+            "reasoning": str,          # 中文推理链
+            "key_insight": str,        # 核心洞察（一句话）
+            "risk_flag": str,          # 风险标记
+            "confidence": float,       # 0-1 置信度
+        }
+    """
+    prompt = _distill_prompt(ticker, agent_results=agent_results, dim_scores=dim_scores,
+                             resonance=resonance, rule_score=rule_score, rule_direction=rule_direction)
+    result = call_json(prompt, system=_DISTILL_SYSTEM, max_tokens=512, temperature=0.3, cache="distill",
+                       validate=validate_distill)
     return result
 
 
+def validate_distill(result) -> Optional[Dict]:
+    """
+    校验单个标的的蒸馏结果：final_score 为 0-10 数值、direction 合法，否则返回 None；
+    confidence 截断到 0-1，文本字段转为字符串
+    """
+    if not isinstance(result, dict):
+        return None
+    score = result.get("final_score")
+    if isinstance(score, bool) or not isinstance(score, (int, float)) or not 0.0 <= score <= 10.0:
+        return None
+    direction = result.get("direction")
+    if direction not in _DIRECTIONS:
+        return None
+    try:
+        confidence = max(0.0, min(1.0, float(result.get("confidence", 0.5))))
+    except (TypeError, ValueError):
+        confidence = 0.5
+    return {
+        "final_score": float(score),
+        "direction": direction,
+        "reasoning": str(result.get("reasoning") or ""),
+        "key_insight": str(result.get("key_insight") or ""),
+        "risk_flag": str(result.get("risk_flag") or ""),
+        "confidence": confidence,
+    }
+
+
+def distill_batch(items: List[Dict], mode: Optional[str] = None) -> Dict[str, Optional[Dict]]:
+    """
+    批量蒸馏：多个标的合并提交，结果按 ticker 拆回并逐个校验
+
+    Args:
+        items: [{ticker, agent_results, dim_scores, resonance, rule_score, rule_direction}, ...]
+        mode: "packed"（每 batch_size 个标的打包成一次请求，共用系统提示）或
+              "batch_api"（提交 Message Batches API，半价但异步，适合非实时的夜间扫描）；
+              None 时读取 LLM_CONFIG["batch_distill"]["mode"]
+
+    Returns:
+        {ticker: validate_distill() 结果或 None}；打包结果缺失/非法的标的按配置回退单独请求
+    """
+    from config import LLM_CONFIG
+    cfg = LLM_CONFIG.get("batch_distill", {})
+    mode = mode or cfg.get("mode", "packed")
+    results: Dict[str, Optional[Dict]] = {item["ticker"]: None for item in items}
+    if not items:
+        return results
+
+    if mode == "batch_api":
+        results.update(_distill_via_batch_api(items, cfg))
+    else:
+        size = max(1, cfg.get("batch_size", 8))
+        for i in range(0, len(items), size):
+            results.update(_distill_packed(items[i:i + size], cfg.get("max_tokens_per_ticker", 400)))
+
+    missing = [item for item in items if results[item["ticker"]] is None]
+    if missing and cfg.get("fallback_single", True) and is_available():
+        _log.info("批量蒸馏 %d/%d 标的结果缺失或非法，回退单独请求", len(missing), len(items))
+        for item in missing:
+            context = {k: v for k, v in item.items() if k != "ticker"}
+            results[item["ticker"]] = distill_with_reasoning(item["ticker"], **context)
+    return results
+
+
+def _distill_packed(items: List[Dict], max_tokens_per_ticker: int) -> Dict[str, Optional[Dict]]:
+    """一次请求蒸馏多个标的，返回 {ticker: 校验后的结果或 None}"""
+    sections = []
+    for item in items:
+        context = {k: v for k, v in item.items() if k != "ticker"}
+        sections.append(f"# {item['ticker']}\n\n{_distill_context(**context)}")
+    tickers = [item["ticker"] for item in items]
+    prompt = (f"分析以下 {len(items)} 个标的的投资机会：{', '.join(tickers)}\n\n"
+              + "\n\n".join(sections) + "\n\n请输出 JSON：")
+
+    with tracing.span("llm.distill_packed", tickers=len(items)):
+        data = call_json(prompt, system=_DISTILL_BATCH_SYSTEM, max_tokens=max_tokens_per_ticker * len(items) + 64,
+                         temperature=0.3, cache="distill")
+    raw = data.get("results") if isinstance(data, dict) else None
+    if isinstance(raw, list):
+        raw = {r.get("ticker"): r for r in raw if isinstance(r, dict)}
+    if not isinstance(raw, dict):
+        raw = {}
+    by_upper = {str(k).upper(): v for k, v in raw.items()}
+    return {t: validate_distill(raw.get(t, by_upper.get(t.upper()))) for t in tickers}
+
+
+def _distill_via_batch_api(items: List[Dict], cfg: Dict) -> Dict[str, Optional[Dict]]:
+    """
+    Message Batches API：每个标的一条与单独蒸馏完全相同的请求（共享响应缓存），
+    一次提交后轮询至结束；超过 max_wait_seconds 时取消并返回已有结果
+    """
+    from config import LLM_CONFIG
+    from llm_cache import get_llm_cache, make_key
+    client = _get_client()
+    out: Dict[str, Optional[Dict]] = {}
+    if client is None:
+        return out
+
+    model = LLM_CONFIG.get("model", "claude-haiku-4-5-20251001")
+    ttl = _cache_ttl("distill")
+    store = get_llm_cache() if ttl > 0 else None
+    # custom_id 只允许 [A-Za-z0-9_-]，ticker 可能含 "."（BRK.B），用序号映射回来
+    requests, keys, ids = [], {}, {}
+    for i, item in enumerate(items):
+        context = {k: v for k, v in item.items() if k != "ticker"}
+        prompt = _distill_prompt(item["ticker"], **context)
+        key = make_key(model, _DISTILL_SYSTEM, prompt, 0.3, 512) if store else None
+        if store:
+            text = _cache_lookup(store, key, ttl, "distill")
+            if text is not None:
+                out[item["ticker"]] = validate_distill(_parse_json(text))
+                continue
+        ids[f"t{i}"] = item["ticker"]
+        keys[item["ticker"]] = key
+        requests.append({
+            "custom_id": f"t{i}",
+            "params": {
+                "model": model, "max_tokens": 512, "temperature": 0.3,
+                "system": _DISTILL_SYSTEM,
+                "messages": [{"role": "user", "content": prompt}],
+            },
+        })
+    if not requests:
+        return out
+
+    dispatcher = get_dispatcher()
+    est = sum(_estimate_tokens(_DISTILL_SYSTEM, r["params"]["messages"][0]["content"], 512) for r in requests)
+    if not dispatcher.admit(est):
+        return out
+
+    discount = cfg.get("batch_api_discount", 0.5)
+    started = time.monotonic()
+    cost = 0.0
+    ok = False
+    try:
+        with tracing.span("llm.distill_batch_api", tickers=len(requests)):
+            batch = client.messages.batches.create(requests=requests)
+            deadline = time.monotonic() + cfg.get("max_wait_seconds", 1800)
+            while batch.processing_status != "ended":
+                if time.monotonic() >= deadline:
+                    _log.warning("Batch API 蒸馏超时（%s），取消并回退", batch.id)
+                    client.messages.batches.cancel(batch.id)
+                    return out
+                time.sleep(cfg.get("poll_seconds", 10))
+                batch = client.messages.batches.retrieve(batch.id)
+
+            for entry in client.messages.batches.results(batch.id):
+                if getattr(entry.result, "type", "") != "succeeded":
+                    continue
+                ticker = ids.get(entry.custom_id)
+                if ticker is None:
+                    continue
+                message = entry.result.message
+                text = "".join(b.text for b in message.content if hasattr(b, "text"))
+                usage = message.usage
+                item_cost, input_total = _record_usage(model, usage, discount)
+                cost += item_cost
+                if store and text:
+                    store.put(keys[ticker], text, input_tokens=input_total,
+                              output_tokens=usage.output_tokens, cost_usd=item_cost, tag="distill")
+                out[ticker] = validate_distill(_parse_json(text))
+        ok = True
+        return out
+    except _api_errors() as e:
+        _log.error("Batch API 蒸馏失败: %s", e, exc_info=True)
+        return out
+    finally:
+        dispatcher.release(cost, time.monotonic() - started, ok)
+
+
 def analyze_news_sentiment(
     ticker: str,
     headlines: List[str],
@@ -330,7 +921,7 @@ def analyze_news_sentiment(
     titles_text = "\n".join(f"- {h}" for h in headlines[:15])
     prompt = f"分析 {ticker} 的以下新闻标题情绪：\n\n{titles_text}\n\n输出 JSON："
 
-    return call_json(prompt, system=system, max_tokens=256, temperature=0.2)
+    return call_json(prompt, system=system, max_tokens=256, temperature=0.2, cache="news")
 
 
 # ==================== Agent 内部 LLM 推理（P1 升级）====================
@@ -385,7 +976,7 @@ def interpret_insider_trades(
 
 输出 JSON："""
 
-    return call_json(prompt, system=system, max_tokens=300, temperature=0.2)
+    return call_json(prompt, system=system, max_tokens=300, temperature=0.2, cache="insider")
 
 
 def interpret_catalyst_impact(
@@ -435,7 +1026,7 @@ def interpret_catalyst_impact(
 
 输出 JSON："""
 
-    return call_json(prompt, system=system, max_tokens=256, temperature=0.2)
+    return call_json(prompt, system=system, max_tokens=256, temperature=0.2, cache="catalyst")
 
 
 def interpret_options_flow(
@@ -485,7 +1076,7 @@ def interpret_options_flow(
 
 输出 JSON："""
 
-    return call_json(prompt, system=system, max_tokens=256, temperature=0.2)
+    return call_json(prompt, system=system, max_tokens=256, temperature=0.2, cache="options")
 
 
 def synthesize_agent_conflicts(
@@ -543,4 +1134,4 @@ def synthesize_agent_conflicts(
 
 输出 JSON："""
 
-    return call_json(prompt, system=system, max_tokens=256, temperature=0.2)
+    return call_json(prompt, system=system, max_tokens=256, temperature=0.2, cache="conflicts")
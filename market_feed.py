@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+🐝 Alpha Hive 共享行情源 - 批量轮询 + 内存环形缓冲 + 向量化指标
+
+替代"每轮随机抽 1-2 个标的、逐个 yf.Ticker().history() 后丢弃 bar"的做法：
+- 每轮一次 yf.download 批量拉取全部标的（首轮 1 个月，之后只拉最近 5 天增量）
+- 日 bar 写入每个标的的定长环形缓冲（同一交易日的盘中 bar 原地更新）
+- snapshot() 把全部标的右对齐成矩阵，一次性向量化计算涨跌幅 / 量比 / 动量 / 波动率
+- stock_data() 产出与 swarm_agents._fetch_stock_data 相同的字段，供蜂群预取复用
+
+用法：
+    feed = get_market_feed()
+    feed.poll(["NVDA", "TSLA"])
+    snap = feed.snapshot(["NVDA", "TSLA"])   # {"tickers": [...], "change_pct": ndarray, ...}
+    data = feed.stock_data("NVDA", max_age=120)
+"""
+
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from hive_logger import get_logger
+from resilience import rate_limit_signal, throttle_errors, yfinance_breaker, yfinance_limiter
+
+_log = get_logger("market_feed")
+
+# 环形缓冲容量（日 bar）：覆盖 20 日均量 / 20 日波动率所需窗口
+RING_CAPACITY = 32
+# 缓冲区 bar 少于该数量时按 1 个月拉取，否则只拉 5 天增量
+_FULL_HISTORY_BARS = 21
+
+
+class BarRing:
+    """单个标的的定长日 bar 环形缓冲（ts / close / volume）"""
+
+    def __init__(self, capacity: int = RING_CAPACITY):
+        self.capacity = capacity
+        self.ts = np.zeros(capacity)
+        self.close = np.full(capacity, np.nan)
+        self.volume = np.full(capacity, np.nan)
+        self.head = 0      # 下一个写入位置
+        self.count = 0
+
+    def _last(self) -> int:
+        return (self.head - 1) % self.capacity
+
+    def upsert(self, ts: float, close: float, volume: float) -> None:
+        """追加新 bar；与最新 bar 同一时间戳时原地更新（盘中 bar），更早的 bar 忽略"""
+        if self.count:
+            last_ts = self.ts[self._last()]
+            if ts == last_ts:
+                self.close[self._last()] = close
+                self.volume[self._last()] = volume
+                return
+            if ts < last_ts:
+                return
+        self.ts[self.head] = ts
+        self.close[self.head] = close
+        self.volume[self.head] = volume
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def window(self, n: int):
+        """最近 n 个 bar（时间正序），不足时左侧以 NaN 填充 → (close, volume)"""
+        n = min(n, self.capacity)
+        close = np.full(n, np.nan)
+        volume = np.full(n, np.nan)
+        k = min(n, self.count)
+        if k:
+            idx = (self.head - k + np.arange(k)) % self.capacity
+            close[n - k:] = self.close[idx]
+            volume[n - k:] = self.volume[idx]
+        return close, volume
+
+
+def _nanmean(m: np.ndarray) -> np.ndarray:
+    """逐行 nanmean（全 NaN 行返回 NaN，不发 RuntimeWarning）"""
+    valid = ~np.isnan(m)
+    cnt = valid.sum(axis=1)
+    total = np.where(valid, m, 0.0).sum(axis=1)
+    return np.divide(total, cnt, out=np.full(len(m), np.nan), where=cnt > 0)
+
+
+class MarketFeed:
+    """共享行情源：批量轮询写入环形缓冲，按需向量化计算指标（线程安全）"""
+
+    def __init__(self, capacity: int = RING_CAPACITY):
+        self.capacity = capacity
+        self._rings: Dict[str, BarRing] = {}
+        self._updated: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.polls = 0
+
+    # ==================== 写入 ====================
+
+    def ingest(self, ticker: str, timestamps, closes, volumes) -> None:
+        """写入一批日 bar（时间正序；NaN 收盘价被跳过）"""
+        ticker = ticker.upper()
+        with self._lock:
+            ring = self._rings.get(ticker)
+            if ring is None:
+                ring = self._rings[ticker] = BarRing(self.capacity)
+            for ts, c, v in zip(timestamps, closes, volumes):
+                if c is None or math.isnan(c):
+                    continue
+                ring.upsert(float(ts), float(c), float(v) if v is not None and not math.isnan(v) else 0.0)
+            self._updated[ticker] = time.time()
+
+    def poll(self, tickers: Iterable[str]) -> List[str]:
+        """
+        批量拉取一轮（一次 yf.download / 分组），返回成功更新的标的
+
+        缓冲区不足 1 个月的标的拉 1mo，其余只拉 5d 增量。失败只记录日志。
+        """
+        tickers = [t.upper() for t in tickers]
+        with self._lock:
+            full = [t for t in tickers if self._rings.get(t) is None
+                    or self._rings[t].count < _FULL_HISTORY_BARS]
+        incremental = [t for t in tickers if t not in full]
+        updated: List[str] = []
+        for period, group in (("1mo", full), ("5d", incremental)):
+            if group:
+                updated.extend(self._download(group, period))
+        self.polls += 1
+        return updated
+
+    def _download(self, tickers: List[str], period: str) -> List[str]:
+        if not yfinance_breaker.allow_request():
+            return []
+        started = None
+        try:
+            yfinance_limiter.acquire()
+            import yfinance as yf
+            import pandas as pd
+            started = time.monotonic()
+            df = yf.download(tickers, period=period, interval="1d", group_by="ticker",
+                             auto_adjust=True, progress=False, threads=True)
+        except (ImportError, ConnectionError, TimeoutError, OSError, ValueError, KeyError) + throttle_errors() as e:
+            _log.debug("批量行情拉取失败 (%s): %s", period, e)
+            retry_after = rate_limit_signal(e)
+            if retry_after is not None:
+                yfinance_limiter.on_throttle(retry_after)
+            yfinance_breaker.record_failure(time.monotonic() - started if started else None)
+            return []
+        latency = time.monotonic() - started
+        if df is None or df.empty:
+            return []
+
+        updated = []
+        for t in tickers:
+            try:
+                sub = df[t] if isinstance(df.columns, pd.MultiIndex) else df
+                sub = sub.dropna(subset=["Close"])
+            except KeyError:
+                continue
+            if sub.empty:
+                continue
+            ts = [idx.timestamp() for idx in sub.index]
+            self.ingest(t, ts, sub["Close"].to_numpy(dtype=float), sub["Volume"].to_numpy(dtype=float))
+            updated.append(t)
+        if updated:
+            yfinance_breaker.record_success(latency)
+            yfinance_limiter.on_success()
+        return updated
+
+    def invalidate(self, ticker: str) -> None:
+        """标记该标的缓冲已过期（保留 bar 供增量轮询；stock_data 在下次写入前返回 None）"""
+        with self._lock:
+            self._updated.pop(ticker.upper(), None)
+
+    # ==================== 读取 ====================
+
+    def age(self, ticker: str) -> Optional[float]:
+        """距该标的上次更新的秒数（从未更新返回 None）"""
+        ts = self._updated.get(ticker.upper())
+        return None if ts is None else time.time() - ts
+
+    def snapshot(self, tickers: Iterable[str], window: int = 22) -> Dict:
+        """
+        向量化计算全部标的的最新指标（缓冲区为空的标的对应 NaN）
+
+        Returns: {"tickers": [...], "price", "change_pct", "momentum_5d",
+                  "volume_ratio_5d", "volume_ratio", "avg_volume", "volatility_20d": ndarray}
+        """
+        tickers = [t.upper() for t in tickers]
+        window = max(6, min(window, self.capacity))
+        closes = np.full((len(tickers), window), np.nan)
+        volumes = np.full((len(tickers), window), np.nan)
+        with self._lock:
+            for i, t in enumerate(tickers):
+                ring = self._rings.get(t)
+                if ring is not None:
+                    closes[i], volumes[i] = ring.window(window)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            price = closes[:, -1]
+            change_pct = (price / closes[:, -2] - 1) * 100
+            # 与 _fetch_stock_data 一致：第 5 个 bar 之前的收盘价为基准；不足 5 bar 时退化为日涨跌
+            momentum_5d = np.where(np.isnan(closes[:, -5]), change_pct,
+                                   (price / closes[:, -5] - 1) * 100)
+            last_vol = volumes[:, -1]
+            avg_5 = _nanmean(volumes[:, -5:])
+            avg_20 = _nanmean(volumes[:, -20:])
+            avg_20 = np.where(np.isnan(avg_20) | (avg_20 <= 0), 1.0, avg_20)
+            returns = closes[:, 1:] / closes[:, :-1] - 1
+            valid = ~np.isnan(returns)
+            n_ret = valid.sum(axis=1)
+            mean_ret = np.divide(np.where(valid, returns, 0.0).sum(axis=1), n_ret,
+                                 out=np.zeros(len(tickers)), where=n_ret > 0)
+            sq = np.where(valid, (returns - mean_ret[:, None]) ** 2, 0.0).sum(axis=1)
+            std = np.sqrt(np.divide(sq, n_ret - 1, out=np.full(len(tickers), np.nan), where=n_ret > 1))
+            volatility = np.where(n_ret >= 19, std * math.sqrt(252) * 100, 0.0)
+
+        return {
+            "tickers": tickers,
+            "price": price,
+            "change_pct": change_pct,
+            "momentum_5d": momentum_5d,
+            "volume_ratio_5d": np.where(avg_5 > 0, last_vol / avg_5, 1.0),
+            "volume_ratio": last_vol / avg_20,
+            "avg_volume": avg_20,
+            "volatility_20d": volatility,
+        }
+
+    def stock_data(self, ticker: str, max_age: float = 120.0) -> Optional[Dict]:
+        """
+        与 swarm_agents._fetch_stock_data 同格式的数据；缓冲区过期或不足 2 个 bar 时返回 None
+
+        供蜂群预取复用 LiveMonitor 已拉取的 bar，避免重复请求 yfinance。
+        """
+        age = self.age(ticker)
+        if age is None or age > max_age:
+            return None
+        snap = self.snapshot([ticker])
+        if np.isnan(snap["change_pct"][0]):
+            return None
+        return {
+            "price": float(snap["price"][0]),
+            "momentum_5d": float(snap["momentum_5d"][0]),
+            "avg_volume": int(snap["avg_volume"][0]),
+            "volume_ratio": float(snap["volume_ratio"][0]),
+            "volatility_20d": float(snap["volatility_20d"][0]),
+        }
+
+
+# ==================== 单例 ====================
+
+_feed: Optional[MarketFeed] = None
+_feed_lock = threading.Lock()
+
+
+def get_market_feed() -> MarketFeed:
+    """获取进程级共享行情源"""
+    global _feed
+    if _feed is None:
+        with _feed_lock:
+            if _feed is None:
+                _feed = MarketFeed()
+    return _feed
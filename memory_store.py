@@ -14,6 +14,7 @@ from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass, asdict
 from threading import Lock
 from hive_logger import get_logger, PATHS
+import compact_codec
 
 _log = get_logger("memory_store")
 
@@ -232,7 +233,8 @@ class MemoryStore:
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (session_id, date, run_mode, json.dumps(tickers), len(tickers),
                   len([e for e in pheromone_snapshot if e.get('support_count', 0) >= 3]),
-                  top_opp, top_score, summary, json.dumps(pheromone_snapshot)[:5000], duration))
+                  top_opp, top_score, summary,
+                  sqlite3.Binary(compact_codec.encode(pheromone_snapshot)), duration))
 
             conn.commit()
             return True
@@ -244,6 +246,28 @@ class MemoryStore:
             if conn:
                 conn.close()
 
+    def get_session_snapshot(self, session_id: str) -> List[Dict]:
+        """读取会话的信息素快照（紧凑二进制；兼容旧版 JSON 文本，截断的旧记录返回空列表）"""
+        conn = None
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT pheromone_snapshot FROM reasoning_sessions WHERE session_id = ?",
+                (session_id,),
+            ).fetchone()
+            if not row or row[0] is None:
+                return []
+            return compact_codec.decode(row[0])
+        except compact_codec.CodecError as e:
+            _log.debug("信息素快照解码失败 %s: %s", session_id, e)
+            return []
+        except (sqlite3.Error, OSError) as e:
+            _log.warning("get_session_snapshot 失败: %s", e)
+            return []
+        finally:
+            if conn:
+                conn.close()
+
     def get_recent_memories(self, ticker: str, days: int = 30,
                             agent_id: Optional[str] = None, limit: int = 50) -> List[Dict]:
         """获取近期记忆"""
@@ -10,6 +10,8 @@ Alpha Hive - 指标收集器 (Week 4 可观测性)
     mc = MetricsCollector()
     mc.record_scan(ticker_count=5, duration=3.2, agent_count=6, ...)
     mc.check_slo()  # 返回违规列表
+    mc.record_spans(tracing.drain(corr_id), session_id="...")  # 阶段耗时分位数
+    mc.record_sources(resilience.collect_source_stats())       # 数据源延迟/错误直方图
     summary = mc.get_summary(days=7)
 """
 
@@ -35,6 +37,13 @@ DEFAULT_SLO = {
     "data_real_pct_min": 50.0,           # 真实数据占比 > 50%
     "min_supporting_agents": 3,          # 最少支持 Agent 数
     "max_consecutive_failures": 3,       # 最大连续失败数
+    # 数据源级 SLO（resilience 限流器/熔断器统计）；未列出的数据源使用 "default"
+    "source_slo": {
+        "default":   {"latency_p95_seconds": 10.0, "error_rate_max": 0.20},
+        "sec_edgar": {"latency_p95_seconds": 3.0,  "error_rate_max": 0.10},
+        "yfinance":  {"latency_p95_seconds": 5.0,  "error_rate_max": 0.10},
+    },
+    "source_min_requests": 5,            # 请求数不足时不评估数据源 SLO
 }
 
 
@@ -86,6 +95,40 @@ class MetricsCollector:
                     analysis_seconds REAL DEFAULT 0.0
                 )
             """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS span_metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    session_id TEXT,
+                    correlation_id TEXT,
+                    name TEXT NOT NULL,
+                    count INTEGER DEFAULT 0,
+                    errors INTEGER DEFAULT 0,
+                    total_seconds REAL DEFAULT 0.0,
+                    p50_seconds REAL DEFAULT 0.0,
+                    p95_seconds REAL DEFAULT 0.0,
+                    p99_seconds REAL DEFAULT 0.0,
+                    max_seconds REAL DEFAULT 0.0
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS source_metrics (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    timestamp TEXT NOT NULL,
+                    session_id TEXT,
+                    source TEXT NOT NULL,
+                    requests INTEGER DEFAULT 0,
+                    errors INTEGER DEFAULT 0,
+                    retries INTEGER DEFAULT 0,
+                    trips INTEGER DEFAULT 0,
+                    throttled INTEGER DEFAULT 0,
+                    rejected INTEGER DEFAULT 0,
+                    wait_total REAL DEFAULT 0.0,
+                    latency_total REAL DEFAULT 0.0,
+                    wait_hist TEXT,
+                    latency_hist TEXT
+                )
+            """)
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS slo_violations (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -181,6 +224,150 @@ class MetricsCollector:
                 ))
                 conn.commit()
 
+    def record_spans(self, spans: List[Dict], session_id: str = "") -> int:
+        """
+        将一次扫描的追踪 span（tracing.drain() 的返回值）按名称汇总为分位数写入 span_metrics
+
+        Returns:
+            写入的行数（每个 span 名一行）
+        """
+        import tracing
+        if not spans:
+            return 0
+        stats = tracing.aggregate(spans)
+        corr = spans[0].get("corr", "")
+        now = datetime.now().isoformat()
+        with self._lock:
+            with self._connect() as conn:
+                conn.executemany("""
+                    INSERT INTO span_metrics (
+                        timestamp, session_id, correlation_id, name, count, errors,
+                        total_seconds, p50_seconds, p95_seconds, p99_seconds, max_seconds
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, [
+                    (now, session_id, corr, name, st["count"], st["errors"],
+                     st["total"], st["p50"], st["p95"], st["p99"], st["max"])
+                    for name, st in stats.items()
+                ])
+                conn.commit()
+        return len(stats)
+
+    def record_sources(self, stats: Dict[str, Dict], session_id: str = "") -> int:
+        """
+        记录各数据源的统计快照（resilience.collect_source_stats() 的返回值）
+
+        直方图按 resilience.HIST_BOUNDS 分桶以 JSON 存储，查询时跨时间窗口逐桶相加（滚动直方图）。
+
+        Returns:
+            写入的行数
+        """
+        if not stats:
+            return 0
+        now = datetime.now().isoformat()
+        rows = [
+            (now, session_id, source,
+             st.get("requests", 0), st.get("errors", 0), st.get("retries", 0),
+             st.get("trips", 0), st.get("throttled", 0), st.get("rejected", 0),
+             st.get("wait_total", 0.0), st.get("latency_total", 0.0),
+             json.dumps(st.get("wait_hist", [])), json.dumps(st.get("latency_hist", [])))
+            for source, st in stats.items()
+        ]
+        with self._lock:
+            with self._connect() as conn:
+                conn.executemany("""
+                    INSERT INTO source_metrics (
+                        timestamp, session_id, source, requests, errors, retries,
+                        trips, throttled, rejected, wait_total, latency_total,
+                        wait_hist, latency_hist
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                conn.commit()
+        return len(rows)
+
+    def get_source_stats(self, days: int = 1) -> Dict[str, Dict]:
+        """
+        最近 N 天各数据源的滚动统计
+
+        Returns:
+            {source: {requests, errors, error_rate, retries, trips, throttled, rejected,
+                      latency_avg/p50/p95/p99, wait_avg/p95}}（秒）
+        """
+        from resilience import hist_percentile
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT * FROM source_metrics WHERE timestamp > ?", (cutoff,)
+            ).fetchall()
+
+        merged: Dict[str, Dict] = {}
+        for r in rows:
+            m = merged.setdefault(r["source"], {
+                "requests": 0, "errors": 0, "retries": 0, "trips": 0,
+                "throttled": 0, "rejected": 0, "wait_total": 0.0, "latency_total": 0.0,
+                "wait_hist": [], "latency_hist": [],
+            })
+            for k in ("requests", "errors", "retries", "trips", "throttled", "rejected",
+                      "wait_total", "latency_total"):
+                m[k] += r[k]
+            for k in ("wait_hist", "latency_hist"):
+                try:
+                    hist = json.loads(r[k] or "[]")
+                except ValueError:
+                    continue
+                acc = m[k]
+                acc.extend([0] * (len(hist) - len(acc)))
+                for i, c in enumerate(hist):
+                    acc[i] += c
+
+        result = {}
+        for source, m in merged.items():
+            n_lat, n_wait = sum(m["latency_hist"]), sum(m["wait_hist"])
+            result[source] = {
+                "requests": m["requests"],
+                "errors": m["errors"],
+                "error_rate": round(m["errors"] / m["requests"], 4) if m["requests"] else 0.0,
+                "retries": m["retries"],
+                "trips": m["trips"],
+                "throttled": m["throttled"],
+                "rejected": m["rejected"],
+                "latency_avg": round(m["latency_total"] / n_lat, 4) if n_lat else 0.0,
+                "latency_p50": round(hist_percentile(m["latency_hist"], 0.50), 4),
+                "latency_p95": round(hist_percentile(m["latency_hist"], 0.95), 4),
+                "latency_p99": round(hist_percentile(m["latency_hist"], 0.99), 4),
+                "wait_avg": round(m["wait_total"] / n_wait, 4) if n_wait else 0.0,
+                "wait_p95": round(hist_percentile(m["wait_hist"], 0.95), 4),
+            }
+        return result
+
+    def _check_source_slo(self, days: int) -> List[Dict]:
+        """数据源级 SLO：p95 延迟与错误率（请求数不足 source_min_requests 的数据源跳过）"""
+        violations = []
+        slo = self._slo.get("source_slo", DEFAULT_SLO["source_slo"])
+        min_requests = self._slo.get("source_min_requests", DEFAULT_SLO["source_min_requests"])
+        for source, st in self.get_source_stats(days=days).items():
+            if st["requests"] < min_requests:
+                continue
+            target = slo.get(source, slo.get("default", {}))
+            p95_max = target.get("latency_p95_seconds")
+            if p95_max is not None and st["latency_p95"] > p95_max:
+                violations.append({
+                    "slo_name": f"source_latency_p95:{source}",
+                    "threshold": p95_max,
+                    "actual": st["latency_p95"],
+                    "details": f"{source} P95 延迟 {st['latency_p95']:.2f}s > {p95_max:.1f}s",
+                })
+            err_max = target.get("error_rate_max")
+            if err_max is not None and st["error_rate"] > err_max:
+                violations.append({
+                    "slo_name": f"source_error_rate:{source}",
+                    "threshold": err_max,
+                    "actual": st["error_rate"],
+                    "details": (f"{source} 错误率 {st['error_rate']:.1%} > {err_max:.0%} "
+                                f"({st['errors']}/{st['requests']})"),
+                })
+        return violations
+
     # ==================== SLO 检查 ====================
 
     def check_slo(self, days: int = 1) -> List[Dict]:
@@ -201,7 +388,8 @@ class MetricsCollector:
             ).fetchall()
 
         if not rows:
-            return violations
+            # 无扫描记录时仍评估数据源级 SLO
+            return self._persist_violations(self._check_source_slo(days))
 
         # 1. P95 延迟检查
         durations = sorted(r["duration_seconds"] for r in rows)
@@ -242,7 +430,13 @@ class MetricsCollector:
                 "details": f"真实数据 {avg_real_pct:.0f}% < {threshold:.0f}%",
             })
 
-        # 持久化违规记录
+        # 4. 数据源级 SLO（SEC / yfinance 等的 P95 延迟与错误率）
+        violations.extend(self._check_source_slo(days))
+
+        return self._persist_violations(violations)
+
+    def _persist_violations(self, violations: List[Dict]) -> List[Dict]:
+        """持久化违规记录"""
         if violations:
             now = datetime.now().isoformat()
             with self._lock:
@@ -280,6 +474,18 @@ class MetricsCollector:
                 (cutoff,)
             ).fetchall()
 
+            # 各阶段：按扫描次数加权的分位数（跨扫描的近似值）+ 最大值
+            stages = conn.execute("""
+                SELECT name, SUM(count) AS count, SUM(errors) AS errors,
+                       SUM(total_seconds) AS total_seconds,
+                       SUM(p50_seconds * count) / SUM(count) AS p50_seconds,
+                       SUM(p95_seconds * count) / SUM(count) AS p95_seconds,
+                       SUM(p99_seconds * count) / SUM(count) AS p99_seconds,
+                       MAX(max_seconds) AS max_seconds
+                FROM span_metrics WHERE timestamp > ? AND count > 0
+                GROUP BY name ORDER BY total_seconds DESC
+            """, (cutoff,)).fetchall()
+
         if not scans:
             return {
                 "period_days": days,
@@ -290,6 +496,8 @@ class MetricsCollector:
                 "avg_score": 5.0,
                 "error_rate": 0.0,
                 "slo_violations": 0,
+                "stages": self._stage_summary(stages),
+                "sources": self._source_summary(days),
             }
 
         durations = [r["duration_seconds"] for r in scans]
@@ -316,6 +524,36 @@ class MetricsCollector:
             "avg_memory_mb": round(sum(r["memory_mb"] for r in scans) / len(scans), 1),
             "slo_violations": len(violations),
             "violation_details": [dict(v) for v in violations[:10]],
+            "stages": self._stage_summary(stages),
+            "sources": self._source_summary(days),
+        }
+
+    def _source_summary(self, days: int) -> Dict[str, Dict]:
+        """各数据源滚动统计 + 是否满足数据源 SLO（slo_ok）"""
+        slo = self._slo.get("source_slo", DEFAULT_SLO["source_slo"])
+        sources = self.get_source_stats(days=days)
+        for source, st in sources.items():
+            target = slo.get(source, slo.get("default", {}))
+            st["slo_ok"] = (
+                st["latency_p95"] <= target.get("latency_p95_seconds", float("inf"))
+                and st["error_rate"] <= target.get("error_rate_max", 1.0)
+            )
+        return sources
+
+    @staticmethod
+    def _stage_summary(rows) -> Dict[str, Dict]:
+        """span_metrics 聚合行 → {name: {count, errors, total, p50, p95, p99, max}}（秒，保留 4 位）"""
+        return {
+            r["name"]: {
+                "count": r["count"],
+                "errors": r["errors"],
+                "total": round(r["total_seconds"], 4),
+                "p50": round(r["p50_seconds"], 4),
+                "p95": round(r["p95_seconds"], 4),
+                "p99": round(r["p99_seconds"], 4),
+                "max": round(r["max_seconds"], 4),
+            }
+            for r in rows
         }
 
     def get_ticker_history(self, ticker: str, days: int = 30) -> List[Dict]:
@@ -329,14 +567,25 @@ class MetricsCollector:
             ).fetchall()
         return [dict(r) for r in rows]
 
-    VALID_TABLES = {"scan_metrics", "ticker_metrics", "slo_violations"}
+    def get_stage_history(self, name: str, days: int = 30) -> List[Dict]:
+        """获取某个追踪阶段（span 名）的逐次扫描分位数"""
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                "SELECT * FROM span_metrics WHERE name = ? AND timestamp > ? ORDER BY timestamp DESC",
+                (name, cutoff),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    VALID_TABLES = {"scan_metrics", "ticker_metrics", "span_metrics", "source_metrics", "slo_violations"}
 
     def cleanup(self, retention_days: int = 90):
         """清理过期数据"""
         cutoff = (datetime.now() - timedelta(days=retention_days)).isoformat()
         with self._lock:
             with self._connect() as conn:
-                for table in ("scan_metrics", "ticker_metrics", "slo_violations"):
+                for table in ("scan_metrics", "ticker_metrics", "span_metrics", "source_metrics", "slo_violations"):
                     if table not in self.VALID_TABLES:
                         raise ValueError(f"Invalid table name: {table}")
                     conn.execute(f"DELETE FROM {table} WHERE timestamp < ?", (cutoff,))
@@ -5,6 +5,7 @@
 
 import json
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import statistics
@@ -790,6 +791,22 @@ class MLPredictionService:
         }
 
 
+_service: Optional[MLPredictionService] = None
+_service_lock = threading.Lock()
+
+
+def get_prediction_service() -> MLPredictionService:
+    """进程级共享预测服务（首次获取时训练一次，之后只读预测）"""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                service = MLPredictionService()
+                service.train_model()
+                _service = service
+    return _service
+
+
 if __name__ == "__main__":
     # 测试
     service = MLPredictionService()
@@ -24,6 +24,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from hive_logger import PATHS, atomic_json_write
+import tracing
 
 _log = _logging.getLogger("alpha_hive.newsapi")
 
@@ -215,6 +216,15 @@ def get_ticker_news(ticker: str, max_articles: int = 10) -> Dict:
     return result
 
 
+def invalidate_cache(ticker: str) -> None:
+    """删除该 ticker 的新闻缓存（事件驱动重扫前调用）"""
+    with _lock:
+        try:
+            (_CACHE_DIR / f"{ticker}_news.json").unlink(missing_ok=True)
+        except OSError as e:
+            _log.debug("新闻缓存删除失败 (%s): %s", ticker, e)
+
+
 def _safe_cache(path: Path, data: Dict):
     try:
         atomic_json_write(path, data)
@@ -224,6 +234,7 @@ def _safe_cache(path: Path, data: Dict):
 
 # ==================== Yahoo Finance ====================
 
+@tracing.traced("fetch.news.yfinance")
 def _fetch_yf_news(ticker: str, max_articles: int = 10) -> Dict:
     """通过 Yahoo Finance 搜索 API 获取新闻"""
     if _req is None:
@@ -269,6 +280,7 @@ def _fetch_yf_news(ticker: str, max_articles: int = 10) -> Dict:
 
 # ==================== Alpha Vantage ====================
 
+@tracing.traced("fetch.news.alphavantage")
 def _fetch_av_news(ticker: str, api_key: str, max_articles: int = 10) -> Dict:
     """通过 Alpha Vantage NEWS_SENTIMENT API 获取新闻（含预处理情绪分）"""
     try:
@@ -5,11 +5,13 @@
 
 import json
 import os
+import threading
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import statistics
 
 from hive_logger import PATHS, get_logger, atomic_json_write
+import tracing
 
 _log = get_logger("options")
 
@@ -101,6 +103,16 @@ class OptionsDataFetcher:
         except Exception:
             pass
 
+    def invalidate(self, ticker: str, data_type: str = "chain") -> None:
+        """删除该 ticker 的期权缓存（事件驱动重扫前调用）"""
+        try:
+            os.remove(self._get_cache_path(ticker, data_type))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            _log.debug("options cache invalidate failed: %s", e)
+
+    @tracing.traced("fetch.options_chain")
     def fetch_options_chain(self, ticker: str) -> Dict:
         """获取期权链数据 - 支持多源降级（yfinance > 样本数据）"""
         # 尝试读取缓存
@@ -920,6 +932,22 @@ class OptionsAgent:
         return result
 
 
+# ==================== 便捷函数 ====================
+
+_agent: Optional[OptionsAgent] = None
+_agent_lock = threading.Lock()
+
+
+def get_options_agent() -> OptionsAgent:
+    """进程级共享 OptionsAgent（无逐 ticker 状态，可跨线程复用）"""
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                _agent = OptionsAgent()
+    return _agent
+
+
 # ==================== 脚本示例 ====================
 if __name__ == "__main__":
     agent = OptionsAgent()
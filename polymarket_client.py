@@ -55,19 +55,22 @@ class PolymarketClient:
         if not polymarket_breaker.allow_request():
             _log.warning("Polymarket 熔断器已打开，跳过请求")
             return None
+        started = None
         try:
             polymarket_limiter.acquire()
+            started = time.monotonic()
             resp = requests.get(
                 f"{GAMMA_BASE}{endpoint}",
                 params=params,
                 timeout=15,
                 headers={"Accept": "application/json"},
             )
+            polymarket_limiter.feedback(resp.status_code, resp.headers)
             resp.raise_for_status()
-            polymarket_breaker.record_success()
+            polymarket_breaker.record_success(time.monotonic() - started)
             return resp.json()
         except (ConnectionError, TimeoutError, OSError, ValueError) as e:
-            polymarket_breaker.record_failure()
+            polymarket_breaker.record_failure(time.monotonic() - started if started else None)
             _log.warning("Polymarket API 请求失败: %s", e)
             return None
 
@@ -18,6 +18,7 @@ from pathlib import Path
 from typing import Dict, List, Optional
 
 from hive_logger import atomic_json_write
+import tracing
 
 _log = _logging.getLogger("alpha_hive.reddit_sentiment")
 
@@ -49,6 +50,7 @@ class RedditSentimentClient:
             time.sleep(6.0 - elapsed)
         self._last_request = time.time()
 
+    @tracing.traced("fetch.reddit")
     def _fetch_ranking(self, filter_name: str = "all-stocks") -> List[Dict]:
         """
         获取 Reddit 股票提及排名（前 100 名）
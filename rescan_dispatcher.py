@@ -0,0 +1,350 @@
+#!/usr/bin/env python3
+"""
+🐝 Alpha Hive 事件驱动重扫调度器
+
+订阅 event_bus 上的检测器事件，只对受影响 ticker 的相关 Agent 做增量重扫：
+- TOPIC_FORM4         新 Form 4 申报（edgar_rss）     → 依赖 form4 的 Agent（ScoutBeeNova / BearBeeContrarian）
+- TOPIC_EARNINGS      财报发布（earnings_watcher）    → 价格 / 新闻 / 期权链相关 Agent
+- TOPIC_PRICE_SPIKE   价格异动（LiveMonitor）         → 依赖价格 bar 的 Agent
+- TOPIC_VOLUME_SPIKE  成交量异动（LiveMonitor）       → 依赖价格 bar 的 Agent
+
+防抖：同一 ticker 的事件在静默 debounce_seconds 后合并为一次重扫（最晚 max_delay_seconds），
+两次重扫至少间隔 cooldown_seconds（冷却期内到达的事件顺延，不丢弃）。
+重扫走 run_swarm_scan 的增量模式（dirty_sources 强制重跑受影响 Agent，其余复用当日输出），
+结果只追加到当日蜂群结果与日报存储；当日 MD / JSON / HTML 文件按 materialize_interval_seconds
+节流生成（空闲时补齐，停止时强制生成一次），单 ticker 重扫的开销不随当日批次数增长。
+
+用法：
+    python3 rescan_dispatcher.py --tickers NVDA TSLA    # 常驻：轮询 EDGAR RSS + 财报，事件触发重扫
+"""
+
+import argparse
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from config import SWARM_CONFIG, WATCHLIST
+from event_bus import (
+    Event, EventBus, get_event_bus,
+    TOPIC_EARNINGS, TOPIC_FORM4, TOPIC_PRICE_SPIKE, TOPIC_VOLUME_SPIKE,
+)
+from hive_logger import get_logger
+from resilience import PRIORITY_INTERACTIVE, request_priority
+
+_log = get_logger("rescan_dispatcher")
+
+# 事件主题 → 受影响的输入源（与 swarm_agents.AGENT_INPUTS 的源名一致）
+TOPIC_SOURCES: Dict[str, tuple] = {
+    TOPIC_FORM4: ("form4",),
+    TOPIC_EARNINGS: ("price", "news", "chain"),
+    TOPIC_PRICE_SPIKE: ("price",),
+    TOPIC_VOLUME_SPIKE: ("price",),
+}
+
+RescanFn = Callable[[str, set], object]
+
+
+class RescanDispatcher:
+    """事件 → 防抖合并 → 单 ticker 增量重扫（单工作线程串行执行）"""
+
+    def __init__(self, rescan_fn: RescanFn, tickers: Optional[Iterable[str]] = None,
+                 bus: Optional[EventBus] = None, debounce_seconds: float = 60,
+                 max_delay_seconds: float = 300, cooldown_seconds: float = 600,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Args:
+            rescan_fn: rescan_fn(ticker, sources) 执行一次重扫（见 reporter_rescan）
+            tickers: 关注的标的（None = 不过滤）
+            bus: 事件总线（默认全局单例）
+            debounce_seconds: 防抖静默时长
+            max_delay_seconds: 首个事件到重扫的最长等待
+            cooldown_seconds: 同一 ticker 两次重扫的最小间隔
+        """
+        self.rescan_fn = rescan_fn
+        self.tickers = {t.upper() for t in tickers} if tickers else None
+        self.bus = bus or get_event_bus()
+        self.debounce = debounce_seconds
+        self.max_delay = max(max_delay_seconds, debounce_seconds)
+        self.cooldown = cooldown_seconds
+        self.clock = clock
+
+        self._cond = threading.Condition()
+        self._pending: Dict[str, Dict] = {}   # ticker → {"sources", "topics", "first", "due"}
+        self._last_run: Dict[str, float] = {}
+        self._cik_to_ticker: Optional[Dict[str, str]] = None
+        self._unsubscribes: List[Callable[[], None]] = []
+        self._threads: List[threading.Thread] = []
+        self._stop = threading.Event()
+
+        self.received = 0
+        self.coalesced = 0
+        self.dispatched = 0
+
+    @classmethod
+    def from_config(cls, rescan_fn: RescanFn, tickers: Optional[Iterable[str]] = None,
+                    bus: Optional[EventBus] = None) -> "RescanDispatcher":
+        """按 SWARM_CONFIG["event_rescan"] 创建"""
+        cfg = SWARM_CONFIG.get("event_rescan", {})
+        return cls(
+            rescan_fn, tickers, bus,
+            debounce_seconds=cfg.get("debounce_seconds", 60),
+            max_delay_seconds=cfg.get("max_delay_seconds", 300),
+            cooldown_seconds=cfg.get("cooldown_seconds", 600),
+        )
+
+    # ==================== 生命周期 ====================
+
+    def start(self, poll: bool = False) -> "RescanDispatcher":
+        """订阅事件并启动工作线程；poll=True 时同时启动 EDGAR RSS / 财报轮询线程"""
+        self._stop.clear()
+        for topic in TOPIC_SOURCES:
+            self._unsubscribes.append(self.bus.subscribe(topic, self.on_event))
+        self._spawn(self._worker, "rescan-dispatcher")
+        if poll:
+            cfg = SWARM_CONFIG.get("event_rescan", {})
+            self._spawn(lambda: self._poll_form4(cfg.get("form4_poll_seconds", 300)), "rescan-poll-form4")
+            self._spawn(lambda: self._poll_earnings(cfg.get("earnings_poll_seconds", 900)), "rescan-poll-earnings")
+        _log.info("事件驱动重扫已启动（%s）", "、".join(sorted(self.tickers)) if self.tickers else "全部标的")
+        return self
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """取消订阅并停止所有线程（进行中的重扫会执行完毕）"""
+        for unsubscribe in self._unsubscribes:
+            unsubscribe()
+        self._unsubscribes.clear()
+        self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads.clear()
+        self._flush_artifacts(force=True)
+
+    def _spawn(self, target, name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    # ==================== 事件接收 ====================
+
+    def on_event(self, event: Event) -> None:
+        """总线回调：登记/合并待重扫 ticker（只做簿记，立即返回）"""
+        sources = TOPIC_SOURCES.get(event.topic)
+        ticker = self._resolve_ticker(event)
+        if not sources or not ticker:
+            return
+        now = self.clock()
+        with self._cond:
+            self.received += 1
+            item = self._pending.get(ticker)
+            if item is None:
+                item = {"sources": set(), "topics": set(), "first": now}
+                self._pending[ticker] = item
+            else:
+                self.coalesced += 1
+            item["sources"].update(sources)
+            item["topics"].add(event.topic)
+            item["due"] = min(now + self.debounce, item["first"] + self.max_delay)
+            self._cond.notify()
+        _log.debug("事件 %s → %s（%s）", event.topic, ticker, event.payload)
+
+    def _resolve_ticker(self, event: Event) -> Optional[str]:
+        """事件 → 关注列表中的 ticker（RSS 申报按 CIK 匹配，失败时按公司名匹配）"""
+        if event.ticker:
+            ticker = event.ticker
+        else:
+            cik = str(event.payload.get("cik") or "").lstrip("0")
+            ticker = self._cik_map().get(cik) if cik else None
+            if ticker is None and self.tickers:
+                name = str(event.payload.get("company_name") or "").upper()
+                ticker = next((t for t in sorted(self.tickers) if t in name.split()), None)
+        if ticker and self.tickers is not None and ticker not in self.tickers:
+            return None
+        return ticker
+
+    def _cik_map(self) -> Dict[str, str]:
+        """关注列表的 CIK → ticker（首次使用时构建）"""
+        if self._cik_to_ticker is None:
+            mapping: Dict[str, str] = {}
+            if self.tickers:
+                try:
+                    from sec_edgar import get_cik
+                    for t in self.tickers:
+                        cik = get_cik(t)
+                        if cik:
+                            mapping[str(cik).lstrip("0")] = t
+                except (ImportError, OSError, ValueError, KeyError) as e:
+                    _log.debug("CIK 映射构建失败: %s", e)
+            self._cik_to_ticker = mapping
+        return self._cik_to_ticker
+
+    # ==================== 调度 ====================
+
+    def _ready_at(self, ticker: str, item: Dict) -> float:
+        last = self._last_run.get(ticker)
+        return item["due"] if last is None else max(item["due"], last + self.cooldown)
+
+    def pending(self) -> Dict[str, set]:
+        """当前待重扫的 {ticker: 输入源}"""
+        with self._cond:
+            return {t: set(item["sources"]) for t, item in self._pending.items()}
+
+    def run_due(self, now: Optional[float] = None) -> List[str]:
+        """执行所有已到期的重扫，返回本次重扫的 ticker（工作线程调用；测试可直接调用）"""
+        now = self.clock() if now is None else now
+        with self._cond:
+            due = sorted(
+                ((t, item) for t, item in self._pending.items() if self._ready_at(t, item) <= now),
+                key=lambda x: x[1]["first"],
+            )
+            for ticker, _ in due:
+                del self._pending[ticker]
+                self._last_run[ticker] = now
+        for ticker, item in due:
+            _log.info("事件重扫 %s：%s → 重跑依赖 %s 的 Agent",
+                      ticker, "+".join(sorted(item["topics"])), "/".join(sorted(item["sources"])))
+            try:
+                self.rescan_fn(ticker, set(item["sources"]))
+            except (ValueError, KeyError, TypeError, AttributeError, RuntimeError, OSError) as e:
+                _log.warning("事件重扫失败 %s: %s", ticker, e)
+            self.dispatched += 1
+        return [ticker for ticker, _ in due]
+
+    def _flush_artifacts(self, force: bool = False) -> Optional[float]:
+        """rescan_fn 支持 flush（见 ReporterRescan）时节流生成当日报告文件；返回距下次可生成的秒数"""
+        flush = getattr(self.rescan_fn, "flush", None)
+        if flush is None:
+            return None
+        try:
+            return flush(force=force)
+        except (ValueError, KeyError, TypeError, AttributeError, RuntimeError, OSError) as e:
+            _log.warning("当日报告生成失败: %s", e)
+            return None
+
+    def _worker(self) -> None:
+        while not self._stop.is_set():
+            retry = self._flush_artifacts()
+            with self._cond:
+                if self._pending:
+                    wait = min(self._ready_at(t, i) for t, i in self._pending.items()) - self.clock()
+                else:
+                    wait = None
+                if retry is not None:
+                    wait = retry if wait is None else min(wait, retry)
+                if wait is None or wait > 0:
+                    self._cond.wait(timeout=wait)
+                    continue
+            self.run_due()
+
+    # ==================== 检测器轮询 ====================
+
+    def _poll_form4(self, interval: float) -> None:
+        """定期强制刷新 EDGAR RSS（新申报由 edgar_rss 发布到总线）"""
+        from xml.etree.ElementTree import ParseError
+        from edgar_rss import get_rss_client
+        while not self._stop.is_set():
+            try:
+                get_rss_client().get_recent_form4_alerts(force_refresh=True)
+            except (ValueError, KeyError, TypeError, OSError, ParseError) as e:
+                _log.warning("EDGAR RSS 轮询失败: %s", e)
+            self._stop.wait(interval)
+
+    def _poll_earnings(self, interval: float) -> None:
+        """定期检查今日财报（抓到结果时由 earnings_watcher 发布到总线）"""
+        from earnings_watcher import get_watcher
+        tickers = sorted(self.tickers) if self.tickers else list(WATCHLIST.keys())
+        while not self._stop.is_set():
+            try:
+                get_watcher().check_and_update(tickers)
+            except (ValueError, KeyError, TypeError, OSError) as e:
+                _log.debug("财报轮询失败: %s", e)
+            self._stop.wait(interval)
+
+
+class ReporterRescan:
+    """
+    基于 AlphaHiveDailyReporter 的 rescan_fn：单 ticker 增量重扫 + 只追加当日报告存储
+
+    当日文件（MD / JSON / ML HTML / index.html）由 flush() 节流生成：距上次生成不足
+    interval 秒时延后，由调度器空闲时或 stop() 时补齐。跨日时自动新建 reporter
+    （日期、会话与当日日志随之切换），切换前先为前一日生成文件。
+    """
+
+    def __init__(self, reporter=None, materialize_interval: float = 300.0,
+                 clock: Callable[[], float] = time.monotonic):
+        self.reporter = reporter
+        self.interval = materialize_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._materialized_at: Optional[float] = None
+
+    def __call__(self, ticker: str, sources: set):
+        from alpha_hive_daily_report import AlphaHiveDailyReporter
+        # 事件触发的重扫按交互优先级申请限流令牌，插队到后台轮询 / 预热之前
+        with self._lock, request_priority(PRIORITY_INTERACTIVE):
+            rep = self.reporter
+            if rep is None or rep.date_str != datetime.now().strftime("%Y-%m-%d"):
+                self._materialize_locked()
+                rep = self.reporter = AlphaHiveDailyReporter()
+            report = rep.run_swarm_scan([ticker], dirty_sources={ticker: set(sources)})
+            rep.save_report(report, materialize=False)
+            self._dirty = True
+            return report
+
+    def flush(self, force: bool = False) -> Optional[float]:
+        """
+        有未生成的重扫结果时生成当日文件（force=False 时受 interval 节流）
+
+        Returns:
+            仍有待生成内容时距下次可生成的秒数，否则 None
+        """
+        with self._lock:
+            if not self._dirty:
+                return None
+            if not force and self._materialized_at is not None:
+                remaining = self._materialized_at + self.interval - self.clock()
+                if remaining > 0:
+                    return remaining
+            self._materialize_locked()
+            return None
+
+    def _materialize_locked(self) -> None:
+        if self._dirty and self.reporter is not None:
+            self.reporter.materialize_report()
+            self._materialized_at = self.clock()
+        self._dirty = False
+
+
+def reporter_rescan(reporter=None) -> ReporterRescan:
+    """按 SWARM_CONFIG["event_rescan"]["materialize_interval_seconds"] 创建 ReporterRescan"""
+    cfg = SWARM_CONFIG.get("event_rescan", {})
+    return ReporterRescan(reporter, materialize_interval=cfg.get("materialize_interval_seconds", 300))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Alpha Hive 事件驱动重扫（常驻）")
+    parser.add_argument("--tickers", nargs="+", help="关注标的（默认 watchlist 前 10 个）")
+    parser.add_argument("--all-watchlist", action="store_true", help="关注全部 watchlist")
+    args = parser.parse_args()
+
+    if args.all_watchlist:
+        tickers = list(WATCHLIST.keys())
+    else:
+        tickers = [t.upper() for t in args.tickers] if args.tickers else list(WATCHLIST.keys())[:10]
+
+    dispatcher = RescanDispatcher.from_config(reporter_rescan(), tickers).start(poll=True)
+    try:
+        while True:
+            time.sleep(60)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dispatcher.stop()
+        _log.info("事件驱动重扫已停止：收到 %d 事件，合并 %d，重扫 %d 次",
+                  dispatcher.received, dispatcher.coalesced, dispatcher.dispatched)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,66 +2,418 @@
 Alpha Hive - 弹性层：RateLimiter + CircuitBreaker + retry
 
 统一所有外部 API 调用的限流、熔断和重试逻辑。
+RateLimiter 为自适应令牌桶：精确等待、按 429 / Retry-After 反馈 AIMD 调速、优先级与按 host 公平排队。
+带 name 的 RateLimiter / CircuitBreaker 按数据源记录统计（等待时间、请求延迟、
+重试、熔断、限流），由 MetricsCollector.record_sources() 持久化为滚动直方图。
+带 name 的实例默认通过 shared_state 跨进程共享令牌桶与熔断状态（同一主机一份预算）；
+共享存储不可用时退回进程内状态。
 """
 
+import bisect
+import itertools
+import sqlite3
 import time
 import threading
 import functools
-from typing import Optional, Callable, Any
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Callable, Any, List, Tuple
 from hive_logger import get_logger
+from shared_state import SharedStateStore, get_shared_state
 
 _log = get_logger("resilience")
 
 
+# ==================== 数据源统计 ====================
+
+# 直方图桶上界（秒，对数间隔）；最后一个桶为溢出桶
+HIST_BOUNDS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.2, 0.5,
+               1.0, 2.0, 5.0, 10.0, 30.0, 60.0)
+
+
+def new_histogram() -> List[int]:
+    return [0] * (len(HIST_BOUNDS) + 1)
+
+
+def hist_percentile(counts: List[int], q: float) -> float:
+    """由桶计数估算分位数（桶内线性插值；落在溢出桶时返回最大上界）"""
+    total = sum(counts)
+    if total == 0:
+        return 0.0
+    rank = q * total
+    cum = 0
+    for i, c in enumerate(counts):
+        if c and cum + c >= rank:
+            if i >= len(HIST_BOUNDS):
+                return HIST_BOUNDS[-1]
+            lo = HIST_BOUNDS[i - 1] if i > 0 else 0.0
+            return lo + (HIST_BOUNDS[i] - lo) * max(0.0, rank - cum) / c
+        cum += c
+    return HIST_BOUNDS[-1]
+
+
+class SourceStats:
+    """单个数据源的累计统计（线程安全；snapshot(reset=True) 取出并清零）"""
+
+    COUNTERS = ("requests", "errors", "retries", "trips", "throttled", "rejected")
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._reset_locked()
+
+    def _reset_locked(self):
+        self.counters = dict.fromkeys(self.COUNTERS, 0)
+        self.wait_hist = new_histogram()
+        self.latency_hist = new_histogram()
+        self.wait_total = 0.0
+        self.latency_total = 0.0
+
+    def observe_wait(self, seconds: float, throttled: bool) -> None:
+        """记录一次限流等待（throttled=True 表示需要等待或等待超时）"""
+        with self._lock:
+            self.wait_hist[bisect.bisect_left(HIST_BOUNDS, seconds)] += 1
+            self.wait_total += seconds
+            if throttled:
+                self.counters["throttled"] += 1
+
+    def observe_request(self, latency: Optional[float], error: bool) -> None:
+        """记录一次请求结果（latency 为 None 时只计数）"""
+        with self._lock:
+            self.counters["requests"] += 1
+            if error:
+                self.counters["errors"] += 1
+            if latency is not None:
+                self.latency_hist[bisect.bisect_left(HIST_BOUNDS, latency)] += 1
+                self.latency_total += latency
+
+    def incr(self, counter: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[counter] += n
+
+    def snapshot(self, reset: bool = False) -> Dict:
+        with self._lock:
+            snap = {
+                **self.counters,
+                "wait_hist": list(self.wait_hist),
+                "latency_hist": list(self.latency_hist),
+                "wait_total": self.wait_total,
+                "latency_total": self.latency_total,
+            }
+            if reset:
+                self._reset_locked()
+        return snap
+
+    def merge(self, snap: Dict) -> None:
+        """合并外部（进程池工作进程）的统计快照"""
+        with self._lock:
+            for k in self.COUNTERS:
+                self.counters[k] += snap.get(k, 0)
+            for attr in ("wait_hist", "latency_hist"):
+                hist = getattr(self, attr)
+                for i, c in enumerate(snap.get(attr, ())[:len(hist)]):
+                    hist[i] += c
+            self.wait_total += snap.get("wait_total", 0.0)
+            self.latency_total += snap.get("latency_total", 0.0)
+
+
+_source_stats: Dict[str, SourceStats] = {}
+_source_stats_lock = threading.Lock()
+
+
+def source_stats(name: str) -> SourceStats:
+    """获取（或创建）数据源统计；同名的限流器与熔断器共享一份"""
+    with _source_stats_lock:
+        stats = _source_stats.get(name)
+        if stats is None:
+            stats = _source_stats[name] = SourceStats(name)
+        return stats
+
+
+def collect_source_stats(reset: bool = True) -> Dict[str, Dict]:
+    """所有数据源的统计快照 {source: snapshot}（默认取出后清零，供每次扫描落库）"""
+    with _source_stats_lock:
+        items = list(_source_stats.values())
+    snaps = {s.name: s.snapshot(reset=reset) for s in items}
+    return {k: v for k, v in snaps.items()
+            if any(v[c] for c in SourceStats.COUNTERS) or sum(v["wait_hist"])}
+
+
+def merge_source_stats(snapshots: Dict[str, Dict]) -> None:
+    """合并工作进程返回的 collect_source_stats() 结果"""
+    for name, snap in (snapshots or {}).items():
+        source_stats(name).merge(snap)
+
+
 # ==================== Token Bucket RateLimiter ====================
 
+# 请求优先级（数值越小越先获得 token）
+PRIORITY_INTERACTIVE = 0   # 交互式 / 事件触发重扫
+PRIORITY_NORMAL = 1        # 定时全量扫描（默认）
+PRIORITY_BACKGROUND = 2    # 后台预热 / 行情轮询
+
+_priority_local = threading.local()
+
+
+def current_priority() -> int:
+    """当前线程的请求优先级（未设置时为 PRIORITY_NORMAL）"""
+    return getattr(_priority_local, "priority", PRIORITY_NORMAL)
+
+
+@contextmanager
+def request_priority(priority: int):
+    """在 with 块内以指定优先级向限流器申请 token"""
+    prev = current_priority()
+    _priority_local.priority = priority
+    try:
+        yield
+    finally:
+        _priority_local.priority = prev
+
+
+def with_priority(fn: Callable, priority: Optional[int] = None) -> Callable:
+    """包装提交到线程池的函数：工作线程沿用提交时（或指定）的优先级"""
+    priority = current_priority() if priority is None else priority
+
+    @functools.wraps(fn)
+    def runner(*args, **kwargs):
+        with request_priority(priority):
+            return fn(*args, **kwargs)
+    return runner
+
+
+def parse_retry_after(value) -> Optional[float]:
+    """解析 Retry-After（秒数或 HTTP 日期），返回距今秒数；无法解析时 None"""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(str(value)).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+def rate_limit_signal(exc: BaseException) -> Optional[float]:
+    """
+    异常是否为服务端限流（HTTP 429 / 503，或 yfinance 的 YFRateLimitError）
+
+    Returns:
+        是：Retry-After 秒数（未提供时 0.0）；否：None
+    """
+    resp = getattr(exc, "response", None)
+    status = getattr(resp, "status_code", None)
+    if status in (429, 503):
+        return parse_retry_after((getattr(resp, "headers", None) or {}).get("Retry-After")) or 0.0
+    if "RateLimit" in type(exc).__name__ or "Too Many Requests" in str(exc):
+        return 0.0
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def throttle_errors() -> tuple:
+    """第三方 SDK 的限流异常类型（如 yfinance YFRateLimitError；未安装时为空元组），供 except 子句拼接"""
+    errors: tuple = ()
+    try:
+        from yfinance.exceptions import YFRateLimitError
+        errors += (YFRateLimitError,)
+    except ImportError:
+        pass
+    return errors
+
+
 class RateLimiter:
     """
-    Token Bucket 限流器
+    自适应 Token Bucket 限流器
+
+    - 精确等待：按 token 缺口 / 当前速率算出下一个 token 的到达时间，一次睡够
+    - 服务端反馈：feedback(status, headers) / on_throttle(retry_after) 处理 429 与 Retry-After，
+      Retry-After 期间暂停发放；AIMD 调速：成功加性提速，被限流乘性降速，速率限制在 [min_rate, max_rate]
+    - 优先级 + 公平：等待者按 (优先级, 该 key 本轮已获批次数, 到达顺序) 排队 ——
+      交互式重扫先于后台预热；同优先级下各 key（如 host）轮流获批
+    - 跨进程：带 name 时令牌、速率与 Retry-After 暂停存于 shared_state，同名限流器（任意进程）共用一个桶；
+      优先级与公平排队仍在进程内生效
 
     用法：
         limiter = RateLimiter(rate=10, burst=10)  # 10 req/s, burst 10
         limiter.acquire()  # 阻塞直到有 token
+        limiter.acquire(priority=PRIORITY_INTERACTIVE, key="data.sec.gov")
+        limiter.feedback(resp.status_code, resp.headers)
     """
 
-    def __init__(self, rate: float, burst: int = 1):
+    def __init__(self, rate: float, burst: int = 1, name: Optional[str] = None,
+                 max_rate: Optional[float] = None, min_rate: Optional[float] = None,
+                 increase: Optional[float] = None, decrease: float = 0.5,
+                 shared: Optional[SharedStateStore] = None):
         """
         Args:
-            rate:  每秒补充的 token 数量
+            rate:  每秒补充的 token 数量（初始速率）
             burst: 桶容量（允许瞬间并发数）
+            name:  数据源名称（非空时记录等待时间 / 限流次数到 source_stats(name)，并按名称跨进程共享桶）
+            max_rate: AIMD 提速上限（默认 = rate，即只降不升超过初始值）
+            min_rate: AIMD 降速下限（默认 rate / 10）
+            increase: 每次成功反馈的加性提速（默认 max_rate 的 2%）
+            decrease: 被限流时的乘性降速因子
+            shared: 共享状态存储（默认 get_shared_state()，按配置启用；False = 仅进程内）
         """
-        self._rate = rate
+        self._initial_rate = float(rate)
+        self._rate = float(rate)
+        self.max_rate = float(max_rate or rate)
+        self.min_rate = float(min_rate or rate / 10.0)
+        self._increase = increase if increase is not None else self.max_rate * 0.02
+        self._decrease = decrease
         self._burst = burst
         self._tokens = float(burst)
         self._last_refill = time.monotonic()
-        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._last_decrease = float("-inf")
+        self._cond = threading.Condition()
+        self._waiters: List[Tuple[int, int, Optional[str]]] = []   # (priority, seq, key)
+        self._seq = itertools.count()
+        self._served: Dict[Optional[str], int] = {}
+        self.name = name
+        self.stats = source_stats(name) if name else None
+        self._shared = shared
+
+    @property
+    def rate(self) -> float:
+        """当前（AIMD 调整后的）速率"""
+        return self._rate
+
+    def _store(self) -> Optional[SharedStateStore]:
+        if not self.name or self._shared is False:
+            return None
+        return self._shared or get_shared_state()
+
+    def _take_shared(self, store: SharedStateStore, tokens: float, now: float) -> Optional[float]:
+        """从共享桶取 token → 需等待秒数（0 = 已获批）；共享存储出错时返回 None（改用本地桶）"""
+        try:
+            wait, self._rate = store.take(self.name, tokens, self._initial_rate, self._burst)
+            return wait
+        except sqlite3.Error as e:
+            _log.debug("RateLimiter[%s] 共享状态不可用，使用进程内令牌桶: %s", self.name, e)
+            return None
+
+    def _head(self) -> Tuple[int, int, Optional[str]]:
+        return min(self._waiters, key=lambda w: (w[0], self._served.get(w[2], 0), w[1]))
 
-    def acquire(self, timeout: float = 30.0) -> bool:
+    def acquire(self, timeout: float = 30.0, tokens: float = 1.0,
+                priority: Optional[int] = None, key: Optional[str] = None) -> bool:
         """
-        获取一个 token，阻塞直到可用或超时。
+        获取 tokens 个 token（按权重限流，如 LLM 的 token/分钟；超过桶容量时按容量计），
+        阻塞直到可用或超时。
+
+        Args:
+            priority: 请求优先级（默认取 current_priority()）
+            key: 公平调度分组（如 host），同优先级下获批次数少的 key 先行
 
         Returns:
-            True 成功获取, False 超时
+            True 成功获取, False 超时（预计等待超过 timeout 时立即返回）
         """
-        deadline = time.monotonic() + timeout
-        while True:
-            with self._lock:
-                self._refill()
-                if self._tokens >= 1.0:
-                    self._tokens -= 1.0
-                    return True
-            # 计算等待时间
-            wait = 1.0 / self._rate
-            if time.monotonic() + wait > deadline:
-                return False
-            time.sleep(wait)
-
-    def _refill(self):
-        now = time.monotonic()
+        tokens = min(float(tokens), float(self._burst))
+        priority = current_priority() if priority is None else priority
+        start = time.monotonic()
+        deadline = start + timeout
+        ticket = (priority, next(self._seq), key)
+        waited = False
+        with self._cond:
+            self._waiters.append(ticket)
+            try:
+                while True:
+                    now = time.monotonic()
+                    if self._head() == ticket:
+                        store = self._store()
+                        wait = self._take_shared(store, tokens, now) if store else None
+                        if wait is None:
+                            self._refill(now)
+                            if now >= self._blocked_until and self._tokens >= tokens:
+                                self._tokens -= tokens
+                                wait = 0.0
+                            else:
+                                # 精确等待：Retry-After 剩余时间与 token 缺口补齐时间取大
+                                wait = max(self._blocked_until - now, (tokens - self._tokens) / self._rate)
+                        if wait <= 0:
+                            self._served[key] = self._served.get(key, 0) + 1
+                            if self.stats:
+                                self.stats.observe_wait(now - start, waited)
+                            return True
+                        if now + wait > deadline:
+                            break
+                    else:
+                        # 排在后面：等前面的请求获批或离开时被唤醒
+                        wait = deadline - now
+                        if wait <= 0:
+                            break
+                    waited = True
+                    self._cond.wait(wait)
+            finally:
+                self._waiters.remove(ticket)
+                if not self._waiters:
+                    self._served.clear()
+                self._cond.notify_all()
+        if self.stats:
+            self.stats.observe_wait(time.monotonic() - start, True)
+        return False
+
+    def _refill(self, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
         elapsed = now - self._last_refill
         self._tokens = min(self._burst, self._tokens + elapsed * self._rate)
         self._last_refill = now
 
+    def on_success(self) -> None:
+        """成功反馈：加性提速（不超过 max_rate）"""
+        store = self._store()
+        if store:
+            try:
+                self._rate = store.succeed(self.name, self._initial_rate, self._burst,
+                                           self._increase, self.max_rate)
+                return
+            except sqlite3.Error as e:
+                _log.debug("RateLimiter[%s] 共享状态不可用: %s", self.name, e)
+        with self._cond:
+            if self._rate < self.max_rate:
+                self._refill()
+                self._rate = min(self.max_rate, self._rate + self._increase)
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """
+        服务端限流反馈：乘性降速（同一秒内的多个 429 只降一次）、清空令牌，
+        retry_after 秒内暂停发放
+        """
+        store = self._store()
+        with self._cond:
+            now = time.monotonic()
+            self._refill(now)
+            shared_rate = None
+            if store:
+                try:
+                    shared_rate = store.throttle(self.name, self._initial_rate, self._burst,
+                                                 self._decrease, self.min_rate, retry_after)
+                except sqlite3.Error as e:
+                    _log.debug("RateLimiter[%s] 共享状态不可用: %s", self.name, e)
+            if shared_rate is not None:
+                self._rate = shared_rate
+            elif now - self._last_decrease >= 1.0:
+                self._rate = max(self.min_rate, self._rate * self._decrease)
+                self._last_decrease = now
+            self._tokens = 0.0
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            rate = self._rate
+            self._cond.notify_all()
+        _log.warning("RateLimiter[%s] 服务端限流 → 速率 %.2f/s%s", self.name or "-", rate,
+                     f"，暂停 {retry_after:.1f}s" if retry_after else "")
+
+    def feedback(self, status_code: Optional[int], headers=None) -> None:
+        """按 HTTP 响应调速：429 / 503 → on_throttle(Retry-After)；2xx / 3xx → on_success"""
+        if status_code in (429, 503):
+            self.on_throttle(parse_retry_after((headers or {}).get("Retry-After")))
+        elif status_code is not None and 200 <= status_code < 400:
+            self.on_success()
+
 
 # ==================== Circuit Breaker ====================
 
@@ -70,6 +422,7 @@ class CircuitBreaker:
     熔断器 - 连续失败 N 次后自动熔断，冷却后半开探测
 
     状态转移：CLOSED -> OPEN -> HALF_OPEN -> CLOSED
+    启用 shared_state 时状态与连续失败数跨进程共享（一个进程熔断，其余进程同时停止请求）
     """
 
     CLOSED = "closed"
@@ -81,12 +434,14 @@ class CircuitBreaker:
         name: str,
         failure_threshold: int = 5,
         recovery_timeout: float = 60.0,
+        shared: Optional[SharedStateStore] = None,
     ):
         """
         Args:
             name: 熔断器名称（用于日志）
             failure_threshold: 连续失败多少次后熔断
             recovery_timeout: 熔断后等待多少秒尝试半开
+            shared: 共享状态存储（默认 get_shared_state()，按配置启用；False = 仅进程内）
         """
         self.name = name
         self._failure_threshold = failure_threshold
@@ -95,9 +450,23 @@ class CircuitBreaker:
         self._failure_count = 0
         self._last_failure_time = 0.0
         self._lock = threading.Lock()
+        self.stats = source_stats(name)
+        self._shared = shared
+
+    def _store(self) -> Optional[SharedStateStore]:
+        return None if self._shared is False else (self._shared or get_shared_state())
 
     @property
     def state(self) -> str:
+        store = self._store()
+        if store:
+            try:
+                state, transitioned = store.breaker_state(self.name, self._recovery_timeout)
+                if transitioned:
+                    _log.info("CircuitBreaker[%s] OPEN -> HALF_OPEN", self.name)
+                return state
+            except sqlite3.Error as e:
+                _log.debug("CircuitBreaker[%s] 共享状态不可用，使用进程内状态: %s", self.name, e)
         with self._lock:
             if self._state == self.OPEN:
                 if time.monotonic() - self._last_failure_time >= self._recovery_timeout:
@@ -108,18 +477,41 @@ class CircuitBreaker:
     def allow_request(self) -> bool:
         """当前是否允许请求通过"""
         s = self.state
-        return s in (self.CLOSED, self.HALF_OPEN)
-
-    def record_success(self):
-        """记录成功调用"""
+        allowed = s in (self.CLOSED, self.HALF_OPEN)
+        if not allowed:
+            self.stats.incr("rejected")
+        return allowed
+
+    def record_success(self, latency: Optional[float] = None):
+        """记录成功调用（latency：请求耗时秒数，计入延迟直方图）"""
+        self.stats.observe_request(latency, error=False)
+        store = self._store()
+        if store:
+            try:
+                if store.breaker_success(self.name) == self.HALF_OPEN:
+                    _log.info("CircuitBreaker[%s] HALF_OPEN -> CLOSED", self.name)
+                return
+            except sqlite3.Error as e:
+                _log.debug("CircuitBreaker[%s] 共享状态不可用: %s", self.name, e)
         with self._lock:
             if self._state == self.HALF_OPEN:
                 _log.info("CircuitBreaker[%s] HALF_OPEN -> CLOSED", self.name)
             self._state = self.CLOSED
             self._failure_count = 0
 
-    def record_failure(self):
+    def record_failure(self, latency: Optional[float] = None):
         """记录失败调用"""
+        self.stats.observe_request(latency, error=True)
+        store = self._store()
+        if store:
+            try:
+                _, failures, tripped = store.breaker_failure(self.name, self._failure_threshold)
+                if tripped:
+                    _log.warning("CircuitBreaker[%s] -> OPEN (failures=%d)", self.name, failures)
+                    self.stats.incr("trips")
+                return
+            except sqlite3.Error as e:
+                _log.debug("CircuitBreaker[%s] 共享状态不可用: %s", self.name, e)
         with self._lock:
             self._failure_count += 1
             self._last_failure_time = time.monotonic()
@@ -129,10 +521,21 @@ class CircuitBreaker:
                         "CircuitBreaker[%s] -> OPEN (failures=%d)",
                         self.name, self._failure_count,
                     )
+                    self.stats.incr("trips")
                 self._state = self.OPEN
 
+    def record_retry(self):
+        """记录一次重试（同一请求的后续尝试）"""
+        self.stats.incr("retries")
+
     def reset(self):
         """手动重置"""
+        store = self._store()
+        if store:
+            try:
+                store.breaker_reset(self.name)
+            except sqlite3.Error as e:
+                _log.debug("CircuitBreaker[%s] 共享状态不可用: %s", self.name, e)
         with self._lock:
             self._state = self.CLOSED
             self._failure_count = 0
@@ -176,16 +579,24 @@ def retry(
                             _log.warning("retry: %s 限流超时", func.__name__)
                             return None
 
+                    started = time.monotonic()
                     result = func(*args, **kwargs)
 
                     # 成功
                     if circuit_breaker:
-                        circuit_breaker.record_success()
+                        circuit_breaker.record_success(time.monotonic() - started)
+                    if rate_limiter:
+                        rate_limiter.on_success()
                     return result
 
                 except exceptions as e:
                     last_exc = e
+                    retry_after = rate_limit_signal(e)
+                    if rate_limiter and retry_after is not None:
+                        rate_limiter.on_throttle(retry_after)
                     if attempt < max_retries:
+                        if circuit_breaker:
+                            circuit_breaker.record_retry()
                         delay = min(backoff_base * (2 ** attempt), backoff_max)
                         _log.warning(
                             "retry: %s attempt %d/%d failed (%s), backoff %.1fs",
@@ -209,14 +620,17 @@ def retry(
 
 # ==================== 预置实例（各数据源共享） ====================
 
-# SEC EDGAR: 10 req/s
-sec_limiter = RateLimiter(rate=8.0, burst=3)
+# SEC EDGAR: 10 req/s（公开上限，AIMD 不超过该值）
+sec_limiter = RateLimiter(rate=8.0, burst=3, name="sec_edgar", max_rate=10.0, min_rate=1.0)
 sec_breaker = CircuitBreaker("sec_edgar", failure_threshold=3, recovery_timeout=120.0)
 
-# Polymarket: 保守 2 req/s
-polymarket_limiter = RateLimiter(rate=2.0, burst=2)
+# Polymarket: 保守 2 req/s 起步，无 429 时逐步探到 5 req/s
+polymarket_limiter = RateLimiter(rate=2.0, burst=2, name="polymarket", max_rate=5.0, min_rate=0.5)
 polymarket_breaker = CircuitBreaker("polymarket", failure_threshold=5, recovery_timeout=60.0)
 
-# yfinance: ~3 req/s
-yfinance_limiter = RateLimiter(rate=3.0, burst=2)
+# yfinance: ~3 req/s 起步（无公开上限，被限流时减半）
+yfinance_limiter = RateLimiter(rate=3.0, burst=2, name="yfinance", max_rate=6.0, min_rate=0.3)
 yfinance_breaker = CircuitBreaker("yfinance", failure_threshold=5, recovery_timeout=90.0)
+
+# LLM（Anthropic API）：熔断器；token/分钟限流器由 llm_service 按 LLM_CONFIG["dispatcher"] 创建
+llm_breaker = CircuitBreaker("llm", failure_threshold=3, recovery_timeout=120.0)
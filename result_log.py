@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+🐝 Alpha Hive 追加式结果日志 - 扫描 checkpoint / 当日蜂群结果 / 当日报告的增量持久化
+
+替代"每个 ticker 完成后重写整个 JSON"的做法（O(n²) 字节写入）：
+- 每条记录追加一行 JSON（JSON Lines）或一个二进制帧（.bin，见 compact_codec），只写新增部分
+- fsync 批量执行（每 N 条或每 T 秒），兼顾崩溃安全与吞吐
+- 回放时同一 key 以最后一条为准，截断的尾行自动跳过
+- 切换到 .bin 前写下的当日 .jsonl 日志作为 legacy_path 先回放，再由 .bin 覆盖
+
+用法：
+    log = checkpoint_log(PATHS.home, "abc")   # .checkpoint_abc.bin
+    done = log.replay()              # {ticker: result}
+    log.append("NVDA", distilled)
+    log.close()
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import compact_codec
+from hive_logger import get_logger, atomic_json_write
+
+_log = get_logger("result_log")
+
+
+class AppendOnlyLog:
+    """线程安全的追加式日志（key → 最新记录；JSONL 或紧凑二进制帧）"""
+
+    def __init__(self, path, fsync_every: int = 8, fsync_interval: float = 2.0,
+                 binary: Optional[bool] = None, legacy_path=None):
+        """
+        Args:
+            path: 日志文件路径
+            fsync_every: 累计多少条未同步记录后强制 fsync
+            fsync_interval: 距上次 fsync 超过多少秒后强制 fsync
+            binary: 是否使用紧凑二进制帧；默认按扩展名判断（.bin → 二进制）
+            legacy_path: 旧格式日志（只读；回放时先读取，再由 path 中的记录覆盖）
+        """
+        self.path = Path(path)
+        self.binary = self.path.suffix == ".bin" if binary is None else binary
+        self.legacy = AppendOnlyLog(legacy_path) if legacy_path else None
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self._lock = threading.Lock()
+        self._fh = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    # ==================== 写入 ====================
+
+    def _encode(self, key: str, record) -> bytes:
+        entry = {"k": key, "ts": time.time(), "v": record}
+        if self.binary:
+            return compact_codec.encode_frame(entry)
+        return (json.dumps(entry, default=str, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def _open_locked(self) -> None:
+        if self._fh is None:
+            self._fh = open(self.path, "ab")
+
+    def append(self, key: str, record: Dict) -> None:
+        """追加一条记录（写入 OS 缓冲；按批次 fsync 到磁盘）"""
+        data = self._encode(key, record)
+        with self._lock:
+            self._open_locked()
+            self._fh.write(data)
+            self._fh.flush()
+            self._unsynced += 1
+            if (self._unsynced >= self.fsync_every
+                    or time.monotonic() - self._last_sync >= self.fsync_interval):
+                self._sync_locked()
+
+    def append_many(self, records: Dict[str, Dict]) -> None:
+        """批量追加（一次 fsync）"""
+        data = b"".join(self._encode(key, record) for key, record in records.items())
+        with self._lock:
+            self._open_locked()
+            self._fh.write(data)
+            self._unsynced += len(records)
+            self._fh.flush()
+            self._sync_locked()
+
+    def flush(self) -> None:
+        """立即 fsync 所有已写入记录"""
+        with self._lock:
+            self._sync_locked()
+
+    def _sync_locked(self) -> None:
+        if self._fh is not None and self._unsynced:
+            os.fsync(self._fh.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """fsync 并关闭文件句柄"""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+                self._sync_locked()
+                self._fh.close()
+                self._fh = None
+
+    def exists(self) -> bool:
+        """日志文件（或旧格式日志）是否存在"""
+        return self.path.exists() or (self.legacy is not None and self.legacy.exists())
+
+    def unlink(self) -> None:
+        """关闭并删除日志文件（含旧格式日志；扫描成功完成后清理 checkpoint）"""
+        self.close()
+        try:
+            self.path.unlink(missing_ok=True)
+        except OSError as e:
+            _log.debug("日志清理失败 %s: %s", self.path, e)
+        if self.legacy is not None:
+            self.legacy.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # ==================== 回放 ====================
+
+    def replay(self) -> Dict[str, Dict]:
+        """回放日志：返回 {key: 最新记录}（损坏或截断的行被跳过；旧格式日志先回放）"""
+        results: Dict[str, Dict] = self.legacy.replay() if self.legacy is not None else {}
+        if not self.path.exists():
+            return results
+        skipped = 0
+        try:
+            with open(self.path, "rb") as f:
+                if self.binary:
+                    bodies = compact_codec.iter_frames(f)
+                else:
+                    bodies = (line for line in (ln.strip() for ln in f) if line)
+                for body in bodies:
+                    try:
+                        entry = (compact_codec.decode(body) if self.binary
+                                 else json.loads(body))
+                        results[entry["k"]] = entry["v"]
+                    except (ValueError, KeyError, TypeError):
+                        skipped += 1
+        except OSError as e:
+            _log.warning("日志回放失败 %s: %s", self.path, e)
+        if skipped:
+            _log.warning("日志 %s 跳过 %d 条损坏记录", self.path.name, skipped)
+        return results
+
+
+# ==================== 扫描 checkpoint ====================
+
+def checkpoint_log(report_dir, session_id: str) -> AppendOnlyLog:
+    """扫描 checkpoint 日志（紧凑二进制帧，每个 ticker 完成后追加一条；兼容旧版 .jsonl）"""
+    report_dir = Path(report_dir)
+    return AppendOnlyLog(report_dir / f".checkpoint_{session_id}.bin",
+                         legacy_path=report_dir / f".checkpoint_{session_id}.jsonl")
+
+
+def llm_pending_key(ticker: str) -> str:
+    """checkpoint 中"待批量 LLM 蒸馏"标记的 key（值为该标的原始 Agent 结果；None = 已增强）"""
+    return f"{ticker}|llm_pending"
+
+
+def replay_llm_pending(records: Dict[str, Dict], tickers) -> Dict[str, List]:
+    """
+    从 checkpoint 回放结果中取出尚未完成批量 LLM 蒸馏的标的
+
+    这些标的的 checkpoint 仅含规则引擎结果（扫描在批量蒸馏前中断），恢复时需重新排队 LLM 步骤
+
+    Returns:
+        {ticker: 原始 Agent 结果}
+    """
+    return {t: records[llm_pending_key(t)] for t in tickers
+            if records.get(llm_pending_key(t)) is not None}
+
+
+def agent_outputs_log(report_dir, date_str: str) -> AppendOnlyLog:
+    """当日 Agent 输出日志（盘中增量重扫复用上一批 analyze 输出，key = "ticker|agent"）"""
+    return AppendOnlyLog(Path(report_dir) / f".agent_outputs_{date_str}.bin")
+
+
+# ==================== 当日蜂群结果 ====================
+
+def swarm_results_log(report_dir, date_str: str) -> AppendOnlyLog:
+    """当日蜂群结果日志（紧凑二进制帧；每批扫描只追加本批结果；兼容旧版 .jsonl）"""
+    report_dir = Path(report_dir)
+    return AppendOnlyLog(report_dir / f".swarm_results_{date_str}.bin",
+                         legacy_path=report_dir / f".swarm_results_{date_str}.jsonl")
+
+
+def load_swarm_results(report_dir, date_str: str) -> Dict[str, Dict]:
+    """
+    读取当日蜂群结果（每个 ticker 取最新一批）
+
+    兼容旧格式：依次读取 .json 快照、.jsonl 日志，再用 .bin 日志覆盖（后两者见 swarm_results_log）。
+    """
+    report_dir = Path(report_dir)
+    results: Dict[str, Dict] = {}
+    legacy = report_dir / f".swarm_results_{date_str}.json"
+    if legacy.exists():
+        try:
+            with open(legacy, encoding="utf-8") as f:
+                data = json.load(f)
+            if isinstance(data, dict):
+                results.update(data)
+        except (OSError, json.JSONDecodeError) as e:
+            _log.debug("旧版蜂群结果读取失败: %s", e)
+    results.update(swarm_results_log(report_dir, date_str).replay())
+    return results
+
+
+def latest_swarm_results_date(report_dir, date_strs) -> Optional[str]:
+    """在候选日期中返回第一个存在蜂群结果的日期（新格式或旧格式）"""
+    report_dir = Path(report_dir)
+    for d in date_strs:
+        if any((report_dir / f".swarm_results_{d}{ext}").exists()
+               for ext in (".bin", ".jsonl", ".json")):
+            return d
+    return None
+
+
+# ==================== 当日报告 ====================
+
+# 每批报告中不进入 header 记录的大字段（单独按 ticker / 批次存储，或不持久化）
+_BATCH_FIELDS = ("opportunities", "markdown_report", "twitter_threads")
+
+
+class DailyReportStore:
+    """
+    当日报告的追加式存储（.report_<date>.bin，紧凑二进制帧；兼容旧版 .report_<date>.jsonl）
+
+    每批扫描只追加本批内容：
+    - "report"       → 最新一批的报告头（swarm_metadata / macro_context 等）
+    - "opp:<ticker>" → 该 ticker 最新的 opportunity
+    - "md:<tickers>" → 每批 Markdown 简报（按本批 ticker 集合取最新；
+                       所含 ticker 全部被更晚批次覆盖的旧批次在 materialize 时丢弃）
+
+    alpha-hive-daily-<date>.json / .md 由 materialize() 按需生成，不再"读旧文件-合并-重写"。
+    """
+
+    def __init__(self, report_dir, date_str: str):
+        self.report_dir = Path(report_dir)
+        self.date_str = date_str
+        self.json_path = self.report_dir / f"alpha-hive-daily-{date_str}.json"
+        self.md_path = self.report_dir / f"alpha-hive-daily-{date_str}.md"
+        self.log = AppendOnlyLog(self.report_dir / f".report_{date_str}.bin",
+                                 legacy_path=self.report_dir / f".report_{date_str}.jsonl")
+
+    def append_batch(self, report: Dict) -> None:
+        """追加一批报告（一次写入 + 一次 fsync）"""
+        if not self.log.exists():
+            self._seed_from_legacy()
+        self._append(report)
+
+    def _append(self, report: Dict) -> None:
+        records: Dict[str, object] = {
+            "report": {k: v for k, v in report.items() if k not in _BATCH_FIELDS},
+        }
+        tickers = []
+        for opp in report.get("opportunities", []):
+            if opp.get("ticker"):
+                records[f"opp:{opp['ticker']}"] = opp
+                tickers.append(opp["ticker"])
+        if report.get("markdown_report"):
+            tickers = sorted(set(tickers))
+            scope = ",".join(tickers) or uuid.uuid4().hex
+            records[f"md:{scope}"] = {"tickers": tickers, "text": report["markdown_report"],
+                                      "ts": time.time()}
+        self.log.append_many(records)
+        self.log.close()
+
+    def _seed_from_legacy(self) -> None:
+        """当日已有旧版 JSON/MD（升级前生成）时，先将其作为第一批导入"""
+        if not self.json_path.exists():
+            return
+        try:
+            with open(self.json_path, encoding="utf-8") as f:
+                legacy = json.load(f)
+            if self.md_path.exists():
+                legacy["markdown_report"] = self.md_path.read_text(encoding="utf-8")
+        except (OSError, json.JSONDecodeError) as e:
+            _log.warning("旧版当日报告导入失败: %s", e)
+            return
+        if isinstance(legacy, dict):
+            self._append(legacy)
+
+    def materialize(self) -> Dict:
+        """回放存储，生成合并后的当日报告（opportunities 按 ticker 取最新、按分数降序）"""
+        entries = self.log.replay()
+        report = dict(entries.get("report") or {})
+        opps = [v for k, v in entries.items() if k.startswith("opp:")]
+        opps.sort(key=lambda o: o.get("opp_score", o.get("opportunity_score", 0)) or 0,
+                  reverse=True)
+        md_batches = self._latest_markdown(entries)
+        report["opportunities"] = opps
+        report["markdown_report"] = "\n\n---\n\n".join(md_batches)
+        if len(md_batches) > 1 and isinstance(report.get("swarm_metadata"), dict):
+            report["swarm_metadata"] = dict(report["swarm_metadata"], tickers_analyzed=len(opps))
+        return report
+
+    @staticmethod
+    def _latest_markdown(entries: Dict) -> List[str]:
+        """Markdown 批次按时间排序；ticker 全部被更晚批次覆盖的批次丢弃（同一 ticker 反复重扫只保留最新一份）"""
+        batches = []
+        for key, value in entries.items():
+            if not key.startswith("md:"):
+                continue
+            if isinstance(value, str):
+                value = {"tickers": [], "text": value, "ts": 0.0}   # 旧版记录（按 uuid 追加）
+            batches.append(value)
+        batches.sort(key=lambda b: b.get("ts", 0.0))
+        kept: List[str] = []
+        covered: set = set()
+        for batch in reversed(batches):
+            tickers = set(batch.get("tickers") or ())
+            if tickers and tickers <= covered:
+                continue
+            covered |= tickers
+            kept.append(batch["text"])
+        kept.reverse()
+        return kept
+
+    def artifacts_age(self) -> float:
+        """距上次生成 JSON / MD 文件的秒数（尚未生成时为 inf）"""
+        try:
+            return max(0.0, time.time() - self.json_path.stat().st_mtime)
+        except OSError:
+            return float("inf")
+
+    def write_artifacts(self, report: Optional[Dict] = None) -> Dict:
+        """将合并后的报告写出为 JSON / Markdown 文件（report 为空时先 materialize）"""
+        if report is None:
+            report = self.materialize()
+        atomic_json_write(self.json_path, report, indent=2)
+        self.md_path.write_text(report.get("markdown_report", ""), encoding="utf-8")
+        return report
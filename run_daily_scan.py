@@ -10,7 +10,21 @@ _log = _logging.getLogger("alpha_hive.run_daily_scan")
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-try:
+
+def main():
+    """执行每日扫描（导入本模块不触发扫描；重依赖在此处才加载）"""
+    try:
+        _run()
+    except (ValueError, KeyError, TypeError, AttributeError, OSError) as e:
+        _log.error("扫描失败: %s", e, exc_info=True)
+        print(f"\n扫描失败: {e}\n")
+        import traceback
+        traceback.print_exc()
+        _notify_failure(e)
+        sys.exit(1)
+
+
+def _run():
     from alpha_hive_daily_report import AlphaHiveDailyReporter
     from slack_report_notifier import SlackReportNotifier
 
@@ -51,12 +65,8 @@ try:
 
     print("\n蜂群扫描完成！")
 
-except (ValueError, KeyError, TypeError, AttributeError, OSError) as e:
-    _log.error("扫描失败: %s", e, exc_info=True)
-    print(f"\n扫描失败: {e}\n")
-    import traceback
-    traceback.print_exc()
 
+def _notify_failure(e: Exception):
     try:
         from slack_report_notifier import SlackReportNotifier
         n = SlackReportNotifier()
@@ -69,4 +79,6 @@ except (ValueError, KeyError, TypeError, AttributeError, OSError) as e:
     except (ConnectionError, TimeoutError, OSError, ValueError) as exc:
         _log.debug("Slack 失败通知发送失败: %s", exc)
 
-    sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -2,9 +2,10 @@
 """
 🐝 Alpha Hive - 自动化定时任务调度器
 支持定时采集数据和生成报告
+
+schedule 库与日志文件在真正启动调度时才加载 / 创建（cron 等短命令不受影响）
 """
 
-import schedule
 import time
 import json
 import subprocess
@@ -14,18 +15,21 @@ import os
 
 _PROJECT_ROOT = os.environ.get("ALPHA_HIVE_HOME", os.path.dirname(os.path.abspath(__file__)))
 
-# 配置日志
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(os.path.join(_PROJECT_ROOT, 'scheduler.log')),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
+def _setup_logging():
+    """配置日志（控制台 + scheduler.log）；由命令行入口调用，导入本模块不产生文件"""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.FileHandler(os.path.join(_PROJECT_ROOT, 'scheduler.log')),
+            logging.StreamHandler()
+        ]
+    )
+
+
 class ReportScheduler:
     """报告生成调度器"""
 
@@ -183,6 +187,7 @@ class ReportScheduler:
 
 def setup_scheduler():
     """设置定时任务"""
+    import schedule
     scheduler = ReportScheduler()
 
     # 每 5 分钟采集一次数据（高频更新关键指标）
@@ -220,6 +225,7 @@ def setup_scheduler():
 
 def run_scheduler(scheduler):
     """运行调度器（阻塞）"""
+    import schedule
     logger.info("🚀 调度器已启动，等待任务触发...")
     logger.info("按 Ctrl+C 停止")
 
@@ -285,6 +291,9 @@ def print_cron_commands():
 if __name__ == "__main__":
     import sys
 
+    if len(sys.argv) == 1 or sys.argv[1] in ("once", "daemon"):
+        _setup_logging()
+
     if len(sys.argv) > 1:
         if sys.argv[1] == "once":
             # 一次性执行
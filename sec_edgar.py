@@ -17,6 +17,7 @@ import xml.etree.ElementTree as ET
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
 
 try:
     import requests
@@ -25,6 +26,7 @@ except ImportError:
 
 from hive_logger import PATHS, get_logger, atomic_json_write
 from resilience import sec_limiter, sec_breaker
+import tracing
 
 _log = get_logger("sec_edgar")
 
@@ -94,10 +96,11 @@ class SECEdgarClient:
 
     # ==================== 请求限流 ====================
 
-    def _throttle(self):
-        """通过 RateLimiter 遵守 SEC 10 req/s 限制"""
-        sec_limiter.acquire()
+    def _throttle(self, url: str = ""):
+        """通过 RateLimiter 遵守 SEC 10 req/s 限制（按 host 公平排队：www / data / efts 轮流获批）"""
+        sec_limiter.acquire(key=urlparse(url).hostname if url else None)
 
+    @tracing.traced("fetch.sec")
     def _request_get(self, url: str, headers: Dict = None, timeout: int = 15):
         """带熔断保护的 HTTP GET"""
         if requests is None:
@@ -106,18 +109,28 @@ class SECEdgarClient:
         if not sec_breaker.allow_request():
             _log.warning("SEC EDGAR 熔断器已打开，跳过请求: %s", url[:80])
             return None
+        self._throttle(url)
+        started = time.monotonic()
         try:
-            self._throttle()
             resp = requests.get(url, headers=headers or SEC_HEADERS, timeout=timeout)
+            sec_limiter.feedback(resp.status_code, resp.headers)
             resp.raise_for_status()
-            sec_breaker.record_success()
+            sec_breaker.record_success(time.monotonic() - started)
             return resp
         except (ConnectionError, TimeoutError, OSError, ValueError) as e:
-            sec_breaker.record_failure()
+            sec_breaker.record_failure(time.monotonic() - started)
             raise
 
     # ==================== Form 4 列表 ====================
 
+    def invalidate_cache(self, ticker: str) -> None:
+        """删除该 ticker 的 Form 4 列表 / 内幕交易摘要缓存（事件驱动重扫前调用，确保拉取到新申报）"""
+        for name in (f"{ticker}_form4_list.json", f"{ticker}_insider_summary.json"):
+            try:
+                (CACHE_DIR / name).unlink(missing_ok=True)
+            except OSError as e:
+                _log.debug("Form4 cache invalidate failed: %s", e)
+
     def get_recent_form4_filings(
         self, ticker: str, limit: int = 20
     ) -> List[Dict]:
@@ -533,11 +546,22 @@ _client: Optional[SECEdgarClient] = None
 _client_lock = threading.Lock()
 
 
-def get_insider_trades(ticker: str, days: int = 30) -> Dict:
-    """便捷函数：获取内幕交易摘要"""
+def get_sec_client() -> SECEdgarClient:
+    """进程级共享客户端（CIK 映射只加载一次）"""
     global _client
     if _client is None:
         with _client_lock:
             if _client is None:
                 _client = SECEdgarClient()
-    return _client.get_insider_trades(ticker, days=days)
+    return _client
+
+
+def get_cik(ticker: str) -> Optional[str]:
+    """便捷函数：ticker → CIK（使用共享客户端的 CIK 映射）"""
+    cik = get_sec_client()._cik_map.get(ticker.upper())
+    return str(cik) if cik else None
+
+
+def get_insider_trades(ticker: str, days: int = 30) -> Dict:
+    """便捷函数：获取内幕交易摘要"""
+    return get_sec_client().get_insider_trades(ticker, days=days)
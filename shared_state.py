@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+🐝 Alpha Hive 跨进程弹性状态 - SQLite 共享令牌桶 + 熔断器状态
+
+定时扫描、桌面端 LiveMonitor、earnings_watcher 与手动 make scan 常同时运行；
+各进程独立的 RateLimiter 会叠加超出 SEC 10 req/s / yfinance 的限额而触发封禁。
+同一主机上所有 Alpha Hive 进程通过同一个 SQLite 文件协调：
+
+- rate_buckets：每个数据源一个令牌桶（token 余量、AIMD 速率、Retry-After 暂停截止时间）
+- breakers：每个数据源的熔断状态（连续失败数、打开时间）
+
+每次操作是一个 BEGIN IMMEDIATE 短事务（WAL 模式，写锁互斥），时间使用墙钟 time.time()。
+长时间未使用的桶（stale_seconds）按调用方的初始速率 / 容量重置，避免前一天的降速残留。
+
+用法：
+    store = get_shared_state()              # 禁用时为 None
+    wait, rate = store.take("sec_edgar", 1.0, rate=8.0, burst=3)   # wait == 0 表示已获批
+    store.throttle("sec_edgar", rate=8.0, burst=3, decrease=0.5, min_rate=1.0, retry_after=10)
+    state, failures = store.breaker_failure("sec_edgar", threshold=3)
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional, Tuple
+
+from hive_logger import PATHS, get_logger
+
+_log = get_logger("shared_state")
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class SharedStateStore:
+    """跨进程共享的限流 / 熔断状态（线程安全：每线程一个连接，fork 后自动重连）"""
+
+    def __init__(self, db_path: str = None, stale_seconds: float = 3600.0, busy_timeout: float = 5.0):
+        """
+        Args:
+            db_path: SQLite 文件路径（默认 <cache_dir>/resilience_state.db）
+            stale_seconds: 桶超过该时长未更新时按调用方参数重置
+            busy_timeout: 等待其他进程释放写锁的秒数
+        """
+        self._db_path = db_path or str(PATHS.cache_dir / "resilience_state.db")
+        self.stale_seconds = stale_seconds
+        self.busy_timeout = busy_timeout
+        self._local = threading.local()
+        self._init_db()
+
+    @property
+    def db_path(self) -> str:
+        return self._db_path
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            os.makedirs(os.path.dirname(self._db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self._db_path, timeout=self.busy_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    @contextmanager
+    def _txn(self):
+        """写事务：BEGIN IMMEDIATE 立即取得写锁，读-改-写期间其他进程排队"""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _init_db(self):
+        with self._txn() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    name TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    rate REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    blocked_until REAL DEFAULT 0.0,
+                    last_decrease REAL DEFAULT 0.0
+                )
+            """)
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS breakers (
+                    name TEXT PRIMARY KEY,
+                    state TEXT NOT NULL,
+                    failures INTEGER DEFAULT 0,
+                    opened_at REAL DEFAULT 0.0
+                )
+            """)
+
+    # ==================== 令牌桶 ====================
+
+    def _load_bucket(self, conn, name: str, now: float, rate: float, burst: float) -> list:
+        """读取并补充令牌：[tokens, rate, blocked_until, last_decrease]；不存在或过期时按调用方参数新建"""
+        row = conn.execute(
+            "SELECT tokens, rate, updated, blocked_until, last_decrease FROM rate_buckets WHERE name = ?",
+            (name,),
+        ).fetchone()
+        if row is None or now - row[2] > self.stale_seconds:
+            return [float(burst), float(rate), 0.0, 0.0]
+        tokens, cur_rate, updated, blocked_until, last_decrease = row
+        tokens = min(float(burst), tokens + max(0.0, now - updated) * cur_rate)
+        return [tokens, cur_rate, blocked_until, last_decrease]
+
+    @staticmethod
+    def _save_bucket(conn, name: str, now: float, bucket: list):
+        conn.execute(
+            "INSERT OR REPLACE INTO rate_buckets (name, tokens, rate, updated, blocked_until, last_decrease) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (name, bucket[0], bucket[1], now, bucket[2], bucket[3]),
+        )
+
+    def take(self, name: str, tokens: float, rate: float, burst: float) -> Tuple[float, float]:
+        """
+        从共享桶取 tokens 个 token
+
+        Args:
+            rate / burst: 调用方的初始速率与桶容量（桶不存在或过期时使用）
+
+        Returns:
+            (wait, rate)：wait == 0 表示已获批；否则为预计需等待的秒数（未扣除 token）
+        """
+        now = time.time()
+        with self._txn() as conn:
+            bucket = self._load_bucket(conn, name, now, rate, burst)
+            if now >= bucket[2] and bucket[0] >= tokens:
+                bucket[0] -= tokens
+                wait = 0.0
+            else:
+                wait = max(bucket[2] - now, (tokens - bucket[0]) / bucket[1], 1e-3)
+            self._save_bucket(conn, name, now, bucket)
+        return wait, bucket[1]
+
+    def succeed(self, name: str, rate: float, burst: float, increase: float, max_rate: float) -> float:
+        """成功反馈：加性提速（不超过 max_rate），返回新速率"""
+        now = time.time()
+        with self._txn() as conn:
+            bucket = self._load_bucket(conn, name, now, rate, burst)
+            if bucket[1] < max_rate:
+                bucket[1] = min(max_rate, bucket[1] + increase)
+                self._save_bucket(conn, name, now, bucket)
+        return bucket[1]
+
+    def throttle(self, name: str, rate: float, burst: float, decrease: float, min_rate: float,
+                 retry_after: Optional[float] = None) -> float:
+        """限流反馈：乘性降速（所有进程合计每秒最多一次）、清空令牌、设置暂停截止时间，返回新速率"""
+        now = time.time()
+        with self._txn() as conn:
+            bucket = self._load_bucket(conn, name, now, rate, burst)
+            if now - bucket[3] >= 1.0:
+                bucket[1] = max(min_rate, bucket[1] * decrease)
+                bucket[3] = now
+            bucket[0] = 0.0
+            if retry_after:
+                bucket[2] = max(bucket[2], now + retry_after)
+            self._save_bucket(conn, name, now, bucket)
+        return bucket[1]
+
+    # ==================== 熔断器 ====================
+
+    def breaker_state(self, name: str, recovery_timeout: float) -> Tuple[str, bool]:
+        """
+        当前状态（OPEN 超过冷却时间时转 HALF_OPEN）→ (state, 本次是否发生转换)
+
+        每次请求都会调用：普通读不取写锁，仅 OPEN → HALF_OPEN 转换时开写事务并复核状态
+        """
+        row = self._conn().execute("SELECT state, opened_at FROM breakers WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return CLOSED, False
+        state, opened_at = row
+        if state != OPEN or time.time() - opened_at < recovery_timeout:
+            return state, False
+        with self._txn() as conn:
+            row = conn.execute("SELECT state, opened_at FROM breakers WHERE name = ?", (name,)).fetchone()
+            if row is None:
+                return CLOSED, False
+            state, opened_at = row
+            if state == OPEN and time.time() - opened_at >= recovery_timeout:
+                conn.execute("UPDATE breakers SET state = ? WHERE name = ?", (HALF_OPEN, name))
+                return HALF_OPEN, True
+            return state, False
+
+    def breaker_success(self, name: str) -> str:
+        """记录成功：置 CLOSED、清零失败计数，返回之前的状态（已是 CLOSED 且无失败计数时不写）"""
+        row = self._conn().execute("SELECT state, failures FROM breakers WHERE name = ?", (name,)).fetchone()
+        if row is None or (row[0] == CLOSED and not row[1]):
+            return CLOSED
+        with self._txn() as conn:
+            row = conn.execute("SELECT state FROM breakers WHERE name = ?", (name,)).fetchone()
+            conn.execute("INSERT OR REPLACE INTO breakers (name, state, failures, opened_at) VALUES (?, ?, 0, 0.0)",
+                         (name, CLOSED))
+        return row[0] if row else CLOSED
+
+    def breaker_failure(self, name: str, threshold: int) -> Tuple[str, int, bool]:
+        """记录失败：连续失败达到阈值时打开 → (state, failures, 本次是否由非 OPEN 转为 OPEN)"""
+        now = time.time()
+        with self._txn() as conn:
+            row = conn.execute("SELECT state, failures FROM breakers WHERE name = ?", (name,)).fetchone()
+            prev, failures = (row[0], row[1] + 1) if row else (CLOSED, 1)
+            state = OPEN if failures >= threshold else prev
+            conn.execute("INSERT OR REPLACE INTO breakers (name, state, failures, opened_at) VALUES (?, ?, ?, ?)",
+                         (name, state, failures, now))
+        return state, failures, state == OPEN and prev != OPEN
+
+    def breaker_reset(self, name: str) -> None:
+        with self._txn() as conn:
+            conn.execute("DELETE FROM breakers WHERE name = ?", (name,))
+
+
+# ==================== 全局实例 ====================
+
+_store: Optional[SharedStateStore] = None
+_store_lock = threading.Lock()
+_store_failed = False
+
+
+def shared_state_enabled() -> bool:
+    """RESILIENCE_CONFIG["shared_state"]["enabled"]；环境变量 ALPHA_HIVE_SHARED_LIMITS=0/1 优先"""
+    env = os.environ.get("ALPHA_HIVE_SHARED_LIMITS")
+    if env is not None:
+        return env.strip().lower() not in ("0", "false", "no", "off", "")
+    from config import RESILIENCE_CONFIG
+    return bool(RESILIENCE_CONFIG.get("shared_state", {}).get("enabled", False))
+
+
+def get_shared_state() -> Optional[SharedStateStore]:
+    """进程级共享状态；禁用或初始化失败时返回 None（限流 / 熔断退回进程内状态）"""
+    global _store, _store_failed
+    if not shared_state_enabled():
+        return None
+    if _store is None and not _store_failed:
+        with _store_lock:
+            if _store is None and not _store_failed:
+                from config import RESILIENCE_CONFIG
+                cfg = RESILIENCE_CONFIG.get("shared_state", {})
+                try:
+                    _store = SharedStateStore(
+                        db_path=cfg.get("db_path"),
+                        stale_seconds=cfg.get("stale_seconds", 3600.0),
+                        busy_timeout=cfg.get("busy_timeout_seconds", 5.0),
+                    )
+                except (sqlite3.Error, OSError) as e:
+                    _store_failed = True
+                    _log.warning("共享限流状态初始化失败，退回进程内限流: %s", e)
+    return _store
@@ -16,7 +16,7 @@ Agent → 维度映射：
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from pheromone_board import PheromoneBoard, PheromoneEntry
 import json
 import logging as _logging
@@ -31,7 +31,9 @@ _log = _logging.getLogger("alpha_hive.swarm")
 import time as _time
 import threading as _threading
 
-from resilience import yfinance_limiter, yfinance_breaker
+import tracing
+from resilience import (yfinance_limiter, yfinance_breaker, collect_source_stats, merge_source_stats,
+                        rate_limit_signal, throttle_errors, with_priority)
 from models import DataQualityChecker as _DQChecker
 
 _yf_cache: Dict[str, Dict] = {}
@@ -51,8 +53,16 @@ def _fetch_stock_data(ticker: str) -> Dict:
     with _yf_lock:
         cached = _yf_cache.get(ticker)
         if cached and (_time.time() - _yf_cache_ts.get(ticker, 0)) < _YF_CACHE_TTL:
+            tracing.event("cache.yfinance.hit", ticker=ticker)
             return cached
 
+    tracing.event("cache.yfinance.miss", ticker=ticker)
+    with tracing.span("fetch.yfinance", ticker=ticker):
+        return _download_stock_data(ticker)
+
+
+def _download_stock_data(ticker: str) -> Dict:
+    """_fetch_stock_data 的未缓存路径（限流 + 熔断 + 重试，成功后写入缓存）"""
     data = {
         "price": 100.0,
         "momentum_5d": 0.0,
@@ -65,11 +75,16 @@ def _fetch_stock_data(ticker: str) -> Dict:
         return data
 
     for attempt in range(_YF_MAX_RETRIES + 1):
+        if attempt:
+            yfinance_breaker.record_retry()
+        started = None
         try:
             yfinance_limiter.acquire()
             import yfinance as yf
+            started = _time.monotonic()
             t = yf.Ticker(ticker)
             hist = t.history(period="1mo")
+            latency = _time.monotonic() - started
             if hist.empty:
                 if attempt < _YF_MAX_RETRIES:
                     _time.sleep(1.0 * (2 ** attempt))
@@ -98,15 +113,19 @@ def _fetch_stock_data(ticker: str) -> Dict:
             with _yf_lock:
                 _yf_cache[ticker] = data
                 _yf_cache_ts[ticker] = _time.time()
-            yfinance_breaker.record_success()
+            yfinance_breaker.record_success(latency)
+            yfinance_limiter.on_success()
             break
 
-        except (ConnectionError, TimeoutError, OSError, ValueError, KeyError) as e:
+        except (ConnectionError, TimeoutError, OSError, ValueError, KeyError) + throttle_errors() as e:
             _log.warning("yfinance fetch %s attempt %d failed: %s", ticker, attempt, e)
+            retry_after = rate_limit_signal(e)
+            if retry_after is not None:
+                yfinance_limiter.on_throttle(retry_after)
             if attempt < _YF_MAX_RETRIES:
                 _time.sleep(1.0 * (2 ** attempt))
             else:
-                yfinance_breaker.record_failure()
+                yfinance_breaker.record_failure(_time.monotonic() - started if started else None)
 
     return data
 
@@ -173,54 +192,130 @@ class BeeAgent(ABC):
             return ""
 
 
-def prefetch_shared_data(tickers: list, retriever=None) -> Dict:
+def prefetch_shared_data(tickers: list, retriever=None, agent_ids: list = None) -> Dict:
     """
-    批量预取所有 ticker 的共享数据（yfinance + VectorMemory），
-    避免 6 个 Agent 各自重复请求。
+    批量预取所有 ticker 的共享数据（yfinance + VectorMemory + 回测准确率），
+    避免 6 个 Agent 各自重复请求。行情优先取自 market_feed 共享环形缓冲（LiveMonitor 已拉取的 bar）。
 
-    返回: {"stock_data": {ticker: data}, "contexts": {ticker: str}}
+    记忆/回测上下文为常数次 DB 往返：向量库 1 次批量查询 + predictions 表 1 次 SQL，
+    再按 Agent 派生专属上下文字符串。
+
+    返回: {"stock_data": {ticker: data}, "contexts": {ticker: str},
+           "agent_contexts": {agent_id: {ticker: str}}}
     """
+    agent_ids = list(agent_ids or [])
     stock_data = {}
-    contexts = {}
+    # {ticker: {"BeeAgent": 通用上下文, agent_id: 专属上下文}}
+    per_ticker: Dict[str, Dict[str, str]] = {t: {} for t in tickers}
 
-    # 1. 批量预取 yfinance（串行但有全局缓存，只请求一次/ticker）
+    # 1. 批量预取 yfinance（优先复用共享行情源中的新鲜 bar；其余串行拉取，有全局缓存）
+    try:
+        from market_feed import get_market_feed
+        feed = get_market_feed()
+    except ImportError:
+        feed = None
+    reused = 0
     for t in tickers:
-        stock_data[t] = _fetch_stock_data(t)
-
-    # 2. 批量预取 VectorMemory 上下文（一次查询/ticker，而非 6 次）
-    if retriever and hasattr(retriever, 'get_context_for_agent'):
+        data = feed.stock_data(t, max_age=_YF_CACHE_TTL) if feed else None
+        if data is not None:
+            reused += 1
+            tracing.event("cache.market_feed.hit", ticker=t)
+        stock_data[t] = data if data is not None else _fetch_stock_data(t)
+    if reused:
+        _log.info("行情预取：%d/%d 标的复用共享行情缓冲", reused, len(tickers))
+
+    # 2. 批量预取 VectorMemory 上下文（单次查询覆盖全部 ticker × Agent）
+    if retriever and hasattr(retriever, 'get_contexts_bulk'):
+        try:
+            per_ticker.update(retriever.get_contexts_bulk(tickers, agent_ids))
+        except (AttributeError, TypeError, ValueError) as e:
+            _log.debug("Bulk context prefetch failed: %s", e)
+    elif retriever and hasattr(retriever, 'get_context_for_agent'):
         for t in tickers:
             try:
-                contexts[t] = retriever.get_context_for_agent(t, "BeeAgent")
+                per_ticker[t]["BeeAgent"] = retriever.get_context_for_agent(t, "BeeAgent")
             except (AttributeError, TypeError, ValueError) as e:
                 _log.debug("Prefetch context failed for %s: %s", t, e)
-                contexts[t] = ""
+                per_ticker[t]["BeeAgent"] = ""
 
-    # 3. P5: 批量预取历史预测准确率（给所有 Agent 注入反馈上下文）
+    # 3. P5: 批量预取历史预测准确率（单次 SQL，给所有 Agent 注入反馈上下文）
+    acc_stats: Dict[str, Dict] = {}
     try:
-        from backtester import Backtester
-        _bt = Backtester()
-        _bt_stats = _bt.store.get_accuracy_stats("t7", days=90)
-        _by_ticker = _bt_stats.get("by_ticker", {})
-        for t in tickers:
-            if t in _by_ticker and _by_ticker[t].get("total", 0) >= 2:
-                info = _by_ticker[t]
-                acc_ctx = (
-                    f"|历史T+7准确率{info['accuracy']*100:.0f}%"
-                    f"({info['total']}次,均收益{info['avg_return']:+.2f}%)"
-                )
-                contexts[t] = (contexts.get(t, "") + acc_ctx).strip("|")
+        from backtester import PredictionStore
+        acc_stats = PredictionStore().get_context_stats(tickers, "t7", days=90)
     except (ImportError, OSError, ValueError, KeyError, TypeError) as e:
         _log.debug("Prefetch backtest context failed: %s", e)
 
-    return {"stock_data": stock_data, "contexts": contexts}
+    contexts: Dict[str, str] = {}
+    agent_contexts: Dict[str, Dict[str, str]] = {a: {} for a in agent_ids}
+    for t in tickers:
+        info = acc_stats.get(t, {})
+        acc_ctx = ""
+        if info.get("total", 0) >= 2:
+            acc_ctx = (
+                f"|历史T+7准确率{info['accuracy']*100:.0f}%"
+                f"({info['total']}次,均收益{info['avg_return']:+.2f}%)"
+            )
+        base = per_ticker.get(t, {}).get("BeeAgent", "")
+        contexts[t] = (base + acc_ctx).strip("|")
+
+        for agent_id in agent_ids:
+            own = per_ticker.get(t, {}).get(agent_id, base) + acc_ctx
+            agent_acc = info.get("agents", {}).get(agent_id, {})
+            if agent_acc.get("total", 0) >= 2:
+                own += f"|本蜂准确率{agent_acc['correct'] / agent_acc['total'] * 100:.0f}%"
+            agent_contexts[agent_id][t] = own.strip("|")
+
+    return {"stock_data": stock_data, "contexts": contexts, "agent_contexts": agent_contexts}
 
 
 def inject_prefetched(agents: list, prefetched: Dict):
-    """将预取数据注入所有 Agent"""
+    """将预取数据注入所有 Agent（有专属上下文的 Agent 使用专属版本）"""
+    agent_contexts = prefetched.get("agent_contexts", {})
     for agent in agents:
         agent._prefetched_stock = prefetched.get("stock_data", {})
-        agent._prefetched_context = prefetched.get("contexts", {})
+        agent._prefetched_context = agent_contexts.get(
+            agent.__class__.__name__, prefetched.get("contexts", {})
+        )
+
+
+def warm_up_clients() -> Dict[str, bool]:
+    """
+    扫描开始前预热进程级共享客户端（SEC CIK 映射、期权分析器、ML 模型训练），
+    使首个 ticker 不承担导入与构造开销；之后所有 Agent 复用同一实例。
+
+    返回: {client_name: 是否预热成功}
+    """
+    status = {}
+    try:
+        from sec_edgar import get_sec_client
+        get_sec_client()
+        status["sec_edgar"] = True
+    except (ImportError, OSError, ValueError) as e:
+        _log.debug("SEC client warm-up skipped: %s", e)
+        status["sec_edgar"] = False
+    try:
+        from options_analyzer import get_options_agent
+        get_options_agent()
+        status["options"] = True
+    except (ImportError, OSError, ValueError) as e:
+        _log.debug("Options agent warm-up skipped: %s", e)
+        status["options"] = False
+    try:
+        from ml_predictor_extended import get_prediction_service
+        get_prediction_service()
+        status["ml_predictor"] = True
+    except (ImportError, OSError, ValueError, KeyError, TypeError) as e:
+        _log.debug("ML service warm-up skipped: %s", e)
+        status["ml_predictor"] = False
+    try:
+        import crowding_detector  # noqa: F401
+        import real_data_sources  # noqa: F401
+        status["crowding"] = True
+    except ImportError as e:
+        _log.debug("Crowding modules warm-up skipped: %s", e)
+        status["crowding"] = False
+    return status
 
 
 # ==================== ScoutBeeNova (Signal 维度) ====================
@@ -260,9 +355,8 @@ class ScoutBeeNova(BeeAgent):
             # ---- 1b. P2: EDGAR RSS 实时流（当日新鲜 Form 4，先于 REST API 反应）----
             try:
                 from edgar_rss import get_today_form4_alerts
-                from sec_edgar import SECEdgarClient as _SEC
-                _cik = str(_SEC()._cik_map.get(ticker.upper(), "")) or None
-                rss_alerts = get_today_form4_alerts(ticker, cik=_cik)
+                from sec_edgar import get_cik
+                rss_alerts = get_today_form4_alerts(ticker, cik=get_cik(ticker))
                 if rss_alerts.get("has_fresh_filings"):
                     fresh_n = rss_alerts["fresh_filings_count"]
                     # 当日新鲜申报信号：提升 insider_score 并在 summary 前注明
@@ -275,8 +369,8 @@ class ScoutBeeNova(BeeAgent):
             # ---- 2. 拥挤度分析（真实数据源）----
             stock = self._get_stock_data(ticker)
 
-            from crowding_detector import CrowdingDetector
-            detector = CrowdingDetector(ticker)
+            from crowding_detector import get_detector
+            detector = get_detector(ticker)
 
             from real_data_sources import get_real_crowding_metrics
             metrics = get_real_crowding_metrics(ticker, stock, self.board)
@@ -417,9 +511,8 @@ class OracleBeeEcho(BeeAgent):
             options_score = 5.0
             signal_summary = "期权数据不可用"
             try:
-                from options_analyzer import OptionsAgent
-                agent = OptionsAgent()
-                result = agent.analyze(ticker, stock_price=current_price)
+                from options_analyzer import get_options_agent
+                result = get_options_agent().analyze(ticker, stock_price=current_price)
                 options_score = result.get("options_score", 5.0)
                 signal_summary = result.get("signal_summary", "平衡")
             except (ImportError, ConnectionError, ValueError, KeyError, TypeError) as e:
@@ -1035,9 +1128,9 @@ class RivalBeeVanguard(BeeAgent):
             # 尝试 ML 预测
             prediction = {}
             try:
-                from ml_predictor_extended import MLPredictionService, TrainingData
+                from ml_predictor_extended import get_prediction_service, TrainingData
                 from datetime import datetime
-                service = MLPredictionService()
+                service = get_prediction_service()
 
                 stock = self._get_stock_data(ticker)
                 opportunity = TrainingData(
@@ -1140,10 +1233,10 @@ class GuardBeeSentinel(BeeAgent):
             # 4. 拥挤度风险折扣（使用真实数据源）
             adj_factor = 1.0
             try:
-                from crowding_detector import CrowdingDetector
+                from crowding_detector import get_detector
                 from real_data_sources import get_real_crowding_metrics
                 stock = self._get_stock_data(ticker)
-                detector = CrowdingDetector(ticker)
+                detector = get_detector(ticker)
                 real_metrics = get_real_crowding_metrics(ticker, stock, self.board)
                 # 覆盖 bullish_agents 为实际信息素板数据
                 real_metrics["bullish_agents"] = bull
@@ -1447,9 +1540,8 @@ class BearBeeContrarian(BeeAgent):
             # 回退：直接调用期权分析模块
             if not options_data:
                 try:
-                    from options_analyzer import OptionsAnalyzer
-                    opt = OptionsAnalyzer()
-                    result = opt.analyze(ticker, stock_price=price if price > 0 else None)
+                    from options_analyzer import get_options_agent
+                    result = get_options_agent().analyze(ticker, stock_price=price if price > 0 else None)
                     if result:
                         data_sources["options"] = "options_api"
                         pc_ratio = result.get("put_call_ratio", 1.0)
@@ -1666,11 +1758,12 @@ class QueenDistiller:
             except (ImportError, AttributeError):
                 self.DIMENSION_WEIGHTS = dict(self.DEFAULT_WEIGHTS)
 
-    def distill(self, ticker: str, agent_results: List[Dict]) -> Dict:
+    def distill(self, ticker: str, agent_results: List[Dict], llm: bool = True) -> Dict:
         """
         5 维加权评分 + 共振增强 + 多数投票 + LLM 推理蒸馏
 
         双引擎：规则引擎始终运行作为基础，LLM 引擎在可用时叠加推理。
+        llm=False 时只跑规则引擎（批量蒸馏模式：扫描完成后由 enhance_batch 统一叠加 LLM）。
         """
         # ===== 规则引擎（始终运行）=====
 
@@ -1852,17 +1945,9 @@ class QueenDistiller:
 
         data_real_pct = round(quality_score / total_fields * 100, 1) if total_fields > 0 else 0.0
 
-        # ===== LLM 引擎（可用时叠加）=====
+        # ===== LLM 引擎（可用时叠加；llm=False 时由 enhance_batch 批量补做）=====
         llm_result = None
-        reasoning = ""
-        key_insight = ""
-        risk_flag = ""
-        llm_confidence = 0.0
-        final_score = rule_score
-        final_direction = rule_direction
-        distill_mode = "rule_engine"
-
-        if self.enable_llm:
+        if self.enable_llm and llm:
             try:
                 import llm_service
                 if llm_service.is_available():
@@ -1877,47 +1962,12 @@ class QueenDistiller:
             except (ImportError, ConnectionError, TimeoutError, ValueError, KeyError) as e:
                 _log.warning("QueenDistiller LLM service unavailable: %s", e)
 
-        if llm_result:
-            distill_mode = "llm_enhanced"
-            reasoning = llm_result.get("reasoning", "")
-            key_insight = llm_result.get("key_insight", "")
-            risk_flag = llm_result.get("risk_flag", "")
-            llm_confidence = llm_result.get("confidence", 0.5)
-
-            llm_score = llm_result.get("final_score")
-            llm_direction = llm_result.get("direction")
-
-            if llm_score is not None and isinstance(llm_score, (int, float)):
-                # 混合策略：规则引擎 60% + LLM 40%（LLM 不完全替代规则引擎）
-                final_score = round(rule_score * 0.6 + float(llm_score) * 0.4, 2)
-                final_score = max(0.0, min(10.0, final_score))
-
-            if llm_direction in ("bullish", "bearish", "neutral"):
-                # LLM 方向与规则引擎一致时采用，不一致时保持规则引擎
-                if llm_direction == rule_direction:
-                    final_direction = llm_direction
-                elif llm_confidence >= 0.7:
-                    # LLM 高置信度时覆盖规则引擎方向
-                    final_direction = llm_direction
+        blend = self._blend_llm(rule_score, rule_direction, llm_result)
 
         # 10. 数据质量折扣（P4 门控）
-        # 数据真实度不足时，将 final_score 向中性值 5.0 压缩，防止低质数据产生高置信结论
-        # ≥ 80%: quality_factor = 1.0（无折扣）
-        # 60–80%: 线性从 1.0 降至 0.875
-        # 40%:    factor = 0.75；0%: factor = 0.5（最大压缩，偏差减半）
-        dq_penalty_applied = False
-        quality_factor = 1.0
-        if data_real_pct < 80.0:
-            quality_factor = round(0.5 + 0.5 * (data_real_pct / 80.0), 3)
-            pre_dq = final_score
-            final_score = round(5.0 + (final_score - 5.0) * quality_factor, 2)
-            final_score = max(0.0, min(10.0, final_score))
-            if abs(final_score - pre_dq) >= 0.05:
-                dq_penalty_applied = True
-                _log.info(
-                    "%s 数据质量折扣: real_pct=%.1f%% factor=%.3f %.2f→%.2f",
-                    ticker, data_real_pct, quality_factor, pre_dq, final_score,
-                )
+        final_score, quality_factor, dq_penalty_applied = self._apply_dq_discount(
+            ticker, blend["final_score"], data_real_pct
+        )
 
         # 保留各 Agent 的原始分析内容（discovery + details）
         agent_details = {}
@@ -1935,7 +1985,7 @@ class QueenDistiller:
         return {
             "ticker": ticker,
             "final_score": final_score,
-            "direction": final_direction,
+            "direction": blend["direction"],
             "resonance": resonance,
             "supporting_agents": len(valid_results),
             "agent_breakdown": {
@@ -1954,11 +2004,11 @@ class QueenDistiller:
             "data_quality": data_quality_summary,
             "data_real_pct": data_real_pct,
             # Phase 1: LLM 推理增强
-            "distill_mode": distill_mode,
-            "reasoning": reasoning,
-            "key_insight": key_insight,
-            "risk_flag": risk_flag,
-            "llm_confidence": llm_confidence,
+            "distill_mode": blend["distill_mode"],
+            "reasoning": blend["reasoning"],
+            "key_insight": blend["key_insight"],
+            "risk_flag": blend["risk_flag"],
+            "llm_confidence": blend["llm_confidence"],
             "rule_score": rule_score,
             "rule_direction": rule_direction,
             "bear_strength": bear_strength,
@@ -1977,3 +2027,500 @@ class QueenDistiller:
             "dimension_missing_reason": dim_missing_reason,
             "dimension_coverage_pct": dimension_coverage_pct,
         }
+
+
+    @staticmethod
+    def _blend_llm(rule_score: float, rule_direction: str, llm_result: Optional[Dict]) -> Dict:
+        """规则引擎结果与 LLM 推理混合（无 LLM 结果时原样返回规则引擎结果）"""
+        blend = {
+            "final_score": rule_score,
+            "direction": rule_direction,
+            "distill_mode": "rule_engine",
+            "reasoning": "",
+            "key_insight": "",
+            "risk_flag": "",
+            "llm_confidence": 0.0,
+        }
+        if not llm_result:
+            return blend
+
+        blend["distill_mode"] = "llm_enhanced"
+        blend["reasoning"] = llm_result.get("reasoning", "")
+        blend["key_insight"] = llm_result.get("key_insight", "")
+        blend["risk_flag"] = llm_result.get("risk_flag", "")
+        llm_confidence = blend["llm_confidence"] = llm_result.get("confidence", 0.5)
+
+        llm_score = llm_result.get("final_score")
+        llm_direction = llm_result.get("direction")
+
+        if llm_score is not None and isinstance(llm_score, (int, float)):
+            # 混合策略：规则引擎 60% + LLM 40%（LLM 不完全替代规则引擎）
+            final_score = round(rule_score * 0.6 + float(llm_score) * 0.4, 2)
+            blend["final_score"] = max(0.0, min(10.0, final_score))
+
+        if llm_direction in ("bullish", "bearish", "neutral"):
+            # LLM 方向与规则引擎一致时采用，不一致时保持规则引擎
+            if llm_direction == rule_direction:
+                blend["direction"] = llm_direction
+            elif llm_confidence >= 0.7:
+                # LLM 高置信度时覆盖规则引擎方向
+                blend["direction"] = llm_direction
+        return blend
+
+    @staticmethod
+    def _apply_dq_discount(ticker: str, final_score: float, data_real_pct: float) -> Tuple[float, float, bool]:
+        """
+        数据真实度不足时，将 final_score 向中性值 5.0 压缩，防止低质数据产生高置信结论
+        ≥ 80%: quality_factor = 1.0（无折扣）
+        60–80%: 线性从 1.0 降至 0.875
+        40%:    factor = 0.75；0%: factor = 0.5（最大压缩，偏差减半）
+
+        Returns:
+            (折扣后分数, quality_factor, 是否生效)
+        """
+        dq_penalty_applied = False
+        quality_factor = 1.0
+        if data_real_pct < 80.0:
+            quality_factor = round(0.5 + 0.5 * (data_real_pct / 80.0), 3)
+            pre_dq = final_score
+            final_score = round(5.0 + (final_score - 5.0) * quality_factor, 2)
+            final_score = max(0.0, min(10.0, final_score))
+            if abs(final_score - pre_dq) >= 0.05:
+                dq_penalty_applied = True
+                _log.info(
+                    "%s 数据质量折扣: real_pct=%.1f%% factor=%.3f %.2f→%.2f",
+                    ticker, data_real_pct, quality_factor, pre_dq, final_score,
+                )
+        return final_score, quality_factor, dq_penalty_applied
+
+    def apply_llm(self, distilled: Dict, llm_result: Optional[Dict]) -> Dict:
+        """把 LLM 推理叠加到规则引擎蒸馏结果上（与 distill 内联路径相同的混合与数据质量折扣）"""
+        if not llm_result:
+            return distilled
+        ticker = distilled["ticker"]
+        blend = self._blend_llm(distilled["rule_score"], distilled["rule_direction"], llm_result)
+        final_score, quality_factor, dq_penalty_applied = self._apply_dq_discount(
+            ticker, blend["final_score"], distilled.get("data_real_pct", 0.0)
+        )
+        out = dict(distilled)
+        out.update(blend)
+        out["final_score"] = final_score
+        out["dq_quality_factor"] = quality_factor
+        out["dq_penalty_applied"] = dq_penalty_applied
+        return out
+
+    def enhance_batch(self, distilled: Dict[str, Dict], agent_results: Dict[str, List[Dict]]) -> Dict[str, Dict]:
+        """
+        批量 LLM 蒸馏：对 distill(..., llm=False) 的结果统一请求 LLM（llm_service.distill_batch），
+        按 ticker 拆回后叠加；LLM 不可用或某标的结果非法时保留规则引擎结果
+
+        Args:
+            distilled: {ticker: 规则引擎蒸馏结果}
+            agent_results: {ticker: 该标的的原始 Agent 结果}
+        """
+        if not (self.enable_llm and distilled):
+            return distilled
+        try:
+            import llm_service
+            if not llm_service.is_available():
+                return distilled
+            items = []
+            for ticker, d in distilled.items():
+                cleaned = _DQChecker().clean_results_batch(agent_results.get(ticker, []))
+                items.append({
+                    "ticker": ticker,
+                    "agent_results": [r for r in cleaned if "error" not in r],
+                    "dim_scores": d["dimension_scores"],
+                    "resonance": d["resonance"],
+                    "rule_score": d["rule_score"],
+                    "rule_direction": d["rule_direction"],
+                })
+            llm_results = llm_service.distill_batch(items)
+        except (ImportError, ConnectionError, TimeoutError, ValueError, KeyError) as e:
+            _log.warning("QueenDistiller batch LLM unavailable: %s", e)
+            return distilled
+        return {t: self.apply_llm(d, llm_results.get(t)) for t, d in distilled.items()}
+
+
+# ==================== 进程池模式（CPU 密集阶段跨进程并行）====================
+
+# 第一阶段核心 Agent（与 AlphaHiveDailyReporter.run_swarm_scan 保持一致）
+PHASE1_AGENT_CLASSES = (
+    ScoutBeeNova, OracleBeeEcho, BuzzBeeWhisper,
+    ChronosBeeHorizon, RivalBeeVanguard, GuardBeeSentinel,
+)
+
+# 工作进程内的状态（由 init_process_worker 初始化，每个进程一份）
+_worker_state: Dict = {}
+
+
+def init_process_worker(prefetched: Dict, llm_enabled: bool = True,
+                        llm_budget_usd: Optional[float] = None,
+                        agent_classes: Optional[Tuple[tuple, type]] = None,
+                        warm_up: bool = True) -> None:
+    """
+    ProcessPoolExecutor initializer：每个工作进程只执行一次
+    预热共享客户端，并持有预取数据与本进程的 Agent 实例
+
+    Args:
+        prefetched: prefetch_shared_data() 的返回值（启动时序列化一次，而非每 ticker）
+        llm_enabled: 主进程 LLM 是否可用（规则引擎模式需在子进程中同样禁用）
+        llm_budget_usd: 本进程分得的扫描预算（主进程剩余预算按进程数均分；None = 按配置）
+        agent_classes: (第一阶段 Agent 类, 第二阶段 Agent 类)；默认 PHASE1_AGENT_CLASSES + BearBeeContrarian
+        warm_up: 是否预热共享客户端（warm_up_clients）
+    """
+    import llm_service
+    if not llm_enabled:
+        llm_service.disable()
+    llm_service.begin_scan(llm_budget_usd)
+    if warm_up:
+        warm_up_clients()
+    phase1_classes, bear_class = agent_classes or (PHASE1_AGENT_CLASSES, BearBeeContrarian)
+    board = PheromoneBoard()
+    phase1 = [cls(board) for cls in phase1_classes]
+    bear = bear_class(board)
+    inject_prefetched(phase1 + [bear], prefetched)
+    _worker_state.update(board=board, phase1=phase1, bear=bear)
+
+
+def analyze_ticker_isolated(ticker: str) -> Dict:
+    """
+    在工作进程中完成单个 ticker 的两阶段 Agent 分析
+
+    使用进程内的私有信息素板（每个 ticker 前清空），返回紧凑载荷供主进程
+    回放到共享信息素板后再由 QueenDistiller 蒸馏：
+        {"ticker": str, "agent_results": [Dict|None], "entries": [Dict], "llm_usage": Dict,
+         "seconds": float, "spans": [Dict], "source_stats": Dict}
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    import llm_service
+
+    usage_before = llm_service.get_usage()
+    board: PheromoneBoard = _worker_state["board"]
+    phase1 = _worker_state["phase1"]
+    bear = _worker_state["bear"]
+    board.clear()
+    tracing.drain()
+    collect_source_stats()
+
+    agent_results = []
+    start = _time.perf_counter()
+    with tracing.span("ticker", ticker=ticker):
+        # Agent 内部仍以 I/O 为主：进程内用线程并行，CPU 密集部分由多进程分摊
+        with ThreadPoolExecutor(max_workers=len(phase1)) as executor:
+            futures = [
+                executor.submit(tracing.wrap(agent.analyze, f"agent.{agent.__class__.__name__}"), ticker)
+                for agent in phase1
+            ]
+            for future in as_completed(futures):
+                try:
+                    agent_results.append(future.result(timeout=60))
+                except (TimeoutError, ValueError, KeyError, TypeError, RuntimeError) as e:
+                    _log.warning("Agent future failed in worker: %s", e)
+                    agent_results.append(None)
+
+        try:
+            with tracing.span("agent.BearBeeContrarian"):
+                agent_results.append(bear.analyze(ticker))
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            _log.warning("BearBeeContrarian failed for %s: %s", ticker, e)
+            agent_results.append(None)
+
+    entries = ticker_entries(board, ticker)
+    usage_after = llm_service.get_usage()
+    llm_usage = {k: usage_after[k] - usage_before.get(k, 0) for k in usage_after}
+    return {"ticker": ticker, "agent_results": agent_results, "entries": entries,
+            "llm_usage": llm_usage, "seconds": _time.perf_counter() - start,
+            "spans": tracing.drain(), "source_stats": collect_source_stats()}
+
+
+def analyze_in_processes(tickers: List[str], prefetched: Dict, board: PheromoneBoard, workers: int,
+                         llm_budget_usd: Optional[float] = None,
+                         agent_classes: Optional[Tuple[tuple, type]] = None,
+                         correlation_id: Optional[str] = None, warm_up: bool = True,
+                         llm_enabled: bool = True):
+    """
+    进程池模式：spawn 工作进程各自完成 ticker 的两阶段分析（analyze_ticker_isolated），
+    主进程按完成顺序把信息素条目回放到 board，并合并 LLM 用量（花费计入本进程扫描预算）、
+    span 与数据源统计
+
+    llm_enabled=False 时工作进程一律走规则引擎（如主进程扫描预算已耗尽）
+
+    Yields:
+        (ticker, payload)；工作进程失败的 ticker 载荷为 {"agent_results": [None, ...], "entries": []}
+    """
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    from concurrent.futures.process import BrokenProcessPool
+    import llm_service
+
+    n_agents = len(agent_classes[0]) + 1 if agent_classes else len(PHASE1_AGENT_CLASSES) + 1
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=init_process_worker,
+        initargs=(prefetched, llm_enabled and llm_service.is_available(), llm_budget_usd,
+                  agent_classes, warm_up),
+    ) as pool:
+        futures = {pool.submit(analyze_ticker_isolated, t): t for t in tickers}
+        for future in as_completed(futures):
+            ticker = futures[future]
+            try:
+                payload = future.result()
+            except (BrokenProcessPool, ValueError, KeyError, TypeError, RuntimeError, OSError) as e:
+                _log.warning("进程池分析失败 %s: %s", ticker, e)
+                payload = {"agent_results": [None] * n_agents, "entries": []}
+            replay_entries(board, payload["entries"])
+            llm_service.merge_usage(payload.get("llm_usage", {}))
+            tracing.merge(payload.get("spans", []), correlation_id=correlation_id)
+            merge_source_stats(payload.get("source_stats", {}))
+            yield ticker, payload
+
+
+def ticker_entries(board: PheromoneBoard, ticker: str) -> List[Dict]:
+    """导出信息素板上某 ticker 的条目（按发布顺序，去掉会在回放时重新计算的强度/共振计数）"""
+    from dataclasses import asdict
+    entries = [
+        {k: v for k, v in asdict(e).items() if k not in ("pheromone_strength", "support_count")}
+        for e in board.get_top_signals(ticker, n=PheromoneBoard.MAX_ENTRIES)
+    ]
+    entries.sort(key=lambda e: e["timestamp"])
+    return entries
+
+
+def replay_entries(board: PheromoneBoard, entries: List[Dict]) -> None:
+    """将工作进程返回的信息素条目按发布顺序回放到主进程信息素板"""
+    for e in entries:
+        board.publish(PheromoneEntry(**e))
+
+
+# ==================== 盘中增量重扫（输入指纹）====================
+
+# 各 Agent 依赖的输入源：全部指纹与上一批相同时，复用上一批的 analyze 输出
+# （历史记忆上下文不计入指纹：每批扫描都会写入新记忆，计入会使增量模式失效）
+AGENT_INPUTS: Dict[str, tuple] = {
+    "ScoutBeeNova":      ("price", "form4"),
+    "OracleBeeEcho":     ("price", "chain"),
+    "BuzzBeeWhisper":    ("price", "news", "reddit", "macro"),
+    "ChronosBeeHorizon": ("price",),
+    "RivalBeeVanguard":  ("price",),
+    "GuardBeeSentinel":  ("price", "macro"),
+    "BearBeeContrarian": ("price", "form4", "chain", "news"),
+}
+
+# 读取信息素板（共振 / 其他 Agent 方向）的第一阶段 Agent：指纹不含板状态，
+# 仅当同阶段其他 Agent 全部复用（板内容与上一批一致）且自身输入未变时才复用
+BOARD_READERS = frozenset({"GuardBeeSentinel"})
+
+# 不参与指纹的易变字段（抓取时间等，内容不变时也会变化）
+_VOLATILE_KEYS = frozenset({
+    "timestamp", "fetched_at", "updated_at", "last_updated", "cached_at",
+    "cache_age", "as_of", "ts", "generated_at",
+})
+
+
+def _stable_digest(obj) -> str:
+    """去掉易变字段后的内容摘要"""
+    import hashlib
+
+    def _strip(o):
+        if isinstance(o, dict):
+            return {k: _strip(v) for k, v in o.items() if k not in _VOLATILE_KEYS}
+        if isinstance(o, (list, tuple)):
+            return [_strip(v) for v in o]
+        return o
+
+    raw = json.dumps(_strip(obj), sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _price_bucket(stock: Dict, tolerance_pct: float) -> str:
+    """价格 bar 指纹：价格按相对容差分桶，动量/量比保留 1 位小数（噪声级波动不触发重算）"""
+    price = float(stock.get("price") or 0.0)
+    bucket = round(math.log(price) / math.log1p(tolerance_pct / 100.0)) if price > 0 else 0
+    return _stable_digest([
+        bucket,
+        round(float(stock.get("momentum_5d") or 0.0), 1),
+        round(float(stock.get("volume_ratio") or 0.0), 1),
+    ])
+
+
+def _probe_ticker_inputs(ticker: str, sources: set) -> Dict[str, str]:
+    """探测单个 ticker 的逐源输入指纹（均走各数据源自身的缓存，Agent 随后重跑时命中同一缓存）"""
+    fp: Dict[str, str] = {}
+    if "form4" in sources:
+        try:
+            from sec_edgar import get_sec_client
+            filings = get_sec_client().get_recent_form4_filings(ticker, limit=10)
+            fp["form4"] = filings[0]["accessionNumber"] if filings else "none"
+        except (ImportError, OSError, ValueError, KeyError, IndexError, TypeError) as e:
+            _log.debug("form4 指纹失败 %s: %s", ticker, e)
+    if "chain" in sources:
+        try:
+            from options_analyzer import get_options_agent
+            fp["chain"] = _stable_digest(get_options_agent().fetcher.fetch_options_chain(ticker))
+        except (ImportError, OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            _log.debug("期权链指纹失败 %s: %s", ticker, e)
+    if "news" in sources:
+        try:
+            from finviz_sentiment import get_finviz_sentiment
+            from newsapi_client import get_ticker_news
+            fp["news"] = _stable_digest([get_finviz_sentiment(ticker), get_ticker_news(ticker)])
+        except (ImportError, OSError, ValueError, KeyError, TypeError) as e:
+            _log.debug("新闻指纹失败 %s: %s", ticker, e)
+    if "reddit" in sources:
+        try:
+            from reddit_sentiment import get_reddit_sentiment
+            fp["reddit"] = _stable_digest(get_reddit_sentiment(ticker))
+        except (ImportError, OSError, ValueError, KeyError, TypeError) as e:
+            _log.debug("Reddit 指纹失败 %s: %s", ticker, e)
+    return fp
+
+
+def invalidate_source_caches(dirty_sources: Dict[str, set]) -> None:
+    """
+    事件驱动重扫前清除 dirty 输入源的逐 ticker 缓存（价格 bar 缓存与共享行情缓冲 / Form 4 /
+    期权链 / 新闻），使随后的预取、指纹探测与 Agent 重跑拉取到反映新事件的数据
+    """
+    for ticker, sources in (dirty_sources or {}).items():
+        if "price" in sources:
+            with _yf_lock:
+                _yf_cache.pop(ticker, None)
+                _yf_cache_ts.pop(ticker, None)
+        try:
+            if "price" in sources:
+                from market_feed import get_market_feed
+                get_market_feed().invalidate(ticker)
+            if "form4" in sources:
+                from sec_edgar import get_sec_client
+                get_sec_client().invalidate_cache(ticker)
+            if "chain" in sources:
+                from options_analyzer import get_options_agent
+                get_options_agent().fetcher.invalidate(ticker)
+            if "news" in sources:
+                import finviz_sentiment
+                import newsapi_client
+                finviz_sentiment.invalidate_cache(ticker)
+                newsapi_client.invalidate_cache(ticker)
+        except (ImportError, OSError) as e:
+            _log.debug("数据源缓存清除失败 %s: %s", ticker, e)
+
+
+def collect_input_fingerprints(tickers: List[str], stock_data: Dict[str, Dict],
+                               price_tolerance_pct: float = 0.5) -> Dict[str, Dict[str, str]]:
+    """
+    采集所有 ticker 的输入指纹
+
+    Args:
+        tickers: 标的列表
+        stock_data: prefetch_shared_data() 预取的行情（价格 bar 指纹直接复用，不再请求）
+        price_tolerance_pct: 价格分桶的相对容差（%）
+
+    Returns:
+        {ticker: {"price": ..., "form4": ..., "chain": ..., "news": ..., "reddit": ..., "macro": ...}}
+        探测失败的源不出现在结果中（依赖该源的 Agent 视为输入已变化）
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    sources = {src for srcs in AGENT_INPUTS.values() for src in srcs}
+    macro_fp = None
+    try:
+        from fear_greed import get_fear_greed
+        from fred_macro import get_macro_context
+        macro_fp = _stable_digest([get_fear_greed(), get_macro_context()])
+    except (ImportError, OSError, ValueError, KeyError, TypeError) as e:
+        _log.debug("宏观指纹失败: %s", e)
+
+    with ThreadPoolExecutor(max_workers=min(8, max(1, len(tickers)))) as executor:
+        probe = with_priority(lambda t: _probe_ticker_inputs(t, sources))
+        probed = dict(zip(tickers, executor.map(probe, tickers)))
+
+    fingerprints: Dict[str, Dict[str, str]] = {}
+    for ticker in tickers:
+        fp = dict(probed.get(ticker, {}))
+        if ticker in stock_data:
+            fp["price"] = _price_bucket(stock_data[ticker], price_tolerance_pct)
+        if macro_fp:
+            fp["macro"] = macro_fp
+        fingerprints[ticker] = fp
+    return fingerprints
+
+
+class DeltaRescanner:
+    """
+    盘中增量重扫：按输入指纹复用上一批的 Agent analyze 输出
+
+    store 为追加式日志（key = "ticker|agent"），记录每个 Agent 的
+    {"fp": 输入指纹, "result": analyze 输出, "entries": 该 Agent 发布的信息素条目}。
+    复用时把条目回放到本批信息素板，使 BearBeeContrarian 与 QueenDistiller 看到完整信号。
+
+    dirty 为 {ticker: {输入源}}：事件驱动重扫时已知变化的输入源（如新 Form 4），
+    依赖这些源的 Agent 无论指纹如何都重跑（调用方先以 invalidate_source_caches 清除这些源的缓存）。
+    """
+
+    def __init__(self, store, fingerprints: Dict[str, Dict[str, str]],
+                 dirty: Optional[Dict[str, set]] = None):
+        self.store = store
+        self.fingerprints = fingerprints
+        self.dirty = dirty or {}
+        self._previous = store.replay()
+        self.reused = 0
+        self.rerun = 0
+
+    def _agent_fp(self, ticker: str, agent_name: str) -> Optional[str]:
+        """Agent 的组合输入指纹；未登记输入源或有源探测失败时返回 None（必须重跑）"""
+        sources = AGENT_INPUTS.get(agent_name)
+        fp = self.fingerprints.get(ticker, {})
+        if not sources or any(src not in fp for src in sources):
+            return None
+        return "|".join(fp[src] for src in sources)
+
+    def cached(self, ticker: str, agent_name: str) -> Optional[Dict]:
+        """输入未变化时返回上一批记录 {"fp", "result", "entries"}，否则 None"""
+        fp = self._agent_fp(ticker, agent_name)
+        if self.dirty.get(ticker, set()) & set(AGENT_INPUTS.get(agent_name, ())):
+            fp = None
+        prev = self._previous.get(f"{ticker}|{agent_name}")
+        if fp is not None and prev and prev.get("fp") == fp and prev.get("result") is not None:
+            self.reused += 1
+            return prev
+        self.rerun += 1
+        return None
+
+    def cached_phase(self, ticker: str, agent_names: List[str]) -> Dict[str, Dict]:
+        """
+        查询同一阶段的多个 Agent，返回 {agent_name: 上一批记录}（按 agent_names 顺序）
+
+        BOARD_READERS 中的 Agent 仅在其余 Agent 全部命中时才查询，否则计为重跑。
+        """
+        hits = {}
+        for name in agent_names:
+            if name not in BOARD_READERS:
+                rec = self.cached(ticker, name)
+                if rec:
+                    hits[name] = rec
+        board_unchanged = all(name in hits for name in agent_names if name not in BOARD_READERS)
+        for name in agent_names:
+            if name in BOARD_READERS:
+                rec = self.cached(ticker, name) if board_unchanged else None
+                if rec:
+                    hits[name] = rec
+                elif not board_unchanged:
+                    self.rerun += 1
+        return {name: hits[name] for name in agent_names if name in hits}
+
+    def record(self, ticker: str, agent_name: str, result: Optional[Dict], entries: List[Dict]) -> None:
+        """记录本批重跑的 Agent 输出（指纹不可用或失败时不记录，下一批继续重跑）"""
+        fp = self._agent_fp(ticker, agent_name)
+        if fp is None or result is None:
+            return
+        record = {"fp": fp, "result": result,
+                  "entries": [e for e in entries if e.get("agent_id") == agent_name]}
+        self._previous[f"{ticker}|{agent_name}"] = record
+        try:
+            self.store.append(f"{ticker}|{agent_name}", record)
+        except (OSError, TypeError, ValueError) as e:
+            _log.warning("增量重扫记录写入失败 %s/%s: %s", ticker, agent_name, e)
+
+    def close(self) -> None:
+        self.store.close()
@@ -21,6 +21,23 @@ def _isolate_env(tmp_path, monkeypatch):
     monkeypatch.setenv("ALPHA_HIVE_CHROMA_PATH", str(tmp_path / "test_chroma"))
     monkeypatch.setenv("ALPHA_HIVE_LOGS_DIR", str(tmp_path / "logs"))
     monkeypatch.setenv("ALPHA_HIVE_CACHE_DIR", str(tmp_path / "cache"))
+    # 跨进程共享限流 / 熔断状态默认关闭（测试间互不影响）；需要时显式传入 SharedStateStore
+    monkeypatch.setenv("ALPHA_HIVE_SHARED_LIMITS", "0")
+    # ML 模型训练后按相对路径（当前目录）保存：重定向到 tmp_path，避免写入仓库目录
+    import ml_predictor
+    import ml_predictor_extended
+    for module in (ml_predictor, ml_predictor_extended):
+        _redirect_model_save(monkeypatch, module.SimpleMLModel, tmp_path)
+
+
+def _redirect_model_save(monkeypatch, model_cls, tmp_path):
+    save = model_cls.save_model
+
+    def save_model(self, filename=None):
+        name = os.path.basename(filename) if filename else save.__defaults__[0]
+        return save(self, str(tmp_path / name))
+
+    monkeypatch.setattr(model_cls, "save_model", save_model)
 
 
 # ==================== Mock 股票数据 ====================
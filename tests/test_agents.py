@@ -146,3 +146,104 @@ class TestAllAgents:
             if "error" not in r1 and "error" not in r2:
                 assert r1["discovery"] != r2["discovery"] or r1["score"] != r2["score"], \
                     f"{name}: NVDA 和 TSLA 结果完全相同"
+
+
+# ==================== 共享数据预取 ====================
+
+class TestPrefetch:
+    def test_bulk_context_single_query(self, all_agents, mock_stock_data):
+        from swarm_agents import prefetch_shared_data, inject_prefetched
+
+        class _BulkRetriever:
+            calls = 0
+
+            def get_contexts_bulk(self, tickers, agent_ids):
+                self.calls += 1
+                return {t: {"BeeAgent": f"{t}-base",
+                            **{a: f"{t}-{a}" for a in agent_ids}} for t in tickers}
+
+            def get_context_for_agent(self, ticker, agent_id):
+                raise AssertionError("不应回退到逐 ticker 查询")
+
+        retriever = _BulkRetriever()
+        agents = list(all_agents.values())
+        prefetched = prefetch_shared_data(
+            ["NVDA", "TSLA"], retriever, agent_ids=["ScoutBeeNova"]
+        )
+        assert retriever.calls == 1
+        assert prefetched["contexts"]["NVDA"] == "NVDA-base"
+        inject_prefetched(agents, prefetched)
+        assert all_agents["scout"]._get_history_context("TSLA") == "TSLA-ScoutBeeNova"
+        assert all_agents["oracle"]._get_history_context("TSLA") == "TSLA-base"
+
+
+class TestSharedClients:
+    def test_clients_constructed_once(self):
+        from options_analyzer import get_options_agent
+        from crowding_detector import get_detector
+        from ml_predictor_extended import get_prediction_service
+        assert get_options_agent() is get_options_agent()
+        assert get_detector("NVDA") is get_detector("NVDA")
+        assert get_detector("NVDA") is not get_detector("TSLA")
+        service = get_prediction_service()
+        assert service is get_prediction_service()
+        assert service.model.is_trained
+
+
+class TestDeltaRescan:
+    FP = {"price": "p1", "form4": "f1", "chain": "c1", "news": "n1", "reddit": "r1", "macro": "m1"}
+
+    def _rescanner(self, tmp_path, fp):
+        from result_log import agent_outputs_log
+        from swarm_agents import DeltaRescanner
+        return DeltaRescanner(agent_outputs_log(tmp_path, "2026-03-01"), {"NVDA": dict(fp)})
+
+    def test_unchanged_inputs_reused(self, tmp_path):
+        first = self._rescanner(tmp_path, self.FP)
+        assert first.cached("NVDA", "OracleBeeEcho") is None
+        entries = [{"agent_id": "OracleBeeEcho", "ticker": "NVDA"},
+                   {"agent_id": "ScoutBeeNova", "ticker": "NVDA"}]
+        first.record("NVDA", "OracleBeeEcho", {"score": 6.5}, entries)
+        first.close()
+
+        second = self._rescanner(tmp_path, self.FP)
+        rec = second.cached("NVDA", "OracleBeeEcho")
+        assert rec["result"] == {"score": 6.5}
+        assert rec["entries"] == [entries[0]]
+        assert second.reused == 1
+
+    def test_changed_input_forces_rerun(self, tmp_path):
+        first = self._rescanner(tmp_path, self.FP)
+        first.record("NVDA", "OracleBeeEcho", {"score": 6.5}, [])
+        first.record("NVDA", "ScoutBeeNova", {"score": 7.0}, [])
+        first.close()
+
+        second = self._rescanner(tmp_path, dict(self.FP, chain="c2"))
+        assert second.cached("NVDA", "OracleBeeEcho") is None  # 期权链变化
+        assert second.cached("NVDA", "ScoutBeeNova") is not None  # 不依赖期权链
+
+    def test_guard_reused_only_with_unchanged_board(self, tmp_path):
+        names = ["ScoutBeeNova", "OracleBeeEcho", "GuardBeeSentinel"]
+        first = self._rescanner(tmp_path, self.FP)
+        for name in names:
+            first.record("NVDA", name, {"score": 6.0}, [])
+        first.close()
+
+        assert list(self._rescanner(tmp_path, self.FP).cached_phase("NVDA", names)) == names
+        second = self._rescanner(tmp_path, dict(self.FP, chain="c2"))
+        reused = second.cached_phase("NVDA", names)
+        assert list(reused) == ["ScoutBeeNova"]        # Oracle 重跑 → 信息素板变化，Guard 一并重跑
+        assert (second.reused, second.rerun) == (1, 2)
+
+    def test_missing_fingerprint_never_cached(self, tmp_path):
+        fp = {k: v for k, v in self.FP.items() if k != "form4"}
+        r = self._rescanner(tmp_path, fp)
+        r.record("NVDA", "ScoutBeeNova", {"score": 7.0}, [])
+        assert r.cached("NVDA", "ScoutBeeNova") is None
+        assert r.cached("NVDA", "CodeExecutorAgent") is None
+
+    def test_price_bucket_tolerance(self):
+        from swarm_agents import _price_bucket
+        base = {"price": 101.0, "momentum_5d": 1.23, "volume_ratio": 1.04}
+        assert _price_bucket(base, 0.5) == _price_bucket(dict(base, price=101.04), 0.5)
+        assert _price_bucket(base, 0.5) != _price_bucket(dict(base, price=103.0), 0.5)
@@ -0,0 +1,114 @@
+"""桌面 App 渲染测试 - 精灵模式 / 脏检查 / 自适应帧率（假 canvas，不需要显示器）"""
+
+import itertools
+
+import pytest
+
+tk = pytest.importorskip("tkinter")
+
+
+class _FakeCanvas:
+    def __init__(self):
+        self._ids = itertools.count(1)
+        self.items = {}
+        self.created = 0
+        self.deleted = 0
+
+    def _create(self, kind, *coords, **opts):
+        self.created += 1
+        item = next(self._ids)
+        self.items[item] = (kind, coords, opts)
+        return item
+
+    def __getattr__(self, name):
+        if name.startswith("create_"):
+            return lambda *c, **o: self._create(name[len("create_"):], *c, **o)
+        raise AttributeError(name)
+
+    def delete(self, item):
+        self.deleted += 1
+        self.items.pop(item, None)
+
+    def coords(self, item, *coords):
+        kind, _, opts = self.items[item]
+        self.items[item] = (kind, coords, opts)
+
+    def itemconfigure(self, item, **opts):
+        kind, coords, old = self.items[item]
+        self.items[item] = (kind, coords, {**old, **opts})
+
+
+class _FakeSprites:
+    def __init__(self):
+        self.rendered = set()
+
+    def get(self, agent_id, colors, facing_right, wing_phase, ps):
+        key = (agent_id, facing_right, wing_phase, ps)
+        self.rendered.add(key)
+        return f"img-{key}"
+
+
+def _run(bee, frames=120):
+    for state in ("idle", "working", "dancing", "sleeping"):
+        bee.set_state(state)
+        for _ in range(frames):
+            bee.update()
+
+
+class TestSpriteMode:
+    def test_items_reused_instead_of_recreated(self):
+        from alpha_hive_app import PixelBee
+        pixel_canvas, sprite_canvas = _FakeCanvas(), _FakeCanvas()
+        _run(PixelBee(pixel_canvas, "ScoutBeeNova", 100, 100))
+        sprites = _FakeSprites()
+        _run(PixelBee(sprite_canvas, "ScoutBeeNova", 100, 100, sprites=sprites))
+        assert sprite_canvas.created * 20 < pixel_canvas.created
+        # 朝向 × 翅膀相位（含无翅膀）最多 6 种精灵
+        assert len(sprites.rendered) <= 6
+
+    def test_bubble_hidden_after_timer(self):
+        from alpha_hive_app import PixelBee
+        canvas = _FakeCanvas()
+        bee = PixelBee(canvas, "OracleBeeEcho", 50, 50, sprites=_FakeSprites())
+        bee.say("!!", 3)
+        for _ in range(5):
+            bee.update()
+        bubble = bee._sprite_items["bubble_text"]
+        assert canvas.items[bubble][2]["state"] == "hidden"
+        bee.say("?", 3)
+        bee.update()
+        assert canvas.items[bubble][2]["state"] == "normal"
+        assert canvas.items[bubble][2]["text"] == "?"
+
+    def test_sprite_pixels_match_pixel_renderer(self):
+        from alpha_hive_app import PixelBee
+        canvas = _FakeCanvas()
+        bee = PixelBee(canvas, "BuzzBeeWhisper", 0, 0, pixel_size=1)
+        bee._draw_bee_body()
+        bee._draw_wings(0)
+        drawn = {(int(c[0]), int(c[1]), o["fill"]) for _, c, o in canvas.items.values()}
+        assert drawn == set(PixelBee.sprite_pixels(bee.colors, 0))
+
+
+class TestIdleDetection:
+    def test_bee_settles_to_idle(self):
+        from alpha_hive_app import PixelBee
+        bee = PixelBee(_FakeCanvas(), "GuardBeeSentinel", 10, 10, sprites=_FakeSprites())
+        bee.say("hi", 10)
+        assert bee.is_animating
+        for _ in range(60):
+            bee.update(step=3)
+        assert not bee.is_animating
+
+    def test_chat_log_skips_unchanged_redraw(self):
+        from alpha_hive_app import ChatLog
+        canvas = _FakeCanvas()
+        log = ChatLog(canvas, 0, 0, 500, 160)
+        log.add("System", "启动", "system")
+        log.draw()
+        created = canvas.created
+        log.draw()
+        assert canvas.created == created
+        log.add("ScoutBeeNova", "NVDA 异动", "alert")
+        log.draw()
+        assert canvas.created > created
@@ -0,0 +1,59 @@
+"""compact_codec 测试 - 内部产物的紧凑二进制编码"""
+
+import io
+import json
+
+import pytest
+
+
+SAMPLE = {
+    "final_score": 7.25,
+    "direction": "bullish",
+    "agent_details": {"OracleBeeEcho": {"details": {"iv_rank": 55.0, "chain": [[1, 2.5, "C"]] * 50}}},
+    "tags": ["共振", None, True],
+}
+
+
+class TestEnvelope:
+    def test_roundtrip(self):
+        import compact_codec
+        data = compact_codec.encode(SAMPLE)
+        assert data.startswith(compact_codec.MAGIC)
+        assert compact_codec.decode(data) == SAMPLE
+
+    def test_smaller_than_indented_json(self):
+        import compact_codec
+        big = {f"T{i}": SAMPLE for i in range(50)}
+        assert len(compact_codec.encode(big)) < len(json.dumps(big, indent=2)) / 5
+
+    def test_legacy_json_accepted(self):
+        import compact_codec
+        assert compact_codec.decode('{"a": 1}') == {"a": 1}
+        assert compact_codec.decode(b'[1, 2]') == [1, 2]
+
+    def test_newer_schema_rejected(self):
+        import compact_codec
+        data = bytearray(compact_codec.encode({"a": 1}))
+        data[3] = compact_codec.SCHEMA_VERSION + 1
+        with pytest.raises(compact_codec.CodecError):
+            compact_codec.decode(bytes(data))
+
+    def test_non_serializable_values(self):
+        from datetime import datetime
+        import compact_codec
+        out = compact_codec.decode(compact_codec.encode({"ts": datetime(2026, 3, 1), "s": {1}}))
+        assert out == {"ts": "2026-03-01T00:00:00", "s": [1]}
+
+
+class TestFilesAndFrames:
+    def test_write_read_file(self, tmp_path):
+        import compact_codec
+        compact_codec.write_file(tmp_path / "model.bin", SAMPLE)
+        assert compact_codec.read_file(tmp_path / "model.bin") == SAMPLE
+        assert [p.name for p in tmp_path.iterdir()] == ["model.bin"]
+
+    def test_truncated_tail_frame_dropped(self):
+        import compact_codec
+        blob = compact_codec.encode_frame({"k": 1}) + compact_codec.encode_frame({"k": 2})
+        bodies = list(compact_codec.iter_frames(io.BytesIO(blob[:-3])))
+        assert [compact_codec.decode(b) for b in bodies] == [{"k": 1}]
@@ -0,0 +1,31 @@
+"""AlphaHiveDailyReporter 测试 - ML 增强报告并行渲染与串行结果一致"""
+
+import pytest
+
+
+TICKERS = ["NVDA", "TSLA", "VKTX", "AMD", "META", "MSFT"]
+
+
+@pytest.fixture
+def reporter(mock_stock_data):
+    from alpha_hive_daily_report import AlphaHiveDailyReporter
+    rep = AlphaHiveDailyReporter()
+    rep._prefetched_stock = {t: mock_stock_data.get(t, mock_stock_data["NVDA"]) for t in TICKERS}
+    return rep
+
+
+def _render_all(rep, report_dir, workers):
+    rep.report_dir = report_dir
+    rep.ML_REPORT_WORKERS = workers
+    report_dir.mkdir()
+    done = rep._generate_ml_reports({"opportunities": [{"ticker": t} for t in TICKERS]})
+    return done, {p.name: p.read_text(encoding="utf-8") for p in report_dir.glob("*-ml-enhanced-*.html")}
+
+
+class TestMLReports:
+    def test_parallel_matches_serial(self, reporter, tmp_path):
+        serial_done, serial = _render_all(reporter, tmp_path / "serial", workers=1)
+        parallel_done, parallel = _render_all(reporter, tmp_path / "parallel", workers=8)
+        assert serial_done == parallel_done == TICKERS
+        assert len(serial) == len(TICKERS)
+        assert parallel == serial
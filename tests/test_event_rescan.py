@@ -0,0 +1,197 @@
+"""事件总线 + 事件驱动重扫调度器测试（假时钟，不启动工作线程）"""
+
+import pytest
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def setup():
+    from event_bus import EventBus
+    from rescan_dispatcher import RescanDispatcher
+    bus = EventBus()
+    clock = _Clock()
+    calls = []
+    d = RescanDispatcher(lambda t, s: calls.append((t, s)), tickers=["NVDA", "TSLA"], bus=bus,
+                         debounce_seconds=60, max_delay_seconds=300, cooldown_seconds=600,
+                         clock=clock)
+    d._cik_to_ticker = {"1045810": "NVDA"}
+    for topic in ("form4", "earnings", "price_spike", "volume_spike"):
+        bus.subscribe(topic, d.on_event)
+    return bus, clock, d, calls
+
+
+class TestEventBus:
+    def test_publish_and_unsubscribe(self):
+        from event_bus import EventBus, ALL_TOPICS
+        bus = EventBus()
+        got = []
+        unsub = bus.subscribe("form4", got.append)
+        bus.subscribe(ALL_TOPICS, got.append)
+        assert bus.publish("form4", "nvda", cik="1") == 2
+        assert got[0].ticker == "NVDA" and got[0].payload == {"cik": "1"}
+        unsub()
+        assert bus.publish("form4") == 1
+
+    def test_handler_error_isolated(self):
+        from event_bus import EventBus
+        bus = EventBus()
+        got = []
+
+        def boom(_):
+            raise ValueError("x")
+        bus.subscribe("earnings", boom)
+        bus.subscribe("earnings", got.append)
+        assert bus.publish("earnings", "TSLA") == 2
+        assert len(got) == 1
+
+
+class TestRescanDispatcher:
+    def test_debounce_coalesces_events(self, setup):
+        bus, clock, d, calls = setup
+        bus.publish("price_spike", "NVDA")
+        clock.now += 30
+        bus.publish("form4", None, cik="0001045810")
+        assert d.run_due() == []          # 静默未满 60s
+        clock.now += 61
+        assert d.run_due() == ["NVDA"]
+        assert calls == [("NVDA", {"price", "form4"})]
+        assert d.coalesced == 1
+
+    def test_max_delay_under_event_storm(self, setup):
+        bus, clock, d, calls = setup
+        for _ in range(12):
+            bus.publish("volume_spike", "TSLA")
+            clock.now += 30
+        assert d.run_due() == ["TSLA"]    # 首个事件 300s 后强制触发
+
+    def test_cooldown_defers_not_drops(self, setup):
+        bus, clock, d, calls = setup
+        bus.publish("earnings", "NVDA")
+        clock.now += 60
+        d.run_due()
+        bus.publish("price_spike", "NVDA")
+        clock.now += 120
+        assert d.run_due() == []          # 冷却中
+        clock.now += 500
+        assert d.run_due() == ["NVDA"]
+        assert len(calls) == 2
+
+    def test_unwatched_and_unknown_ignored(self, setup):
+        bus, clock, d, calls = setup
+        bus.publish("price_spike", "AAPL")
+        bus.publish("form4", None, cik="999", company_name="ACME CORP")
+        assert d.pending() == {}
+
+
+class TestPollers:
+    def test_form4_poller_survives_errors(self, monkeypatch):
+        import threading
+        import edgar_rss
+        from rescan_dispatcher import RescanDispatcher
+        calls = []
+        polled = threading.Event()
+
+        class FlakyClient:
+            def get_recent_form4_alerts(self, force_refresh=False):
+                calls.append(force_refresh)
+                if len(calls) == 1:
+                    raise OSError("EDGAR unreachable")
+                polled.set()
+                return []
+
+        monkeypatch.setattr(edgar_rss, "get_rss_client", lambda: FlakyClient())
+        d = RescanDispatcher(lambda t, s: None, tickers=["NVDA"])
+        d._spawn(lambda: d._poll_form4(0.01), "test-poll-form4")
+        try:
+            assert polled.wait(5.0)
+        finally:
+            d.stop(timeout=1.0)
+        assert calls[:2] == [True, True]
+
+
+class TestReporterRescan:
+    class _Reporter:
+        def __init__(self):
+            from datetime import datetime
+            self.date_str = datetime.now().strftime("%Y-%m-%d")
+            self.saved, self.materialized = [], 0
+
+        def run_swarm_scan(self, tickers, dirty_sources=None):
+            return {"tickers": tickers}
+
+        def save_report(self, report, materialize=True):
+            self.saved.append(materialize)
+
+        def materialize_report(self, report=None):
+            self.materialized += 1
+
+    def test_rescans_append_and_materialize_throttled(self):
+        from rescan_dispatcher import ReporterRescan
+        clock = _Clock()
+        rep = self._Reporter()
+        fn = ReporterRescan(rep, materialize_interval=300, clock=clock)
+        assert fn.flush() is None                      # 无新结果不生成
+        fn("NVDA", {"form4"})
+        assert rep.saved == [False] and rep.materialized == 0
+        assert fn.flush() is None and rep.materialized == 1
+        fn("TSLA", {"price"})
+        clock.now += 100
+        assert fn.flush() == pytest.approx(200)        # 节流：延后生成
+        assert rep.materialized == 1
+        assert fn.flush(force=True) is None and rep.materialized == 2
+
+    def test_dispatcher_stop_flushes(self):
+        from rescan_dispatcher import ReporterRescan, RescanDispatcher
+        rep = self._Reporter()
+        fn = ReporterRescan(rep, materialize_interval=300)
+        fn("NVDA", {"form4"})
+        fn._materialized_at = fn.clock()               # 刚生成过，flush 会被节流
+        RescanDispatcher(fn, tickers=["NVDA"]).stop()
+        assert rep.materialized == 1
+
+
+class TestDirtySources:
+    def test_dirty_source_forces_dependent_agents(self, tmp_path):
+        from result_log import agent_outputs_log
+        from swarm_agents import DeltaRescanner
+        fp = {"NVDA": {"price": "p", "form4": "f", "chain": "c"}}
+        first = DeltaRescanner(agent_outputs_log(tmp_path, "2026-03-01"), fp)
+        first.record("NVDA", "ScoutBeeNova", {"score": 7.0}, [])
+        first.record("NVDA", "OracleBeeEcho", {"score": 6.0}, [])
+        first.close()
+        second = DeltaRescanner(agent_outputs_log(tmp_path, "2026-03-01"), fp,
+                                dirty={"NVDA": {"form4"}})
+        assert second.cached("NVDA", "ScoutBeeNova") is None
+        assert second.cached("NVDA", "OracleBeeEcho") is not None
+
+    def test_dirty_sources_invalidate_caches(self, tmp_path, monkeypatch):
+        import finviz_sentiment
+        import newsapi_client
+        import sec_edgar
+        from options_analyzer import get_options_agent
+        from swarm_agents import invalidate_source_caches
+        cache_dir = tmp_path / "caches"
+        cache_dir.mkdir()
+        monkeypatch.setattr(sec_edgar, "CACHE_DIR", cache_dir)
+        monkeypatch.setattr(sec_edgar, "_client", object.__new__(sec_edgar.SECEdgarClient))
+        monkeypatch.setattr(newsapi_client, "_CACHE_DIR", cache_dir)
+        monkeypatch.setattr(finviz_sentiment, "CACHE_DIR", cache_dir)
+        fetcher = get_options_agent().fetcher
+        monkeypatch.setattr(fetcher, "cache_dir", str(cache_dir))
+        names = ["NVDA_form4_list.json", "NVDA_insider_summary.json", "NVDA_news.json",
+                 "NVDA_titles.json", "options_NVDA_chain.json", "TSLA_form4_list.json"]
+        for name in names:
+            (cache_dir / name).write_text("{}")
+
+        invalidate_source_caches({"NVDA": {"form4", "news"}})
+        assert sorted(p.name for p in cache_dir.iterdir()) == ["TSLA_form4_list.json",
+                                                              "options_NVDA_chain.json"]
+        invalidate_source_caches({"NVDA": {"chain"}})
+        assert not (cache_dir / "options_NVDA_chain.json").exists()
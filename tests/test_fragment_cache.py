@@ -0,0 +1,63 @@
+"""fragment_cache 测试 - index.html 逐 ticker 片段的增量构建"""
+
+
+class TestFragmentCache:
+    def test_hit_and_miss(self, tmp_path):
+        from fragment_cache import FragmentCache
+        cache = FragmentCache(tmp_path / "cache")
+        d1 = cache.digest({"score": 7.5})
+        assert cache.get("NVDA", d1) is None
+        cache.put("NVDA", d1, {"row": "<tr>NVDA</tr>"})
+        assert cache.get("NVDA", d1) == {"row": "<tr>NVDA</tr>"}
+        assert cache.get("NVDA", cache.digest({"score": 8.0})) is None
+        assert (cache.hits, cache.misses) == (1, 2)
+
+    def test_digest_stable_and_versioned(self, tmp_path):
+        from fragment_cache import FragmentCache
+        a = FragmentCache(tmp_path, version=1)
+        assert a.digest({"x": 1, "y": 2}) == a.digest({"y": 2, "x": 1})
+        assert a.digest({"x": 1}) != FragmentCache(tmp_path, version=2).digest({"x": 1})
+
+    def test_corrupt_entry_is_miss(self, tmp_path):
+        from fragment_cache import FragmentCache
+        cache = FragmentCache(tmp_path)
+        (tmp_path / "NVDA.json").write_text('{"digest": "ab', encoding="utf-8")
+        assert cache.get("NVDA", "ab") is None
+
+    def test_prune(self, tmp_path):
+        from fragment_cache import FragmentCache
+        cache = FragmentCache(tmp_path)
+        for t in ("NVDA", "TSLA", "META"):
+            cache.put(t, "d", {})
+        assert cache.prune(["NVDA"]) == 2
+        assert [p.name for p in tmp_path.iterdir()] == ["NVDA.json"]
+
+
+class TestIncrementalDashboard:
+    def _reporter(self, tmp_path):
+        from alpha_hive_daily_report import AlphaHiveDailyReporter
+        r = AlphaHiveDailyReporter.__new__(AlphaHiveDailyReporter)
+        r.report_dir = tmp_path
+        r.date_str = "2026-03-01"
+        return r
+
+    def test_only_changed_ticker_rerendered(self, tmp_path, monkeypatch):
+        r = self._reporter(tmp_path)
+        swarm = {t: {"final_score": 6.0, "direction": "bullish"} for t in ("NVDA", "TSLA", "META")}
+        first = r._build_ticker_fragments(list(swarm), {}, swarm)
+
+        rendered = []
+        orig = r._render_ticker_fragments
+        monkeypatch.setattr(r, "_render_ticker_fragments",
+                            lambda t, *a: rendered.append(t) or orig(t, *a))
+        swarm["TSLA"] = {"final_score": 3.0, "direction": "bearish"}
+        second = r._build_ticker_fragments(list(swarm), {}, swarm)
+        assert rendered == ["TSLA"]
+        assert second["NVDA"] == first["NVDA"]
+        assert "看空" in second["TSLA"]["row"]
+
+    def test_rank_filled_at_stitch_time(self, tmp_path):
+        r = self._reporter(tmp_path)
+        frags = r._render_ticker_fragments("NVDA", {}, {"final_score": 7.2}, False)
+        assert r._RANK_TOKEN in frags["card"] and r._RANK_TOKEN in frags["row"]
+        assert len(frags["radar"]) == 5
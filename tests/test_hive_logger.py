@@ -0,0 +1,125 @@
+"""hive_logger 测试 - 队列日志管道（写线程批量 flush / correlation_id / 采样 / 队列满降级）"""
+
+import pytest
+
+
+class TestQueueLogging:
+    @pytest.fixture
+    def pipeline(self, tmp_path):
+        """独立的队列管道：QueueHandler → 写线程 → 批量 flush 的 JSON 文件 handler"""
+        import logging
+        from hive_logger import JSONFormatter, _BatchRotatingFileHandler, make_queue_pipeline
+
+        class CountingHandler(_BatchRotatingFileHandler):
+            batches = 0
+
+            def flush_batch(self):
+                CountingHandler.batches += 1
+                super().flush_batch()
+
+        path = tmp_path / "q.jsonl"
+        fh = CountingHandler(str(path), maxBytes=1 << 20, backupCount=1, encoding="utf-8")
+        fh.setFormatter(JSONFormatter())
+        created = []
+
+        def build(**kwargs):
+            qh, listener = make_queue_pipeline([fh], **kwargs)
+            lg = logging.getLogger(f"test_queue_{len(created)}")
+            lg.propagate = False
+            lg.setLevel(logging.DEBUG)
+            lg.addHandler(qh)
+            created.append((lg, qh, listener))
+            return lg, qh, listener
+
+        yield build, path, CountingHandler
+        for lg, qh, listener in created:
+            lg.removeHandler(qh)
+            if listener._thread is not None:
+                listener.stop()
+        fh.close()
+
+    @staticmethod
+    def _entries(path):
+        import json
+        with open(path) as f:
+            return [json.loads(line) for line in f]
+
+    def test_writer_thread_keeps_caller_correlation_and_batches(self, pipeline):
+        import threading
+        from hive_logger import set_correlation_id
+        build, path, counter = pipeline
+        lg, qh, listener = build(batch_size=64)
+
+        def worker(n):
+            set_correlation_id(f"scan_{n}")
+            for i in range(50):
+                lg.info("t%d msg %d", n, i)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        listener.stop()
+
+        entries = self._entries(path)
+        assert len(entries) == 200
+        assert all(e["corr_id"] == f"scan_{e['msg'][1]}" for e in entries)
+        assert [e["msg"] for e in entries if e["corr_id"] == "scan_0"] == [f"t0 msg {i}" for i in range(50)]
+        assert counter.batches < 200
+
+    def test_debug_sampled_per_call_site(self, pipeline):
+        from hive_logger import _SamplingFilter
+        build, path, _ = pipeline
+        lg, qh, listener = build(sample_every=10, sample_burst=5)
+        for i in range(100):
+            lg.debug("hot %d", i)
+        for i in range(20):
+            lg.info("info %d", i)
+        listener.stop()
+
+        msgs = [e["msg"] for e in self._entries(path)]
+        debug = [m for m in msgs if m.startswith("hot")]
+        # 前 5 条全量，之后第 15、25 … 95 条各保留 1 条
+        assert debug[:5] == [f"hot {i}" for i in range(5)]
+        assert len(debug) == 14
+        assert sum(m.startswith("info") for m in msgs) == 20
+        sampler = next(f for f in qh.filters if isinstance(f, _SamplingFilter))
+        assert sampler.sampled_out == 86
+
+    def test_full_queue_drops_low_levels_only(self, pipeline):
+        import logging
+        import queue
+        from hive_logger import _HiveQueueHandler
+        qh = _HiveQueueHandler(queue.Queue(maxsize=1))
+        lg = logging.getLogger("test_queue_full")
+        lg.propagate = False
+        lg.setLevel(logging.DEBUG)
+        lg.addHandler(qh)
+        try:
+            lg.warning("first")
+            lg.info("dropped")
+            assert qh.dropped == 1
+            assert qh.queue.get_nowait().getMessage() == "first"
+        finally:
+            lg.removeHandler(qh)
+
+    def test_sampling_counts_exact_across_threads(self):
+        import logging
+        import threading
+        from hive_logger import _SamplingFilter
+        sampler = _SamplingFilter(every=10, burst=5)
+        record = logging.LogRecord("test_sampling", logging.DEBUG, __file__, 1, "hot", None, None)
+        kept = []
+
+        def worker():
+            kept.append(sum(sampler.filter(record) for _ in range(2000)))
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 共 16000 条：前 5 条 + 之后每 10 条 1 条
+        assert sum(kept) == 5 + (16000 - 5) // 10
+        assert sampler.sampled_out == 16000 - sum(kept)
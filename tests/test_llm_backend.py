@@ -0,0 +1,107 @@
+"""LLM 后端测试 - 离线替身回放 / 故障模拟 / 录制往返 / 完整 LLM 蒸馏路径"""
+
+import json
+from types import SimpleNamespace
+
+import pytest
+
+
+def _kwargs(prompt="p", system="s"):
+    return {"model": "claude-haiku-4-5-20251001", "max_tokens": 512, "temperature": 0.3,
+            "system": system, "messages": [{"role": "user", "content": prompt}]}
+
+
+@pytest.fixture
+def replay(monkeypatch):
+    """把 llm_service 切到离线替身（关闭响应缓存，独立调度器）"""
+    import llm_cache
+    import llm_service
+    from llm_backend import ReplayClient
+    from resilience import CircuitBreaker
+
+    def install(**kwargs):
+        client = ReplayClient(**kwargs)
+        monkeypatch.setattr(llm_service, "_disabled", False)
+        monkeypatch.setattr(llm_service, "_client", client)
+        monkeypatch.setattr(llm_cache, "_cache", None)
+        monkeypatch.setattr(llm_service, "_dispatcher", llm_service.LLMDispatcher(
+            max_concurrency=4, tokens_per_minute=0, scan_budget_usd=0,
+            acquire_timeout=1.0, breaker=CircuitBreaker("llm_replay_test", failure_threshold=100)))
+        return client
+    return install
+
+
+class TestReplayClient:
+    def test_recorded_response_replayed_by_key(self, replay):
+        import llm_service
+        from llm_backend import request_key
+        key = request_key(dict(_kwargs("hello"), system=[{"type": "text", "text": "s"}]))
+        assert key == request_key(_kwargs("hello"))
+        client = replay(recordings={key: {"text": "recorded", "input_tokens": 7, "output_tokens": 3}})
+        before = llm_service.get_usage()
+        assert llm_service.call("hello", system="s", max_tokens=512) == "recorded"
+        assert llm_service.get_usage()["input_tokens"] - before["input_tokens"] == 7
+        assert client.stats()["hits"] == 1
+
+    def test_miss_policy(self, replay):
+        import llm_service
+        replay()
+        assert json.loads(llm_service.call("unknown"))["direction"] == "neutral"
+        replay(miss="error")
+        assert llm_service.call("unknown") is None
+
+    def test_fault_injection_is_deterministic(self):
+        from llm_backend import ReplayClient
+
+        def outcomes():
+            client = ReplayClient(error_rate=0.3, timeout_rate=0.2, seed=7)
+            seen = []
+            for i in range(40):
+                try:
+                    client.create(**_kwargs(f"p{i}"))
+                    seen.append("ok")
+                except TimeoutError:
+                    seen.append("timeout")
+                except ConnectionError:
+                    seen.append("error")
+            return seen
+
+        first = outcomes()
+        assert first == outcomes()
+        assert {"ok", "timeout", "error"} <= set(first)
+
+    def test_latency_beyond_timeout_raises(self):
+        from llm_backend import ReplayClient
+        client = ReplayClient(latency_ms=50)
+        with pytest.raises(TimeoutError):
+            client.create(timeout=0.01, **_kwargs())
+
+    def test_full_llm_distill_path_offline(self, replay, board):
+        from swarm_agents import QueenDistiller
+        replay(latency_ms=5)
+        results = [{"score": 7.0, "direction": "bullish", "confidence": 0.8, "discovery": "x",
+                    "source": "ScoutBeeNova", "dimension": "signal", "data_quality": {"x": "real"}}]
+        out = QueenDistiller(board).distill("NVDA", results)
+        assert out["distill_mode"] == "llm_enhanced"
+        assert out["reasoning"] == "离线替身响应"
+
+
+class TestRecordingClient:
+    def test_record_then_replay(self, tmp_path):
+        from llm_backend import RecordingClient, ReplayClient
+        path = str(tmp_path / "rec.jsonl")
+        inner = SimpleNamespace(messages=SimpleNamespace(create=lambda **kw: SimpleNamespace(
+            content=[SimpleNamespace(text='{"ok": 1}')],
+            usage=SimpleNamespace(input_tokens=11, output_tokens=4))))
+        RecordingClient(inner, path).create(**_kwargs("q"))
+
+        response = ReplayClient(recordings=path).create(**_kwargs("q"))
+        assert response.content[0].text == '{"ok": 1}'
+        assert response.usage.input_tokens == 11
+
+    def test_replay_from_response_cache_db(self, tmp_path):
+        from llm_backend import ReplayClient, request_key
+        from llm_cache import LLMResponseCache
+        db = str(tmp_path / "llm_responses.db")
+        LLMResponseCache(db_path=db).put(request_key(_kwargs("q")), "cached", input_tokens=5, output_tokens=2)
+        assert ReplayClient(recordings=db).create(**_kwargs("q")).content[0].text == "cached"
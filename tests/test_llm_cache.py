@@ -0,0 +1,80 @@
+"""LLM 响应缓存测试 - 内容寻址 / TTL / 容量淘汰 / llm_service 命中统计"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+
+@pytest.fixture
+def cache(tmp_path):
+    from llm_cache import LLMResponseCache
+    return LLMResponseCache(db_path=str(tmp_path / "llm.db"))
+
+
+class TestLLMResponseCache:
+    def test_key_covers_all_request_params(self):
+        from llm_cache import make_key
+        base = make_key("m", "sys", "prompt", 0.2, 256)
+        assert base == make_key("m", "sys", "prompt", 0.2, 256)
+        assert base != make_key("m", "sys", "prompt", 0.3, 256)
+        assert base != make_key("m", "sys", "prompt", 0.2, 512)
+        assert base != make_key("m", "other", "prompt", 0.2, 256)
+
+    def test_put_get_and_ttl(self, cache):
+        cache.put("k", "answer", input_tokens=10, output_tokens=5, cost_usd=0.01, tag="news")
+        hit = cache.get("k", ttl=60)
+        assert hit["text"] == "answer" and hit["cost_usd"] == 0.01
+        assert cache.get("k", ttl=0) is None
+        time.sleep(0.02)
+        assert cache.get("k", ttl=0.01) is None
+        assert cache.stats()["hits"] == 1
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        from llm_cache import LLMResponseCache
+        c = LLMResponseCache(db_path=str(tmp_path / "small.db"), max_entries=2)
+        c.put("a", "1")
+        time.sleep(0.01)
+        c.put("b", "2")
+        time.sleep(0.01)
+        c.get("a", ttl=60)          # a 最近使用过
+        time.sleep(0.01)
+        c.put("c", "3")
+        assert c.get("b", ttl=60) is None
+        assert c.get("a", ttl=60) is not None and c.get("c", ttl=60) is not None
+
+    def test_byte_bound(self, tmp_path):
+        from llm_cache import LLMResponseCache
+        c = LLMResponseCache(db_path=str(tmp_path / "bytes.db"), max_bytes=100)
+        for i in range(5):
+            c.put(f"k{i}", "x" * 40)
+            time.sleep(0.005)
+        assert c.stats()["bytes"] <= 100
+
+
+class TestLLMServiceCache:
+    def test_repeat_call_served_from_cache(self, cache, monkeypatch):
+        import llm_cache
+        import llm_service
+        calls = []
+
+        def create(**kwargs):
+            calls.append(kwargs)
+            return SimpleNamespace(content=[SimpleNamespace(text='{"ok": 1}')],
+                                   usage=SimpleNamespace(input_tokens=100, output_tokens=50))
+
+        monkeypatch.setattr(llm_service, "_disabled", False)
+        monkeypatch.setattr(llm_service, "_client", SimpleNamespace(messages=SimpleNamespace(create=create)))
+        monkeypatch.setattr(llm_cache, "_cache", cache)
+        before = llm_service.get_usage()
+
+        assert llm_service.call_json("p", system="s", cache="news") == {"ok": 1}
+        assert llm_service.call_json("p", system="s", cache="news") == {"ok": 1}
+        assert llm_service.call("p", system="s", cache="default") == '{"ok": 1}'  # TTL 0：不走缓存
+
+        after = llm_service.get_usage()
+        assert len(calls) == 2
+        assert after["call_count"] - before["call_count"] == 2
+        assert after["cache_hits"] - before["cache_hits"] == 1
+        assert after["cache_saved_tokens"] - before["cache_saved_tokens"] == 150
+        assert after["cache_saved_usd"] > before["cache_saved_usd"]
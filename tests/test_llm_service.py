@@ -0,0 +1,280 @@
+"""llm_service 测试 - 调度器（并发 / token 限流 / 扫描预算 / 熔断）"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+
+def _response(text='{"ok": 1}', input_tokens=100, output_tokens=50):
+    return SimpleNamespace(content=[SimpleNamespace(text=text)],
+                           usage=SimpleNamespace(input_tokens=input_tokens, output_tokens=output_tokens))
+
+
+def _events(response, chunk=8):
+    """把完整响应拆成流式事件（message_start / content_block_delta / message_delta）"""
+    text = "".join(b.text for b in response.content)
+    yield SimpleNamespace(type="message_start", message=SimpleNamespace(
+        usage=SimpleNamespace(input_tokens=response.usage.input_tokens, output_tokens=1)))
+    for i in range(0, len(text), chunk):
+        yield SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(text=text[i:i + chunk]))
+    yield SimpleNamespace(type="message_delta", usage=SimpleNamespace(output_tokens=response.usage.output_tokens))
+
+
+def _dispatch(client, kw):
+    client.calls.append(kw)
+    response = client.create(**kw)
+    return _events(response) if kw.get("stream") and hasattr(response, "content") else response
+
+
+@pytest.fixture
+def llm(monkeypatch):
+    """启用 llm_service 并注入假 client（支持 stream=True）；每个测试使用独立调度器与熔断器"""
+    import llm_service
+    from resilience import CircuitBreaker
+    client = SimpleNamespace(calls=[], create=None)
+    client.messages = SimpleNamespace(create=lambda **kw: _dispatch(client, kw))
+    client.create = lambda **kw: _response()
+    monkeypatch.setattr(llm_service, "_disabled", False)
+    monkeypatch.setattr(llm_service, "_client", client)
+    monkeypatch.setattr(llm_service, "_dispatcher", llm_service.LLMDispatcher(
+        max_concurrency=2, tokens_per_minute=0, scan_budget_usd=0,
+        acquire_timeout=1.0, breaker=CircuitBreaker("llm_test", failure_threshold=2)))
+    return client
+
+
+class TestDispatcher:
+    def test_timeout_passed_to_client(self, llm):
+        import llm_service
+        assert llm_service.call("p", timeout=7.5) == '{"ok": 1}'
+        assert llm.calls[0]["timeout"] == 7.5
+
+    def test_concurrency_cap(self, llm):
+        import llm_service
+        active, peak = [0], [0]
+        lock = threading.Lock()
+
+        def slow(**kw):
+            with lock:
+                active[0] += 1
+                peak[0] = max(peak[0], active[0])
+            time.sleep(0.05)
+            with lock:
+                active[0] -= 1
+            return _response()
+
+        llm.create = slow
+        threads = [threading.Thread(target=llm_service.call, args=(f"p{i}",)) for i in range(6)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=5)
+        assert len(llm.calls) == 6
+        assert peak[0] <= 2
+
+    def test_scan_budget_degrades_to_rules(self, llm):
+        import llm_service
+        llm_service.begin_scan(budget_usd=0.0005)
+        assert llm_service.call("a") is not None       # 100 in + 50 out ≈ $0.00035
+        assert llm_service.call("b") is not None       # 累计 $0.0007 ≥ 预算
+        assert llm_service.call("c") is None
+        assert not llm_service.is_available()
+        assert llm_service.get_dispatcher().stats()["rejected"]["budget"] == 1
+        llm_service.begin_scan()
+        assert llm_service.is_available()
+
+    def test_failures_open_breaker(self, llm):
+        import llm_service
+
+        def timeout(**kw):
+            raise TimeoutError("slow")
+
+        llm.create = timeout
+        assert llm_service.call("a") is None
+        assert llm_service.call("b") is None
+        assert not llm_service.is_available()
+        assert llm_service.call("c") is None
+        assert len(llm.calls) == 2                     # 熔断打开后不再请求
+
+    def test_token_rate_limit(self, llm):
+        import llm_service
+        from resilience import CircuitBreaker
+        llm_service._dispatcher = llm_service.LLMDispatcher(
+            max_concurrency=4, tokens_per_minute=600, scan_budget_usd=0, acquire_timeout=0.05,
+            breaker=CircuitBreaker("llm_rate_test"))
+        assert llm_service.call("x" * 100, max_tokens=400) is not None   # 500/600 token
+        assert llm_service.call("x" * 100, max_tokens=400) is None       # 桶不足且等待超时
+        assert llm_service.get_dispatcher().stats()["rejected"]["rate"] == 1
+
+    def test_worker_usage_charged_to_scan_budget(self, llm):
+        import llm_service
+        dispatcher = llm_service.get_dispatcher()
+        llm_service.begin_scan(budget_usd=0.01)
+        assert dispatcher.split_budget(4) == pytest.approx(0.0025)
+        llm_service.merge_usage({"call_count": 2, "total_cost_usd": 0.006})
+        assert dispatcher.stats()["scan_spent_usd"] == pytest.approx(0.006)
+        assert dispatcher.split_budget(4) == pytest.approx(0.001)
+        llm_service.merge_usage({"call_count": 2, "total_cost_usd": 0.004})
+        assert dispatcher.split_budget(4) is None       # 已耗尽：工作进程禁用 LLM，而非传 0（= 不限）
+        assert llm_service.call("a") is None
+        llm_service.begin_scan(budget_usd=0)
+        assert dispatcher.split_budget(4) == 0
+
+
+class TestWeightedRateLimiter:
+    def test_weighted_acquire_waits_for_deficit(self):
+        from resilience import RateLimiter
+        rl = RateLimiter(rate=1000.0, burst=100)
+        assert rl.acquire(timeout=1.0, tokens=100)
+        start = time.monotonic()
+        assert rl.acquire(timeout=1.0, tokens=50)
+        assert time.monotonic() - start >= 0.04
+
+
+def _item(ticker, score=6.0):
+    return {"ticker": ticker, "agent_results": [{"source": "ScoutBeeNova", "dimension": "signal",
+                                                  "score": score, "direction": "bullish", "discovery": "x"}],
+            "dim_scores": {"signal": score}, "resonance": {}, "rule_score": score, "rule_direction": "bullish"}
+
+
+def _verdict(score, direction="bullish"):
+    return {"final_score": score, "direction": direction, "reasoning": "r", "key_insight": "k",
+            "risk_flag": "f", "confidence": 0.8}
+
+
+class TestBatchDistill:
+    def test_packed_single_round_trip(self, llm, monkeypatch):
+        import json
+        import llm_cache
+        import llm_service
+        monkeypatch.setattr(llm_cache, "_cache", None)
+        llm.create = lambda **kw: _response(json.dumps({"results": {
+            "NVDA": _verdict(7.5), "TSLA": _verdict(3.0, "bearish"), "AMD": _verdict(6.0)}}))
+        out = llm_service.distill_batch([_item("NVDA"), _item("TSLA"), _item("AMD")], mode="packed")
+        assert len(llm.calls) == 1
+        assert llm.calls[0]["system"] == llm_service._DISTILL_BATCH_SYSTEM
+        assert out["NVDA"]["final_score"] == 7.5 and out["TSLA"]["direction"] == "bearish"
+
+    def test_invalid_entry_falls_back_to_single(self, llm, monkeypatch):
+        import json
+        import llm_cache
+        import llm_service
+        monkeypatch.setattr(llm_cache, "_cache", None)
+
+        def create(**kw):
+            if kw["system"] == llm_service._DISTILL_BATCH_SYSTEM:
+                return _response(json.dumps({"results": {"NVDA": _verdict(7.5),
+                                                         "TSLA": _verdict(42, "up")}}))
+            return _response(json.dumps(_verdict(4.0, "neutral")))
+
+        llm.create = create
+        out = llm_service.distill_batch([_item("NVDA"), _item("TSLA")], mode="packed")
+        assert len(llm.calls) == 2
+        assert out["TSLA"] == llm_service.validate_distill(_verdict(4.0, "neutral"))
+
+    def test_validate_distill(self):
+        from llm_service import validate_distill
+        assert validate_distill(_verdict(11)) is None
+        assert validate_distill(_verdict(True)) is None
+        assert validate_distill({"final_score": 5, "direction": "sideways"}) is None
+        assert validate_distill(dict(_verdict(5), confidence=3))["confidence"] == 1.0
+
+    def test_batch_api_maps_results_back(self, llm, monkeypatch):
+        import json
+        import llm_cache
+        import llm_service
+        monkeypatch.setattr(llm_cache, "_cache", None)
+        submitted = {}
+
+        def create(requests):
+            submitted["requests"] = requests
+            return SimpleNamespace(id="b1", processing_status="ended")
+
+        def results(batch_id):
+            for req in submitted["requests"]:
+                msg = _response(json.dumps(_verdict(8.0)))
+                yield SimpleNamespace(custom_id=req["custom_id"],
+                                      result=SimpleNamespace(type="succeeded", message=msg))
+
+        llm.messages.batches = SimpleNamespace(create=create, results=results)
+        before = llm_service.get_usage()["total_cost_usd"]
+        out = llm_service.distill_batch([_item("BRK.B"), _item("NVDA")], mode="batch_api")
+        assert out["BRK.B"]["final_score"] == 8.0 and out["NVDA"] is not None
+        assert all(r["params"]["system"] == llm_service._DISTILL_SYSTEM
+                   for r in submitted["requests"])
+        # 两条 100 in + 50 out，半价
+        assert llm_service.get_usage()["total_cost_usd"] - before == pytest.approx(2 * 0.00035 * 0.5)
+
+
+class TestPromptCaching:
+    def test_system_prompt_sent_without_cache_marker(self, llm):
+        import llm_service
+        llm_service.call("p", system="static instructions")
+        assert llm.calls[0]["system"] == "static instructions"
+
+    def test_cache_read_and_write_priced_separately(self, llm):
+        import llm_service
+        usage = SimpleNamespace(input_tokens=100, output_tokens=50,
+                                cache_creation_input_tokens=2000, cache_read_input_tokens=0)
+        llm.create = lambda **kw: SimpleNamespace(content=[SimpleNamespace(text="ok")], usage=usage)
+        before = llm_service.get_usage()
+        llm_service.call("a", system="s")
+        usage.cache_creation_input_tokens, usage.cache_read_input_tokens = 0, 2000
+        llm_service.call("b", system="s")
+        after = llm_service.get_usage()
+
+        assert after["prompt_cache_write_tokens"] - before["prompt_cache_write_tokens"] == 2000
+        assert after["prompt_cache_read_tokens"] - before["prompt_cache_read_tokens"] == 2000
+        assert after["input_tokens"] - before["input_tokens"] == 200
+        # haiku: 输入 $1/M，写入 $1.25/M，读取 $0.10/M，输出 $5/M
+        expected = (200 * 1.0 + 2000 * 1.25 + 2000 * 0.10 + 100 * 5.0) / 1_000_000
+        assert after["total_cost_usd"] - before["total_cost_usd"] == pytest.approx(expected)
+        # 净节省 = 读取省下 2000×0.9 − 写入多付 2000×0.25
+        saved = after["prompt_cache_saved_usd"] - before["prompt_cache_saved_usd"]
+        assert saved == pytest.approx((2000 * 0.9 - 2000 * 0.25) / 1_000_000)
+
+
+class TestStreamingJSON:
+    def test_scanner_stops_at_object_close(self):
+        from llm_service import _JSONObjectScanner
+        sc = _JSONObjectScanner()
+        assert not sc.feed('```json\n{"a": "x}{\\"", ')
+        assert sc.feed('"b": {"c": 1}} trailing')
+        assert sc.result() == '{"a": "x}{\\"", "b": {"c": 1}}'
+
+    def test_scanner_fails_on_long_preamble(self):
+        from llm_service import _JSONObjectScanner
+        sc = _JSONObjectScanner(max_preamble=10)
+        sc.feed("I think the answer is")
+        assert sc.failed and sc.result() is None
+
+    def test_stream_returns_before_trailing_text(self, llm, monkeypatch):
+        import llm_cache
+        import llm_service
+        monkeypatch.setattr(llm_cache, "_cache", None)
+        consumed = []
+
+        def create(**kw):
+            def events():
+                yield SimpleNamespace(type="message_start", message=SimpleNamespace(
+                    usage=SimpleNamespace(input_tokens=100, output_tokens=1)))
+                for piece in ['{"ok": ', '1}', ' 以下是解释', '……' * 50]:
+                    consumed.append(piece)
+                    yield SimpleNamespace(type="content_block_delta", delta=SimpleNamespace(text=piece))
+            return events()
+
+        llm.create = create
+        assert llm_service.call_json("p", stream=True) == {"ok": 1}
+        assert consumed == ['{"ok": ', '1}']
+        assert llm.calls[0]["stream"] is True
+
+    def test_schema_failure_returns_none(self, llm, monkeypatch):
+        import json
+        import llm_cache
+        import llm_service
+        monkeypatch.setattr(llm_cache, "_cache", None)
+        llm.create = lambda **kw: _response(json.dumps(_verdict(15)))
+        assert llm_service.distill_with_reasoning("NVDA", **{k: v for k, v in _item("NVDA").items()
+                                                              if k != "ticker"}) is None
+        assert llm.calls[0]["stream"] is True
@@ -0,0 +1,96 @@
+"""market_feed 测试 - 环形缓冲 / 向量化指标 / 预取复用（不访问网络）"""
+
+import math
+
+import numpy as np
+import pytest
+
+
+DAY = 86400.0
+
+
+def _bars(n, start=100.0, step=1.0, vol=1_000_000.0):
+    ts = [i * DAY for i in range(n)]
+    closes = [start + i * step for i in range(n)]
+    vols = [vol + i * 10_000 for i in range(n)]
+    return ts, closes, vols
+
+
+class TestBarRing:
+    def test_wraps_and_keeps_latest(self):
+        from market_feed import BarRing
+        ring = BarRing(capacity=4)
+        for i in range(6):
+            ring.upsert(i * DAY, 100.0 + i, 10.0)
+        close, _ = ring.window(4)
+        assert close.tolist() == [102.0, 103.0, 104.0, 105.0]
+
+    def test_same_bar_updated_in_place(self):
+        from market_feed import BarRing
+        ring = BarRing(capacity=4)
+        ring.upsert(DAY, 100.0, 10.0)
+        ring.upsert(DAY, 101.5, 12.0)   # 盘中更新
+        ring.upsert(0.0, 99.0, 1.0)     # 更早的 bar 被忽略
+        close, vol = ring.window(3)
+        assert ring.count == 1
+        assert math.isnan(close[0]) and close[-1] == 101.5 and vol[-1] == 12.0
+
+
+class TestSnapshot:
+    def test_matches_per_ticker_formulas(self):
+        import pandas as pd
+        from market_feed import MarketFeed
+        feed = MarketFeed()
+        ts, closes, vols = _bars(22, step=1.5)
+        feed.ingest("NVDA", ts, closes, vols)
+        data = feed.stock_data("NVDA")
+
+        hist = pd.DataFrame({"Close": closes, "Volume": vols})
+        assert data["price"] == pytest.approx(closes[-1])
+        assert data["momentum_5d"] == pytest.approx((closes[-1] / closes[-5] - 1) * 100)
+        avg20 = hist["Volume"].iloc[-20:].mean()
+        assert data["volume_ratio"] == pytest.approx(vols[-1] / avg20)
+        vol20 = hist["Close"].pct_change().dropna().std() * (252 ** 0.5) * 100
+        assert data["volatility_20d"] == pytest.approx(vol20)
+
+    def test_vectorized_across_tickers(self):
+        from market_feed import MarketFeed
+        feed = MarketFeed()
+        feed.ingest("NVDA", *_bars(10, step=2.0))
+        feed.ingest("TSLA", [0.0, DAY], [100.0, 97.0], [1.0, 3.0])
+        snap = feed.snapshot(["NVDA", "TSLA", "AMD"])
+        assert snap["change_pct"][1] == pytest.approx(-3.0)
+        assert snap["volume_ratio_5d"][1] == pytest.approx(1.5)
+        assert np.isnan(snap["change_pct"][2])   # 无数据
+        assert feed.stock_data("AMD") is None
+
+    def test_stale_buffer_not_reused(self):
+        from market_feed import MarketFeed
+        feed = MarketFeed()
+        feed.ingest("NVDA", *_bars(5))
+        feed._updated["NVDA"] -= 600
+        assert feed.stock_data("NVDA", max_age=120) is None
+
+
+class TestPrefetchReuse:
+    def test_prefetch_uses_fresh_feed(self, monkeypatch):
+        import market_feed
+        import swarm_agents
+        feed = market_feed.MarketFeed()
+        feed.ingest("NVDA", *_bars(22))
+        monkeypatch.setattr(market_feed, "_feed", feed)
+        fetched = []
+        monkeypatch.setattr(swarm_agents, "_fetch_stock_data", lambda t: fetched.append(t) or {"price": 1.0})
+        data = swarm_agents.prefetch_shared_data(["NVDA", "TSLA"])
+        assert fetched == ["TSLA"]
+        assert data["stock_data"]["NVDA"]["price"] == pytest.approx(121.0)
+
+    def test_dirty_price_invalidates_feed(self, monkeypatch):
+        import market_feed
+        import swarm_agents
+        feed = market_feed.MarketFeed()
+        feed.ingest("NVDA", *_bars(22))
+        monkeypatch.setattr(market_feed, "_feed", feed)
+        swarm_agents.invalidate_source_caches({"NVDA": {"price"}})
+        assert feed.stock_data("NVDA") is None
+        assert feed._rings["NVDA"].count == 22      # bar 保留，下次轮询仍为增量
@@ -73,6 +73,16 @@ class TestSession:
         )
         assert ok
 
+    def test_pheromone_snapshot_roundtrip(self, memory_store):
+        snapshot = [{"ticker": "NVDA", "agent_id": "ScoutBeeNova", "support_count": 3,
+                     "discovery": "机构增持" * 400}]
+        memory_store.save_session(
+            session_id="snap", date="2026-02-25", run_mode="test",
+            tickers=["NVDA"], swarm_results={}, pheromone_snapshot=snapshot, duration=1.0,
+        )
+        assert memory_store.get_session_snapshot("snap") == snapshot
+        assert memory_store.get_session_snapshot("missing") == []
+
     def test_session_id_format(self, memory_store):
         sid = memory_store.generate_session_id("swarm")
         assert "swarm" in sid
@@ -172,3 +172,54 @@ class TestJSONFormatter:
 
         test_logger.removeHandler(handler)
         handler.close()
+
+
+class TestSpanMetrics:
+    def test_record_spans_and_stage_summary(self, mc):
+        spans = [{"name": "agent.Scout", "dur": d, "corr": "c1"} for d in (0.1, 0.2, 0.3)]
+        spans.append({"name": "cache.yfinance.hit", "dur": 0.0, "corr": "c1", "event": True})
+        assert mc.record_spans(spans, session_id="s1") == 2
+        mc.record_scan(ticker_count=1, duration_seconds=1.0)
+        stages = mc.get_summary(days=1)["stages"]
+        assert stages["agent.Scout"]["count"] == 3
+        assert stages["agent.Scout"]["p50"] == pytest.approx(0.2)
+        assert stages["cache.yfinance.hit"]["count"] == 1
+        assert mc.get_stage_history("agent.Scout")[0]["correlation_id"] == "c1"
+
+    def test_ticker_analysis_seconds(self, mc):
+        mc.record_ticker(ticker="NVDA", final_score=7.0, analysis_seconds=1.25)
+        assert mc.get_ticker_history("NVDA")[0]["analysis_seconds"] == 1.25
+
+
+class TestSourceMetrics:
+    @staticmethod
+    def _snap(latencies, errors=0, retries=0):
+        import bisect
+        from resilience import HIST_BOUNDS, new_histogram
+        hist = new_histogram()
+        for v in latencies:
+            hist[bisect.bisect_left(HIST_BOUNDS, v)] += 1
+        return {"requests": len(latencies), "errors": errors, "retries": retries,
+                "trips": 0, "throttled": 0, "rejected": 0,
+                "wait_total": 0.0, "latency_total": sum(latencies),
+                "wait_hist": new_histogram(), "latency_hist": hist}
+
+    def test_rolling_histograms_merge_across_scans(self, mc):
+        mc.record_sources({"yfinance": self._snap([0.1] * 10)})
+        mc.record_sources({"yfinance": self._snap([0.1] * 10, errors=1, retries=2)})
+        st = mc.get_source_stats(days=1)["yfinance"]
+        assert st["requests"] == 20 and st["retries"] == 2
+        assert st["error_rate"] == 0.05
+        assert 0.05 < st["latency_p95"] <= 0.1
+
+    def test_source_slo_violations_in_summary(self, mc):
+        mc.record_sources({"sec_edgar": self._snap([4.0] * 10, errors=3)})
+        mc.record_scan(ticker_count=1, duration_seconds=1.0, data_real_pct=80.0)
+        names = {v["slo_name"] for v in mc.check_slo(days=1)}
+        assert {"source_latency_p95:sec_edgar", "source_error_rate:sec_edgar"} <= names
+        summary = mc.get_summary(days=1)
+        assert summary["sources"]["sec_edgar"]["slo_ok"] is False
+
+    def test_source_slo_skips_low_volume(self, mc):
+        mc.record_sources({"sec_edgar": self._snap([9.0] * 2, errors=2)})
+        assert mc.check_slo(days=1) == []
@@ -0,0 +1,108 @@
+"""进程池模式测试 - spawn 工作进程分析结果与线程模式一致 / 信息素回放 / 用量·span·数据源统计合并"""
+
+from types import SimpleNamespace
+
+import pytest
+
+
+class _BaseStub:
+    """桩 Agent 基类（不在模块顶层导入 swarm_agents：收集阶段导入会在隔离环境生效前初始化日志目录）"""
+
+    def __init__(self, board):
+        self.board = board
+
+
+class _StubAgent(_BaseStub):
+    """第一阶段桩 Agent：发布一条信息素，记录一次数据源请求与一次 LLM 调用"""
+
+    BASE = 5.0
+
+    def analyze(self, ticker):
+        import llm_service
+        from pheromone_board import PheromoneEntry
+        from resilience import source_stats
+        score = self.BASE + len(ticker) / 10
+        self.board.publish(PheromoneEntry(agent_id=type(self).__name__, ticker=ticker,
+                                          discovery=f"{type(self).__name__} {ticker}", source="stub",
+                                          self_score=score, direction="bullish"))
+        source_stats("stub_source").observe_request(0.01, False)
+        llm_service._record_usage("stub-model", SimpleNamespace(input_tokens=100, output_tokens=10))
+        return {"agent": type(self).__name__, "score": score, "direction": "bullish"}
+
+
+class StubScout(_StubAgent):
+    BASE = 6.0
+
+
+class StubOracle(_StubAgent):
+    BASE = 4.0
+
+
+class StubBear(_BaseStub):
+    """第二阶段桩 Agent：分数取自信息素板上本 ticker 的看多条目数"""
+
+    def analyze(self, ticker):
+        bullish = sum(1 for e in self.board.get_top_signals(ticker, n=20) if e.direction == "bullish")
+        return {"agent": "StubBear", "score": float(bullish), "direction": "bearish"}
+
+
+AGENT_CLASSES = ((StubScout, StubOracle), StubBear)
+TICKERS = ["NVDA", "TSLA", "AMD"]
+
+
+def _by_agent(results):
+    return sorted(results, key=lambda r: r["agent"])
+
+
+def _thread_mode(ticker):
+    """与 run_swarm_scan 线程模式相同的两阶段顺序（同一进程、共享信息素板）"""
+    from pheromone_board import PheromoneBoard
+    board = PheromoneBoard()
+    phase1 = [cls(board) for cls in AGENT_CLASSES[0]]
+    return [a.analyze(ticker) for a in phase1] + [AGENT_CLASSES[1](board).analyze(ticker)]
+
+
+@pytest.fixture
+def pool_run():
+    import llm_service
+    import tracing
+    from pheromone_board import PheromoneBoard
+    from resilience import collect_source_stats
+    from swarm_agents import analyze_in_processes
+    collect_source_stats()
+    tracing.drain()
+    usage_before = llm_service.get_usage()
+    board = PheromoneBoard()
+    payloads = dict(analyze_in_processes(
+        TICKERS, {"stock_data": {}, "contexts": {}}, board, workers=2,
+        agent_classes=AGENT_CLASSES, correlation_id="pool_test", warm_up=False,
+    ))
+    usage = {k: v - usage_before.get(k, 0) for k, v in llm_service.get_usage().items()}
+    yield SimpleNamespace(board=board, payloads=payloads, usage=usage,
+                          spans=tracing.drain("pool_test"), stats=collect_source_stats())
+
+
+class TestProcessPool:
+    def test_results_match_thread_mode(self, pool_run):
+        assert set(pool_run.payloads) == set(TICKERS)
+        for ticker in TICKERS:
+            assert _by_agent(pool_run.payloads[ticker]["agent_results"]) == _by_agent(_thread_mode(ticker))
+
+    def test_entries_replayed_onto_board(self, pool_run):
+        for ticker in TICKERS:
+            agents = {e.agent_id for e in pool_run.board.get_top_signals(ticker, n=20)}
+            assert agents == {"StubScout", "StubOracle"}
+
+    def test_usage_spans_and_source_stats_merged(self, pool_run):
+        n_calls = len(TICKERS) * len(AGENT_CLASSES[0])
+        assert pool_run.usage["call_count"] == n_calls
+        assert pool_run.usage["input_tokens"] == 100 * n_calls
+        assert pool_run.stats["stub_source"]["requests"] == n_calls
+
+        ticker_spans = [s for s in pool_run.spans if s["name"] == "ticker"]
+        assert sorted(s["attrs"]["ticker"] for s in ticker_spans) == sorted(TICKERS)
+        ids = {s["id"] for s in pool_run.spans}
+        assert len(ids) == len(pool_run.spans)                     # 跨进程合并后 id 不冲突
+        agent_spans = [s for s in pool_run.spans if s["name"] == "agent.StubScout"]
+        assert len(agent_spans) == len(TICKERS)
+        assert all(s["parent"] in {t["id"] for t in ticker_spans} for s in agent_spans)
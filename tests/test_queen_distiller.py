@@ -207,3 +207,46 @@ class TestDistill:
         # catalyst/odds/sentiment/risk_adj 均未提供
         assert out["dimension_status"]["catalyst"] == "absent"
         assert out["dimension_status"]["odds"] == "absent"
+
+
+class TestBatchDistill:
+    def _results(self):
+        return [
+            _make_result("signal", 7.0, source="ScoutBeeNova"),
+            _make_result("catalyst", 6.5, source="ChronosBeeHorizon"),
+            _make_result("risk_adj", 6.0, source="GuardBeeSentinel"),
+        ]
+
+    def test_apply_llm_matches_inline_path(self, board, monkeypatch):
+        import llm_service
+        verdict = {"final_score": 8.0, "direction": "bullish", "reasoning": "r",
+                   "key_insight": "k", "risk_flag": "f", "confidence": 0.9}
+        monkeypatch.setattr(llm_service, "is_available", lambda: True)
+        monkeypatch.setattr(llm_service, "distill_with_reasoning", lambda **kw: dict(verdict))
+        queen = QueenDistiller(board)
+        inline = queen.distill("NVDA", self._results())
+        deferred = queen.distill("NVDA", self._results(), llm=False)
+        assert deferred["distill_mode"] == "rule_engine"
+        applied = queen.apply_llm(deferred, dict(verdict))
+        for key in ("final_score", "direction", "distill_mode", "reasoning", "llm_confidence",
+                    "dq_quality_factor", "dq_penalty_applied"):
+            assert applied[key] == inline[key], key
+
+    def test_enhance_batch_uses_one_batch(self, board, monkeypatch):
+        import llm_service
+        calls = []
+
+        def fake_batch(items):
+            calls.append([i["ticker"] for i in items])
+            return {"NVDA": {"final_score": 9.0, "direction": "bullish", "confidence": 0.8},
+                    "TSLA": None}
+
+        monkeypatch.setattr(llm_service, "is_available", lambda: True)
+        monkeypatch.setattr(llm_service, "distill_batch", fake_batch)
+        queen = QueenDistiller(board)
+        results = {t: self._results() for t in ("NVDA", "TSLA")}
+        out = queen.enhance_batch({t: queen.distill(t, r, llm=False) for t, r in results.items()}, results)
+        assert calls == [["NVDA", "TSLA"]]
+        assert out["NVDA"]["distill_mode"] == "llm_enhanced"
+        assert out["TSLA"]["distill_mode"] == "rule_engine"
+        assert out["TSLA"]["reasoning"] == ""
@@ -188,3 +188,135 @@ class TestPresetInstances:
         from resilience import yfinance_limiter, yfinance_breaker
         assert yfinance_limiter is not None
         assert yfinance_breaker.state == "closed"
+
+
+class TestSourceStats:
+    def test_limiter_and_breaker_record_stats(self):
+        from resilience import RateLimiter, CircuitBreaker, collect_source_stats
+        collect_source_stats()
+        rl = RateLimiter(rate=20.0, burst=1, name="stats_src")
+        cb = CircuitBreaker("stats_src", failure_threshold=2)
+        rl.acquire(timeout=1.0)
+        rl.acquire(timeout=1.0)  # 需等待补充 → throttled
+        cb.record_success(0.05)
+        cb.record_retry()
+        cb.record_failure(1.5)
+        cb.record_failure()
+        assert not cb.allow_request()
+        snap = collect_source_stats()["stats_src"]
+        assert snap["requests"] == 3 and snap["errors"] == 2
+        assert snap["retries"] == 1 and snap["trips"] == 1 and snap["rejected"] == 1
+        assert snap["throttled"] == 1
+        assert sum(snap["latency_hist"]) == 2
+        assert sum(snap["wait_hist"]) == 2
+        assert "stats_src" not in collect_source_stats()  # 取出后已清零
+
+    def test_retry_decorator_counts_retries(self):
+        from resilience import retry, CircuitBreaker, collect_source_stats
+        cb = CircuitBreaker("retry_src", failure_threshold=10)
+        collect_source_stats()
+        calls = []
+
+        @retry(max_retries=2, backoff_base=0.01, exceptions=(ValueError,), circuit_breaker=cb)
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ValueError("fail")
+            return "ok"
+
+        assert flaky() == "ok"
+        snap = collect_source_stats()["retry_src"]
+        assert snap["retries"] == 2 and snap["requests"] == 1 and snap["errors"] == 0
+
+    def test_hist_percentile(self):
+        from resilience import HIST_BOUNDS, hist_percentile, new_histogram
+        import bisect
+        counts = new_histogram()
+        for v in [0.05] * 90 + [2.0] * 10:
+            counts[bisect.bisect_left(HIST_BOUNDS, v)] += 1
+        assert hist_percentile(counts, 0.5) <= 0.05
+        assert 1.0 < hist_percentile(counts, 0.95) <= 2.0
+        assert hist_percentile(new_histogram(), 0.95) == 0.0
+
+
+class TestAdaptiveRateLimiter:
+    def test_exact_wait_for_fractional_deficit(self):
+        from resilience import RateLimiter
+        rl = RateLimiter(rate=10.0, burst=1)
+        assert rl.acquire(timeout=1.0)
+        time.sleep(0.07)                       # 已补充 0.7 个 token，只差 0.3 个（30ms）
+        start = time.monotonic()
+        assert rl.acquire(timeout=1.0)
+        assert time.monotonic() - start < 0.08  # 旧实现至少等一个完整间隔（100ms）
+
+    def test_retry_after_pauses_and_aimd(self):
+        from resilience import RateLimiter
+        rl = RateLimiter(rate=100.0, burst=5, max_rate=200.0, min_rate=10.0, increase=10.0)
+        rl.feedback(429, {"Retry-After": "0.15"})
+        assert rl.rate == 50.0
+        rl.on_throttle()                        # 同一秒内的重复 429 不再降速
+        assert rl.rate == 50.0
+        assert not rl.acquire(timeout=0.05)     # 暂停期内等不到 → 立即失败
+        start = time.monotonic()
+        assert rl.acquire(timeout=1.0)
+        assert time.monotonic() - start >= 0.09
+        for _ in range(30):
+            rl.feedback(200)
+        assert rl.rate == 200.0
+
+    def test_parse_retry_after(self):
+        from email.utils import formatdate
+        from resilience import parse_retry_after, rate_limit_signal
+        assert parse_retry_after("3") == 3.0
+        assert 8 <= parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+        assert parse_retry_after("soon") is None
+
+        class HTTPError(OSError):
+            response = type("R", (), {"status_code": 429, "headers": {"Retry-After": "2"}})()
+
+        assert rate_limit_signal(HTTPError()) == 2.0
+        assert rate_limit_signal(ValueError("bad")) is None
+
+    def test_priority_jumps_queue(self):
+        from resilience import (RateLimiter, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE,
+                                request_priority)
+        rl = RateLimiter(rate=20.0, burst=1)
+        assert rl.acquire(timeout=1.0)
+        order = []
+
+        def worker(tag, priority):
+            with request_priority(priority):
+                if rl.acquire(timeout=2.0):
+                    order.append(tag)
+
+        background = [threading.Thread(target=worker, args=(f"bg{i}", PRIORITY_BACKGROUND)) for i in range(3)]
+        for t in background:
+            t.start()
+        time.sleep(0.01)
+        urgent = threading.Thread(target=worker, args=("interactive", PRIORITY_INTERACTIVE))
+        urgent.start()
+        for t in background + [urgent]:
+            t.join(timeout=5)
+        assert order[0] == "interactive"
+
+    def test_per_key_fairness(self):
+        from resilience import RateLimiter
+        rl = RateLimiter(rate=50.0, burst=1)
+        assert rl.acquire(timeout=1.0)
+        order = []
+        lock = threading.Lock()
+
+        def worker(host):
+            if rl.acquire(timeout=3.0, key=host):
+                with lock:
+                    order.append(host)
+
+        threads = [threading.Thread(target=worker, args=("a",)) for _ in range(4)]
+        for t in threads:
+            t.start()
+        time.sleep(0.01)
+        late = threading.Thread(target=worker, args=("b",))
+        late.start()
+        for t in threads + [late]:
+            t.join(timeout=5)
+        assert order.index("b") <= 1            # 后到的 host b 不必排在 a 的全部请求之后
@@ -0,0 +1,193 @@
+"""result_log 测试 - 追加式 checkpoint / 当日蜂群结果日志"""
+
+import json
+
+
+class TestAppendOnlyLog:
+    def test_append_and_replay(self, tmp_path):
+        from result_log import AppendOnlyLog
+        log = AppendOnlyLog(tmp_path / "ckpt.jsonl")
+        log.append("NVDA", {"final_score": 7.5})
+        log.append("TSLA", {"final_score": 4.0})
+        log.close()
+        assert AppendOnlyLog(tmp_path / "ckpt.jsonl").replay() == {
+            "NVDA": {"final_score": 7.5},
+            "TSLA": {"final_score": 4.0},
+        }
+
+    def test_latest_record_wins(self, tmp_path):
+        from result_log import AppendOnlyLog
+        with AppendOnlyLog(tmp_path / "ckpt.jsonl") as log:
+            log.append("NVDA", {"final_score": 5.0})
+            log.append("NVDA", {"final_score": 8.0})
+        assert AppendOnlyLog(tmp_path / "ckpt.jsonl").replay()["NVDA"]["final_score"] == 8.0
+
+    def test_truncated_tail_skipped(self, tmp_path):
+        from result_log import AppendOnlyLog
+        path = tmp_path / "ckpt.jsonl"
+        with AppendOnlyLog(path) as log:
+            log.append("NVDA", {"final_score": 7.0})
+        with open(path, "a") as f:
+            f.write('{"k": "TSLA", "v": {"final_sc')  # 模拟崩溃时写了一半
+        assert list(AppendOnlyLog(path).replay()) == ["NVDA"]
+
+    def test_only_appends(self, tmp_path):
+        from result_log import AppendOnlyLog
+        path = tmp_path / "ckpt.jsonl"
+        log = AppendOnlyLog(path, fsync_every=2)
+        log.append("A", {"x": 1})
+        first = path.read_bytes()
+        log.append("B", {"x": 2})
+        log.close()
+        content = path.read_bytes()
+        assert content.startswith(first)  # 已有内容未被重写
+        assert content.count(b"\n") == 2
+
+    def test_unlink(self, tmp_path):
+        from result_log import AppendOnlyLog
+        log = AppendOnlyLog(tmp_path / "ckpt.jsonl")
+        log.append("NVDA", {})
+        log.unlink()
+        assert not (tmp_path / "ckpt.jsonl").exists()
+        assert log.replay() == {}
+
+
+class TestSwarmResults:
+    def test_batches_merge_latest(self, tmp_path):
+        from result_log import swarm_results_log, load_swarm_results
+        with swarm_results_log(tmp_path, "2026-03-01") as log:
+            log.append_many({"NVDA": {"final_score": 6.0}, "TSLA": {"final_score": 5.0}})
+        with swarm_results_log(tmp_path, "2026-03-01") as log:
+            log.append_many({"NVDA": {"final_score": 7.0}})
+        data = load_swarm_results(tmp_path, "2026-03-01")
+        assert data == {"NVDA": {"final_score": 7.0}, "TSLA": {"final_score": 5.0}}
+
+    def test_legacy_json_overlaid(self, tmp_path):
+        from result_log import swarm_results_log, load_swarm_results, latest_swarm_results_date
+        with open(tmp_path / ".swarm_results_2026-03-01.json", "w") as f:
+            json.dump({"NVDA": {"final_score": 6.0}, "META": {"final_score": 5.5}}, f)
+        with swarm_results_log(tmp_path, "2026-03-01") as log:
+            log.append_many({"NVDA": {"final_score": 7.0}})
+        data = load_swarm_results(tmp_path, "2026-03-01")
+        assert data["NVDA"]["final_score"] == 7.0
+        assert data["META"]["final_score"] == 5.5
+        assert latest_swarm_results_date(tmp_path, ["2026-03-02", "2026-03-01"]) == "2026-03-01"
+
+
+class TestDailyReportStore:
+    def _batch(self, opps, md):
+        return {"date": "2026-03-01", "swarm_metadata": {"tickers_analyzed": len(opps)},
+                "opportunities": [{"ticker": t, "opp_score": s} for t, s in opps],
+                "markdown_report": md, "twitter_threads": ["t1"]}
+
+    def test_batches_merge_latest_per_ticker(self, tmp_path):
+        from result_log import DailyReportStore
+        store = DailyReportStore(tmp_path, "2026-03-01")
+        store.append_batch(self._batch([("NVDA", 6.0), ("TSLA", 5.0)], "# 批次1"))
+        store.append_batch(self._batch([("NVDA", 8.0), ("META", 7.0)], "# 批次2"))
+        report = store.materialize()
+        assert [(o["ticker"], o["opp_score"]) for o in report["opportunities"]] == [
+            ("NVDA", 8.0), ("META", 7.0), ("TSLA", 5.0)]
+        assert report["markdown_report"] == "# 批次1\n\n---\n\n# 批次2"
+        assert report["swarm_metadata"]["tickers_analyzed"] == 3
+        assert "twitter_threads" not in report
+
+    def test_rescan_replaces_same_scope_markdown(self, tmp_path):
+        from result_log import DailyReportStore
+        store = DailyReportStore(tmp_path, "2026-03-01")
+        store.append_batch(self._batch([("NVDA", 6.0), ("TSLA", 5.0)], "# 全量"))
+        store.append_batch(self._batch([("TSLA", 5.5)], "# TSLA 重扫1"))
+        store.append_batch(self._batch([("TSLA", 6.5)], "# TSLA 重扫2"))
+        assert store.materialize()["markdown_report"] == "# 全量\n\n---\n\n# TSLA 重扫2"
+
+    def test_superseded_batch_markdown_dropped(self, tmp_path):
+        from result_log import DailyReportStore
+        store = DailyReportStore(tmp_path, "2026-03-01")
+        store.append_batch(self._batch([("NVDA", 6.0)], "# NVDA"))
+        store.append_batch(self._batch([("NVDA", 7.0), ("TSLA", 5.0)], "# 全量"))
+        assert store.materialize()["markdown_report"] == "# 全量"
+
+    def test_write_artifacts(self, tmp_path):
+        from result_log import DailyReportStore
+        store = DailyReportStore(tmp_path, "2026-03-01")
+        store.append_batch(self._batch([("NVDA", 6.0)], "# 简报"))
+        store.write_artifacts()
+        data = json.loads(store.json_path.read_text(encoding="utf-8"))
+        assert data["opportunities"][0]["ticker"] == "NVDA"
+        assert store.md_path.read_text(encoding="utf-8") == "# 简报"
+
+    def test_legacy_report_seeded(self, tmp_path):
+        from result_log import DailyReportStore
+        with open(tmp_path / "alpha-hive-daily-2026-03-01.json", "w", encoding="utf-8") as f:
+            json.dump({"opportunities": [{"ticker": "TSLA", "opp_score": 5.0}]}, f)
+        (tmp_path / "alpha-hive-daily-2026-03-01.md").write_text("# 旧简报", encoding="utf-8")
+        store = DailyReportStore(tmp_path, "2026-03-01")
+        store.append_batch(self._batch([("NVDA", 6.0)], "# 新批次"))
+        report = store.materialize()
+        assert {o["ticker"] for o in report["opportunities"]} == {"NVDA", "TSLA"}
+        assert report["markdown_report"].startswith("# 旧简报")
+
+
+class TestBinaryLogs:
+    def test_binary_truncated_tail_skipped(self, tmp_path):
+        from result_log import AppendOnlyLog
+        path = tmp_path / "ckpt.bin"
+        with AppendOnlyLog(path) as log:
+            assert log.binary
+            log.append("NVDA", {"final_score": 7.0})
+            log.append("TSLA", {"final_score": 6.0})
+        path.write_bytes(path.read_bytes()[:-5])  # 模拟崩溃时写了一半
+        assert AppendOnlyLog(path).replay() == {"NVDA": {"final_score": 7.0}}
+
+    def test_swarm_results_overlay_jsonl_then_bin(self, tmp_path):
+        from result_log import AppendOnlyLog, swarm_results_log, load_swarm_results
+        with AppendOnlyLog(tmp_path / ".swarm_results_2026-03-01.jsonl") as log:
+            log.append_many({"NVDA": {"final_score": 6.0}, "META": {"final_score": 5.5}})
+        with swarm_results_log(tmp_path, "2026-03-01") as log:
+            log.append_many({"NVDA": {"final_score": 7.0}})
+        assert load_swarm_results(tmp_path, "2026-03-01") == {
+            "NVDA": {"final_score": 7.0}, "META": {"final_score": 5.5}}
+
+    def test_checkpoint_resumes_from_legacy_jsonl(self, tmp_path):
+        from result_log import AppendOnlyLog, checkpoint_log
+        with AppendOnlyLog(tmp_path / ".checkpoint_s1.jsonl") as log:
+            log.append("NVDA", {"final_score": 7.0})
+        ckpt = checkpoint_log(tmp_path, "s1")
+        ckpt.append("TSLA", {"final_score": 6.0})
+        assert ckpt.replay() == {"NVDA": {"final_score": 7.0}, "TSLA": {"final_score": 6.0}}
+        ckpt.unlink()
+        assert not (tmp_path / ".checkpoint_s1.jsonl").exists()
+        assert not (tmp_path / ".checkpoint_s1.bin").exists()
+
+    def test_checkpoint_llm_pending_survives_resume(self, tmp_path):
+        from result_log import checkpoint_log, llm_pending_key, replay_llm_pending
+        agent_results = [{"source": "ScoutBeeNova", "score": 7.0}]
+        with checkpoint_log(tmp_path, "s1") as ckpt:
+            for ticker in ("NVDA", "TSLA"):
+                ckpt.append(llm_pending_key(ticker), agent_results)
+                ckpt.append(ticker, {"final_score": 6.0, "distill_mode": "rule_engine"})
+        records = checkpoint_log(tmp_path, "s1").replay()
+        assert replay_llm_pending(records, ["NVDA", "TSLA", "AMD"]) == {
+            "NVDA": agent_results, "TSLA": agent_results}
+
+        with checkpoint_log(tmp_path, "s1") as ckpt:
+            ckpt.append_many({"NVDA": {"final_score": 7.5, "distill_mode": "llm_enhanced"},
+                              llm_pending_key("NVDA"): None})
+        records = checkpoint_log(tmp_path, "s1").replay()
+        assert records["NVDA"]["distill_mode"] == "llm_enhanced"
+        assert replay_llm_pending(records, ["NVDA", "TSLA"]) == {"TSLA": agent_results}
+
+    def test_report_store_reads_legacy_jsonl(self, tmp_path):
+        from result_log import AppendOnlyLog, DailyReportStore
+        (tmp_path / "alpha-hive-daily-2026-03-01.json").write_text(
+            json.dumps({"opportunities": [{"ticker": "NVDA", "opp_score": 6.0}]}), encoding="utf-8")
+        with AppendOnlyLog(tmp_path / ".report_2026-03-01.jsonl") as log:
+            log.append_many({"report": {"date": "2026-03-01"},
+                             "opp:NVDA": {"ticker": "NVDA", "opp_score": 6.0},
+                             "md:0f3a": "# 旧批次"})
+        store = DailyReportStore(tmp_path, "2026-03-01")
+        store.append_batch({"opportunities": [{"ticker": "TSLA", "opp_score": 5.0}],
+                            "markdown_report": "# 新批次"})
+        report = store.materialize()
+        assert {o["ticker"] for o in report["opportunities"]} == {"NVDA", "TSLA"}
+        assert report["markdown_report"] == "# 旧批次\n\n---\n\n# 新批次"   # 未重复导入当日 JSON
@@ -0,0 +1,115 @@
+"""跨进程共享限流 / 熔断状态测试 - 同名实例共用预算 / 降速与 Retry-After 传播 / 多进程 / 降级"""
+
+import multiprocessing
+import time
+
+import pytest
+
+from resilience import CircuitBreaker, RateLimiter
+from shared_state import SharedStateStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return SharedStateStore(db_path=str(tmp_path / "state.db"))
+
+
+def _drain(db_path, n, out):
+    """子进程：以独立的限流器实例取 n 个 token"""
+    limiter = RateLimiter(rate=20.0, burst=1, name="mp_src", shared=SharedStateStore(db_path=db_path))
+    out.put(sum(limiter.acquire(timeout=10.0) for _ in range(n)))
+
+
+class TestSharedRateLimiter:
+    def test_same_name_shares_one_bucket(self, store):
+        a = RateLimiter(rate=1.0, burst=2, name="src", shared=store)
+        b = RateLimiter(rate=1.0, burst=2, name="src", shared=store)
+        assert a.acquire(timeout=0.1) and b.acquire(timeout=0.1)
+        assert not b.acquire(timeout=0.1)             # 两个实例合计已用完容量
+        other = RateLimiter(rate=1.0, burst=2, name="other", shared=store)
+        assert other.acquire(timeout=0.1)
+
+    def test_throttle_propagates_rate_and_retry_after(self, store):
+        a = RateLimiter(rate=8.0, burst=3, name="src", shared=store, min_rate=1.0)
+        b = RateLimiter(rate=8.0, burst=3, name="src", shared=store, min_rate=1.0)
+        a.on_throttle(retry_after=5.0)
+        assert not b.acquire(timeout=0.2)             # 另一实例同样处于 Retry-After 暂停
+        assert b.rate == pytest.approx(4.0)
+
+    def test_stale_bucket_resets_to_initial_rate(self, tmp_path):
+        store = SharedStateStore(db_path=str(tmp_path / "state.db"), stale_seconds=0.05)
+        a = RateLimiter(rate=8.0, burst=3, name="src", shared=store)
+        a.on_throttle()
+        time.sleep(0.1)
+        assert a.acquire(timeout=0.1)
+        assert a.rate == 8.0
+
+    def test_processes_share_budget(self, tmp_path):
+        db_path = str(tmp_path / "state.db")
+        SharedStateStore(db_path=db_path)
+        ctx = multiprocessing.get_context("spawn")
+        out = ctx.Queue()
+        procs = [ctx.Process(target=_drain, args=(db_path, 5, out)) for _ in range(3)]
+        start = time.monotonic()
+        for p in procs:
+            p.start()
+        granted = sum(out.get(timeout=30) for _ in procs)
+        for p in procs:
+            p.join(timeout=10)
+        # 15 个 token、20/s、容量 1：合计至少 14 个补充间隔
+        assert granted == 15
+        assert time.monotonic() - start >= 14 / 20.0
+
+    def test_falls_back_to_local_bucket_on_db_error(self, store, monkeypatch):
+        import sqlite3
+
+        def broken(*args, **kwargs):
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(store, "take", broken)
+        limiter = RateLimiter(rate=1.0, burst=1, name="src", shared=store)
+        assert limiter.acquire(timeout=0.1)
+        assert not limiter.acquire(timeout=0.1)
+
+
+class TestSharedCircuitBreaker:
+    def test_failures_open_breaker_everywhere(self, store):
+        a = CircuitBreaker("src", failure_threshold=3, recovery_timeout=60.0, shared=store)
+        b = CircuitBreaker("src", failure_threshold=3, recovery_timeout=60.0, shared=store)
+        a.record_failure()
+        b.record_failure()
+        assert a.allow_request()
+        a.record_failure()
+        assert b.state == CircuitBreaker.OPEN and not b.allow_request()
+        b.reset()
+        assert a.state == CircuitBreaker.CLOSED
+
+    def test_half_open_then_close(self, store):
+        a = CircuitBreaker("src", failure_threshold=1, recovery_timeout=0.05, shared=store)
+        b = CircuitBreaker("src", failure_threshold=1, recovery_timeout=0.05, shared=store)
+        a.record_failure()
+        time.sleep(0.1)
+        assert b.state == CircuitBreaker.HALF_OPEN
+        b.record_success()
+        assert a.state == CircuitBreaker.CLOSED
+
+    def test_state_read_does_not_take_write_lock(self, tmp_path):
+        db_path = str(tmp_path / "state.db")
+        store = SharedStateStore(db_path=db_path, busy_timeout=1.0)
+        breaker = CircuitBreaker("src", failure_threshold=1, recovery_timeout=0.05, shared=store)
+        breaker.record_failure()
+        with SharedStateStore(db_path=db_path)._txn():          # 另一连接持有写锁
+            start = time.monotonic()
+            assert breaker.state == CircuitBreaker.OPEN
+            assert not breaker.allow_request()
+            assert store.breaker_success("other") == CircuitBreaker.CLOSED
+            assert time.monotonic() - start < 0.5
+        time.sleep(0.1)
+        assert store.breaker_state("src", 0.05) == (CircuitBreaker.HALF_OPEN, True)
+        assert store.breaker_state("src", 0.05) == (CircuitBreaker.HALF_OPEN, False)
+
+
+def test_env_switch_disables_store(monkeypatch):
+    import shared_state
+    monkeypatch.setenv("ALPHA_HIVE_SHARED_LIMITS", "0")
+    assert shared_state.get_shared_state() is None
@@ -0,0 +1,49 @@
+"""CLI 启动开销测试 - 入口模块导入不加载重依赖 / 可选子系统，--help 在预算内返回"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 入口导入时不应加载的模块（重依赖 + 按需初始化的可选子系统）
+HEAVY = ("yfinance", "pandas", "numpy", "chromadb", "anthropic", "schedule",
+         "generate_ml_report", "backtester", "earnings_watcher", "memory_store",
+         "vector_memory", "calendar_integrator", "code_executor_agent", "crewai_adapter",
+         "slack_report_notifier", "metrics_collector")
+
+# 导入耗时预算（秒，-X importtime 累计值，不含解释器自身启动）
+IMPORT_BUDGET = 0.5
+
+
+def _python(*args, timeout=60):
+    return subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True, timeout=timeout)
+
+
+@pytest.mark.parametrize("module", ["alpha_hive_daily_report", "run_daily_scan", "scheduler"])
+def test_entry_import_is_light(module):
+    code = (f"import sys, json; import {module}; "
+            f"print(json.dumps(sorted(m for m in {HEAVY!r} if m in sys.modules)))")
+    proc = _python("-c", code)
+    assert proc.returncode == 0, proc.stderr
+    assert json.loads(proc.stdout.strip().splitlines()[-1]) == []
+
+
+def test_import_time_budget():
+    proc = _python("-X", "importtime", "-c", "import alpha_hive_daily_report")
+    assert proc.returncode == 0, proc.stderr
+    line = next(l for l in proc.stderr.splitlines() if l.rstrip().endswith("| alpha_hive_daily_report"))
+    cumulative_us = int(line.split("|")[1])
+    assert cumulative_us / 1e6 < IMPORT_BUDGET
+
+
+def test_help_returns_quickly():
+    start = time.monotonic()
+    proc = _python("alpha_hive_daily_report.py", "--help")
+    assert proc.returncode == 0, proc.stderr
+    assert "--swarm" in proc.stdout
+    assert time.monotonic() - start < 3.0     # 含解释器启动；CI 机器留余量（本地约 0.2s）
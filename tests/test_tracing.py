@@ -0,0 +1,86 @@
+"""tracing 测试 - 嵌套 span / 线程池传播 / 汇总分位数 / 导出 / 跨进程合并"""
+
+import time
+
+import pytest
+
+
+class TestTracing:
+    @pytest.fixture(autouse=True)
+    def _clean(self):
+        import tracing
+        tracing.drain()
+        yield
+        tracing.drain()
+
+    def test_nested_spans_share_correlation(self):
+        import tracing
+        from hive_logger import set_correlation_id
+        set_correlation_id("trace_test")
+        with tracing.span("ticker", ticker="NVDA"):
+            with tracing.span("distill"):
+                pass
+            tracing.event("cache.yfinance.hit")
+        spans = {s["name"]: s for s in tracing.drain("trace_test")}
+        assert set(spans) == {"ticker", "distill", "cache.yfinance.hit"}
+        assert spans["distill"]["parent"] == spans["ticker"]["id"]
+        assert spans["cache.yfinance.hit"]["parent"] == spans["ticker"]["id"]
+        assert spans["ticker"]["attrs"] == {"ticker": "NVDA"}
+
+    def test_wrap_propagates_into_pool_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        import tracing
+        from hive_logger import get_correlation_id, set_correlation_id
+        set_correlation_id("trace_pool")
+        with tracing.span("ticker"):
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                corr = pool.submit(tracing.wrap(get_correlation_id, "agent.Test")).result()
+        assert corr == "trace_pool"
+        spans = {s["name"]: s for s in tracing.drain("trace_pool")}
+        assert spans["agent.Test"]["parent"] == spans["ticker"]["id"]
+
+    def test_error_recorded_and_reraised(self):
+        import tracing
+        with pytest.raises(ValueError):
+            with tracing.span("fetch.bad"):
+                raise ValueError("boom")
+        assert tracing.drain()[0]["error"] == "ValueError"
+
+    def test_merge_remaps_worker_span_ids(self):
+        import tracing
+        with tracing.span("scan"):
+            pass
+        local = tracing.drain()[0]
+        worker = [{"id": local["id"], "parent": None, "name": "ticker", "corr": "w", "dur": 2.0},
+                  {"id": local["id"] + 1, "parent": local["id"], "name": "agent.Scout", "corr": "w",
+                   "dur": 1.5}]
+        tracing.merge(worker, correlation_id="scan1")
+        merged = tracing.drain("scan1")
+        assert local["id"] not in {s["id"] for s in merged}
+        assert merged[0]["parent"] is None
+        assert merged[1]["parent"] == merged[0]["id"]
+        assert worker[1]["parent"] == local["id"]            # 不修改调用方的 span
+
+    def test_aggregate_percentiles(self):
+        import tracing
+        spans = [{"name": "llm.call", "dur": d / 10} for d in range(1, 11)]
+        st = tracing.aggregate(spans)["llm.call"]
+        assert st["count"] == 10
+        assert st["p50"] == pytest.approx(0.55)
+        assert st["max"] == pytest.approx(1.0)
+        assert st["p50"] <= st["p95"] <= st["p99"] <= st["max"]
+
+    def test_export_folded_and_chrome(self, tmp_path):
+        import json
+        import tracing
+        with tracing.span("scan"):
+            with tracing.span("agent.Scout"):
+                time.sleep(0.002)
+        spans = tracing.drain()
+        tracing.export_folded(spans, tmp_path / "t.folded")
+        tracing.export_chrome_trace(spans, tmp_path / "t.json")
+        lines = (tmp_path / "t.folded").read_text().splitlines()
+        assert any(line.startswith("scan;agent.Scout ") for line in lines)
+        events = json.loads((tmp_path / "t.json").read_text())["traceEvents"]
+        assert {e["name"] for e in events} == {"scan", "agent.Scout"}
+        assert all(e["ph"] == "X" and e["dur"] >= 0 for e in events)
@@ -0,0 +1,77 @@
+"""VectorMemory 测试 - 批量写入（使用内存中的假 collection，不依赖 chromadb）"""
+
+import pytest
+
+
+class _FakeCollection:
+    def __init__(self):
+        self.add_calls = []
+        self.get_calls = []
+        self.metadatas = []
+
+    def add(self, documents, metadatas, ids):
+        self.add_calls.append((documents, metadatas, ids))
+        self.metadatas.extend(metadatas)
+
+    def get(self, where=None, include=None):
+        self.get_calls.append(where)
+        return {"ids": [str(i) for i in range(len(self.metadatas))], "metadatas": list(self.metadatas)}
+
+
+@pytest.fixture
+def vm():
+    from vector_memory import VectorMemory
+    v = VectorMemory.__new__(VectorMemory)
+    v.db_path = ""
+    v.retention_days = 90
+    v._client = None
+    v._collection = _FakeCollection()
+    v.enabled = True
+    return v
+
+
+class TestStoreMany:
+    def test_single_add_call(self, vm):
+        items = [
+            {"ticker": "NVDA", "agent_id": "QueenDistiller", "discovery": "评分7.5",
+             "direction": "bullish", "score": 7.5, "source": "swarm_scan"},
+            {"ticker": "TSLA", "agent_id": "ScoutBeeNova", "discovery": "机构减持",
+             "direction": "bearish", "score": 6.5},
+        ]
+        ids = vm.store_many(items, session_id="s1")
+        assert len(ids) == 2
+        assert len(set(ids)) == 2
+        assert len(vm._collection.add_calls) == 1
+        docs, metas, _ = vm._collection.add_calls[0]
+        assert docs[0].startswith("NVDA")
+        assert metas[1]["session_id"] == "s1"
+        assert metas[1]["source"] == ""
+
+    def test_empty_items(self, vm):
+        assert vm.store_many([]) == []
+        assert vm._collection.add_calls == []
+
+    def test_disabled(self, vm):
+        vm.enabled = False
+        assert vm.store_many([{"ticker": "NVDA"}]) == []
+
+
+class TestContextsBulk:
+    def test_single_query_for_all_tickers(self, vm):
+        vm.store_many([
+            {"ticker": "NVDA", "agent_id": "ScoutBeeNova", "direction": "bullish", "score": 8.0},
+            {"ticker": "NVDA", "agent_id": "OracleBeeEcho", "direction": "bearish", "score": 4.0},
+            {"ticker": "TSLA", "agent_id": "ScoutBeeNova", "direction": "bearish", "score": 3.0},
+        ])
+        ctx = vm.get_contexts_bulk(["NVDA", "TSLA", "VKTX"], ["ScoutBeeNova", "OracleBeeEcho"])
+        assert len(vm._collection.get_calls) == 1
+        assert ctx["NVDA"]["BeeAgent"] == "历史2条:多1/空1,均分6.0"
+        assert ctx["NVDA"]["ScoutBeeNova"].endswith("本蜂1条均分8.0")
+        assert ctx["TSLA"]["OracleBeeEcho"] == "历史1条:多0/空1,均分3.0"
+        assert ctx["VKTX"] == {"BeeAgent": "", "ScoutBeeNova": "", "OracleBeeEcho": ""}
+
+    def test_disabled_returns_empty_contexts(self, vm):
+        vm.enabled = False
+        assert vm.get_contexts_bulk(["NVDA"], ["ScoutBeeNova"]) == {
+            "NVDA": {"BeeAgent": "", "ScoutBeeNova": ""}
+        }
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+🐝 Alpha Hive 轻量追踪 - 热路径计时 span + 缓存命中事件
+
+- span(name, **attrs)：上下文管理器，记录耗时、线程、父 span 与 correlation_id
+  （取自 hive_logger.set_correlation_id，同一次扫描的所有 span 可按它汇总）
+- event(name, **attrs)：零耗时事件（缓存命中/未命中等），只计数
+- wrap(fn, name)：把当前 correlation_id 与父 span 带入线程池工作线程
+- aggregate()：按 span 名汇总 count / total / p50 / p95 / p99 / max（写入 metrics.db）
+- export_chrome_trace() / export_folded()：导出为 Chrome/Perfetto 轨迹或
+  flamegraph.pl / speedscope 可读的折叠栈
+
+关闭追踪（configure(enabled=False)）后 span() 只剩一次布尔判断。
+
+用法：
+    with tracing.span("agent.ScoutBeeNova", ticker="NVDA"):
+        ...
+    tracing.event("cache.yfinance.hit", ticker="NVDA")
+    spans = tracing.drain(get_correlation_id())
+"""
+
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import wraps
+from typing import Callable, Deque, Dict, Iterable, List, Optional
+
+from hive_logger import get_correlation_id, set_correlation_id
+
+_enabled = True
+_spans: Deque[Dict] = deque(maxlen=50_000)
+_lock = threading.Lock()
+_local = threading.local()
+_ids = iter(range(1, 1 << 62))
+# 轨迹时间基准：perf_counter 与墙钟的偏移（导出时换算为绝对时间）
+_EPOCH_OFFSET = time.time() - time.perf_counter()
+
+
+def configure(enabled: bool = True, max_spans: int = 50_000) -> None:
+    """设置追踪开关与缓冲上限（超出上限时丢弃最早的 span）"""
+    global _enabled, _spans
+    with _lock:
+        _enabled = enabled
+        if max_spans != _spans.maxlen:
+            _spans = deque(_spans, maxlen=max_spans)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def _stack() -> List[int]:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def _record(record: Dict) -> None:
+    with _lock:
+        _spans.append(record)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    """计时 span（可嵌套；异常照常抛出，span 标记 error）"""
+    if not _enabled:
+        yield
+        return
+    stack = _stack()
+    span_id = next(_ids)
+    parent = stack[-1] if stack else getattr(_local, "parent", None)
+    stack.append(span_id)
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        end = time.perf_counter()
+        stack.pop()
+        record = {
+            "id": span_id, "parent": parent, "name": name,
+            "start": start, "dur": end - start,
+            "tid": threading.get_ident(), "corr": get_correlation_id(),
+        }
+        if attrs:
+            record["attrs"] = attrs
+        if error:
+            record["error"] = error
+        _record(record)
+
+
+def event(name: str, **attrs) -> None:
+    """记录零耗时事件（缓存命中/未命中、复用等）"""
+    if not _enabled:
+        return
+    stack = _stack()
+    record = {
+        "id": next(_ids), "parent": stack[-1] if stack else getattr(_local, "parent", None),
+        "name": name, "start": time.perf_counter(), "dur": 0.0, "event": True,
+        "tid": threading.get_ident(), "corr": get_correlation_id(),
+    }
+    if attrs:
+        record["attrs"] = attrs
+    _record(record)
+
+
+def traced(name: str):
+    """装饰器：整个函数调用作为一个 span"""
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def wrap(fn: Callable, name: Optional[str] = None, **attrs) -> Callable:
+    """
+    包装提交到线程池的函数：在工作线程中恢复提交时的 correlation_id 与父 span，
+    name 非空时再包一层 span
+    """
+    if not _enabled:
+        return fn
+    corr = get_correlation_id()
+    stack = _stack()
+    parent = stack[-1] if stack else getattr(_local, "parent", None)
+
+    @wraps(fn)
+    def runner(*args, **kwargs):
+        prev_corr = get_correlation_id()
+        prev_parent = getattr(_local, "parent", None)
+        set_correlation_id(corr)
+        _local.parent = parent
+        try:
+            if name:
+                with span(name, **attrs):
+                    return fn(*args, **kwargs)
+            return fn(*args, **kwargs)
+        finally:
+            set_correlation_id(prev_corr)
+            _local.parent = prev_parent
+    return runner
+
+
+# ==================== 读取 / 合并 ====================
+
+def drain(correlation_id: Optional[str] = None) -> List[Dict]:
+    """取出并移除 span（指定 correlation_id 时只取该次扫描的）"""
+    with _lock:
+        if correlation_id is None:
+            out = list(_spans)
+            _spans.clear()
+            return out
+        out, keep = [], []
+        for s in _spans:
+            (out if s["corr"] == correlation_id else keep).append(s)
+        _spans.clear()
+        _spans.extend(keep)
+        return out
+
+
+def merge(spans: Iterable[Dict], correlation_id: Optional[str] = None) -> None:
+    """
+    合并外部（进程池工作进程）产生的 span；跨进程时间基准不同，仅用于汇总与导出
+
+    spawn 启动的工作进程 span id 同样从 1 开始，合并时按本进程 _ids 重新分配 id
+    并改写同批内的 parent 引用（指向批外的 parent 置为 None），避免与本进程 span 串链。
+    """
+    spans = list(spans)
+    remap = {s["id"]: next(_ids) for s in spans if "id" in s}
+    with _lock:
+        for s in spans:
+            s = dict(s, id=remap.get(s.get("id")), parent=remap.get(s.get("parent")))
+            if correlation_id is not None:
+                s["corr"] = correlation_id
+            _spans.append(s)
+
+
+def _percentile(sorted_vals: List[float], q: float) -> float:
+    """线性插值分位数（sorted_vals 已排序且非空）"""
+    if len(sorted_vals) == 1:
+        return sorted_vals[0]
+    pos = (len(sorted_vals) - 1) * q
+    lo, hi = math.floor(pos), math.ceil(pos)
+    return sorted_vals[lo] + (sorted_vals[hi] - sorted_vals[lo]) * (pos - lo)
+
+
+def aggregate(spans: Iterable[Dict]) -> Dict[str, Dict]:
+    """按名称汇总：{name: {count, errors, total, p50, p95, p99, max}}（事件只计数）"""
+    groups: Dict[str, List[Dict]] = {}
+    for s in spans:
+        groups.setdefault(s["name"], []).append(s)
+    result = {}
+    for name, items in groups.items():
+        durs = sorted(s["dur"] for s in items)
+        result[name] = {
+            "count": len(items),
+            "errors": sum(1 for s in items if s.get("error")),
+            "total": sum(durs),
+            "p50": _percentile(durs, 0.50),
+            "p95": _percentile(durs, 0.95),
+            "p99": _percentile(durs, 0.99),
+            "max": durs[-1],
+        }
+    return result
+
+
+# ==================== 导出 ====================
+
+def export_chrome_trace(spans: Iterable[Dict], path) -> None:
+    """导出 Chrome Trace Event 格式（chrome://tracing / Perfetto / speedscope 可直接打开）"""
+    events = []
+    for s in spans:
+        ev = {
+            "name": s["name"], "pid": 1, "tid": s["tid"],
+            "ts": round((s["start"] + _EPOCH_OFFSET) * 1e6, 1),
+            "args": dict(s.get("attrs", {}), corr=s["corr"]),
+        }
+        if s.get("event"):
+            ev.update(ph="i", s="t")
+        else:
+            ev.update(ph="X", dur=round(s["dur"] * 1e6, 1))
+        if s.get("error"):
+            ev["args"]["error"] = s["error"]
+        events.append(ev)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False, default=str)
+
+
+def export_folded(spans: Iterable[Dict], path) -> None:
+    """
+    导出折叠栈（flamegraph.pl / speedscope / inferno 可读）：每行 "root;child;leaf 自身耗时微秒"
+
+    父 span 不在本批中时（如跨线程提交后父 span 已被裁剪），从该 span 开始作为根。
+    """
+    spans = [s for s in spans if not s.get("event")]
+    by_id = {s["id"]: s for s in spans}
+    child_time: Dict[int, float] = {}
+    for s in spans:
+        if s.get("parent") in by_id:
+            child_time[s["parent"]] = child_time.get(s["parent"], 0.0) + s["dur"]
+
+    folded: Dict[str, int] = {}
+    for s in spans:
+        names, cur, seen = [], s, set()
+        while cur is not None and cur["id"] not in seen:
+            seen.add(cur["id"])
+            names.append(cur["name"].replace(";", ":").replace(" ", "_"))
+            cur = by_id.get(cur.get("parent"))
+        self_us = int(max(0.0, s["dur"] - child_time.get(s["id"], 0.0)) * 1e6)
+        if self_us > 0:
+            key = ";".join(reversed(names))
+            folded[key] = folded.get(key, 0) + self_us
+    with open(path, "w", encoding="utf-8") as f:
+        for key, us in sorted(folded.items()):
+            f.write(f"{key} {us}\n")
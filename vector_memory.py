@@ -121,6 +121,57 @@ class VectorMemory:
             _log.warning("VectorMemory.store 失败: %s", e)
             return None
 
+    def store_many(self, items: List[Dict], session_id: str = "") -> List[str]:
+        """
+        批量存储 Agent 发现（单次嵌入 + 单次 collection.add）
+
+        Args:
+            items: 记录列表，每项含 store() 的同名字段
+                   （ticker / agent_id / discovery / direction / score / source）
+            session_id: 会话 ID（单项未指定 session_id 时使用）
+
+        Returns:
+            成功写入的文档 ID 列表（失败时为空列表）
+        """
+        if not self.enabled or not items:
+            return []
+
+        try:
+            now = datetime.now()
+            created_at = now.isoformat()
+            date_str = now.strftime("%Y-%m-%d")
+            epoch_day = int(time.time() // 86400)
+            base_ms = int(time.time() * 1000)
+
+            ids, documents, metadatas = [], [], []
+            for i, item in enumerate(items):
+                ticker = item.get("ticker", "")
+                agent_id = item.get("agent_id", "")
+                discovery = item.get("discovery", "")
+                direction = item.get("direction", "neutral")
+                source = item.get("source", "")
+                # 同毫秒批量写入：追加序号保证 ID 唯一
+                ids.append(f"{ticker}_{agent_id}_{base_ms}_{i}")
+                documents.append(f"{ticker} {discovery} {direction} {source}"[:500])
+                metadatas.append({
+                    "ticker": ticker,
+                    "agent_id": agent_id,
+                    "direction": direction,
+                    "score": item.get("score", 5.0),
+                    "source": source,
+                    "session_id": item.get("session_id") or session_id,
+                    "created_at": created_at,
+                    "date": date_str,
+                    "epoch_day": epoch_day,
+                })
+
+            self._collection.add(documents=documents, metadatas=metadatas, ids=ids)
+            return ids
+
+        except (ValueError, KeyError, TypeError, AttributeError, OSError) as e:
+            _log.warning("VectorMemory.store_many 失败: %s", e)
+            return []
+
     def search(
         self,
         query: str,
@@ -224,6 +275,73 @@ class VectorMemory:
             _log.debug("get_context_for_agent 降级为空字符串: %s", exc)
             return ""
 
+    def get_contexts_bulk(
+        self,
+        tickers: List[str],
+        agent_ids: List[str] = None,
+        max_chars: int = 200,
+        per_ticker: int = 5,
+        days: int = 30
+    ) -> Dict[str, Dict[str, str]]:
+        """
+        单次查询为所有标的 × 所有 Agent 生成历史上下文（替代逐 ticker 的 get_context_for_agent）
+
+        Args:
+            tickers: 股票代码列表
+            agent_ids: 需要专属上下文的 Agent 名称列表
+            max_chars: 每条上下文最大字符数
+            per_ticker: 每个 ticker 汇总的最近记忆条数
+            days: 回溯天数
+
+        Returns:
+            {ticker: {"BeeAgent": 通用上下文, agent_id: 含本 Agent 历史的上下文}}
+            无历史记录的 ticker 返回空字符串
+        """
+        agent_ids = agent_ids or []
+        contexts = {t: {a: "" for a in ["BeeAgent", *agent_ids]} for t in tickers}
+        if not self.enabled or not tickers:
+            return contexts
+
+        try:
+            cutoff_day = int(time.time() // 86400) - days
+            data = self._collection.get(
+                where={"$and": [
+                    {"ticker": {"$in": list(tickers)}},
+                    {"epoch_day": {"$gte": cutoff_day}},
+                ]},
+                include=["metadatas"],
+            )
+            metas = (data or {}).get("metadatas") or []
+        except (ValueError, KeyError, TypeError, AttributeError, OSError) as e:
+            _log.warning("VectorMemory.get_contexts_bulk 失败: %s", e)
+            return contexts
+
+        by_ticker: Dict[str, List[Dict]] = {}
+        for meta in metas:
+            by_ticker.setdefault(meta.get("ticker", ""), []).append(meta)
+
+        for ticker in tickers:
+            rows = sorted(by_ticker.get(ticker, []),
+                          key=lambda m: m.get("created_at", ""), reverse=True)
+            recent = rows[:per_ticker]
+            if not recent:
+                continue
+            bullish = sum(1 for m in recent if m.get("direction") == "bullish")
+            bearish = sum(1 for m in recent if m.get("direction") == "bearish")
+            avg_score = sum(m.get("score", 0) for m in recent) / len(recent)
+            base = f"历史{len(recent)}条:多{bullish}/空{bearish},均分{avg_score:.1f}"
+            contexts[ticker]["BeeAgent"] = base[:max_chars]
+
+            for agent_id in agent_ids:
+                own = [m for m in rows if m.get("agent_id") == agent_id][:per_ticker]
+                ctx = base
+                if own:
+                    own_avg = sum(m.get("score", 0) for m in own) / len(own)
+                    ctx = f"{base}|本蜂{len(own)}条均分{own_avg:.1f}"
+                contexts[ticker][agent_id] = ctx[:max_chars]
+
+        return contexts
+
     def cleanup(self, days: int = None) -> int:
         """
         清理过期记忆